@@ -0,0 +1,155 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from threegpp_common.cache_governor import CacheGovernor
+from threegpp_common.config import CommonConfig
+
+
+class Test_test_cache_governor(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.patches = [
+            mock.patch.object(CommonConfig, 'root', CommonConfig.DEFAULT_ROOT),
+            mock.patch.object(CommonConfig, 'app_name', 'meeting_helper'),
+            mock.patch.object(CacheGovernor, '_pending_registrations', {}),
+            mock.patch.object(CacheGovernor, '_pending_accesses', {}),
+            mock.patch.object(CacheGovernor, '_active_meeting', None),
+            mock.patch.object(CacheGovernor, '_scan_folders', set()),
+        ]
+        for patch in self.patches:
+            patch.start()
+        CommonConfig.configure(os.path.join(self.temp_dir.name, 'cache_root'))
+
+    def tearDown(self):
+        for patch in reversed(self.patches):
+            patch.stop()
+        self.temp_dir.cleanup()
+
+    def write_entry(self, name: str, size: int, category: str, meeting: str = None, last_access: float = 0) -> str:
+        file_path = os.path.join(self.temp_dir.name, name)
+        with open(file_path, 'wb') as f:
+            f.write(b'0' * size)
+        CacheGovernor.register(file_path, category, meeting=meeting)
+        # Deterministic last access
+        CacheGovernor._pending_registrations[CacheGovernor._normalize_path(file_path)] = (
+            category, meeting, None, last_access)
+        return file_path
+
+    def test_register_and_touch(self):
+        file_path = self.write_entry('a.pickle', 100, CacheGovernor.PICKLE, last_access=10)
+        CacheGovernor.touch(file_path)
+        entries = CacheGovernor.get_entries()
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0].size, 100)
+        self.assertEqual(entries[0].category, CacheGovernor.PICKLE)
+        self.assertGreater(entries[0].last_access, 10)
+        self.assertTrue(CommonConfig.path('cache_catalogue.sqlite').exists())
+
+    def test_lru_eviction(self):
+        old_file = self.write_entry('old.zip', 100, CacheGovernor.TDOCS, last_access=1)
+        new_file = self.write_entry('new.zip', 100, CacheGovernor.TDOCS, last_access=2)
+        other_file = self.write_entry('other.md', 100, CacheGovernor.MARKDOWN, last_access=0)
+        reports = CacheGovernor.enforce_quotas(quotas={CacheGovernor.TDOCS: 150, CacheGovernor.MARKDOWN: 150})
+
+        tdocs_report = [report for report in reports if report.category == CacheGovernor.TDOCS][0]
+        self.assertEqual(tdocs_report.used, 200)
+        self.assertEqual(tdocs_report.freed, 100)
+        self.assertFalse(os.path.exists(old_file))
+        self.assertTrue(os.path.exists(new_file))
+        self.assertTrue(os.path.exists(other_file))
+        self.assertEqual(len(CacheGovernor.get_entries(CacheGovernor.TDOCS)), 1)
+
+    def test_freed_counts_hard_links_once(self):
+        first_file = self.write_entry('first.zip', 100, CacheGovernor.TDOCS, last_access=1)
+        second_file = os.path.join(self.temp_dir.name, 'second.zip')
+        os.link(first_file, second_file)
+        CacheGovernor.register(second_file, CacheGovernor.TDOCS)
+        CacheGovernor._pending_registrations[CacheGovernor._normalize_path(second_file)] = (
+            CacheGovernor.TDOCS, None, None, 2)
+        kept_link = os.path.join(self.temp_dir.name, 'kept.zip')
+        os.link(self.write_entry('third.zip', 100, CacheGovernor.TDOCS, last_access=3), kept_link)
+
+        reports = CacheGovernor.enforce_quotas(dry_run=True, quotas={CacheGovernor.TDOCS: 0})
+        self.assertEqual(len(reports[0].evicted), 3)
+        # first.zip and second.zip are the same 100 bytes, third.zip is still linked from kept.zip
+        self.assertEqual(reports[0].freed, 100)
+
+    def test_dry_run(self):
+        old_file = self.write_entry('old.zip', 100, CacheGovernor.TDOCS, last_access=1)
+        self.write_entry('new.zip', 100, CacheGovernor.TDOCS, last_access=2)
+        reports = CacheGovernor.enforce_quotas(dry_run=True, quotas={CacheGovernor.TDOCS: 150})
+        self.assertEqual([entry.path for entry in reports[0].evicted], [CacheGovernor._normalize_path(old_file)])
+        self.assertTrue(os.path.exists(old_file))
+        self.assertIn('Would evict 1 entries', CacheGovernor.format_report(reports, dry_run=True))
+
+    def test_active_meeting_and_pinned_not_evicted(self):
+        active_file = self.write_entry('active.zip', 100, CacheGovernor.TDOCS, meeting='SA2_160', last_access=1)
+        pinned_file = self.write_entry('pinned.zip', 100, CacheGovernor.TDOCS, last_access=2)
+        old_file = self.write_entry('old.zip', 100, CacheGovernor.TDOCS, meeting='SA2_150', last_access=3)
+        CacheGovernor.pin(pinned_file)
+        CacheGovernor.set_active_meeting('SA2_160')
+        CacheGovernor.enforce_quotas(quotas={CacheGovernor.TDOCS: 0})
+        self.assertTrue(os.path.exists(active_file))
+        self.assertTrue(os.path.exists(pinned_file))
+        self.assertFalse(os.path.exists(old_file))
+
+        # The active meeting is persisted
+        CacheGovernor._active_meeting = None
+        self.assertEqual(CacheGovernor.get_active_meeting(), 'SA2_160')
+
+    def test_active_meeting_of_other_application_not_evicted(self):
+        tools_file = self.write_entry('tools.zip', 100, CacheGovernor.TDOCS, meeting='SA2_161', last_access=1)
+        old_file = self.write_entry('old.zip', 100, CacheGovernor.TDOCS, meeting='SA2_150', last_access=2)
+        CacheGovernor.set_active_meeting('SA2_160')
+        with mock.patch.object(CommonConfig, 'app_name', '3gpp_tools'), \
+                mock.patch.object(CacheGovernor, '_active_meeting', None):
+            CacheGovernor.set_active_meeting('SA2_161')
+        self.assertEqual(CacheGovernor.get_active_meeting(), 'SA2_160')
+        self.assertEqual(CacheGovernor.get_protected_meetings(), {'SA2_160', 'SA2_161'})
+        CacheGovernor.enforce_quotas(quotas={CacheGovernor.TDOCS: 0})
+        self.assertTrue(os.path.exists(tools_file))
+        self.assertFalse(os.path.exists(old_file))
+
+    def test_deleted_files_dropped(self):
+        file_path = self.write_entry('deleted.md', 100, CacheGovernor.MARKDOWN, last_access=1)
+        CacheGovernor.flush()
+        os.remove(file_path)
+        CacheGovernor.enforce_quotas(quotas={CacheGovernor.MARKDOWN: 1000})
+        self.assertEqual(CacheGovernor.get_entries(), [])
+
+    def test_quota_file(self):
+        # Created with the defaults, then read back with the user's changes
+        self.assertEqual(CacheGovernor.get_quotas_mb(), CacheGovernor.DEFAULT_QUOTAS_MB)
+        quota_file = CacheGovernor.get_quota_file()
+        self.assertTrue(quota_file.exists())
+        quota_file.write_text(quota_file.read_text().replace('QuotaMB_tdocs = 20480', 'QuotaMB_tdocs = 30000'))
+        quotas = CacheGovernor.get_quotas()
+        self.assertEqual(quotas[CacheGovernor.TDOCS], 30000 * 1024 * 1024)
+        self.assertEqual(quotas[CacheGovernor.MARKDOWN], CacheGovernor.DEFAULT_QUOTAS_MB['markdown'] * 1024 * 1024)
+
+    def test_scan_existing_entries(self):
+        meetings_dir = os.path.join(self.temp_dir.name, 'cache')
+        for folder in ('SA2_160/S2-2401234', 'SA2_160/Agenda', 'SA2_160/export'):
+            os.makedirs(os.path.join(meetings_dir, folder))
+        with open(os.path.join(meetings_dir, 'SA2_160', 'S2-2401234', 'S2-2401234.zip'), 'wb') as f:
+            f.write(b'0' * 100)
+        with open(os.path.join(meetings_dir, 'SA2_160', 'TdocsByAgenda.pickle'), 'wb') as f:
+            f.write(b'0' * 10)
+        CacheGovernor.add_scan_folder(meetings_dir)
+        CacheGovernor.run_maintenance(dry_run=True)
+        entries = CacheGovernor.get_entries()
+        self.assertEqual(
+            sorted((os.path.basename(entry.path), entry.category, entry.meeting, entry.size) for entry in entries),
+            [('S2-2401234', CacheGovernor.TDOCS, 'SA2_160', 100),
+             ('TdocsByAgenda.pickle', CacheGovernor.PICKLE, 'SA2_160', 10)])
+
+        # Scanned once
+        os.makedirs(os.path.join(meetings_dir, 'SA2_160', 'S2-2401235'))
+        CacheGovernor.scan_existing_entries(meetings_dir)
+        self.assertEqual(len(CacheGovernor.get_entries()), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
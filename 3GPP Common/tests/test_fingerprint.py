@@ -0,0 +1,66 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from threegpp_common.config import CommonConfig
+from threegpp_common.fingerprint import Fingerprint
+
+
+class Test_test_fingerprint(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.temp_dir.name, 'tdocs.xlsx')
+        with open(self.file_name, 'wb') as f:
+            f.write(b'some content')
+        # Older than the "racy" window, so that the digest is persisted
+        old_time = time.time() - 60
+        os.utime(self.file_name, (old_time, old_time))
+
+        self.patches = [
+            mock.patch.object(CommonConfig, 'root', CommonConfig.DEFAULT_ROOT),
+            mock.patch.object(Fingerprint, '_memory', {}),
+            mock.patch.object(Fingerprint, '_initialized_path', None),
+        ]
+        for patch in self.patches:
+            patch.start()
+        CommonConfig.configure(os.path.join(self.temp_dir.name, 'cache_root'))
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+        self.temp_dir.cleanup()
+
+    def test_digest_size(self):
+        self.assertEqual(len(Fingerprint.bytes(b'abc')), 32)
+        self.assertEqual(len(Fingerprint.bytes(b'abc', digest_size=8)), 16)
+        self.assertEqual(Fingerprint.bytes('abc'), Fingerprint.bytes(b'abc'))
+
+    def test_file_same_as_bytes(self):
+        self.assertEqual(Fingerprint.file(self.file_name), Fingerprint.bytes(b'some content'))
+
+    def test_unchanged_file_not_read(self):
+        digest = Fingerprint.file(self.file_name)
+        self.assertTrue(Fingerprint.get_index_path().exists())
+        Fingerprint._memory.clear()
+        with mock.patch('builtins.open', side_effect=AssertionError('File should not be read')):
+            self.assertEqual(Fingerprint.file(self.file_name), digest)
+
+    def test_changed_file_is_read(self):
+        digest = Fingerprint.file(self.file_name)
+        with open(self.file_name, 'wb') as f:
+            f.write(b'other content')
+        self.assertNotEqual(Fingerprint.file(self.file_name), digest)
+
+    def test_recent_file_not_persisted(self):
+        os.utime(self.file_name, None)
+        self.assertEqual(Fingerprint.file(self.file_name), Fingerprint.bytes(b'some content'))
+        self.assertFalse(Fingerprint.get_index_path().exists())
+
+    def test_missing_file(self):
+        self.assertIsNone(Fingerprint.file(os.path.join(self.temp_dir.name, 'missing.xlsx')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import datetime
+import unittest
+
+from threegpp_common.folder_watcher import FolderWatcher
+from threegpp_common.ftp_listing import ListingEntry
+
+revisions_url = 'https://www.3gpp.org/ftp/tsg_sa/WG2_Arch/TSGS2_160_Hyderabad_2024-02/INBOX/Revisions/'
+mtime = datetime.datetime(2024, 2, 26, 10, 30)
+
+
+def entry(name: str, size: int | None = 1000, is_dir=False) -> ListingEntry:
+    return ListingEntry(name, is_dir, size, mtime, revisions_url + name)
+
+
+def listing_html(entries) -> str:
+    rows = ''.join(
+        f'<tr><td><img src="/ftp/geticon.axd?file=zip"></td><td><a href="{revisions_url}{name}">{name}</a></td>'
+        f'<td>2024/02/26 10:30</td><td>{size} bytes</td></tr>' for name, size in entries)
+    return f'<html><body><table>{rows}</table></body></html>'
+
+
+class FakeServer:
+    """Fetch function returning the queued listings. None means "not modified" """
+
+    def __init__(self, listings):
+        self.listings = list(listings)
+        self.fetch_states = []
+
+    def fetch(self, url: str, fetch_state: dict):
+        self.fetch_states.append(fetch_state)
+        listing = self.listings.pop(0)
+        if isinstance(listing, Exception):
+            raise listing
+        return listing, {'etag': f'"{len(self.fetch_states)}"'}
+
+
+class Test_test_folder_watcher(unittest.TestCase):
+    def test_split_tdoc_file_name(self):
+        self.assertEqual(FolderWatcher.split_tdoc_file_name('S2-2401234r01.zip'), ('S2-2401234', 'r01'))
+        self.assertEqual(FolderWatcher.split_tdoc_file_name('s2-2401234.zip'), ('S2-2401234', ''))
+        self.assertIsNone(FolderWatcher.split_tdoc_file_name('Chair_Notes.docx'))
+
+    def test_diff_listings(self):
+        previous = [entry('S2-2401234r01.zip'), entry('S2-2401235r01.zip')]
+        current = [
+            entry('S2-2401234r01.zip'),
+            entry('S2-2401235r01.zip', size=2000),
+            entry('S2-2401234r02.zip'),
+            entry('S2-2401236.zip'),
+            entry('Archive', size=None, is_dir=True),
+            entry('readme.txt')]
+        events = FolderWatcher.diff_listings(previous, current)
+        self.assertEqual(
+            [(e.kind, e.tdoc, e.revision) for e in events],
+            [(FolderWatcher.SIZE_CHANGED, 'S2-2401235', 'r01'),
+             (FolderWatcher.NEW_REVISION, 'S2-2401234', 'r02'),
+             (FolderWatcher.NEW_TDOC, 'S2-2401236', '')])
+        self.assertEqual(events[0].previous_size, 1000)
+        self.assertEqual(events[0].size, 2000)
+
+        # The first listing is the baseline
+        self.assertEqual(FolderWatcher.diff_listings(None, current), [])
+
+    def test_refresh(self):
+        server = FakeServer([
+            listing_html([('S2-2401234r01.zip', 1000)]),
+            None,
+            listing_html([('S2-2401234r01.zip', 1000), ('S2-2401234r02.zip', 1000)])])
+        watcher = FolderWatcher(server.fetch, min_interval_s=10, max_interval_s=20, backoff_factor=1.5)
+        published = []
+        watcher.subscribe(lambda folder_url, events: published.append((folder_url, events)))
+
+        entries = watcher.refresh(revisions_url)
+        self.assertEqual([e.name for e in entries], ['S2-2401234r01.zip'])
+        self.assertEqual(published, [])
+        self.assertEqual(watcher._get_folder(revisions_url).interval_s, 15)
+
+        # Not modified: the last listing, no download. Unchanged folders are polled less and less often
+        self.assertEqual(watcher.refresh(revisions_url), entries)
+        self.assertEqual(server.fetch_states[1], {'etag': '"1"'})
+        self.assertEqual(watcher._get_folder(revisions_url).interval_s, 20)
+
+        entries = watcher.refresh(revisions_url)
+        self.assertEqual(watcher.get_entries(revisions_url), entries)
+        self.assertEqual(len(published), 1)
+        self.assertEqual(published[0][0], revisions_url)
+        self.assertEqual([(e.tdoc, e.revision) for e in published[0][1]], [('S2-2401234', 'r02')])
+        self.assertEqual(watcher._get_folder(revisions_url).interval_s, 10)
+
+    def test_watch_with_baseline(self):
+        server = FakeServer([listing_html([('S2-2401234r01.zip', 1000), ('S2-2401234r02.zip', 1000)])])
+        watcher = FolderWatcher(server.fetch)
+        published = []
+        watcher.subscribe(lambda folder_url, events: published.append(events))
+        watcher.watch(revisions_url.rstrip('/'), entries=[entry('S2-2401234r01.zip')], fetch_state={'etag': '"0"'})
+        watcher.watch(revisions_url)
+        self.assertEqual(watcher._get_folder(revisions_url).watchers, 2)
+
+        watcher.refresh(revisions_url)
+        self.assertEqual(server.fetch_states, [{'etag': '"0"'}])
+        self.assertEqual([(e.tdoc, e.revision) for e in published[0]], [('S2-2401234', 'r02')])
+
+        watcher.unwatch(revisions_url)
+        watcher.unwatch(revisions_url)
+        watcher.unwatch(revisions_url)
+        self.assertEqual(watcher._get_folder(revisions_url).watchers, 0)
+
+    def test_fetch_errors_raised(self):
+        watcher = FolderWatcher(FakeServer([ConnectionError('404')]).fetch)
+        with self.assertRaises(ConnectionError):
+            watcher.refresh(revisions_url)
+        self.assertIsNone(watcher.get_entries(revisions_url))
+
+
+if __name__ == '__main__':
+    unittest.main()
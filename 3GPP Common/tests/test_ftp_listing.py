@@ -0,0 +1,50 @@
+import datetime
+import unittest
+
+import threegpp_common.ftp_listing as ftp_listing
+
+
+class Test_test_ftp_listing(unittest.TestCase):
+    def test_listing_entries_v1(self):
+        html = '''<html><head><title>www.3gpp.org - /ftp/tsg_sa/WG2_Arch/TSGS2_129BIS_West_Palm_Beach/</title></head><body><H1>www.3gpp.org - /ftp/tsg_sa/WG2_Arch/TSGS2_129BIS_West_Palm_Beach/</H1><hr>
+        <pre><A HREF="/ftp/tsg_sa/WG2_Arch/">[To Parent Directory]</A><br><br>11/21/2018  5:35 AM        &lt;dir&gt; <A HREF="/ftp/tsg_sa/WG2_Arch/TSGS2_129BIS_West_Palm_Beach/Agenda/">Agenda</A><br>12/19/2018  7:35 PM      3771299 <A HREF="/ftp/tsg_sa/WG2_Arch/TSGS2_129BIS_West_Palm_Beach/SA2-129BIS_Index_2018.zip">SA2-129BIS_Index_2018.zip</A><br></pre><hr></body></html>'''
+        entries = ftp_listing.parse_listing(html, base_url='https://www.3gpp.org/')
+        self.assertListEqual(entries, [
+            ftp_listing.ListingEntry(
+                'Agenda', True, None, datetime.datetime(2018, 11, 21, 5, 35),
+                'https://www.3gpp.org/ftp/tsg_sa/WG2_Arch/TSGS2_129BIS_West_Palm_Beach/Agenda/'),
+            ftp_listing.ListingEntry(
+                'SA2-129BIS_Index_2018.zip', False, 3771299, datetime.datetime(2018, 12, 19, 19, 35),
+                'https://www.3gpp.org/ftp/tsg_sa/WG2_Arch/TSGS2_129BIS_West_Palm_Beach/SA2-129BIS_Index_2018.zip')])
+
+    def test_fallback_to_links(self):
+        # Neither the IIS nor the "Directory Listing" format (e.g. a page generated by another server)
+        html = '''<html><body><h2>Revisions</h2><ul>
+        <li><a href="?sort=name">Name</a></li>
+        <li><a href="S2-2401234r01.zip">S2-2401234r01.zip</a> (Nokia)</li>
+        <li><a href='/ftp/Inbox/Revisions/S2-2401500r01.zip'>S2-2401500r01</a></li>
+        <li><a href="S2-2401234r01.zip">again</a></li>
+        <li><a href="Drafts/">Drafts</a></li>
+        </ul></body></html>'''
+        base_url = 'https://www.3gpp.org/ftp/Inbox/Revisions/'
+        self.assertListEqual(ftp_listing.parse_listing(html, base_url=base_url), [])
+        self.assertListEqual(ftp_listing.parse_listing(html, base_url=base_url, fallback_to_links=True), [
+            ftp_listing.ListingEntry('S2-2401234r01.zip', False, None, None, f'{base_url}S2-2401234r01.zip'),
+            ftp_listing.ListingEntry(
+                'S2-2401500r01', False, None, None, 'https://www.3gpp.org/ftp/Inbox/Revisions/S2-2401500r01.zip'),
+            ftp_listing.ListingEntry('Drafts', True, None, None, f'{base_url}Drafts/')])
+
+    def test_ftp_list_lines(self):
+        lines = [
+            '12-04-19  06:36PM       <DIR>          Updates',
+            '12-05-19  11:02AM             71373 S2-1911100.zip',
+            'total 2']
+        entries = ftp_listing.parse_ftp_list_lines(lines, base_url='/SA/SA2/Inbox')
+        self.assertListEqual(entries, [
+            ftp_listing.ListingEntry('Updates', True, None, datetime.datetime(2019, 12, 4, 18, 36), '/SA/SA2/Inbox/Updates'),
+            ftp_listing.ListingEntry(
+                'S2-1911100.zip', False, 71373, datetime.datetime(2019, 12, 5, 11, 2), '/SA/SA2/Inbox/S2-1911100.zip')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import unittest
+from types import SimpleNamespace
+
+import requests
+
+from threegpp_common.host_concurrency import HostCircuitOpenError, HostConcurrency, HostController
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class Test_test_host_concurrency(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.controller = HostController('www.3gpp.org', initial=4, minimum=1, maximum=8, failure_threshold=3,
+                                         cooldown_s=30, max_cooldown_s=300, clock=self.clock)
+
+    def complete_window(self, seconds: float):
+        """Completes as many requests as the current limit in the given time"""
+        for i in range(self.controller.limit):
+            self.controller.acquire()
+        self.clock.now += seconds
+        for i in range(self.controller.limit):
+            self.controller.release()
+            self.controller.record_success(n_bytes=1000)
+
+    def test_increase_while_throughput_improves(self):
+        self.complete_window(1)
+        self.assertEqual(self.controller.limit, 5)
+        # 5 requests in 1s: more throughput
+        self.complete_window(1)
+        self.assertEqual(self.controller.limit, 6)
+        # Same throughput with one more request in parallel: the host is saturated
+        self.complete_window(1.2)
+        self.assertEqual(self.controller.limit, 6)
+        # Lower throughput
+        self.complete_window(3)
+        self.assertEqual(self.controller.limit, 5)
+
+    def test_maximum(self):
+        for i in range(10):
+            self.complete_window(1 / (i + 1))
+        self.assertEqual(self.controller.limit, 8)
+
+    def test_decrease_on_failure(self):
+        self.controller.limit = 8
+        for i in range(4):
+            self.controller.acquire()
+        self.controller.release()
+        self.controller.record_failure()
+        self.assertEqual(self.controller.limit, 4)
+        # Requests sent with the old limit do not halve the limit again
+        self.controller.release()
+        self.controller.record_failure()
+        self.assertEqual(self.controller.limit, 4)
+        self.assertFalse(self.controller.is_open())
+
+    def test_retried_success_is_congestion(self):
+        self.controller.record_success(n_bytes=1000, congested=True)
+        self.assertEqual(self.controller.limit, 2)
+        self.assertEqual(self.controller.consecutive_failures, 0)
+
+    def test_circuit_breaker(self):
+        for i in range(3):
+            self.controller.record_failure()
+        self.assertTrue(self.controller.is_open())
+        self.assertEqual(self.controller.limit, 1)
+        self.assertRaises(HostCircuitOpenError, self.controller.acquire)
+
+        # Probe request after the cooldown
+        self.clock.now += 30
+        self.controller.acquire()
+        self.controller.release()
+        self.controller.record_failure()
+        # Longer pause if the probe fails
+        self.clock.now += 30
+        self.assertTrue(self.controller.is_open())
+        self.clock.now += 30
+        self.controller.acquire()
+        self.controller.release()
+        self.controller.record_success()
+        self.assertFalse(self.controller.is_open())
+        self.assertEqual(self.controller.cooldown_s, 30)
+
+    def test_retry_after(self):
+        self.controller.record_failure(retry_after_s=120)
+        self.assertTrue(self.controller.is_open())
+        self.clock.now += 119
+        self.assertTrue(self.controller.is_open())
+        self.clock.now += 1
+        self.assertFalse(self.controller.is_open())
+
+
+class Test_test_host_concurrency_slot(unittest.TestCase):
+    url = 'https://www.3gpp.org/ftp/Specs/archive/'
+
+    def setUp(self):
+        HostConcurrency._controllers.clear()
+        self.controller = HostConcurrency.get_controller(self.url)
+
+    def tearDown(self):
+        HostConcurrency._controllers.clear()
+
+    def test_nested_slot_not_counted(self):
+        with HostConcurrency.slot(self.url):
+            self.assertEqual(self.controller.active, 1)
+            with HostConcurrency.slot(self.url) as nested_slot:
+                self.assertIsNone(nested_slot.controller)
+                self.assertEqual(self.controller.active, 1)
+        self.assertEqual(self.controller.active, 0)
+
+    def test_failures_recorded(self):
+        for error in [requests.exceptions.Timeout(), requests.exceptions.RetryError()]:
+            with self.assertRaises(type(error)):
+                with HostConcurrency.slot(self.url):
+                    raise error
+        self.assertEqual(self.controller.consecutive_failures, 2)
+
+        # Not related to the host
+        with self.assertRaises(OSError):
+            with HostConcurrency.slot(self.url):
+                raise OSError()
+        self.assertEqual(self.controller.consecutive_failures, 2)
+
+    def test_cached_response_not_recorded(self):
+        with HostConcurrency.slot(self.url) as slot:
+            slot.record_response(SimpleNamespace(from_cache=True, status_code=503))
+        self.assertEqual(self.controller.consecutive_failures, 0)
+
+        with HostConcurrency.slot(self.url) as slot:
+            slot.record_response(SimpleNamespace(status_code=503, headers={'Retry-After': '60'}))
+        self.assertTrue(self.controller.is_open())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+import docx
+
+from threegpp_common.redline import DocxRedline, RedlineBlock
+
+
+class Test_test_redline(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.original_file = self.create_docx(
+            'S2-2400001.docx',
+            ['5.1 General', 'The UE shall send the request to the AMF.', 'This paragraph is removed.'],
+            [['IE', 'Presence'], ['SUPI', 'M']])
+        self.revised_file = self.create_docx(
+            'S2-2400001r01.docx',
+            ['5.1 General', 'The UE shall send the registration request to the SMF.', 'This paragraph is new.'],
+            [['IE', 'Presence'], ['SUPI', 'O']])
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def create_docx(self, file_name: str, paragraphs: list, table_rows: list) -> Path:
+        document = docx.Document()
+        document.add_heading(paragraphs[0], level=2)
+        for paragraph in paragraphs[1:]:
+            document.add_paragraph(paragraph)
+        table = document.add_table(rows=len(table_rows), cols=len(table_rows[0]))
+        for row_idx, row in enumerate(table_rows):
+            for col_idx, cell_text in enumerate(row):
+                table.cell(row_idx, col_idx).text = cell_text
+        file_path = Path(self.temp_dir.name) / file_name
+        document.save(str(file_path))
+        return file_path
+
+    def test_extract_blocks(self):
+        blocks = DocxRedline.extract_blocks(self.original_file)
+        self.assertEqual(blocks[0].heading_level, 2)
+        self.assertEqual(blocks[0].text, '5.1 General')
+        self.assertEqual(blocks[-1], RedlineBlock('row', 0, 'SUPI | M'))
+
+    def test_word_diff(self):
+        paragraphs = DocxRedline.diff_blocks(
+            DocxRedline.extract_blocks(self.original_file),
+            DocxRedline.extract_blocks(self.revised_file))
+        changed = [p for p in paragraphs if any(kind != 'equal' for kind, _ in p.segments)]
+        segments = changed[0].segments
+        self.assertIn(('insert', 'registration '), segments)
+        self.assertIn(('delete', 'AMF'), segments)
+        self.assertIn(('insert', 'SMF'), segments)
+
+        # Table rows are compared as well
+        table_segments = [p.segments for p in paragraphs if p.kind == 'row']
+        self.assertIn([('equal', 'SUPI | '), ('delete', 'M'), ('insert', 'O')], table_segments)
+
+    def test_html_output(self):
+        output_file = DocxRedline.compare(self.original_file, self.revised_file)
+        self.assertEqual(
+            output_file,
+            Path(self.temp_dir.name) / 'export' / 'S2-2400001r01_vs_S2-2400001.html')
+        html = output_file.read_text(encoding='utf-8')
+        self.assertIn('<ins>SMF</ins>', html)
+        self.assertIn('<del>AMF</del>', html)
+
+    def test_docx_output(self):
+        output_file = DocxRedline.compare(self.original_file, self.revised_file, output_format='docx')
+        with zipfile.ZipFile(output_file) as zf:
+            document_xml = zf.read('word/document.xml').decode('utf-8')
+        self.assertIn('<w:ins ', document_xml)
+        self.assertIn('<w:del ', document_xml)
+        self.assertIn('<w:delText', document_xml)
+        self.assertIn('w:author="3GPP Delegate Helper"', document_xml)
+
+        output_file = DocxRedline.compare(
+            self.original_file, self.revised_file, output_format='docx', author='3GPP Meeting Helper')
+        with zipfile.ZipFile(output_file) as zf:
+            self.assertIn('w:author="3GPP Meeting Helper"', zf.read('word/document.xml').decode('utf-8'))
+
+    def test_revision_chains(self):
+        self.assertEqual(
+            DocxRedline.get_revision_chains(['S2-2400002r01', 'S2-2400001', 'S2-2400001r02', 'S2-2400001r01',
+                                             'S2-2400002', 'S2-2400003']),
+            [('S2-2400002', 'S2-2400002r01'),
+             ('S2-2400001', 'S2-2400001r01'),
+             ('S2-2400001r01', 'S2-2400001r02')])
+
+    def test_batch_compare(self):
+        revised_file_2 = self.create_docx(
+            'S2-2400001r02.docx',
+            ['5.1 General', 'The UE shall send the registration request to the AMF.'],
+            [['IE', 'Presence'], ['SUPI', 'O']])
+        file_pairs = [(self.original_file, self.revised_file), (self.revised_file, revised_file_2)]
+        results = DocxRedline.batch_compare(file_pairs, max_workers=2)
+        self.assertEqual(set(results.keys()), set(file_pairs))
+        for output_file in results.values():
+            self.assertTrue(output_file.exists())
+
+        # String paths (keys as passed) and a common output folder
+        output_folder = Path(self.temp_dir.name) / 'redlines'
+        file_pairs = [(str(original), str(revised)) for original, revised in file_pairs]
+        results = DocxRedline.batch_compare(file_pairs, output_format='docx', max_workers=2,
+                                            output_folder=output_folder)
+        self.assertEqual(
+            results[file_pairs[1]],
+            output_folder / 'S2-2400001r02_vs_S2-2400001r01.docx')
+        self.assertTrue(all(output_file.exists() for output_file in results.values()))
+
+    def test_failed_pair(self):
+        missing_file = Path(self.temp_dir.name) / 'S2-2400001r02.docx'
+        results = DocxRedline.batch_compare([(self.revised_file, missing_file)])
+        self.assertIsNone(results[(self.revised_file, missing_file)])
+
+
+if __name__ == '__main__':
+    unittest.main()
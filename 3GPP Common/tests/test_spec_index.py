@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from threegpp_common.config import CommonConfig
+from threegpp_common.spec_index import SpecIndex
+
+archive_url = 'https://www.3gpp.org/ftp/Specs/archive/23_series/23.501'
+archive_file_versions = ['h40', 'h50', 'h60', 'i00', 'i10', 'i20', 'i30', 'j00']
+
+
+class Test_test_spec_index(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root_patch = mock.patch.object(CommonConfig, 'root', CommonConfig.DEFAULT_ROOT)
+        self.root_patch.start()
+        CommonConfig.configure(os.path.join(self.temp_dir.name, 'cache_root'))
+
+    def tearDown(self):
+        self.root_patch.stop()
+        self.temp_dir.cleanup()
+
+    @staticmethod
+    def record_archive():
+        SpecIndex.record_versions(
+            [(f'23501-{v}.zip', f'{archive_url}/23501-{v}.zip') for v in archive_file_versions] +
+            [('not_a_spec.zip', f'{archive_url}/not_a_spec.zip')],
+            archive_of_spec='23.501')
+
+    def test_version_queries(self):
+        self.assertFalse(SpecIndex.is_archive_indexed('23.501'))
+        self.assertEqual(SpecIndex.get_versions('23.501'), [])
+        self.record_archive()
+        self.assertTrue(SpecIndex.is_archive_indexed('23.501'))
+        self.assertTrue(CommonConfig.path('spec_index', 'index.sqlite').exists())
+
+        all_versions = SpecIndex.get_versions('23.501')
+        self.assertEqual([v.file_version for v in all_versions], archive_file_versions)
+        self.assertEqual(all_versions[0].version, '17.4.0')
+        self.assertEqual(all_versions[0].url, f'{archive_url}/23501-h40.zip')
+
+        self.assertEqual(
+            [v.version for v in SpecIndex.get_versions('23.501', from_version='v17.5', to_version='18.2')],
+            ['17.5.0', '17.6.0', '18.0.0', '18.1.0', '18.2.0'])
+        self.assertEqual(SpecIndex.get_latest_version('23.501', release='Rel-18').version, '18.3.0')
+        self.assertEqual(SpecIndex.get_latest_version('23.501').version, '19.0.0')
+        self.assertIsNone(SpecIndex.get_latest_version('23.502'))
+
+    def test_version_bounds(self):
+        self.assertEqual(SpecIndex.parse_version_bound('18.2', upper=False), 180200)
+        self.assertEqual(SpecIndex.parse_version_bound('18.2', upper=True), 180299)
+        self.assertEqual(SpecIndex.parse_version_bound('Rel-18', upper=True), 189999)
+        self.assertIsNone(SpecIndex.parse_version_bound('latest', upper=True))
+        self.assertEqual(SpecIndex.split_spec_file_name('23700-07-h00.zip'), ('23.700-07', 'h00'))
+
+    def test_local_files(self):
+        source_file = os.path.join(self.temp_dir.name, 'tools', '23501-i20.zip')
+        os.makedirs(os.path.dirname(source_file))
+        with open(source_file, 'wb') as f:
+            f.write(b'spec content')
+        digest = SpecIndex.record_local_file(source_file)
+        self.assertEqual(str(SpecIndex.find_local_file(file_name='23501-I20.zip')), os.path.realpath(source_file))
+        self.assertEqual(str(SpecIndex.find_local_file(digest=digest)), os.path.realpath(source_file))
+
+        # Reused by the other application instead of downloaded. A copy: writing to it does not change the source
+        target_file = os.path.join(self.temp_dir.name, 'helper', '23.501', '23501-i20.zip')
+        self.assertTrue(SpecIndex.place_local_file(target_file))
+        with open(target_file, 'rb') as f:
+            self.assertEqual(f.read(), b'spec content')
+        self.assertEqual(os.stat(source_file).st_nlink, 1)
+        with open(target_file, 'wb') as f:
+            f.write(b'modified')
+        with open(source_file, 'rb') as f:
+            self.assertEqual(f.read(), b'spec content')
+        self.assertFalse(SpecIndex.place_local_file(os.path.join(self.temp_dir.name, '23501-i30.zip')))
+
+        # Deleted files are removed from the index
+        os.remove(target_file)
+        os.remove(source_file)
+        self.assertIsNone(SpecIndex.find_local_file(file_name='23501-i20.zip'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from threegpp_common.cache_governor import CacheGovernor
+from threegpp_common.config import CommonConfig
+from threegpp_common.tdoc_store import TDocStore
+
+ZIP_CONTENT = b'PK\x03\x04 S2-2401234'
+
+
+class Test_test_tdoc_store(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.meeting_folder = Path(self.folder.name) / 'TSGS2_162_Fukuoka' / 'Docs' / 'S2-2401234'
+        self.meeting_folder.mkdir(parents=True)
+        self.patches = [
+            mock.patch.object(CommonConfig, 'root', CommonConfig.DEFAULT_ROOT),
+            mock.patch.object(CacheGovernor, '_pending_registrations', {}),
+            mock.patch.object(CacheGovernor, '_pending_accesses', {}),
+        ]
+        for patch in self.patches:
+            patch.start()
+        CommonConfig.configure(Path(self.folder.name) / 'cache_root')
+
+    def tearDown(self):
+        for patch in reversed(self.patches):
+            patch.stop()
+        self.folder.cleanup()
+
+    def write_download(self, name: str = 'S2-2401234.zip') -> Path:
+        zip_path = self.meeting_folder / name
+        zip_path.write_bytes(ZIP_CONTENT)
+        return zip_path
+
+    def test_split_tdoc_name(self):
+        self.assertEqual(TDocStore.split_tdoc_name('S2-2401234'), ('S2', 'S2-2401234', ''))
+        self.assertEqual(TDocStore.split_tdoc_name('s2-2401234R02'), ('S2', 'S2-2401234', 'r02'))
+        self.assertIsNone(TDocStore.split_tdoc_name('TdocsByAgenda'))
+
+    def test_lookup_empty_store(self):
+        self.assertIsNone(TDocStore.lookup('S2-2401234'))
+
+    def test_put_bytes_and_lookup(self):
+        stored = TDocStore.put_bytes(ZIP_CONTENT, 'S2-2401234r01', meeting='TSGS2_161_Athens', source_url='x')
+        self.assertEqual(stored.size, len(ZIP_CONTENT))
+        self.assertEqual(stored.path.parent.parent.parent, CommonConfig.path('tdoc_store'))
+
+        # Found also when requested from another meeting folder (e.g. the other application)
+        self.assertEqual(TDocStore.lookup('S2-2401234r01', meeting='SA2#161'), stored)
+        self.assertIsNone(TDocStore.lookup('S2-2401234'))
+        self.assertIsNone(TDocStore.lookup('S2-2401234r02'))
+
+    def test_put_file_and_lookup(self):
+        zip_path = self.write_download()
+        stored = TDocStore.put_file(zip_path, 'S2-2401234', meeting='TSGS2_162_Fukuoka')
+        self.assertEqual(stored.path.read_bytes(), ZIP_CONTENT)
+        self.assertEqual(TDocStore.lookup('S2-2401234'), stored)
+
+    def test_working_file_not_linked_to_blob(self):
+        zip_path = self.write_download()
+        stored = TDocStore.put_file(zip_path, 'S2-2401234')
+        self.assertEqual(zip_path.read_bytes(), ZIP_CONTENT)
+        self.assertFalse(os.path.samefile(zip_path, stored.path))
+        zip_path.write_bytes(b'overwritten')
+        self.assertEqual(stored.path.read_bytes(), ZIP_CONTENT)
+
+    def test_blob_is_not_the_downloaded_file(self):
+        # Still open by the downloader: writes to it must not reach the store
+        zip_path = self.write_download()
+        with open(zip_path, 'r+b') as f:
+            stored = TDocStore.put_file(zip_path, 'S2-2401234')
+            f.write(b'XX')
+        self.assertEqual(stored.path.read_bytes(), ZIP_CONTENT)
+
+    def test_same_content_stored_once(self):
+        first = TDocStore.put_file(self.write_download(), 'S2-2401234', meeting='TSGS2_162_Fukuoka')
+        second = TDocStore.put_bytes(ZIP_CONTENT, 'S2-2401234', meeting='TSGS2_163_Online')
+        self.assertEqual(first.path, second.path)
+        blobs = [p for p in (TDocStore.get_folder() / 'objects').rglob('*') if p.is_file()]
+        self.assertEqual(len(blobs), 1)
+
+    def test_materialize(self):
+        stored = TDocStore.put_bytes(ZIP_CONTENT, 'S2-2401234')
+        target = os.path.join(self.folder.name, 'meeting', 'S2-2401234', 'S2-2401234.zip')
+        self.assertTrue(TDocStore.materialize(stored, target))
+        with open(target, 'rb') as f:
+            self.assertEqual(f.read(), ZIP_CONTENT)
+
+        # In-place writes to the working copy do not reach the blob
+        with open(target, 'r+b') as f:
+            f.write(b'XX')
+        self.assertEqual(stored.path.read_bytes(), ZIP_CONTENT)
+        self.assertTrue(TDocStore.materialize(stored, target))
+        with open(target, 'rb') as f:
+            self.assertEqual(f.read(), ZIP_CONTENT)
+
+    def test_blobs_evicted_by_cache_governor(self):
+        stored = TDocStore.put_bytes(ZIP_CONTENT, 'S2-2401234')
+        entries = CacheGovernor.get_entries(CacheGovernor.TDOC_STORE)
+        self.assertEqual([entry.size for entry in entries], [len(ZIP_CONTENT)])
+
+        CacheGovernor.enforce_quotas(quotas={CacheGovernor.TDOC_STORE: 0})
+        self.assertFalse(stored.path.exists())
+        self.assertIsNone(TDocStore.lookup('S2-2401234'))
+
+    def test_missing_blob_is_ignored(self):
+        stored = TDocStore.put_bytes(ZIP_CONTENT, 'S2-2401234')
+        os.remove(stored.path)
+        self.assertIsNone(TDocStore.lookup('S2-2401234'))
+
+    def test_not_a_tdoc(self):
+        self.assertIsNone(TDocStore.put_file(self.write_download('agenda.zip'), 'agenda'))
+        self.assertIsNone(TDocStore.put_bytes(ZIP_CONTENT, 'agenda'))
+
+
+if __name__ == '__main__':
+    unittest.main()
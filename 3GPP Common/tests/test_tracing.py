@@ -0,0 +1,92 @@
+import json
+import logging
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from threegpp_common.config import CommonConfig
+from threegpp_common.tracing import Tracing
+
+
+class Test_test_tracing(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.patches = [
+            mock.patch.object(CommonConfig, 'root', CommonConfig.DEFAULT_ROOT),
+            mock.patch.object(Tracing, 'enabled', True),
+            mock.patch.object(Tracing, '_logger', None),
+            mock.patch.object(Tracing, '_durations', {}),
+            mock.patch.object(Tracing, '_bytes', {}),
+            mock.patch.object(Tracing, '_cache_hits', {}),
+        ]
+        for patch in self.patches:
+            patch.start()
+        CommonConfig.configure(self.temp_dir.name)
+
+    def tearDown(self):
+        logger = logging.getLogger('tgpp.trace')
+        for handler in list(logger.handlers):
+            handler.close()
+            logger.removeHandler(handler)
+        for patch in reversed(self.patches):
+            patch.stop()
+        self.temp_dir.cleanup()
+
+    def read_records(self):
+        with open(os.path.join(Tracing.get_trace_folder(), 'trace.jsonl'), encoding='utf-8') as f:
+            return [json.loads(line) for line in f]
+
+    def test_trace_folder_below_cache_root(self):
+        self.assertEqual(Tracing.get_trace_folder().parent.parent, CommonConfig.root)
+
+    def test_span_record(self):
+        with Tracing.span('http.fetch', url='https://www.3gpp.org') as s:
+            s.set(bytes=1234)
+        records = self.read_records()
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]['type'], 'span')
+        self.assertEqual(records[0]['name'], 'http.fetch')
+        self.assertEqual(records[0]['url'], 'https://www.3gpp.org')
+        self.assertEqual(records[0]['bytes'], 1234)
+        self.assertIn('ms', records[0])
+        self.assertIn('thread', records[0])
+
+    def test_span_error(self):
+        with self.assertRaises(ValueError):
+            with Tracing.span('parse.listing'):
+                raise ValueError()
+        self.assertEqual(self.read_records()[0]['error'], 'ValueError')
+
+    def test_traced(self):
+        @Tracing.traced('db.write', record_result_size=True)
+        def write():
+            return b'12345'
+
+        self.assertEqual(write(), b'12345')
+        self.assertEqual(Tracing.summary()['spans']['db.write']['bytes'], 5)
+
+    def test_summary(self):
+        Tracing._durations['excel.export'] = [float(i) for i in range(1, 101)]
+        for hit in (True, True, True, False):
+            Tracing.cache_access('http_cache', hit)
+        result = Tracing.summary()
+        self.assertEqual(result['spans']['excel.export']['count'], 100)
+        self.assertEqual(result['spans']['excel.export']['p50_ms'], 51.0)
+        self.assertEqual(result['spans']['excel.export']['p95_ms'], 95.0)
+        self.assertEqual(result['spans']['excel.export']['max_ms'], 100.0)
+        self.assertEqual(result['caches']['http_cache'], {'hits': 3, 'misses': 1, 'hit_ratio': 0.75})
+
+    def test_disabled(self):
+        with mock.patch.object(Tracing, 'enabled', False):
+            with Tracing.span('http.fetch') as s:
+                s.set(bytes=1)
+            Tracing.cache_access('http_cache', True)
+            with Tracing.profile('test') as profiler:
+                self.assertIsNone(profiler)
+        self.assertEqual(Tracing.summary(), {'spans': {}, 'caches': {}})
+        self.assertFalse(os.path.exists(os.path.join(Tracing.get_trace_folder(), 'trace.jsonl')))
+
+
+if __name__ == '__main__':
+    unittest.main()
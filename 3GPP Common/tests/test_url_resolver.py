@@ -0,0 +1,113 @@
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from threegpp_common.config import CommonConfig
+from threegpp_common.url_resolver import URLResolver
+
+
+class FakeServer:
+    """Answers the probes: 200 for the URLs holding a file, 404 otherwise. Unreachable hosts return None"""
+
+    def __init__(self, existing_urls, unreachable_prefix='http://10.10.10.10/'):
+        self.existing_urls = set(existing_urls)
+        self.unreachable_prefix = unreachable_prefix
+        self.total_requests = 0
+        self.lock = threading.Lock()
+
+    def probe(self, url: str, timeout: tuple):
+        with self.lock:
+            self.total_requests += 1
+        if url.startswith(self.unreachable_prefix):
+            return None
+        return 200 if url in self.existing_urls else 404
+
+
+class Test_test_url_resolver(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.server = FakeServer([self.get_candidates(tdoc_id)[2] for tdoc_id in ('S2-2410000', 'S2-2410001',
+                                                                                   'S2-2410002')])
+        self.patches = [
+            mock.patch.object(CommonConfig, 'root', CommonConfig.DEFAULT_ROOT),
+            mock.patch.object(URLResolver, '_locations', None),
+            mock.patch.object(URLResolver, '_not_found', {}),
+            mock.patch.object(URLResolver, '_probe_function', None),
+            # The unreachable local server does not delay the tests
+            mock.patch.object(URLResolver, 'HEDGE_DELAY_S', 0.01),
+        ]
+        for patch in self.patches:
+            patch.start()
+        CommonConfig.configure(self.temp_dir.name)
+        URLResolver.set_probe_function(self.server.probe)
+
+    def tearDown(self):
+        for patch in reversed(self.patches):
+            patch.stop()
+        self.temp_dir.cleanup()
+
+    @staticmethod
+    def get_candidates(tdoc_id: str):
+        meeting_path = 'tsg_sa/WG2_Arch/TSGS2_160_Goteborg'
+        return [
+            f'http://10.10.10.10/ftp/SA/SA2/TSGS2_160_Goteborg/Inbox/{tdoc_id}.zip',
+            f'https://www.3gpp.org/ftp/{meeting_path}/Inbox/{tdoc_id}.zip',
+            f'https://www.3gpp.org/ftp/{meeting_path}/Docs/{tdoc_id}.zip',
+        ]
+
+    def test_hedged_probe_and_learned_location(self):
+        candidates = self.get_candidates('S2-2410000')
+        resolved_urls = URLResolver.resolve(candidates, 'TSGS2_160_Goteborg')
+        self.assertEqual(next(resolved_urls), candidates[2])
+        URLResolver.record_found(candidates[2], 'TSGS2_160_Goteborg')
+
+        # Learned location: no probing needed
+        requests_before = self.server.total_requests
+        candidates = self.get_candidates('S2-2410001')
+        resolved_urls = URLResolver.resolve(candidates, 'TSGS2_160_Goteborg')
+        self.assertEqual(next(resolved_urls), candidates[2])
+        self.assertEqual(self.server.total_requests, requests_before)
+
+        # Persisted below the cache root
+        URLResolver._locations = None
+        self.assertEqual(
+            URLResolver._load_locations(),
+            {'TSGS2_160_Goteborg|tdoc': 'https://www.3gpp.org/ftp/tsg_sa/WG2_Arch/TSGS2_160_Goteborg/Docs'})
+        self.assertTrue(CommonConfig.path('tdoc_locations.json').exists())
+
+    def test_negative_cache(self):
+        candidates = self.get_candidates('S2-2410002')
+        self.assertEqual(URLResolver.hedged_probe(candidates), candidates[2])
+        self.assertTrue(URLResolver.is_known_not_found(candidates[1]))
+        self.assertFalse(URLResolver.is_known_not_found(candidates[2]))
+
+        # Not found URLs are not probed again
+        requests_before = self.server.total_requests
+        resolved_urls = list(URLResolver.resolve(candidates[1:], None))
+        self.assertEqual(resolved_urls, [candidates[2]])
+        self.assertEqual(self.server.total_requests, requests_before + 1)
+
+        with mock.patch('threegpp_common.url_resolver.time.monotonic',
+                        return_value=URLResolver.NEGATIVE_CACHE_TTL_S * 1000000):
+            self.assertFalse(URLResolver.is_known_not_found(candidates[1]))
+
+    def test_not_found_anywhere(self):
+        candidates = self.get_candidates('S2-2499999')
+        self.assertIsNone(URLResolver.hedged_probe(candidates))
+        # The unreachable server is still tried sequentially
+        self.assertEqual(list(URLResolver.resolve(candidates, None)), [candidates[0]])
+
+    def test_no_probe_function(self):
+        URLResolver.set_probe_function(None)
+        candidates = self.get_candidates('S2-2410000')
+        self.assertEqual(list(URLResolver.resolve(candidates, None)), candidates)
+
+    def test_location_key(self):
+        self.assertEqual(URLResolver.get_location_key('https://a/Inbox/S2-2410000r01.zip', 'M'), 'M|revision')
+        self.assertEqual(URLResolver.get_location_key('https://a/Inbox/Drafts/S2-2410000.zip', 'M'), 'M|draft')
+        self.assertEqual(URLResolver.get_location_key('https://a/Docs/S2-2410000.zip', 'M'), 'M|tdoc')
+
+
+if __name__ == '__main__':
+    unittest.main()
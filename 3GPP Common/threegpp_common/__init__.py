@@ -0,0 +1,8 @@
+"""
+Code shared by the 3GPP Meeting Helper and 3GPP Tools: the caches, indexes and network helpers both applications
+use on the same files. Each application configures the package at startup (see CommonConfig) and wraps it in its
+own modules where it needs app-specific settings.
+"""
+from threegpp_common.config import CommonConfig
+
+__version__ = "1.0.0"
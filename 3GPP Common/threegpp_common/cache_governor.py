@@ -0,0 +1,504 @@
+import atexit
+import configparser
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from threegpp_common.config import CommonConfig
+
+logger = logging.getLogger(__name__)
+
+
+class CacheEntry(NamedTuple):
+    path: str
+    category: str
+    meeting: Optional[str]
+    size: int
+    last_access: float
+    pinned: bool
+
+
+class QuotaReport(NamedTuple):
+    """
+    Usage of a category and the entries evicted (or that would be evicted, in a dry run) to meet its quota. freed is
+    the disk space released: files hard-linked several times are counted once, and only if all their links are evicted
+    """
+    category: str
+    quota: Optional[int]
+    used: int
+    n_entries: int
+    evicted: List[CacheEntry]
+    freed: int
+
+
+class CacheGovernor:
+    """
+    Cache size governor with per-category quotas and LRU eviction.
+    Downloaders and cache writers register() their files/folders, cache readers touch() them on a hit.
+    Both are buffered in memory and written to the catalogue (<cache root>/cache_catalogue.sqlite) in batches, so that
+    hot paths (e.g. every HTTP cache hit) do not write to disk.
+    enforce_quotas() evicts the least recently used entries above each quota (<cache root>/cache.ini). Pinned entries
+    and entries of the active meetings are never evicted, and files that are not in the catalogue are never deleted.
+    Applications sharing a cache root share the catalogue: each stores its active meeting under its own key and the
+    active meetings of all of them are protected.
+    """
+    ACTIVE_MEETING_KEY_PREFIX = "active_meeting"
+    LAYOUT_VERSION = 1
+    FLUSH_THRESHOLD = 256
+
+    HTTP = "http"
+    PICKLE = "pickle"
+    TDOCS = "tdocs"
+    MARKDOWN = "markdown"
+    SPECS = "specs"
+    TDOC_STORE = "tdoc_store"
+
+    # Quota per category in MB, unless set in the quota file (e.g. QuotaMB_tdocs = 30000)
+    DEFAULT_QUOTAS_MB = {
+        HTTP: 1024,
+        PICKLE: 1024,
+        TDOCS: 20480,
+        MARKDOWN: 1024,
+        SPECS: 10240,
+        TDOC_STORE: 10240,
+    }
+    QUOTA_SECTION = "CACHE"
+    QUOTA_KEY_PREFIX = "quotamb_"
+
+    # Sub-folders of a meeting folder that are not TDoc folders
+    NON_TDOC_FOLDERS = ("agenda", "export")
+
+    _lock = threading.RLock()
+    _pending_registrations: Dict[str, tuple] = {}
+    _pending_accesses: Dict[str, float] = {}
+    _active_meeting: Optional[str] = None
+    # Meeting download folders scanned once for TDoc folders cached before the catalogue existed
+    _scan_folders: set = set()
+
+    @staticmethod
+    def get_catalogue_path() -> Path:
+        return CommonConfig.path("cache_catalogue.sqlite")
+
+    @staticmethod
+    def get_quota_file() -> Path:
+        return CommonConfig.path("cache.ini")
+
+    @classmethod
+    def get_active_meeting_key(cls) -> str:
+        return f"{cls.ACTIVE_MEETING_KEY_PREFIX}.{CommonConfig.app_name}"
+
+    @classmethod
+    def _connect(cls) -> sqlite3.Connection:
+        catalogue_path = cls.get_catalogue_path()
+        catalogue_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(catalogue_path, timeout=30)
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                path TEXT PRIMARY KEY,
+                category TEXT,
+                meeting TEXT,
+                size INTEGER,
+                last_access REAL,
+                pinned INTEGER DEFAULT 0,
+                added REAL
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_cache_entries_lru ON cache_entries(category, last_access)')
+        conn.execute('CREATE TABLE IF NOT EXISTS cache_metadata (key TEXT PRIMARY KEY, value TEXT)')
+        conn.execute(f'PRAGMA user_version = {cls.LAYOUT_VERSION}')
+        return conn
+
+    @staticmethod
+    def _normalize_path(path: Union[str, Path]) -> str:
+        return os.path.normcase(os.path.abspath(str(path)))
+
+    @staticmethod
+    def get_size(path: Union[str, Path]) -> int:
+        """Size in bytes of a file or (recursively) a folder. 0 if it does not exist."""
+        path = str(path)
+        try:
+            if not os.path.isdir(path):
+                return os.path.getsize(path)
+        except OSError:
+            return 0
+        total_size = 0
+        for folder, _, files in os.walk(path):
+            for file in files:
+                try:
+                    total_size += os.path.getsize(os.path.join(folder, file))
+                except OSError:
+                    pass
+        return total_size
+
+    @staticmethod
+    def get_inodes(path: Union[str, Path]) -> List[Tuple[Tuple[int, int], int, int]]:
+        """((device, inode), size, number of hard links) of a file or of each file in a folder."""
+        path = str(path)
+        if os.path.isdir(path):
+            file_paths = [os.path.join(folder, file) for folder, _, files in os.walk(path) for file in files]
+        else:
+            file_paths = [path]
+        inodes = []
+        for file_path in file_paths:
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                continue
+            inodes.append(((stat.st_dev, stat.st_ino), stat.st_size, stat.st_nlink))
+        return inodes
+
+    @staticmethod
+    def get_freed_size(inodes: Iterable[Tuple[Tuple[int, int], int, int]]) -> int:
+        """
+        Disk space released by deleting the files (see get_inodes()): per unique inode, and only for the inodes whose
+        links are all among the files.
+        """
+        n_links: Dict[Tuple[int, int], int] = {}
+        sizes: Dict[Tuple[int, int], Tuple[int, int]] = {}
+        for inode, size, nlink in inodes:
+            sizes[inode] = (size, nlink)
+            n_links[inode] = n_links.get(inode, 0) + 1
+        return sum(size for inode, (size, nlink) in sizes.items() if n_links[inode] >= nlink)
+
+    @classmethod
+    def register(cls, path: Union[str, Path], category: str, meeting: str = None, pinned: bool = None):
+        """
+        Registers (or refreshes) a cache entry after it was written. Folders are evicted as a whole (e.g. a TDoc
+        folder with its extracted files). The size is measured when the catalogue is written.
+        Entries of the active meetings are kept. If set, pinned pins/unpins the entry.
+        """
+        if not path:
+            return
+        with cls._lock:
+            cls._pending_registrations[cls._normalize_path(path)] = (category, meeting, pinned, time.time())
+            n_pending = len(cls._pending_registrations) + len(cls._pending_accesses)
+        if n_pending >= cls.FLUSH_THRESHOLD:
+            cls.flush()
+
+    @classmethod
+    def touch(cls, path: Union[str, Path]):
+        """Records a cache hit on a registered entry (no-op for unregistered paths)."""
+        if not path:
+            return
+        with cls._lock:
+            cls._pending_accesses[cls._normalize_path(path)] = time.time()
+            n_pending = len(cls._pending_registrations) + len(cls._pending_accesses)
+        if n_pending >= cls.FLUSH_THRESHOLD:
+            cls.flush()
+
+    @classmethod
+    def pin(cls, path: Union[str, Path], pinned: bool = True):
+        cls.flush()
+        try:
+            with cls._connect() as conn:
+                conn.execute('UPDATE cache_entries SET pinned = ? WHERE path = ?',
+                             (int(pinned), cls._normalize_path(path)))
+        except sqlite3.Error as e:
+            logger.warning(f"Could not pin cache entry {path}: {e}")
+
+    @classmethod
+    def set_active_meeting(cls, meeting_folder_name: Optional[str]):
+        """The meeting being worked on. Persisted, so it is also protected at the next startup."""
+        if meeting_folder_name == cls._active_meeting:
+            return
+        cls._active_meeting = meeting_folder_name
+        try:
+            with cls._connect() as conn:
+                conn.execute("INSERT OR REPLACE INTO cache_metadata (key, value) VALUES (?, ?)",
+                             (cls.get_active_meeting_key(), meeting_folder_name))
+        except sqlite3.Error as e:
+            logger.warning(f"Could not store active meeting in cache catalogue: {e}")
+
+    @classmethod
+    def get_active_meeting(cls) -> Optional[str]:
+        if cls._active_meeting is None:
+            try:
+                with cls._connect() as conn:
+                    row = conn.execute("SELECT value FROM cache_metadata WHERE key = ?",
+                                       (cls.get_active_meeting_key(),)).fetchone()
+                if row is not None:
+                    cls._active_meeting = row[0]
+            except sqlite3.Error as e:
+                logger.warning(f"Could not read active meeting from cache catalogue: {e}")
+        return cls._active_meeting
+
+    @classmethod
+    def get_protected_meetings(cls) -> set:
+        """Active meetings of all applications sharing the catalogue (never evicted)."""
+        protected = set()
+        if cls.get_active_meeting() is not None:
+            protected.add(cls.get_active_meeting())
+        try:
+            with cls._connect() as conn:
+                rows = conn.execute("SELECT value FROM cache_metadata WHERE key LIKE ? AND value IS NOT NULL",
+                                    (cls.ACTIVE_MEETING_KEY_PREFIX + '.%',)).fetchall()
+            protected.update(row[0] for row in rows)
+        except sqlite3.Error as e:
+            logger.warning(f"Could not read active meetings from cache catalogue: {e}")
+        return protected
+
+    @classmethod
+    def flush(cls):
+        """Writes the buffered registrations and accesses to the catalogue."""
+        with cls._lock:
+            registrations = dict(cls._pending_registrations)
+            accesses = dict(cls._pending_accesses)
+            cls._pending_registrations.clear()
+            cls._pending_accesses.clear()
+        if not registrations and not accesses:
+            return
+
+        # Sizes are measured outside the lock (folders need a walk)
+        rows = [(path, category, meeting, cls.get_size(path), timestamp, timestamp,
+                 None if pinned is None else int(pinned))
+                for path, (category, meeting, pinned, timestamp) in registrations.items()]
+        try:
+            with cls._connect() as conn:
+                conn.executemany('''
+                    INSERT INTO cache_entries (path, category, meeting, size, last_access, added, pinned)
+                    VALUES (?, ?, ?, ?, ?, ?, COALESCE(?, 0))
+                    ON CONFLICT(path) DO UPDATE SET
+                        category = excluded.category,
+                        meeting = COALESCE(excluded.meeting, cache_entries.meeting),
+                        size = excluded.size,
+                        last_access = MAX(cache_entries.last_access, excluded.last_access),
+                        pinned = COALESCE(?, cache_entries.pinned)
+                ''', [row + (row[-1],) for row in rows])
+                conn.executemany('UPDATE cache_entries SET last_access = MAX(last_access, ?) WHERE path = ?',
+                                 [(timestamp, path) for path, timestamp in accesses.items()])
+        except sqlite3.Error as e:
+            logger.warning(f"Could not update cache catalogue: {e}")
+
+    @classmethod
+    def get_entries(cls, category: str = None) -> List[CacheEntry]:
+        """Catalogue entries, least recently used first."""
+        cls.flush()
+        query = 'SELECT path, category, meeting, size, last_access, pinned FROM cache_entries'
+        params = ()
+        if category is not None:
+            query += ' WHERE category = ?'
+            params = (category,)
+        query += ' ORDER BY last_access ASC'
+        try:
+            with cls._connect() as conn:
+                rows = conn.execute(query, params).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not read cache catalogue: {e}")
+            return []
+        return [CacheEntry(path, cat, meeting, size or 0, last_access or 0, bool(pinned))
+                for path, cat, meeting, size, last_access, pinned in rows]
+
+    @classmethod
+    def _write_default_quota_file(cls, quota_file: Path):
+        lines = [
+            "# Maximum size (MB) of each local cache category, shared by the applications using this cache folder.",
+            "# Least recently used entries are evicted first. Files of the selected meetings are never evicted.",
+            f"[{cls.QUOTA_SECTION}]"]
+        lines.extend(f"QuotaMB_{category} = {quota_mb}" for category, quota_mb in cls.DEFAULT_QUOTAS_MB.items())
+        try:
+            quota_file.parent.mkdir(parents=True, exist_ok=True)
+            quota_file.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        except OSError as e:
+            logger.warning(f"Could not write {quota_file}: {e}")
+
+    @classmethod
+    def get_quotas_mb(cls) -> Dict[str, float]:
+        """The quotas in MB: DEFAULT_QUOTAS_MB, overridden by the quota file (created with the defaults if missing)."""
+        quotas_mb = dict(cls.DEFAULT_QUOTAS_MB)
+        quota_file = cls.get_quota_file()
+        if not quota_file.exists():
+            cls._write_default_quota_file(quota_file)
+            return quotas_mb
+        parser = configparser.ConfigParser()
+        try:
+            parser.read(quota_file, encoding="utf-8")
+            if parser.has_section(cls.QUOTA_SECTION):
+                for key, value in parser.items(cls.QUOTA_SECTION):
+                    if key.lower().startswith(cls.QUOTA_KEY_PREFIX):
+                        quotas_mb[key[len(cls.QUOTA_KEY_PREFIX):].lower()] = float(value)
+        except (configparser.Error, ValueError) as e:
+            logger.warning(f"Could not read cache quotas from {quota_file}: {e}")
+        return quotas_mb
+
+    @classmethod
+    def get_quotas(cls) -> Dict[str, int]:
+        """The quota in bytes per category."""
+        return {category: int(quota_mb * 1024 * 1024) for category, quota_mb in cls.get_quotas_mb().items()}
+
+    @classmethod
+    def _remove_from_catalogue(cls, paths: List[str]):
+        if not paths:
+            return
+        try:
+            with cls._connect() as conn:
+                conn.executemany('DELETE FROM cache_entries WHERE path = ?', [(path,) for path in paths])
+        except sqlite3.Error as e:
+            logger.warning(f"Could not update cache catalogue: {e}")
+
+    @staticmethod
+    def _delete_entry(entry: CacheEntry) -> bool:
+        try:
+            if os.path.isdir(entry.path):
+                shutil.rmtree(entry.path)
+            elif os.path.exists(entry.path):
+                os.remove(entry.path)
+            return True
+        except OSError as e:
+            # e.g. a document that is open in Word
+            logger.warning(f"Could not evict {entry.path}: {e}")
+            return False
+
+    @classmethod
+    def enforce_quotas(cls, dry_run: bool = False, quotas: Dict[str, int] = None) -> List[QuotaReport]:
+        """
+        Evicts least recently used entries until every category is below its quota (bytes, defaults to
+        get_quotas()). Entries whose files were deleted meanwhile are dropped from the catalogue.
+        """
+        if quotas is None:
+            quotas = cls.get_quotas()
+        protected_meetings = cls.get_protected_meetings()
+        entries = cls.get_entries()
+        missing = {entry.path for entry in entries if not os.path.exists(entry.path)}
+        if not dry_run:
+            cls._remove_from_catalogue(list(missing))
+
+        per_category: Dict[str, List[CacheEntry]] = {}
+        for entry in entries:
+            if entry.path not in missing:
+                per_category.setdefault(entry.category, []).append(entry)
+
+        reports = []
+        for category in sorted(set(quotas) | set(per_category)):
+            category_entries = per_category.get(category, [])
+            quota = quotas.get(category)
+            used = sum(entry.size for entry in category_entries)
+            evicted = []
+            evicted_inodes = []
+            if quota is not None and used > quota:
+                remaining = used
+                # Entries are sorted by last access: least recently used first
+                for entry in category_entries:
+                    if remaining <= quota:
+                        break
+                    if entry.pinned or entry.meeting in protected_meetings:
+                        continue
+                    # Read before deleting: the inodes are gone afterwards
+                    inodes = cls.get_inodes(entry.path)
+                    if dry_run or cls._delete_entry(entry):
+                        evicted.append(entry)
+                        evicted_inodes.extend(inodes)
+                        remaining -= entry.size
+                if not dry_run:
+                    cls._remove_from_catalogue([entry.path for entry in evicted])
+            reports.append(QuotaReport(category, quota, used, len(category_entries), evicted,
+                                       cls.get_freed_size(evicted_inodes)))
+        return reports
+
+    @staticmethod
+    def format_size(n_bytes: Optional[int]) -> str:
+        if n_bytes is None:
+            return "no quota"
+        size = float(n_bytes)
+        for unit in ("B", "KB", "MB", "GB"):
+            if abs(size) < 1024:
+                return f"{size:.1f} {unit}"
+            size /= 1024
+        return f"{size:.1f} TB"
+
+    @classmethod
+    def format_report(cls, reports: List[QuotaReport], dry_run: bool = True) -> str:
+        """A human-readable report of enforce_quotas(), e.g. to log or show in a message box."""
+        verb = "Would evict" if dry_run else "Evicted"
+        lines = [f"Cache usage (active meeting: {cls.get_active_meeting()})"]
+        for report in reports:
+            lines.append(f"    {report.category}: {cls.format_size(report.used)} of {cls.format_size(report.quota)} "
+                         f"({report.n_entries} entries). {verb} {len(report.evicted)} entries, "
+                         f"{cls.format_size(report.freed)}")
+            for entry in report.evicted[:10]:
+                lines.append(f"        {entry.path} ({cls.format_size(entry.size)}, last access "
+                             f"{time.strftime('%Y-%m-%d', time.localtime(entry.last_access))})")
+            if len(report.evicted) > 10:
+                lines.append(f"        ... and {len(report.evicted) - 10} more")
+        return "\n".join(lines)
+
+    @classmethod
+    def is_scanned(cls, scan_key: str) -> bool:
+        try:
+            with cls._connect() as conn:
+                return conn.execute('SELECT 1 FROM cache_metadata WHERE key = ?', (scan_key,)).fetchone() is not None
+        except sqlite3.Error as e:
+            logger.warning(f"Could not read cache catalogue: {e}")
+            return True
+
+    @classmethod
+    def register_existing(cls, scan_key: str, entries: Iterable[Tuple[Union[str, Path], str, Optional[str]]]):
+        """
+        Registers (path, category, meeting) entries cached before the catalogue existed and marks scan_key as
+        scanned. The last access is estimated from the modification time. Entries already registered are kept as
+        they are: what the application registered itself is more accurate than a scan.
+        """
+        start = time.time()
+        rows = []
+        for path, category, meeting in entries:
+            try:
+                last_access = os.path.getmtime(path)
+            except OSError:
+                continue
+            rows.append((cls._normalize_path(path), category, meeting, cls.get_size(path), last_access, start))
+        try:
+            with cls._connect() as conn:
+                conn.executemany('''
+                    INSERT OR IGNORE INTO cache_entries (path, category, meeting, size, last_access, added)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', rows)
+                conn.execute('INSERT OR REPLACE INTO cache_metadata (key, value) VALUES (?, ?)',
+                             (scan_key, str(start)))
+            logger.info(f"Registered {len(rows)} existing cache entries in {time.time() - start:.1f}s")
+        except sqlite3.Error as e:
+            logger.warning(f"Could not update cache catalogue: {e}")
+
+    @classmethod
+    def scan_existing_entries(cls, meetings_dir: Union[str, Path], force: bool = False):
+        """
+        Registers the TDoc folders (and parsed TDoc lists) downloaded to a meetings folder before the catalogue
+        existed. Done once per meetings folder, unless forced.
+        """
+        meetings_dir = Path(meetings_dir)
+        scan_key = f"scanned:{cls._normalize_path(meetings_dir)}"
+        if (not force and cls.is_scanned(scan_key)) or not meetings_dir.is_dir():
+            return
+
+        def get_entries():
+            for meeting_folder in meetings_dir.iterdir():
+                if not meeting_folder.is_dir():
+                    continue
+                for entry in meeting_folder.iterdir():
+                    if entry.is_dir() and entry.name.lower() not in cls.NON_TDOC_FOLDERS:
+                        yield entry, cls.TDOCS, meeting_folder.name
+                    elif entry.is_file() and entry.suffix == ".pickle":
+                        yield entry, cls.PICKLE, meeting_folder.name
+
+        cls.register_existing(scan_key, get_entries())
+
+    @classmethod
+    def add_scan_folder(cls, meetings_dir: Union[str, Path]):
+        """Announces a meetings download folder (see scan_existing_entries())."""
+        if meetings_dir:
+            cls._scan_folders.add(Path(meetings_dir))
+
+    @classmethod
+    def run_maintenance(cls, dry_run: bool = False) -> str:
+        """Registers pre-existing TDoc folders (first run only), enforces the quotas and logs the report."""
+        for meetings_dir in list(cls._scan_folders):
+            cls.scan_existing_entries(meetings_dir)
+        report = cls.format_report(cls.enforce_quotas(dry_run=dry_run), dry_run=dry_run)
+        logger.info(report)
+        return report
+
+
+atexit.register(CacheGovernor.flush)
@@ -0,0 +1,30 @@
+import os
+from pathlib import Path
+from typing import Union
+
+
+class CommonConfig:
+    """
+    Where the shared subsystems keep their files. Each application calls configure() at startup with its cache root,
+    i.e. the folder holding its "cache" download folder:
+        3GPP Meeting Helper   HomeDirectory/ApplicationFolder in config.ini
+        3GPP Tools            the parent of the meetings download folder (meetings_config.json)
+    Both default to ~/3GPP_Delegate_Helper, so the two applications share the TDoc store, the spec index and the
+    cache catalogue unless a user moves the cache of one of them.
+    """
+    DEFAULT_ROOT = Path.home() / "3GPP_Delegate_Helper"
+
+    root: Path = DEFAULT_ROOT
+    # Tells the applications sharing a cache root apart (e.g. their trace files)
+    app_name: str = "3gpp"
+
+    @classmethod
+    def configure(cls, root: Union[str, Path], app_name: str = None):
+        cls.root = Path(os.path.expanduser(str(root)))
+        if app_name:
+            cls.app_name = app_name
+
+    @classmethod
+    def path(cls, *parts: str) -> Path:
+        """A path below the cache root, e.g. CommonConfig.path("tdoc_store")."""
+        return cls.root.joinpath(*parts)
@@ -0,0 +1,126 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from threegpp_common.config import CommonConfig
+
+logger = logging.getLogger(__name__)
+
+
+class Fingerprint:
+    """
+    Fast content fingerprints (BLAKE2b, 16 bytes -> 32 hex chars) with a persisted index.
+    Digests are stored in <cache root>/fingerprints.sqlite keyed by (path, size, mtime_ns, inode), so unchanged files
+    are never re-read.
+    """
+    DIGEST_SIZE = 16
+    CHUNK_SIZE = 1024 * 1024
+
+    # Files modified less than this ago may still change without a size/mtime change (coarse timestamps):
+    # they are hashed, but not persisted
+    RACY_WINDOW_NS = 2_000_000_000
+
+    _lock = threading.Lock()
+    _memory = {}
+    # The index whose table was created (the cache root can be changed at runtime)
+    _initialized_path: Optional[Path] = None
+
+    @staticmethod
+    def get_index_path() -> Path:
+        return CommonConfig.path("fingerprints.sqlite")
+
+    @classmethod
+    def bytes(cls, data, digest_size: int = DIGEST_SIZE) -> str:
+        """Digest of in-memory content, e.g. a downloaded HTML page. str is encoded as UTF-8."""
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        return hashlib.blake2b(data, digest_size=digest_size).hexdigest()
+
+    @classmethod
+    def _connect(cls) -> sqlite3.Connection:
+        index_path = cls.get_index_path()
+        conn = sqlite3.connect(index_path, timeout=30)
+        if cls._initialized_path != index_path:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS fingerprints (
+                    path TEXT,
+                    digest_size INTEGER,
+                    size INTEGER,
+                    mtime_ns INTEGER,
+                    inode INTEGER,
+                    digest TEXT,
+                    PRIMARY KEY (path, digest_size)
+                )
+            ''')
+            cls._initialized_path = index_path
+        return conn
+
+    @classmethod
+    def _lookup(cls, key: tuple, file_id: tuple) -> Optional[str]:
+        with cls._lock:
+            cached = cls._memory.get(key)
+            if cached is None:
+                if not cls.get_index_path().exists():
+                    return None
+                try:
+                    with cls._connect() as conn:
+                        row = conn.execute(
+                            'SELECT size, mtime_ns, inode, digest FROM fingerprints WHERE path = ? AND digest_size = ?',
+                            key).fetchone()
+                except sqlite3.Error as e:
+                    logger.warning(f"Could not read fingerprint index: {e}")
+                    return None
+                if row is None:
+                    return None
+                cached = tuple(row)
+                cls._memory[key] = cached
+        return cached[3] if cached[:3] == file_id else None
+
+    @classmethod
+    def _store(cls, key: tuple, file_id: tuple, digest: str):
+        with cls._lock:
+            cls._memory[key] = (*file_id, digest)
+            try:
+                cls.get_index_path().parent.mkdir(parents=True, exist_ok=True)
+                with cls._connect() as conn:
+                    conn.execute(
+                        'INSERT OR REPLACE INTO fingerprints (path, digest_size, size, mtime_ns, inode, digest) '
+                        'VALUES (?, ?, ?, ?, ?, ?)',
+                        (*key, *file_id, digest))
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"Could not write fingerprint index: {e}")
+
+    @classmethod
+    def file(cls, file_path, digest_size: int = DIGEST_SIZE) -> Optional[str]:
+        """Digest of the file content, or None if it cannot be read. Unchanged files are served from the index."""
+        try:
+            path = os.path.abspath(file_path)
+            stat = os.stat(path)
+        except OSError as e:
+            logger.warning(f"Could not fingerprint {file_path}: {e}")
+            return None
+
+        key = (path, digest_size)
+        file_id = (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+        digest = cls._lookup(key, file_id)
+        if digest is not None:
+            return digest
+
+        hasher = hashlib.blake2b(digest_size=digest_size)
+        try:
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(cls.CHUNK_SIZE), b""):
+                    hasher.update(chunk)
+        except OSError as e:
+            logger.warning(f"Could not fingerprint {file_path}: {e}")
+            return None
+        digest = hasher.hexdigest()
+
+        if time.time_ns() - stat.st_mtime_ns > cls.RACY_WINDOW_NS:
+            cls._store(key, file_id, digest)
+        return digest
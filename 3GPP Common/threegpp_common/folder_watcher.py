@@ -0,0 +1,254 @@
+import logging
+import re
+import threading
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+from urllib.parse import unquote
+
+from threegpp_common.ftp_listing import ListingEntry, parse_listing
+
+logger = logging.getLogger(__name__)
+
+# (url, fetch state) -> (listing, or None if it did not change since the state, new fetch state). The fetch state is
+# opaque to the watcher (e.g. ETag, Last-Modified, content hash). Errors (e.g. 404, server not reachable) are raised
+FetchFunction = Callable[[str, dict], Tuple[Optional[Union[str, bytes]], dict]]
+
+
+class ListingEvent(NamedTuple):
+    """A change in a watched folder"""
+    # FolderWatcher.NEW_TDOC / NEW_REVISION / SIZE_CHANGED
+    kind: str
+    # e.g. S2-2401234
+    tdoc: str
+    # e.g. r01. Empty for TDocs
+    revision: str
+    size: Optional[int]
+    previous_size: Optional[int]
+    url: str
+
+
+# (folder URL, events). Called from the thread that fetched the listing
+ListingCallback = Callable[[str, List[ListingEvent]], None]
+
+
+class _WatchedFolder:
+    """Polling state of a folder"""
+
+    def __init__(self, url: str, interval_s: float):
+        self.url = url
+        self.fetch_state: dict = {}
+        self.entries: Optional[List[ListingEntry]] = None
+        self.watchers = 0
+        self.interval_s = interval_s
+        self.next_poll = time.monotonic()
+        # Held while fetching: concurrent refreshes of the same folder wait for the running one
+        self.lock = threading.Lock()
+
+
+class FolderWatcher:
+    """
+    Single poller for the meeting folders (Inbox, Revisions, Drafts, Docs...). Every folder listing goes through
+    refresh(): a conditional GET (the application's fetch function), parsed once and diffed against the last
+    snapshot. Changes are published as ListingEvents to the subscribers, so that the windows and threads that need a
+    listing share one download instead of each fetching and parsing it.
+    Watched folders are polled by a background thread with an adaptive interval: back to the minimum when a folder
+    changes, slower while it does not.
+    """
+    NEW_TDOC = "new_tdoc"
+    NEW_REVISION = "new_revision"
+    SIZE_CHANGED = "size_changed"
+
+    MIN_INTERVAL_S = 30
+    MAX_INTERVAL_S = 300
+    BACKOFF_FACTOR = 1.5
+
+    REVISION_PATTERN = re.compile(r'^([A-Za-z0-9\-]+)(r\d+[a-zA-Z]?)\.zip$', re.IGNORECASE)
+    TDOC_PATTERN = re.compile(r'^([A-Za-z0-9]+-\d+)\.zip$', re.IGNORECASE)
+
+    def __init__(self, fetch: FetchFunction, min_interval_s: float = None, max_interval_s: float = None,
+                 backoff_factor: float = None):
+        self.fetch = fetch
+        self.min_interval_s = min_interval_s or self.MIN_INTERVAL_S
+        self.max_interval_s = max_interval_s or self.MAX_INTERVAL_S
+        self.backoff_factor = backoff_factor or self.BACKOFF_FACTOR
+        self.running = False
+        self._folders: Dict[str, _WatchedFolder] = {}
+        self._folders_lock = threading.Lock()
+        self._subscribers: List[ListingCallback] = []
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def folder_key(url: str) -> str:
+        return url.rstrip('/') + '/'
+
+    def start(self):
+        """Starts the polling thread (once)"""
+        with self._folders_lock:
+            if self._thread is not None:
+                return
+            self.running = True
+            # Daemon thread: does not block closing the application
+            self._thread = threading.Thread(target=self._run, name="FolderWatcher", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stops the polling thread. A fetch in progress is not interrupted"""
+        self.running = False
+        self._wakeup.set()
+
+    def subscribe(self, callback: ListingCallback):
+        """Registers a function to be called with the events of each changed folder. Subscribing again has no effect"""
+        with self._folders_lock:
+            if callback not in self._subscribers:
+                self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: ListingCallback):
+        with self._folders_lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def _get_folder(self, url: str) -> _WatchedFolder:
+        key = self.folder_key(url)
+        with self._folders_lock:
+            if key not in self._folders:
+                self._folders[key] = _WatchedFolder(key, self.min_interval_s)
+            return self._folders[key]
+
+    def watch(self, url: str, entries: List[ListingEntry] = None, fetch_state: dict = None):
+        """
+        Polls the folder in the background until unwatch() is called as many times
+        Args:
+            url: The folder URL
+            entries: A listing retrieved just before (e.g. a local copy). See set_baseline()
+            fetch_state: The fetch state of the baseline listing
+        """
+        folder = self._get_folder(url)
+        with self._folders_lock:
+            folder.watchers += 1
+        if entries is not None:
+            self.set_baseline(url, entries, fetch_state)
+        self._wakeup.set()
+
+    def set_baseline(self, url: str, entries: List[ListingEntry], fetch_state: dict = None):
+        """
+        Sets a listing retrieved just before (e.g. a local copy) as the last known listing, if the folder was not
+        fetched yet, so that the next refresh is a conditional request. The next poll is delayed by the minimum interval
+        """
+        folder = self._get_folder(url)
+        with self._folders_lock:
+            if folder.entries is None:
+                folder.entries = entries
+                folder.fetch_state = fetch_state or {}
+                folder.next_poll = time.monotonic() + folder.interval_s
+
+    def unwatch(self, url: str):
+        with self._folders_lock:
+            folder = self._folders.get(self.folder_key(url))
+            if folder is not None and folder.watchers > 0:
+                folder.watchers -= 1
+
+    def get_entries(self, url: str) -> Optional[List[ListingEntry]]:
+        """Last known listing of the folder, without network access. None if it was never fetched"""
+        with self._folders_lock:
+            folder = self._folders.get(self.folder_key(url))
+        return folder.entries if folder is not None else None
+
+    def refresh(self, url: str) -> List[ListingEntry]:
+        """
+        Fetches the folder listing now (conditional GET) and publishes the changes since the last snapshot. Errors of
+        the fetch function are raised to the caller
+        Args:
+            url: The folder URL
+
+        Returns: The current entries
+        """
+        folder = self._get_folder(url)
+        with folder.lock:
+            content, new_state = self.fetch(folder.url, folder.fetch_state)
+            folder.fetch_state = new_state
+            if content is None and folder.entries is not None:
+                self._schedule_next_poll(folder, changed=False)
+                return folder.entries
+
+            # Pages in other formats (e.g. other listings of the meeting server): their links are the entries
+            entries = parse_listing(content or "", base_url=folder.url, fallback_to_links=True)
+            events = self.diff_listings(folder.entries, entries)
+            folder.entries = entries
+            self._schedule_next_poll(folder, changed=bool(events))
+
+        if events:
+            logger.info(f"{len(events)} changes in {folder.url}")
+            self._publish(folder.url, events)
+        return entries
+
+    def _publish(self, folder_url: str, events: List[ListingEvent]):
+        with self._folders_lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(folder_url, events)
+            except Exception as e:
+                logger.exception(f"Could not process the events of {folder_url}: {e}")
+
+    def _schedule_next_poll(self, folder: _WatchedFolder, changed: bool):
+        if changed:
+            folder.interval_s = self.min_interval_s
+        else:
+            folder.interval_s = min(folder.interval_s * self.backoff_factor, self.max_interval_s)
+        folder.next_poll = time.monotonic() + folder.interval_s
+
+    @classmethod
+    def split_tdoc_file_name(cls, file_name: str) -> Optional[Tuple[str, str]]:
+        """'S2-2401234r01.zip' -> ('S2-2401234', 'r01'), 'S2-2401234.zip' -> ('S2-2401234', ''). None otherwise."""
+        match = cls.REVISION_PATTERN.match(file_name)
+        if match:
+            return match.group(1).upper(), match.group(2).lower()
+        match = cls.TDOC_PATTERN.match(file_name)
+        if match:
+            return match.group(1).upper(), ""
+        return None
+
+    @classmethod
+    def diff_listings(cls, previous: Optional[List[ListingEntry]], current: List[ListingEntry]) -> List[ListingEvent]:
+        """New and resized TDoc files. Nothing is reported for the first listing (the baseline)."""
+        if previous is None:
+            return []
+        previous_by_name = {e.name: e for e in previous if not e.is_dir}
+        events = []
+        for entry in current:
+            if entry.is_dir:
+                continue
+            tdoc_and_revision = cls.split_tdoc_file_name(unquote(entry.url.rsplit('/', 1)[-1]))
+            if tdoc_and_revision is None:
+                continue
+            tdoc, revision = tdoc_and_revision
+            previous_entry = previous_by_name.get(entry.name)
+            if previous_entry is None:
+                kind = cls.NEW_REVISION if revision else cls.NEW_TDOC
+                events.append(ListingEvent(kind, tdoc, revision, entry.size, None, entry.url))
+            elif None not in (entry.size, previous_entry.size) and entry.size != previous_entry.size:
+                events.append(ListingEvent(cls.SIZE_CHANGED, tdoc, revision, entry.size, previous_entry.size,
+                                           entry.url))
+        return events
+
+    def _run(self):
+        while self.running:
+            self._wakeup.clear()
+            with self._folders_lock:
+                watched = [f for f in self._folders.values() if f.watchers > 0]
+
+            for folder in watched:
+                if not self.running:
+                    break
+                if folder.next_poll > time.monotonic():
+                    continue
+                try:
+                    self.refresh(folder.url)
+                except Exception as e:
+                    logger.warning(f"Could not check {folder.url}: {e}")
+                    self._schedule_next_poll(folder, changed=False)
+
+            with self._folders_lock:
+                next_polls = [f.next_poll for f in self._folders.values() if f.watchers > 0]
+            self._wakeup.wait(max(min(next_polls) - time.monotonic(), 0) if next_polls else None)
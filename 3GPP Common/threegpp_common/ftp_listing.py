@@ -0,0 +1,233 @@
+import datetime
+import html as html_lib
+import re
+from typing import NamedTuple, Optional, List, Iterable
+from urllib.parse import urljoin, unquote
+
+from threegpp_common.tracing import Tracing
+
+
+class ListingEntry(NamedTuple):
+    """
+    An entry (file or folder) of a 3GPP server folder listing. Size and modification time are None if not
+    provided by the listing
+    """
+    name: str
+    is_dir: bool
+    size: Optional[int]
+    mtime: Optional[datetime.datetime]
+    url: str
+
+
+# Single-pass tokenizer over the raw HTML. Only the tokens needed to reconstruct the listing are matched:
+#   - <a href=...>text</a> (the entries)
+#   - <tr> and </tr> (row boundaries in the v2 table listing)
+#   - <img src="/ftp/geticon.axd?file=<ext>"> (the file type icon in the v2 listing. Empty extension for folders)
+# All tokens start with "<" so that the regex engine can skip to the next tag without backtracking
+listing_token_regex = re.compile(
+    r'<(?:a\s[^>]*?href\s*=\s*["\']?(?P<href>[^"\'\s>]*)["\']?[^>]*>(?P<text>[^<]*(?:<(?!/a\s*>)[^<]*)*)</a\s*>'
+    r'|(?P<row_start>tr[\s>])'
+    r'|(?P<row_end>/tr\s*>)'
+    r'|img\s[^>]*?geticon\.axd\?file=(?P<icon>[^"\'&\s>]*)[^>]*>)',
+    re.IGNORECASE)
+tag_regex = re.compile(r'<[^>]*>')
+
+# Any <a href=...>text</a>, for pages that are not listings (see parse_links)
+link_regex = re.compile(
+    r'<a\s[^>]*?href\s*=\s*["\']?(?P<href>[^"\'\s>]*)["\']?[^>]*>(?P<text>[^<]*(?:<(?!/a\s*>)[^<]*)*)</a\s*>',
+    re.IGNORECASE)
+ignored_link_prefixes = ('?', '#', 'javascript:', 'mailto:')
+
+# Listing v1 (IIS <pre>), text before the link: "11/19/2018  8:36 AM        <dir> " or "12/19/2018  7:35 AM  3771299 "
+listing_v1_entry_regex = re.compile(r'(\d?\d/\d?\d/\d{4}) +(\d?\d:\d\d) *(AM|PM) +(<dir>|\d+) *$', re.IGNORECASE)
+
+# Listing v2 (table), text after the link: "2020/02/21 7:20   20,3 KB" (no size for folders)
+listing_v2_entry_regex = re.compile(
+    r'(\d{4}/\d?\d/\d?\d) +(\d?\d:\d\d)(?: +([\d.,]+) *(bytes|KB|MB|GB))?',
+    re.IGNORECASE)
+listing_size_units = {'bytes': 1, 'kb': 1024, 'mb': 1024 ** 2, 'gb': 1024 ** 3}
+
+# FTP "LIST" output (MS-DOS format), e.g.: "12-04-19  06:36PM       <DIR>          Updates"
+ftp_list_line_regex = re.compile(
+    r'^(\d\d-\d\d-\d\d) +(\d\d:\d\d)(AM|PM) +(<DIR>|\d+) +(.+)$',
+    re.IGNORECASE)
+
+
+def _clean_text(markup: str) -> str:
+    if '<' in markup:
+        markup = tag_regex.sub(' ', markup)
+    if '&' in markup:
+        markup = html_lib.unescape(markup)
+    return ' '.join(markup.split())
+
+
+def _to_datetime(year, month, day, hour, minute) -> Optional[datetime.datetime]:
+    # Much faster than strptime, which matters for listings with thousands of entries
+    try:
+        return datetime.datetime(int(year), int(month), int(day), int(hour), int(minute))
+    except ValueError:
+        return None
+
+
+def _parse_size(value: str, unit: str) -> Optional[int]:
+    try:
+        return int(float(value.replace(',', '.')) * listing_size_units[unit.lower()])
+    except (ValueError, KeyError):
+        return None
+
+
+def _parse_v1_metadata(text: str) -> Optional[tuple]:
+    match = listing_v1_entry_regex.search(text)
+    if match is None:
+        return None
+    month, day, year = match.group(1).split('/')
+    hour, minute = match.group(2).split(':')
+    mtime = _to_datetime(year, month, day, int(hour) % 12 + (12 if match.group(3).upper() == 'PM' else 0), minute)
+    if match.group(4).lower() == '<dir>':
+        return True, None, mtime
+    return False, int(match.group(4)), mtime
+
+
+def _make_entry(href: str, text: str, is_dir: bool, size, mtime, base_url: str) -> ListingEntry:
+    name = _clean_text(text)
+    if name == '':
+        name = unquote(href.rstrip('/').rsplit('/', 1)[-1])
+    url = urljoin(base_url, href) if base_url else href
+    return ListingEntry(name, is_dir, size, mtime, url)
+
+
+def _parse_v2_row(
+        row_link: tuple,
+        row_icon: Optional[str],
+        row_text: List[str],
+        base_url: str) -> Optional[ListingEntry]:
+    match = listing_v2_entry_regex.search(_clean_text(' '.join(row_text)))
+    if match is None:
+        return None
+    year, month, day = match.group(1).split('/')
+    hour, minute = match.group(2).split(':')
+    mtime = _to_datetime(year, month, day, hour, minute)
+    size = _parse_size(match.group(3), match.group(4)) if match.group(3) else None
+    # Folders have an icon without file extension. Fall back to the (missing) size if there is no icon
+    is_dir = row_icon == '' if row_icon is not None else size is None
+    return _make_entry(row_link[0], row_link[1], is_dir, size, mtime, base_url)
+
+
+@Tracing.traced('parse.listing')
+def parse_listing(html, base_url: str = None, fallback_to_links: bool = False) -> List[ListingEntry]:
+    """
+    Parses a 3GPP server folder listing in a single pass over the HTML. Supports both the old (v1, IIS <pre> list)
+    and the new (v2, "Directory Listing" table) formats. Links that are not listing entries (parent folder,
+    breadcrumbs, sorting links) are ignored
+    Args:
+        html: The HTML of the listing (str or bytes)
+        base_url: If provided, used to resolve the entry URLs
+        fallback_to_links: If the page is not a listing in one of these formats (no entries found, e.g. other
+            listings of the meeting server), return all its links instead (see parse_links())
+
+    Returns: The list of entries in the order they appear in the listing
+
+    """
+    if html is None:
+        return []
+    if isinstance(html, bytes):
+        html = html.decode('utf-8', errors='replace')
+
+    entries: List[ListingEntry] = []
+    last_end = 0
+    in_row = False
+    row_icon = None
+    row_link = None
+    row_text = []
+
+    for token in listing_token_regex.finditer(html):
+        gap = html[last_end:token.start()]
+        last_end = token.end()
+        if in_row and row_link is not None:
+            # v2: metadata follows the link, in the remaining cells of the row
+            row_text.append(gap)
+
+        if token.group('href') is not None:
+            href = token.group('href')
+            if in_row:
+                if row_link is None:
+                    row_link = (href, token.group('text'))
+                continue
+
+            # v1: metadata precedes the link
+            metadata = _parse_v1_metadata(_clean_text(gap))
+            if metadata is None:
+                continue
+            is_dir, size, mtime = metadata
+            entries.append(_make_entry(href, token.group('text'), is_dir, size, mtime, base_url))
+        elif token.group('row_start') is not None:
+            in_row = True
+            row_icon = None
+            row_link = None
+            row_text = []
+        elif token.group('row_end') is not None:
+            if row_link is not None:
+                entry = _parse_v2_row(row_link, row_icon, row_text, base_url)
+                if entry is not None:
+                    entries.append(entry)
+            in_row = False
+            row_link = None
+        elif in_row:
+            row_icon = token.group('icon')
+
+    if fallback_to_links and len(entries) == 0:
+        return parse_links(html, base_url)
+    return entries
+
+
+def parse_links(html, base_url: str = None) -> List[ListingEntry]:
+    """
+    Generic fallback for pages that are not folder listings: every link of the page, without size and modification
+    time. Links ending in "/" are folders. Query, fragment, javascript and mailto links are ignored
+    Args:
+        html: The HTML of the page (str or bytes)
+        base_url: If provided, used to resolve the entry URLs
+
+    Returns: The list of entries in the order they appear in the page, without duplicate URLs
+
+    """
+    if html is None:
+        return []
+    if isinstance(html, bytes):
+        html = html.decode('utf-8', errors='replace')
+
+    entries = {}
+    for token in link_regex.finditer(html):
+        href = token.group('href')
+        if href == '' or href.startswith(ignored_link_prefixes):
+            continue
+        entry = _make_entry(href, token.group('text'), href.endswith('/'), None, None, base_url)
+        entries.setdefault(entry.url, entry)
+    return list(entries.values())
+
+
+def parse_ftp_list_lines(lines: Iterable[str], base_url: str = None) -> List[ListingEntry]:
+    """
+    Parses the output of an FTP "LIST" command (MS-DOS format, as used by the 3GPP FTP server)
+    Args:
+        lines: The lines returned by the server
+        base_url: If provided, the entry URLs are base_url/name
+
+    Returns: The list of entries
+
+    """
+    entries: List[ListingEntry] = []
+    for line in lines:
+        match = ftp_list_line_regex.match(line.strip())
+        if match is None:
+            continue
+        try:
+            mtime = datetime.datetime.strptime(f'{match.group(1)} {match.group(2)}{match.group(3)}', '%m-%d-%y %I:%M%p')
+        except ValueError:
+            mtime = None
+        name = match.group(5).strip()
+        is_dir = match.group(4).upper() == '<DIR>'
+        size = None if is_dir else int(match.group(4))
+        url = '{0}/{1}'.format(base_url.rstrip('/'), name) if base_url else name
+        entries.append(ListingEntry(name, is_dir, size, mtime, url))
+    return entries
@@ -0,0 +1,224 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+
+class HostCircuitOpenError(requests.exceptions.RequestException):
+    """Raised instead of sending a request to a host paused after repeated failures."""
+    pass
+
+
+class HostController:
+    """AIMD concurrency limit and circuit breaker for one host"""
+    # Throughput changes below these thresholds are considered noise
+    IMPROVEMENT_THRESHOLD = 1.05
+    DEGRADATION_THRESHOLD = 0.8
+
+    def __init__(self, host: str, initial: int, minimum: int, maximum: int, failure_threshold: int,
+                 cooldown_s: float, max_cooldown_s: float, clock: Callable[[], float] = time.monotonic):
+        self.host = host
+        self.limit = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.failure_threshold = failure_threshold
+        self.base_cooldown_s = cooldown_s
+        self.max_cooldown_s = max_cooldown_s
+        self.clock = clock
+
+        self.active = 0
+        self.consecutive_failures = 0
+        self.cooldown_s = cooldown_s
+        self.open_until = 0.0
+        # One measurement window lasts as many completed requests as the current limit
+        self._window_start = clock()
+        self._window_requests = 0
+        self._window_bytes = 0
+        self._last_throughput: Optional[float] = None
+        # Requests sent with the old limit must complete before the limit is halved again
+        self._decrease_holdoff = 0
+        self._condition = threading.Condition()
+
+    def is_open(self) -> bool:
+        return self.clock() < self.open_until
+
+    def acquire(self):
+        """Blocks until a request may be sent. Raises HostCircuitOpenError while the host is paused."""
+        with self._condition:
+            while True:
+                if self.is_open():
+                    raise HostCircuitOpenError(
+                        f"{self.host} paused for {self.open_until - self.clock():.0f}s after repeated failures")
+                if self.active < self.limit:
+                    self.active += 1
+                    return
+                self._condition.wait(1)
+
+    def release(self):
+        with self._condition:
+            self.active = max(self.active - 1, 0)
+            self._condition.notify_all()
+
+    def record_success(self, n_bytes: int = 0, congested: bool = False):
+        """congested: the request only succeeded after urllib3 retried timeouts, 429 or 5xx."""
+        with self._condition:
+            self.consecutive_failures = 0
+            self.cooldown_s = self.base_cooldown_s
+            if congested:
+                self._decrease()
+                return
+            if self._decrease_holdoff > 0:
+                self._decrease_holdoff -= 1
+            self._window_requests += 1
+            self._window_bytes += n_bytes
+            if self._window_requests >= self.limit:
+                self._end_window()
+            self._condition.notify_all()
+
+    def record_failure(self, retry_after_s: Optional[float] = None):
+        """Timeout, connection error, 429 or 5xx."""
+        with self._condition:
+            self.consecutive_failures += 1
+            self._decrease()
+            if self.is_open():
+                # Requests sent before the host was paused
+                return
+            if self.consecutive_failures >= self.failure_threshold or retry_after_s is not None:
+                cooldown_s = self.cooldown_s if retry_after_s is None else min(retry_after_s, self.max_cooldown_s)
+                self.open_until = self.clock() + cooldown_s
+                # A single probe request once the cooldown expires. Longer pause if it fails again
+                self.limit = self.minimum
+                self.cooldown_s = min(self.cooldown_s * 2, self.max_cooldown_s)
+                logger.warning(f"Pausing requests to {self.host} for {cooldown_s:.0f}s "
+                               f"({self.consecutive_failures} consecutive failures)")
+
+    def _decrease(self):
+        self._reset_window()
+        self._last_throughput = None
+        if self._decrease_holdoff > 0:
+            self._decrease_holdoff -= 1
+            return
+        new_limit = max(self.minimum, self.limit // 2)
+        if new_limit != self.limit:
+            logger.info(f"Reducing parallel requests to {self.host}: {self.limit} -> {new_limit}")
+        self.limit = new_limit
+        self._decrease_holdoff = self.active
+
+    def _end_window(self):
+        elapsed_s = max(self.clock() - self._window_start, 1e-6)
+        # Bytes/s for downloads, requests/s if no sizes were recorded
+        amount = self._window_bytes if self._window_bytes > 0 else self._window_requests
+        throughput = amount / elapsed_s
+        if self._last_throughput is None or throughput >= self._last_throughput * self.IMPROVEMENT_THRESHOLD:
+            self.limit = min(self.limit + 1, self.maximum)
+        elif throughput < self._last_throughput * self.DEGRADATION_THRESHOLD:
+            self.limit = max(self.limit - 1, self.minimum)
+        self._last_throughput = throughput
+        self._reset_window()
+
+    def _reset_window(self):
+        self._window_start = self.clock()
+        self._window_requests = 0
+        self._window_bytes = 0
+
+
+class HostSlot:
+    """A request in progress, handed out by HostConcurrency.slot()."""
+
+    def __init__(self, controller: Optional[HostController]):
+        # None for requests nested in another slot: the outer slot records the outcome
+        self.controller = controller
+        self.recorded = False
+
+    def record_response(self, response: requests.Response, n_bytes: Optional[int] = None):
+        """Call before raise_for_status(). n_bytes defaults to the content length (pass it for streamed responses)."""
+        self.recorded = True
+        if self.controller is None:
+            return
+        if getattr(response, 'from_cache', False):
+            # Served from the HTTP cache: says nothing about the host
+            return
+        if response.status_code == 429 or response.status_code >= 500:
+            self.controller.record_failure(HostConcurrency.get_retry_after_s(response))
+            return
+        # Timeouts, 429 or 5xx retried by urllib3 before succeeding
+        retries = getattr(getattr(response, 'raw', None), 'retries', None)
+        history = retries.history if retries is not None else ()
+        congested = any(h.error is not None or h.status == 429 or (h.status or 0) >= 500 for h in history)
+        self.controller.record_success(len(response.content) if n_bytes is None else n_bytes, congested=congested)
+
+
+class HostConcurrency:
+    """
+    Adaptive number of parallel requests per host. The limit grows by one while the measured throughput improves and
+    is halved on timeouts, 429 or 5xx (AIMD). After repeated failures the host is paused (circuit breaker).
+    Thread pools are sized to MAX_CONCURRENCY; the controller decides how many requests actually run.
+    """
+    INITIAL_CONCURRENCY = 4
+    MIN_CONCURRENCY = 1
+    MAX_CONCURRENCY = 16
+    FAILURE_THRESHOLD = 5
+    COOLDOWN_S = 30
+    MAX_COOLDOWN_S = 300
+
+    _controllers: Dict[str, HostController] = {}
+    _lock = threading.Lock()
+    # Requests made inside a slot (e.g. a page fetch from a download slot) must not take a second one
+    _local = threading.local()
+
+    @classmethod
+    def get_controller(cls, url: str) -> HostController:
+        host = urlparse(url).netloc.lower()
+        with cls._lock:
+            if host not in cls._controllers:
+                cls._controllers[host] = HostController(
+                    host, cls.INITIAL_CONCURRENCY, cls.MIN_CONCURRENCY, cls.MAX_CONCURRENCY, cls.FAILURE_THRESHOLD,
+                    cls.COOLDOWN_S, cls.MAX_COOLDOWN_S)
+            return cls._controllers[host]
+
+    @staticmethod
+    def get_retry_after_s(response: requests.Response) -> Optional[float]:
+        try:
+            return float(response.headers.get('Retry-After'))
+        except (TypeError, ValueError):
+            # Missing or an HTTP date
+            return None
+
+    @classmethod
+    @contextmanager
+    def slot(cls, url: str):
+        """
+        Limits the parallel requests to the host of url. Timeouts and connection errors raised in the block are
+        recorded as failures; responses are recorded with HostSlot.record_response().
+        """
+        if getattr(cls._local, 'slot', None) is not None:
+            # Nested request: already counted by the outer slot
+            yield HostSlot(None)
+            return
+
+        controller = cls.get_controller(url)
+        controller.acquire()
+        slot = HostSlot(controller)
+        cls._local.slot = slot
+        try:
+            yield slot
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError, requests.exceptions.RetryError):
+            slot.recorded = True
+            controller.record_failure()
+            raise
+        except BaseException:
+            # Not related to the host (e.g. 404, local file could not be written)
+            slot.recorded = True
+            raise
+        else:
+            if not slot.recorded:
+                controller.record_success()
+        finally:
+            cls._local.slot = None
+            controller.release()
@@ -0,0 +1,343 @@
+import concurrent.futures
+import datetime
+import html
+import logging
+import os
+import re
+import zipfile
+from concurrent.futures.process import BrokenProcessPool
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+from lxml import etree as ET
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+TAG_BODY = f"{W_NS}body"
+TAG_P = f"{W_NS}p"
+TAG_TBL = f"{W_NS}tbl"
+TAG_TR = f"{W_NS}tr"
+TAG_TC = f"{W_NS}tc"
+TAG_T = f"{W_NS}t"
+TAG_TAB = f"{W_NS}tab"
+TAG_BR = f"{W_NS}br"
+TAG_SDT = f"{W_NS}sdt"
+TAG_SDT_CONTENT = f"{W_NS}sdtContent"
+TAG_PPR = f"{W_NS}pPr"
+TAG_PSTYLE = f"{W_NS}pStyle"
+ATTR_VAL = f"{W_NS}val"
+
+
+class RedlineBlock(NamedTuple):
+    """A paragraph ('p') or table row ('row', cells separated by ' | ')."""
+    kind: str
+    heading_level: int
+    text: str
+
+
+class RedlineParagraph(NamedTuple):
+    """A paragraph of the comparison: (tag, text) segments, tag being 'equal', 'insert' or 'delete'."""
+    kind: str
+    heading_level: int
+    segments: List[Tuple[str, str]]
+
+
+class DocxRedline:
+    """
+    COM-free comparison of two .docx files, so that revision chains (r00 -> r01 -> r02) can be diffed in bulk,
+    in a process pool and on any OS. Word is only needed for a Word-native comparison.
+        1. Paragraph and table-row text is read from the WordprocessingML (tracked changes accepted).
+        2. Blocks are diffed with difflib.SequenceMatcher, similar paired blocks word by word.
+        3. The result is rendered as an HTML page or as a .docx with real w:ins/w:del tracked changes.
+    """
+    HEADING_STYLE_REGEX = re.compile(r'heading\s*(?P<level>\d)', re.IGNORECASE)
+    WORD_REGEX = re.compile(r'\w+|\s+|[^\w\s]')
+    REVISION_CHAIN_REGEX = re.compile(r'^(?P<tdoc>\w+-\d+)(?P<revision>r\d{2})?$', re.IGNORECASE)
+
+    # Paired blocks less similar than this are shown as deleted + inserted instead of word by word
+    MIN_SIMILARITY_FOR_WORD_DIFF = 0.5
+    MAX_WORKERS = 4
+    # Author of the tracked changes of .docx comparisons. Each application passes its own name
+    AUTHOR = "3GPP Delegate Helper"
+
+    @classmethod
+    def _get_heading_levels(cls, styles_root) -> Dict[str, int]:
+        heading_levels = {}
+        if styles_root is None:
+            return heading_levels
+        for style in styles_root.iter(f"{W_NS}style"):
+            name = style.find(f"{W_NS}name")
+            match = cls.HEADING_STYLE_REGEX.match(name.get(ATTR_VAL, "")) if name is not None else None
+            if match:
+                heading_levels[style.get(f"{W_NS}styleId")] = int(match.group('level'))
+        return heading_levels
+
+    @staticmethod
+    def _get_text(element) -> str:
+        """Text as displayed with all changes accepted (w:delText is skipped)."""
+        pieces = []
+        for node in element.iter():
+            if node.tag == TAG_T and node.text:
+                pieces.append(node.text)
+            elif node.tag in (TAG_TAB, TAG_BR):
+                pieces.append(" ")
+        return "".join(pieces).replace("\u00a0", " ").strip()
+
+    @classmethod
+    def _iter_blocks(cls, container):
+        for child in container:
+            if child.tag in (TAG_P, TAG_TBL):
+                yield child
+            elif child.tag == TAG_SDT:
+                content = child.find(TAG_SDT_CONTENT)
+                if content is not None:
+                    yield from cls._iter_blocks(content)
+
+    @classmethod
+    def extract_blocks(cls, doc_path: PathLike) -> List[RedlineBlock]:
+        """Non-empty paragraphs and table rows of a .docx, in document order."""
+        with zipfile.ZipFile(doc_path, "r") as zf:
+            document_root = ET.fromstring(zf.read("word/document.xml"))
+            styles_root = ET.fromstring(zf.read("word/styles.xml")) if "word/styles.xml" in zf.namelist() else None
+        heading_levels = cls._get_heading_levels(styles_root)
+
+        blocks = []
+        body = document_root.find(TAG_BODY)
+        if body is None:
+            return blocks
+        for element in cls._iter_blocks(body):
+            if element.tag == TAG_TBL:
+                for row in element.findall(TAG_TR):
+                    cells = [" ".join(t for t in (cls._get_text(p) for p in cell.iter(TAG_P)) if t)
+                             for cell in row.findall(TAG_TC)]
+                    if any(cells):
+                        blocks.append(RedlineBlock("row", 0, " | ".join(cells)))
+                continue
+
+            text = cls._get_text(element)
+            if not text:
+                continue
+            heading_level = 0
+            p_pr = element.find(TAG_PPR)
+            if p_pr is not None and p_pr.find(TAG_PSTYLE) is not None:
+                heading_level = heading_levels.get(p_pr.find(TAG_PSTYLE).get(ATTR_VAL), 0)
+            blocks.append(RedlineBlock("p", heading_level, text))
+        return blocks
+
+    @classmethod
+    def _diff_words(cls, original_text: str, revised_text: str) -> List[Tuple[str, str]]:
+        original_words = cls.WORD_REGEX.findall(original_text)
+        revised_words = cls.WORD_REGEX.findall(revised_text)
+        segments = []
+        matcher = SequenceMatcher(None, original_words, revised_words, autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag in ("delete", "replace"):
+                segments.append(("delete", "".join(original_words[i1:i2])))
+            if tag in ("insert", "replace"):
+                segments.append(("insert", "".join(revised_words[j1:j2])))
+            if tag == "equal":
+                segments.append(("equal", "".join(original_words[i1:i2])))
+        return segments
+
+    @classmethod
+    def diff_blocks(cls, original: List[RedlineBlock], revised: List[RedlineBlock]) -> List[RedlineParagraph]:
+        """Block-level diff; changed blocks paired with a similar block are diffed word by word."""
+        result = []
+        matcher = SequenceMatcher(None, [b.text for b in original], [b.text for b in revised], autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                result.extend(RedlineParagraph(b.kind, b.heading_level, [("equal", b.text)]) for b in revised[j1:j2])
+                continue
+
+            original_blocks, revised_blocks = original[i1:i2], revised[j1:j2]
+            deleted, inserted = [], []
+            for idx in range(max(len(original_blocks), len(revised_blocks))):
+                original_block = original_blocks[idx] if idx < len(original_blocks) else None
+                revised_block = revised_blocks[idx] if idx < len(revised_blocks) else None
+                if original_block and revised_block:
+                    similarity = SequenceMatcher(None, original_block.text, revised_block.text).quick_ratio()
+                    if similarity >= cls.MIN_SIMILARITY_FOR_WORD_DIFF:
+                        # Flush the unpaired blocks first to keep the document order
+                        result.extend(deleted + inserted)
+                        deleted, inserted = [], []
+                        result.append(RedlineParagraph(revised_block.kind, revised_block.heading_level,
+                                                       cls._diff_words(original_block.text, revised_block.text)))
+                        continue
+                if original_block:
+                    deleted.append(RedlineParagraph(original_block.kind, original_block.heading_level,
+                                                    [("delete", original_block.text)]))
+                if revised_block:
+                    inserted.append(RedlineParagraph(revised_block.kind, revised_block.heading_level,
+                                                     [("insert", revised_block.text)]))
+            result.extend(deleted + inserted)
+        return result
+
+    @staticmethod
+    def render_html(paragraphs: List[RedlineParagraph], title: str) -> str:
+        lines = [
+            "<!DOCTYPE html>",
+            '<html><head><meta charset="utf-8">',
+            f"<title>{html.escape(title)}</title>",
+            "<style>",
+            "body { font-family: Arial, sans-serif; font-size: 10pt; }",
+            "ins { color: #006100; background-color: #e2f5e2; }",
+            "del { color: #9c0006; background-color: #fbe3e4; }",
+            "p.row { font-family: Consolas, monospace; border-left: 3px solid #ccc; padding-left: 4px; }",
+            "</style></head><body>",
+            f"<h1>{html.escape(title)}</h1>",
+        ]
+        for paragraph in paragraphs:
+            content = "".join(
+                f"<ins>{html.escape(text)}</ins>" if tag == "insert" else
+                f"<del>{html.escape(text)}</del>" if tag == "delete" else
+                html.escape(text)
+                for tag, text in paragraph.segments)
+            if paragraph.kind == "row":
+                lines.append(f'<p class="row">{content}</p>')
+            elif 1 <= paragraph.heading_level <= 5:
+                # h1 is the title of the comparison
+                lines.append(f"<h{paragraph.heading_level + 1}>{content}</h{paragraph.heading_level + 1}>")
+            else:
+                lines.append(f"<p>{content}</p>")
+        lines.append("</body></html>")
+        return "\n".join(lines)
+
+    @classmethod
+    def render_docx(cls, paragraphs: List[RedlineParagraph], output_path: PathLike, author: Optional[str] = None):
+        """Writes the differences as tracked changes, so they can be reviewed with Word's Accept/Reject."""
+        from docx import Document
+        from docx.oxml import OxmlElement
+        from docx.oxml.ns import qn
+
+        document = Document()
+        revision_date = datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        revision_id = 0
+        for paragraph in paragraphs:
+            style = f"Heading {paragraph.heading_level}" if 1 <= paragraph.heading_level <= 9 else None
+            p = document.add_paragraph(style=style)
+            for tag, text in paragraph.segments:
+                run = OxmlElement("w:r")
+                text_element = OxmlElement("w:delText" if tag == "delete" else "w:t")
+                text_element.set(qn("xml:space"), "preserve")
+                text_element.text = text
+                run.append(text_element)
+                if tag == "equal":
+                    p._p.append(run)
+                    continue
+                revision_id += 1
+                revision = OxmlElement("w:ins" if tag == "insert" else "w:del")
+                revision.set(qn("w:id"), str(revision_id))
+                revision.set(qn("w:author"), author or cls.AUTHOR)
+                revision.set(qn("w:date"), revision_date)
+                revision.append(run)
+                p._p.append(revision)
+        document.save(str(output_path))
+
+    @staticmethod
+    def get_default_output_path(original: PathLike, revised: PathLike, output_format: str,
+                                output_folder: Optional[PathLike] = None) -> Path:
+        """'<output folder>/<revised>_vs_<original>.<html|docx>'. By default, the export folder of the revised file"""
+        original, revised = Path(original), Path(revised)
+        output_folder = revised.parent / "export" if output_folder is None else Path(output_folder)
+        return output_folder / f"{revised.stem}_vs_{original.stem}.{output_format}"
+
+    @classmethod
+    def compare(cls, original: PathLike, revised: PathLike, output_path: Optional[PathLike] = None,
+                output_format: str = "html", author: Optional[str] = None) -> Path:
+        """
+        Compares two .docx files
+        Args:
+            original: The original (base) document
+            revised: The revised document
+            output_path: Where to write the comparison. By default, in the export folder of the revised document
+            output_format: "html" or "docx"
+            author: Author of the tracked changes ("docx" output). By default, AUTHOR
+
+        Returns: The path of the comparison
+        """
+        original, revised = Path(original), Path(revised)
+        if output_path is None:
+            output_path = cls.get_default_output_path(original, revised, output_format)
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        paragraphs = cls.diff_blocks(cls.extract_blocks(original), cls.extract_blocks(revised))
+        if output_format == "docx":
+            cls.render_docx(paragraphs, output_path, author)
+        else:
+            output_path.write_text(cls.render_html(paragraphs, f"{revised.name} vs. {original.name}"),
+                                   encoding="utf-8")
+        return output_path
+
+    @classmethod
+    def get_revision_chains(cls, tdoc_ids: List[str]) -> List[Tuple[str, str]]:
+        """
+        Consecutive (original, revised) pairs per TDoc, e.g.
+        S2-2400001, S2-2400001r01, S2-2400001r02 -> (S2-2400001, S2-2400001r01), (S2-2400001r01, S2-2400001r02)
+        """
+        chains: Dict[str, List[Tuple[str, str]]] = {}
+        for tdoc_id in tdoc_ids:
+            match = cls.REVISION_CHAIN_REGEX.match(tdoc_id.strip())
+            if match:
+                chains.setdefault(match.group('tdoc').upper(), []).append(
+                    ((match.group('revision') or "").lower(), tdoc_id.strip()))
+
+        pairs = []
+        for chain in chains.values():
+            chain = sorted(set(chain))
+            pairs.extend((chain[idx][1], chain[idx + 1][1]) for idx in range(len(chain) - 1))
+        return pairs
+
+    @classmethod
+    def batch_compare(cls, file_pairs: List[Tuple[PathLike, PathLike]], output_format: str = "html",
+                      max_workers: Optional[int] = None, output_folder: Optional[PathLike] = None,
+                      author: Optional[str] = None) -> Dict[Tuple[PathLike, PathLike], Optional[Path]]:
+        """
+        Compares many (original, revised) pairs in a process pool. Failed pairs map to None. The comparisons are
+        written to output_folder, by default to the export folder of each revised document
+        """
+        # Resolved here: class attributes changed at runtime are not seen by spawned worker processes
+        author = author or cls.AUTHOR
+        output_folder = str(output_folder) if output_folder is not None else None
+        results = {}
+        if len(file_pairs) < 2:
+            for original, revised in file_pairs:
+                results[(original, revised)] = compare_docx_pair(
+                    str(original), str(revised), output_format, output_folder, author)
+            return results
+
+        if max_workers is None:
+            max_workers = max(1, min(cls.MAX_WORKERS, (os.cpu_count() or 2) - 1))
+        try:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+                future_to_pair = {
+                    executor.submit(compare_docx_pair, str(original), str(revised), output_format, output_folder,
+                                    author): (original, revised)
+                    for original, revised in file_pairs}
+                for future in concurrent.futures.as_completed(future_to_pair):
+                    results[future_to_pair[future]] = future.result()
+        except BrokenProcessPool as e:
+            # e.g. frozen build without freeze_support(): compare the remaining pairs inline
+            logger.warning(f"Comparison pool unavailable, comparing inline: {e}")
+            for original, revised in file_pairs:
+                if results.get((original, revised)) is None:
+                    results[(original, revised)] = compare_docx_pair(
+                        str(original), str(revised), output_format, output_folder, author)
+        return results
+
+
+def compare_docx_pair(original: str, revised: str, output_format: str, output_folder: Optional[str] = None,
+                      author: Optional[str] = None) -> Optional[Path]:
+    """DocxRedline.compare() for the process pool (module level so that it can be pickled). None if it fails"""
+    try:
+        output_path = None
+        if output_folder is not None:
+            output_path = DocxRedline.get_default_output_path(original, revised, output_format, output_folder)
+        return DocxRedline.compare(original, revised, output_path, output_format=output_format, author=author)
+    except Exception as e:
+        logger.error(f"Could not compare {Path(revised).name} vs. {Path(original).name}: {e}")
+        return None
@@ -0,0 +1,311 @@
+import functools
+import hashlib
+import logging
+import os
+import re
+import shutil
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Tuple, Union
+
+from threegpp_common.config import CommonConfig
+from threegpp_common.tracing import Tracing
+
+logger = logging.getLogger(__name__)
+
+
+class IndexedSpecVersion(NamedTuple):
+    """A version of a specification in the 3GPP archive"""
+    spec: str
+    file_version: str
+    version: str
+    release: int
+    file_name: str
+    url: str
+
+
+class SpecIndex:
+    """
+    Specification archive index in <cache root>/spec_index/index.sqlite:
+        spec_versions   (spec, file_version) -> file name, URL and a sortable version key, so that queries such as
+                        "latest Rel-18 version of 23.501" or "all versions between 17.5 and 18.2" are answered without
+                        listing the 3GPP archive folders
+        spec_archives   specs whose whole archive folder was indexed (spec_versions may also contain only the
+                        versions in "latest")
+        spec_files      local path -> content hash (SHA-256) of the downloaded spec zip files, so that a version
+                        already downloaded by either application is reused instead of downloaded again
+    """
+    LAYOUT_VERSION = 1
+
+    # e.g. 23501-i20.zip, 23700-07-h00.zip, 23003-aa0.zip
+    SPEC_FILE_NAME_REGEX = re.compile(r'^(?P<spec>\d{5}(-\d{1,2})?)-(?P<file_version>[\da-z]{3})\.zip$', re.IGNORECASE)
+    # e.g. 18.2.0, v17.5, Rel-18, 18
+    VERSION_REGEX = re.compile(r'^(?:v|Rel-?)?(?P<version>\d+(\.\d+){0,2})$', re.IGNORECASE)
+
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_folder(cls, create: bool = True) -> Path:
+        folder = CommonConfig.path("spec_index")
+        if create:
+            folder.mkdir(parents=True, exist_ok=True)
+        return folder
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def file_version_to_tuple(file_version: str) -> Tuple[int, int, int]:
+        """'i20' -> (18, 2, 0)"""
+        def letter_to_number(character: str) -> int:
+            return int(character) if character.isdigit() else ord(character.lower()) - ord('a') + 10
+
+        return letter_to_number(file_version[0]), letter_to_number(file_version[1]), letter_to_number(file_version[2])
+
+    @staticmethod
+    def get_version_key(version_tuple: Tuple[int, int, int]) -> int:
+        """Sortable integer. Each 3GPP version field is a single character, i.e. lower than 36."""
+        return version_tuple[0] * 10000 + version_tuple[1] * 100 + version_tuple[2]
+
+    @classmethod
+    def parse_version_bound(cls, version: str, upper: bool) -> Optional[int]:
+        """Partial versions cover their sub-versions: '18.2' as upper bound includes 18.2.5, 'Rel-18' all of Rel-18."""
+        match = cls.VERSION_REGEX.match(version.strip()) if version else None
+        if not match:
+            return None
+        fields = [int(field) for field in match.group('version').split('.')]
+        fields += [99 if upper else 0] * (3 - len(fields))
+        return cls.get_version_key((fields[0], fields[1], fields[2]))
+
+    @classmethod
+    def split_spec_file_name(cls, file_name: str) -> Optional[Tuple[str, str]]:
+        """'23501-i20.zip' -> ('23.501', 'i20'). None if it is not a spec file name."""
+        match = cls.SPEC_FILE_NAME_REGEX.match(Path(file_name).name)
+        if not match:
+            return None
+        spec = match.group('spec')
+        return f"{spec[:2]}.{spec[2:]}", match.group('file_version').lower()
+
+    @classmethod
+    def _connect(cls, folder: Path) -> sqlite3.Connection:
+        conn = sqlite3.connect(folder / "index.sqlite", timeout=30)
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS spec_versions (
+                spec TEXT,
+                file_version TEXT,
+                version_key INTEGER,
+                release INTEGER,
+                file_name TEXT,
+                url TEXT,
+                indexed REAL,
+                PRIMARY KEY (spec, file_version)
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_spec_versions_key ON spec_versions(spec, version_key)')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS spec_archives (
+                spec TEXT PRIMARY KEY,
+                listed REAL
+            )
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS spec_files (
+                path TEXT PRIMARY KEY,
+                file_name TEXT,
+                digest TEXT,
+                size INTEGER,
+                mtime REAL,
+                added REAL
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_spec_files_name ON spec_files(file_name)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_spec_files_digest ON spec_files(digest)')
+        conn.execute(f'PRAGMA user_version = {cls.LAYOUT_VERSION}')
+        return conn
+
+    @classmethod
+    def _index_exists(cls) -> bool:
+        return (cls.get_folder(create=False) / "index.sqlite").exists()
+
+    @classmethod
+    @Tracing.traced('db.spec_index.record_versions')
+    def record_versions(cls, spec_files: List[Tuple[str, str]], archive_of_spec: str = None):
+        """
+        Adds the spec files listed in a 3GPP folder (archive, latest, drafts) to the index
+        Args:
+            spec_files: (file name, URL) tuples, e.g. ('23501-i20.zip', 'https://.../23501-i20.zip'). Files not
+            following the spec file naming are ignored
+            archive_of_spec: If the files are the listing of the archive folder of a spec (i.e. all its versions),
+            the spec number, e.g. 23.501
+        """
+        now = time.time()
+        rows = []
+        for file_name, url in spec_files:
+            split_name = cls.split_spec_file_name(file_name)
+            if not split_name:
+                continue
+            spec, file_version = split_name
+            version_tuple = cls.file_version_to_tuple(file_version)
+            rows.append((spec, file_version, cls.get_version_key(version_tuple), version_tuple[0], file_name, url, now))
+        if not rows and archive_of_spec is None:
+            return
+        try:
+            with cls._lock, cls._connect(cls.get_folder()) as conn:
+                conn.executemany(
+                    'INSERT OR REPLACE INTO spec_versions '
+                    '(spec, file_version, version_key, release, file_name, url, indexed) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    rows)
+                if archive_of_spec is not None:
+                    conn.execute('INSERT OR REPLACE INTO spec_archives (spec, listed) VALUES (?, ?)',
+                                 (archive_of_spec, now))
+        except sqlite3.Error as e:
+            logger.warning(f"Could not write spec index: {e}")
+
+    @classmethod
+    def is_archive_indexed(cls, spec: str) -> bool:
+        """Whether all versions of a specification (i.e. its archive folder) are in the index"""
+        if not cls._index_exists():
+            return False
+        try:
+            with cls._lock, cls._connect(cls.get_folder(create=False)) as conn:
+                return conn.execute('SELECT 1 FROM spec_archives WHERE spec = ?', (spec,)).fetchone() is not None
+        except sqlite3.Error as e:
+            logger.warning(f"Could not read spec index: {e}")
+            return False
+
+    @classmethod
+    def get_versions(cls, spec: str, from_version: str = None, to_version: str = None,
+                     release: Union[int, str] = None) -> List[IndexedSpecVersion]:
+        """
+        Retrieves the indexed versions of a specification
+        Args:
+            spec: The specification number, e.g. 23.501
+            from_version: Lower bound (inclusive), e.g. 17.5 or 17.5.0
+            to_version: Upper bound (inclusive), e.g. 18.2 (includes 18.2.x)
+            release: Only versions of this release, e.g. 18
+
+        Returns: The versions, oldest first. An empty list if the specification is not indexed
+        """
+        if not cls._index_exists():
+            return []
+        query = 'SELECT spec, file_version, release, file_name, url FROM spec_versions WHERE spec = ?'
+        params: list = [spec]
+        if from_version:
+            query += ' AND version_key >= ?'
+            params.append(cls.parse_version_bound(from_version, upper=False))
+        if to_version:
+            query += ' AND version_key <= ?'
+            params.append(cls.parse_version_bound(to_version, upper=True))
+        if release is not None:
+            query += ' AND release = ?'
+            params.append(int(str(release).lower().replace('rel-', '')))
+        query += ' ORDER BY version_key'
+        try:
+            with cls._lock, cls._connect(cls.get_folder(create=False)) as conn:
+                rows = conn.execute(query, params).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not read spec index: {e}")
+            return []
+
+        versions = []
+        for spec_number, file_version, row_release, file_name, url in rows:
+            major, middle, minor = cls.file_version_to_tuple(file_version)
+            versions.append(IndexedSpecVersion(spec_number, file_version, f"{major}.{middle}.{minor}", row_release,
+                                               file_name, url))
+        return versions
+
+    @classmethod
+    def get_latest_version(cls, spec: str, release: Union[int, str] = None) -> Optional[IndexedSpecVersion]:
+        """The latest indexed version of a specification (of a release if set), None if not found"""
+        versions = cls.get_versions(spec, release=release)
+        return versions[-1] if versions else None
+
+    @classmethod
+    def record_local_file(cls, path: Union[str, Path]) -> Optional[str]:
+        """
+        Adds a downloaded spec zip file to the index. Files already indexed with the same size and modification time
+        are not hashed again
+        Args:
+            path: The local path of the file
+
+        Returns: The content hash of the file, or None if it could not be indexed
+        """
+        path = Path(path).resolve()
+        try:
+            stat = path.stat()
+            with cls._lock, cls._connect(cls.get_folder()) as conn:
+                row = conn.execute('SELECT digest, size, mtime FROM spec_files WHERE path = ?', (str(path),)).fetchone()
+            if row and row[1] == stat.st_size and row[2] == stat.st_mtime:
+                return row[0]
+
+            sha = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    sha.update(chunk)
+            digest = sha.hexdigest()
+            with cls._lock, cls._connect(cls.get_folder()) as conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO spec_files (path, file_name, digest, size, mtime, added) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    (str(path), path.name.lower(), digest, stat.st_size, stat.st_mtime, time.time()))
+            return digest
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Could not add {path} to spec index: {e}")
+            return None
+
+    @classmethod
+    def find_local_file(cls, file_name: str = None, digest: str = None) -> Optional[Path]:
+        """
+        Searches for an already-downloaded spec zip file, regardless of which application downloaded it. Entries whose
+        file no longer exists (or was modified) are removed
+        Args:
+            file_name: The file name, e.g. 23501-i20.zip
+            digest: The content hash (SHA-256) of the file
+
+        Returns: The path of the file, or None if not found
+        """
+        if (not file_name and not digest) or not cls._index_exists():
+            return None
+        if digest:
+            query, params = 'SELECT path, size, mtime FROM spec_files WHERE digest = ?', (digest,)
+        else:
+            query, params = 'SELECT path, size, mtime FROM spec_files WHERE file_name = ?', (file_name.lower(),)
+        try:
+            with cls._lock, cls._connect(cls.get_folder(create=False)) as conn:
+                stale_paths = []
+                for path, size, mtime in conn.execute(query, params).fetchall():
+                    try:
+                        stat = os.stat(path)
+                        if stat.st_size == size and stat.st_mtime == mtime:
+                            return Path(path)
+                    except OSError:
+                        pass
+                    stale_paths.append((path,))
+                conn.executemany('DELETE FROM spec_files WHERE path = ?', stale_paths)
+        except sqlite3.Error as e:
+            logger.warning(f"Could not read spec index: {e}")
+        return None
+
+    @classmethod
+    def place_local_file(cls, target_path: Union[str, Path]) -> bool:
+        """
+        Places a copy of an already-downloaded spec zip file in the target path. The file is copied (not linked) so
+        that each application can modify or evict its files without affecting the other one
+        Args:
+            target_path: Where the file should be placed. The file name identifies the spec version
+
+        Returns: Whether the file was placed in the target path
+        """
+        target_path = Path(target_path)
+        source_path = cls.find_local_file(file_name=target_path.name)
+        if not source_path or source_path.resolve() == target_path.resolve():
+            return False
+        try:
+            target_path.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(source_path, target_path)
+        except OSError as e:
+            logger.warning(f"Could not place {source_path} in {target_path}: {e}")
+            return False
+        logger.info(f"Reused {source_path} for {target_path}")
+        cls.record_local_file(target_path)
+        return True
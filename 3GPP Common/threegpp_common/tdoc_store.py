@@ -0,0 +1,192 @@
+import hashlib
+import logging
+import os
+import re
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from threegpp_common.cache_governor import CacheGovernor
+from threegpp_common.config import CommonConfig
+from threegpp_common.tracing import Tracing
+
+logger = logging.getLogger(__name__)
+
+
+class StoredTdoc(NamedTuple):
+    """A TDoc zip file in the store"""
+    digest: str
+    path: Path
+    size: int
+
+
+class TDocStore:
+    """
+    Content-addressed TDoc zip store in <cache root>/tdoc_store:
+        objects/<2 hex chars>/<sha256>   every TDoc zip stored once, no matter which server or meeting folder it
+                                         was downloaded for
+        index.sqlite                     (wg, meeting, tdoc, revision) -> sha256
+    The zip files in the meeting folders are copies of the blobs, never hard links: a file written in place in a
+    meeting folder (e.g. a download overwriting it) must not change the blob shared by all meetings.
+    Blobs are registered in the CacheGovernor (category tdoc_store) and evicted LRU like the other caches. Index rows
+    of evicted blobs are ignored by lookup().
+    """
+    LAYOUT_VERSION = 1
+
+    # e.g. S2-2401234, S2-2401234r02, S2-2401234r1
+    TDOC_NAME_REGEX = re.compile(r'^(?P<tdoc>(?P<wg>[A-Za-z0-9]+)-\d+)(?P<revision>r\d+[a-zA-Z]?)?$', re.IGNORECASE)
+
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_folder(cls, create: bool = True) -> Path:
+        folder = CommonConfig.path("tdoc_store")
+        if create:
+            (folder / "objects").mkdir(parents=True, exist_ok=True)
+        return folder
+
+    @classmethod
+    def split_tdoc_name(cls, tdoc_name: str) -> Optional[tuple]:
+        """'S2-2401234r02' -> ('S2', 'S2-2401234', 'r02'). None if it is not a TDoc name."""
+        match = cls.TDOC_NAME_REGEX.match(tdoc_name.strip())
+        if not match:
+            return None
+        return match.group('wg').upper(), match.group('tdoc').upper(), (match.group('revision') or '').lower()
+
+    @classmethod
+    def _connect(cls, folder: Path) -> sqlite3.Connection:
+        conn = sqlite3.connect(folder / "index.sqlite", timeout=30)
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS tdoc_blobs (
+                wg TEXT,
+                meeting TEXT,
+                tdoc TEXT,
+                revision TEXT,
+                digest TEXT,
+                size INTEGER,
+                source_url TEXT,
+                added REAL,
+                PRIMARY KEY (wg, meeting, tdoc, revision)
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_tdoc_blobs_tdoc ON tdoc_blobs(tdoc, revision)')
+        conn.execute(f'PRAGMA user_version = {cls.LAYOUT_VERSION}')
+        return conn
+
+    @staticmethod
+    def _blob_path(folder: Path, digest: str) -> Path:
+        return folder / "objects" / digest[:2] / digest
+
+    @classmethod
+    def lookup(cls, tdoc_name: str, meeting: str = None) -> Optional[StoredTdoc]:
+        """
+        Finds a stored zip. TDoc IDs are unique, so entries stored for other meeting folder names (or by the other
+        application) also count. Entries of the given meeting are preferred.
+        """
+        key = cls.split_tdoc_name(tdoc_name)
+        folder = cls.get_folder(create=False)
+        if not key or not (folder / "index.sqlite").exists():
+            return None
+        wg, tdoc, revision = key
+        try:
+            with cls._lock, cls._connect(folder) as conn:
+                rows = conn.execute(
+                    'SELECT digest, size, meeting FROM tdoc_blobs WHERE tdoc = ? AND revision = ? AND wg = ?',
+                    (tdoc, revision, wg)).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not read TDoc store index: {e}")
+            return None
+
+        rows.sort(key=lambda row: row[2] != meeting)
+        for digest, size, _ in rows:
+            path = cls._blob_path(folder, digest)
+            try:
+                if path.stat().st_size == size:
+                    CacheGovernor.touch(path)
+                    return StoredTdoc(digest, path, size)
+            except OSError:
+                continue
+        return None
+
+    @classmethod
+    def _add_to_index(cls, folder: Path, key: tuple, digest: str, size: int, meeting: str, source_url: str):
+        wg, tdoc, revision = key
+        with cls._lock, cls._connect(folder) as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO tdoc_blobs (wg, meeting, tdoc, revision, digest, size, source_url, added) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (wg, meeting or "", tdoc, revision, digest, size, source_url or "", time.time()))
+
+    @classmethod
+    @Tracing.traced('db.tdoc_store.put')
+    def put_bytes(cls, data: bytes, tdoc_name: str, meeting: str = "", source_url: str = "") -> Optional[StoredTdoc]:
+        """Adds a downloaded zip (in memory) to the store. None if it is not a TDoc or it could not be stored."""
+        key = cls.split_tdoc_name(tdoc_name)
+        if not key or data is None:
+            return None
+        folder = cls.get_folder()
+        digest = hashlib.sha256(data).hexdigest()
+        blob_path = cls._blob_path(folder, digest)
+
+        try:
+            if not blob_path.exists():
+                blob_path.parent.mkdir(parents=True, exist_ok=True)
+                # Unique temp name + atomic rename: concurrent writers of the same content are harmless
+                tmp_path = blob_path.with_name(f"{digest}.{uuid.uuid4().hex}.tmp")
+                tmp_path.write_bytes(data)
+                os.replace(tmp_path, blob_path)
+            cls._add_to_index(folder, key, digest, len(data), meeting, source_url)
+            CacheGovernor.register(blob_path, CacheGovernor.TDOC_STORE)
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Could not add {tdoc_name} to TDoc store: {e}")
+            return None
+        return StoredTdoc(digest, blob_path, len(data))
+
+    @classmethod
+    def put_file(cls, file_path: Path, tdoc_name: str, meeting: str = "", source_url: str = "") -> Optional[StoredTdoc]:
+        """Adds a downloaded zip to the store. The file is copied into the store and left as it is."""
+        key = cls.split_tdoc_name(tdoc_name)
+        if not key:
+            return None
+        file_path = Path(file_path)
+        folder = cls.get_folder()
+
+        try:
+            sha = hashlib.sha256()
+            with open(file_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    sha.update(chunk)
+            digest = sha.hexdigest()
+            size = file_path.stat().st_size
+
+            blob_path = cls._blob_path(folder, digest)
+            if not blob_path.exists():
+                blob_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = blob_path.with_name(f"{digest}.{uuid.uuid4().hex}.tmp")
+                shutil.copyfile(file_path, tmp_path)
+                os.replace(tmp_path, blob_path)
+
+            cls._add_to_index(folder, key, digest, size, meeting, source_url)
+            CacheGovernor.register(blob_path, CacheGovernor.TDOC_STORE)
+            return StoredTdoc(digest, blob_path, size)
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Could not add {tdoc_name} to TDoc store: {e}")
+            return None
+
+    @staticmethod
+    def materialize(stored: StoredTdoc, target_path) -> bool:
+        """Places a working copy of a stored zip. A copy, so that the working file can be modified or overwritten."""
+        target_path = Path(target_path)
+        try:
+            target_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = target_path.with_name(f"{target_path.name}.{uuid.uuid4().hex}.tmp")
+            shutil.copyfile(stored.path, tmp_path)
+            os.replace(tmp_path, target_path)
+            return True
+        except OSError as e:
+            logger.warning(f"Could not place {stored.path} in {target_path}: {e}")
+            return False
@@ -0,0 +1,224 @@
+import atexit
+import cProfile
+import functools
+import json
+import logging
+import logging.handlers
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from threegpp_common.config import CommonConfig
+
+logger = logging.getLogger(__name__)
+
+
+class _NoOpSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+    def set(self, **attributes):
+        pass
+
+
+class Span:
+    """A timed section. Attributes (e.g. bytes=..., url=...) are written with the span."""
+    __slots__ = ("name", "attributes", "_start", "_start_epoch")
+
+    def __init__(self, name: str, attributes: dict):
+        self.name = name
+        self.attributes = attributes
+
+    def __enter__(self):
+        self._start_epoch = time.time()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        duration_ms = (time.perf_counter() - self._start) * 1000
+        Tracing._record_span(self.name, self._start_epoch, duration_ms, self.attributes, exc_type)
+        return False
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+
+class Tracing:
+    """
+    Lightweight performance tracing.
+    Disabled unless the TGPP_TRACE environment variable is set (e.g. TGPP_TRACE=1): span() then returns a
+    shared no-op object and @Tracing.traced functions are called directly, so the instrumentation costs one flag check.
+
+    Spans go to <cache root>/traces/<application>/trace.jsonl (rotated), one object per span:
+      {"type": "span", "name": "http.fetch", "start": <epoch s>, "ms": 12.3, "thread": "...", "bytes": 1234, ...}
+    At exit, a summary line is written with count/p50/p95/total per span name, bytes and cache hit ratios.
+    """
+    ENV_VARIABLE = "TGPP_TRACE"
+    MAX_BYTES = 10 * 1024 * 1024
+    BACKUP_COUNT = 3
+
+    enabled = os.environ.get(ENV_VARIABLE, "").strip().lower() not in ("", "0", "false", "no")
+
+    _lock = threading.Lock()
+    _durations: Dict[str, List[float]] = {}
+    _bytes: Dict[str, int] = {}
+    _cache_hits: Dict[str, List[int]] = {}
+    _logger: Optional[logging.Logger] = None
+    _no_op_span = _NoOpSpan()
+
+    @staticmethod
+    def get_trace_folder() -> Path:
+        # One folder per application: both may trace at the same time and rotate their files independently
+        return CommonConfig.path("traces", CommonConfig.app_name)
+
+    @classmethod
+    def _get_logger(cls) -> logging.Logger:
+        if cls._logger is None:
+            trace_folder = cls.get_trace_folder()
+            trace_folder.mkdir(parents=True, exist_ok=True)
+            # Own logger: trace records must not end up in the application log (e.g. the UI log window)
+            trace_logger = logging.getLogger("tgpp.trace")
+            trace_logger.propagate = False
+            trace_logger.setLevel(logging.INFO)
+            handler = logging.handlers.RotatingFileHandler(
+                trace_folder / "trace.jsonl",
+                maxBytes=cls.MAX_BYTES,
+                backupCount=cls.BACKUP_COUNT,
+                encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            trace_logger.addHandler(handler)
+            cls._logger = trace_logger
+        return cls._logger
+
+    @classmethod
+    def _write(cls, record: dict):
+        try:
+            cls._get_logger().info(json.dumps(record, default=str))
+        except Exception as e:
+            logger.debug(f"Could not write trace record: {e}")
+
+    @classmethod
+    def _record_span(cls, name: str, start_epoch: float, duration_ms: float, attributes: dict, exc_type):
+        n_bytes = attributes.get("bytes")
+        with cls._lock:
+            cls._durations.setdefault(name, []).append(duration_ms)
+            if isinstance(n_bytes, int):
+                cls._bytes[name] = cls._bytes.get(name, 0) + n_bytes
+        record = {
+            "type": "span",
+            "name": name,
+            "start": round(start_epoch, 6),
+            "ms": round(duration_ms, 3),
+            "thread": threading.current_thread().name}
+        record.update(attributes)
+        if exc_type is not None:
+            record["error"] = exc_type.__name__
+        cls._write(record)
+
+    @classmethod
+    def span(cls, name: str, **attributes):
+        """
+        Times a block: with Tracing.span("http.fetch", url=url) as s: ...; s.set(bytes=len(data))
+        Names used: http.fetch, parse.*, db.*, excel.export.*, com.*, plantuml.render, queue.task
+        """
+        if not cls.enabled:
+            return cls._no_op_span
+        return Span(name, attributes)
+
+    @classmethod
+    def traced(cls, name: str = None, record_result_size: bool = False):
+        """Decorator version of span(). The name defaults to module.function."""
+        def decorator(func):
+            span_name = name or f"{func.__module__}.{func.__qualname__}"
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not cls.enabled:
+                    return func(*args, **kwargs)
+                with Span(span_name, {}) as s:
+                    result = func(*args, **kwargs)
+                    if record_result_size and isinstance(result, (bytes, str)):
+                        s.set(bytes=len(result))
+                    return result
+
+            return wrapper
+
+        return decorator
+
+    @classmethod
+    def cache_access(cls, name: str, hit: bool):
+        """Records a cache lookup, used for the hit ratios in the summary."""
+        if not cls.enabled:
+            return
+        with cls._lock:
+            counters = cls._cache_hits.setdefault(name, [0, 0])
+            counters[0 if hit else 1] += 1
+
+    @staticmethod
+    def _percentile(sorted_values: List[float], percentile: float) -> float:
+        idx = min(len(sorted_values) - 1, max(0, round(percentile / 100 * (len(sorted_values) - 1))))
+        return sorted_values[idx]
+
+    @classmethod
+    def summary(cls) -> dict:
+        with cls._lock:
+            durations = {k: sorted(v) for k, v in cls._durations.items()}
+            transferred = dict(cls._bytes)
+            caches = {k: list(v) for k, v in cls._cache_hits.items()}
+        spans = {}
+        for span_name, values in durations.items():
+            spans[span_name] = {
+                "count": len(values),
+                "p50_ms": round(cls._percentile(values, 50), 3),
+                "p95_ms": round(cls._percentile(values, 95), 3),
+                "max_ms": round(values[-1], 3),
+                "total_ms": round(sum(values), 3)}
+            if span_name in transferred:
+                spans[span_name]["bytes"] = transferred[span_name]
+        cache_ratios = {k: {"hits": hits, "misses": misses, "hit_ratio": round(hits / (hits + misses), 3)}
+                        for k, (hits, misses) in caches.items() if hits + misses > 0}
+        return {"spans": spans, "caches": cache_ratios}
+
+    @classmethod
+    def write_summary(cls):
+        if not cls.enabled or (not cls._durations and not cls._cache_hits):
+            return
+        record = {"type": "summary", "end": round(time.time(), 6), "pid": os.getpid()}
+        record.update(cls.summary())
+        cls._write(record)
+
+    @classmethod
+    @contextmanager
+    def profile(cls, name: str):
+        """
+        Captures a cProfile profile of a block to <trace folder>/<name>_<timestamp>.prof (only if tracing is
+        enabled). Open it with e.g. "python -m pstats" or snakeviz.
+        """
+        if not cls.enabled:
+            yield None
+            return
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield profiler
+        finally:
+            profiler.disable()
+            trace_folder = cls.get_trace_folder()
+            trace_folder.mkdir(parents=True, exist_ok=True)
+            file_name = trace_folder / f"{name}_{time.strftime('%Y%m%d-%H%M%S')}.prof"
+            try:
+                profiler.dump_stats(str(file_name))
+                logger.info(f"Saved profile to {file_name}")
+            except Exception as e:
+                logger.warning(f"Could not save profile {file_name}: {e}")
+
+
+atexit.register(Tracing.write_summary)
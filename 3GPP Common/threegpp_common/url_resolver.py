@@ -0,0 +1,206 @@
+import concurrent.futures
+import json
+import logging
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from threegpp_common.config import CommonConfig
+
+logger = logging.getLogger(__name__)
+
+# (url, (connect timeout, read timeout)) -> HTTP status code, or None if unknown (timeout, server not reachable...)
+ProbeFunction = Callable[[str, Tuple[float, float]], Optional[int]]
+
+
+class URLResolver:
+    """
+    Resolves which of the candidate URLs of a TDoc (e.g. 10.10.10.10 Inbox/Revisions, Inbox, Docs, SYNC folder,
+    meeting folder in the archive) holds it, so that opening a TDoc during a meeting takes a single round trip
+    instead of one timeout/404 per candidate:
+        1. The folder where TDocs of the same type (TDoc/revision/draft) were last found for the meeting is tried
+           first, without probing. The locations are kept in <cache root>/tdoc_locations.json.
+        2. Otherwise, the first candidates are probed (HTTP HEAD) in parallel, staggered by HEDGE_DELAY_S.
+           The first hit wins and the remaining probes are cancelled.
+        3. 404s are remembered for NEGATIVE_CACHE_TTL_S.
+    Each application sets its probe function (its HTTP session, proxies...) with set_probe_function().
+    """
+    HEDGE_DELAY_S = 0.3
+    MAX_HEDGED_PROBES = 4
+    NEGATIVE_CACHE_TTL_S = 60
+    PROBE_TIMEOUT = (3.05, 3)
+
+    REVISION_REGEX = re.compile(r'r\d{2}\.zip$', re.IGNORECASE)
+
+    _lock = threading.Lock()
+    _not_found: Dict[str, float] = {}
+    _locations: Optional[Dict[str, str]] = None
+    _probe_function: Optional[ProbeFunction] = None
+
+    @classmethod
+    def set_probe_function(cls, probe_function: ProbeFunction):
+        cls._probe_function = probe_function
+
+    @staticmethod
+    def get_locations_path() -> Path:
+        return CommonConfig.path("tdoc_locations.json")
+
+    @classmethod
+    def _load_locations(cls) -> Dict[str, str]:
+        if cls._locations is None:
+            cls._locations = {}
+            try:
+                locations_path = cls.get_locations_path()
+                if locations_path.exists():
+                    cls._locations = json.loads(locations_path.read_text(encoding="utf-8"))
+            except Exception as e:
+                logger.warning(f"Could not load TDoc locations: {e}")
+        return cls._locations
+
+    @classmethod
+    def _save_locations(cls):
+        try:
+            locations_path = cls.get_locations_path()
+            locations_path.parent.mkdir(parents=True, exist_ok=True)
+            locations_path.write_text(json.dumps(cls._locations, indent=1), encoding="utf-8")
+        except Exception as e:
+            logger.warning(f"Could not save TDoc locations: {e}")
+
+    @classmethod
+    def get_location_key(cls, url: str, meeting: str) -> str:
+        """The meeting and the type of document (each type is stored in a different folder), e.g. 'M|revision'."""
+        if "/drafts/" in url.lower():
+            kind = "draft"
+        elif cls.REVISION_REGEX.search(url):
+            kind = "revision"
+        else:
+            kind = "tdoc"
+        return f"{meeting}|{kind}"
+
+    @staticmethod
+    def _get_folder(url: str) -> str:
+        return url.rsplit('/', 1)[0]
+
+    @classmethod
+    def record_found(cls, url: str, meeting: str):
+        """Remembers the folder from which a TDoc was retrieved for this meeting."""
+        if not url or not meeting:
+            return
+        key = cls.get_location_key(url, meeting)
+        folder = cls._get_folder(url)
+        with cls._lock:
+            locations = cls._load_locations()
+            if locations.get(key) == folder:
+                return
+            locations[key] = folder
+            cls._save_locations()
+        logger.debug(f"TDoc location for {key}: {folder}")
+
+    @classmethod
+    def record_not_found(cls, url: str):
+        """Skips the URL until NEGATIVE_CACHE_TTL_S expires."""
+        with cls._lock:
+            cls._not_found[url] = time.monotonic() + cls.NEGATIVE_CACHE_TTL_S
+
+    @classmethod
+    def is_known_not_found(cls, url: str) -> bool:
+        with cls._lock:
+            expiry = cls._not_found.get(url)
+            if expiry is None:
+                return False
+            if expiry < time.monotonic():
+                del cls._not_found[url]
+                return False
+            return True
+
+    @classmethod
+    def _probe(cls, url: str) -> Optional[bool]:
+        """True if found, False on 404/410, None if unknown (timeout, HEAD not supported, no probe function...)."""
+        if cls._probe_function is None:
+            return None
+        status_code = cls._probe_function(url, cls.PROBE_TIMEOUT)
+        if status_code == 200:
+            return True
+        if status_code in (404, 410):
+            cls.record_not_found(url)
+            return False
+        return None
+
+    @classmethod
+    def hedged_probe(cls, urls: List[str]) -> Optional[str]:
+        """
+        Probes the URLs in parallel. Each probe starts HEDGE_DELAY_S after the previous one, or immediately if all
+        previous probes already failed. Returns the first URL (in priority order) found, None if none was found.
+        """
+        if not urls:
+            return None
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=len(urls))
+        # Insertion order is the priority order
+        future_to_url: Dict[concurrent.futures.Future, str] = {}
+
+        def get_found_url() -> Optional[str]:
+            for probe_future, probed_url in future_to_url.items():
+                if probe_future.done() and probe_future.result():
+                    return probed_url
+            return None
+
+        try:
+            for url in urls:
+                future_to_url[executor.submit(cls._probe, url)] = url
+                deadline = time.monotonic() + cls.HEDGE_DELAY_S
+                while True:
+                    found_url = get_found_url()
+                    if found_url:
+                        return found_url
+                    pending = [f for f in future_to_url if not f.done()]
+                    remaining_s = deadline - time.monotonic()
+                    if not pending or remaining_s <= 0:
+                        break
+                    concurrent.futures.wait(pending, timeout=remaining_s,
+                                            return_when=concurrent.futures.FIRST_COMPLETED)
+
+            for future in concurrent.futures.as_completed(future_to_url):
+                if future.result():
+                    return future_to_url[future]
+            return None
+        finally:
+            # Losers still queued are cancelled; in-flight HEADs finish in the background
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @classmethod
+    def resolve(cls, candidate_urls: List[str], meeting: Optional[str]) -> Iterator[str]:
+        """
+        Yields the candidate URLs of a TDoc, best first. Stop iterating once the download succeeds and call
+        record_found().
+        """
+        candidates = [url for url in candidate_urls if url and not cls.is_known_not_found(url)]
+        if not candidates:
+            return
+        tried = set()
+
+        # 1. Learned location: no probe, one round trip
+        if meeting:
+            with cls._lock:
+                learned_folder = cls._load_locations().get(cls.get_location_key(candidates[0], meeting))
+            learned_urls = [url for url in candidates if cls._get_folder(url) == learned_folder]
+            if learned_urls:
+                tried.add(learned_urls[0])
+                yield learned_urls[0]
+
+        # 2. Hedged probing of the first candidates
+        to_probe = [url for url in candidates if url not in tried][:cls.MAX_HEDGED_PROBES]
+        try:
+            found_url = cls.hedged_probe(to_probe)
+        except Exception as e:
+            logger.warning(f"Could not probe TDoc URLs: {e}")
+            found_url = None
+        if found_url:
+            tried.add(found_url)
+            yield found_url
+
+        # 3. Sequential fallback for the rest (servers not answering HEAD, FTP)
+        for url in candidates:
+            if url not in tried and not cls.is_known_not_found(url):
+                yield url
@@ -9,6 +9,7 @@ from pandas import DataFrame
 from application.common import color_black, color_green, color_light_green, color_dark_red, color_light_red, \
     color_dark_grey, color_light_grey, color_dark_yellow, color_light_yellow, tdoc_status_formats
 from application.os import startfile
+from threegpp_common.tracing import Tracing
 
 if platform.system() == 'Windows':
     print('Windows System detected. Importing win32.client')
@@ -36,6 +37,7 @@ def get_excel():
         return None
 
 
+@Tracing.traced('com.excel.open')
 def open_excel_document(filename=None, sheet_name=None):
     """
 
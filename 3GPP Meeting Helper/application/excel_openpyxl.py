@@ -1,5 +1,6 @@
+import posixpath
 import zipfile
-from typing import NamedTuple, Dict
+from typing import NamedTuple, Dict, List, Tuple, Any, Iterable
 
 import openpyxl
 import openpyxl.utils
@@ -191,3 +192,144 @@ def parse_tdoc_3gu_list_for_wis(file_path) -> Dict[str,str]:
     return dict(hyperlinks_list)
 
 
+
+
+# XML Namespaces used by Excel
+xlsx_ns = {
+    'main': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main',
+    'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships',
+    'rels': 'http://schemas.openxmlformats.org/package/2006/relationships'
+}
+
+
+class XlsxSheetLocation(NamedTuple):
+    sheet_name: str
+    # Path of the sheet XML within the zip file, e.g. xl/worksheets/sheet1.xml
+    sheet_path: str
+
+
+class XlsxCellColors(NamedTuple):
+    # Style index (cellXfs) per (row, column), zero-based. Cells not contained here use style 0
+    cell_styles: Dict[Tuple[int, int], int]
+    # Per style index, the same values as openpyxl's cell.fill.fgColor.index and cell.font.color.index
+    fill_colors: List[Any]
+    font_colors: List[Any]
+
+
+def get_active_sheet_zip(excel_path: str) -> XlsxSheetLocation:
+    """
+    Finds the active sheet (as openpyxl's workbook.active) by reading the workbook XML directly
+    Args:
+        excel_path: The .xlsx file
+
+    Returns: The sheet name and the path of its XML file
+    """
+    with zipfile.ZipFile(excel_path, 'r') as z:
+        workbook_tree = ET.fromstring(z.read('xl/workbook.xml'))
+        rels_tree = ET.fromstring(z.read('xl/_rels/workbook.xml.rels'))
+
+    rel_map = {rel.attrib['Id']: rel.attrib['Target'] for rel in rels_tree.findall('rels:Relationship', xlsx_ns)}
+    workbook_view = workbook_tree.find('main:bookViews/main:workbookView', xlsx_ns)
+    active_tab = int(workbook_view.attrib.get('activeTab', 0)) if workbook_view is not None else 0
+    sheets = workbook_tree.findall('main:sheets/main:sheet', xlsx_ns)
+    sheet = sheets[active_tab] if active_tab < len(sheets) else sheets[0]
+
+    target = rel_map[sheet.attrib[f"{{{xlsx_ns['r']}}}id"]]
+    if target.startswith('/'):
+        sheet_path = target[1:]
+    else:
+        sheet_path = posixpath.normpath(posixpath.join('xl', target))
+    return XlsxSheetLocation(sheet.attrib['name'], sheet_path)
+
+
+def _get_color_index(color_element):
+    """Same value as openpyxl's Color.index: indexed and theme colors are ints, RGB colors an ARGB string"""
+    if color_element is None:
+        # openpyxl's default Color()
+        return '00000000'
+    attrib = color_element.attrib
+    if 'indexed' in attrib:
+        return int(attrib['indexed'])
+    if 'theme' in attrib:
+        return int(attrib['theme'])
+    if 'auto' in attrib:
+        return attrib['auto'] in ('1', 'true')
+    rgb = attrib.get('rgb', '00000000')
+    if len(rgb) == 6:
+        rgb = '00' + rgb
+    return rgb
+
+
+def _column_letters_to_index(letters: str, cache: Dict[str, int]) -> int:
+    column_idx = cache.get(letters)
+    if column_idx is None:
+        column_idx = column_index_from_string(letters) - 1
+        cache[letters] = column_idx
+    return column_idx
+
+
+def read_cell_colors_zip(excel_path: str, sheet_path: str, columns: Iterable[int] = None) -> XlsxCellColors:
+    """
+    Reads the fill (foreground) and font colors of the cells of a sheet by parsing the styles and sheet XML
+    directly. Much faster than loading the workbook with openpyxl, which creates an object per cell.
+    Args:
+        excel_path: The .xlsx file
+        sheet_path: The path of the sheet XML within the file (see get_active_sheet_zip)
+        columns: Zero-based column indexes for which to read the cell styles. All columns if None
+
+    Returns: The style index per cell and the colors per style index. Colors are None if they can not be read
+    (e.g. gradient fills or fonts without color)
+    """
+    columns = set(columns) if columns is not None else None
+    main_ns = f"{{{xlsx_ns['main']}}}"
+    with zipfile.ZipFile(excel_path, 'r') as z:
+        styles_tree = ET.fromstring(z.read('xl/styles.xml'))
+
+        fills = []
+        for fill in styles_tree.findall('main:fills/main:fill', xlsx_ns):
+            pattern_fill = fill.find('main:patternFill', xlsx_ns)
+            fills.append(None if pattern_fill is None else
+                         _get_color_index(pattern_fill.find('main:fgColor', xlsx_ns)))
+        fonts = []
+        for font in styles_tree.findall('main:fonts/main:font', xlsx_ns):
+            font_color = font.find('main:color', xlsx_ns)
+            fonts.append(None if font_color is None else _get_color_index(font_color))
+
+        fill_colors = []
+        font_colors = []
+        for xf in styles_tree.findall('main:cellXfs/main:xf', xlsx_ns):
+            fill_id = int(xf.attrib.get('fillId', 0))
+            font_id = int(xf.attrib.get('fontId', 0))
+            fill_colors.append(fills[fill_id] if fill_id < len(fills) else None)
+            font_colors.append(fonts[font_id] if font_id < len(fonts) else None)
+        if len(fill_colors) == 0:
+            fill_colors.append('00000000')
+            font_colors.append(None)
+
+        # Only the style attribute of the cells is needed. Cells without style use style 0
+        cell_styles = {}
+        column_cache = {}
+        row_idx = -1
+        column_idx = -1
+        with z.open(sheet_path) as sheet_file:
+            for event, element in ET.iterparse(sheet_file, events=('start', 'end')):
+                if event == 'start':
+                    if element.tag == f'{main_ns}row':
+                        row_number = element.attrib.get('r')
+                        row_idx = int(row_number) - 1 if row_number is not None else row_idx + 1
+                        column_idx = -1
+                    continue
+                if element.tag == f'{main_ns}c':
+                    reference = element.attrib.get('r')
+                    if reference is None:
+                        column_idx += 1
+                    else:
+                        column_idx = _column_letters_to_index(reference.rstrip('0123456789'), column_cache)
+                    style = element.attrib.get('s')
+                    if style is not None and (columns is None or column_idx in columns):
+                        cell_styles[(row_idx, column_idx)] = int(style)
+                    element.clear()
+                elif element.tag == f'{main_ns}row':
+                    element.clear()
+
+    return XlsxCellColors(cell_styles, fill_colors, font_colors)
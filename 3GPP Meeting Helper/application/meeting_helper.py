@@ -4,6 +4,8 @@ import os
 import traceback
 from typing import NamedTuple, List
 
+from threegpp_common import CommonConfig
+
 import application.outlook
 import config.cache as local_cache_config
 from config.markdown import MarkdownConfig
@@ -95,6 +97,25 @@ except Exception as e:
     print(f'ApplicationFolder not set. Using "{application_folder}": {e}')
 finally:
     local_cache_config.CacheConfig.root_folder = application_folder
+    # The shared caches (TDoc store, spec index, cache catalogue) are created in the application folder
+    CommonConfig.configure(os.path.join(home_directory, application_folder), app_name='meeting_helper')
+
+# Background TDoc prefetch
+try:
+    prefetch_config = config_parser['PREFETCH']
+    config.networking.NetworkingConfig.prefetch_enabled = prefetch_config.getboolean(
+        'Enabled', fallback=config.networking.NetworkingConfig.prefetch_enabled)
+    config.networking.NetworkingConfig.prefetch_next_agenda_items = prefetch_config.getint(
+        'NextAgendaItems', fallback=config.networking.NetworkingConfig.prefetch_next_agenda_items)
+    config.networking.NetworkingConfig.prefetch_downloads_per_minute = prefetch_config.getfloat(
+        'DownloadsPerMinute', fallback=config.networking.NetworkingConfig.prefetch_downloads_per_minute)
+    print(f'TDoc prefetch: enabled={config.networking.NetworkingConfig.prefetch_enabled}, '
+          f'next AIs={config.networking.NetworkingConfig.prefetch_next_agenda_items}, '
+          f'downloads/min={config.networking.NetworkingConfig.prefetch_downloads_per_minute}')
+except KeyError:
+    print('TDoc prefetch not configured. Using defaults')
+except Exception as e:
+    print(f'Could not read TDoc prefetch configuration: {e}')
 
 try:
     open_sa2_drafts_url = config_parser['GUI']['SA2_Drafts_URL']
@@ -13,6 +13,7 @@ from application.os import startfile
 from server.common.Tdoc import Tdoc
 from server.common.server_utils import DownloadedTdocDocument
 from utils import local_cache
+from threegpp_common.tracing import Tracing
 from utils.caching.common import export_subfolder
 
 if platform.system() == 'Windows':
@@ -68,6 +69,7 @@ def get_word(visible=True, display_alerts=False):
     return word
 
 
+@Tracing.traced('com.word.open')
 def open_word_document(filename='', set_as_active_document=True, visible=True, ) -> Any|None:
     if filename is None or filename == '':
         return None
@@ -218,6 +220,7 @@ def open_files(
         return opened_files_count
 
 
+@Tracing.traced('com.word.export')
 def export_document(
         word_files: List[str],
         export_format: ExportType = ExportType.PDF,
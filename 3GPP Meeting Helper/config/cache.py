@@ -1,3 +1,4 @@
 class CacheConfig:
     user_folder = '~'
     root_folder = '3GPP_SA2_Meeting_Helper'
+
@@ -1,5 +1,26 @@
 class NetworkingConfig:
-    network_check_interval_ms = 10000
+    # The network check is cheap (see server.common.network_utils.get_network_status): the full meeting network/VPN
+    # check only runs when the local addresses change or after this time
+    network_check_interval_ms = 2000
+    network_full_check_interval_s = 60
+
+    # Background TDoc prefetch for the selected meeting (see server/prefetch.py). Can be overridden in the [PREFETCH]
+    # section of config.ini
+    prefetch_enabled = True
+    # TDocs of the AI being discussed plus the following N AIs are prefetched
+    prefetch_next_agenda_items = 2
+    prefetch_downloads_per_minute = 30
+    # Prefetching pauses until no user-triggered download happened for this time
+    prefetch_foreground_idle_s = 5
+    # How often the prefetch plan is recalculated if nothing happens. New revisions in the Inbox are notified right
+    # away by the folder watcher
+    prefetch_refresh_interval_s = 300
+
+    # Polling of the Inbox, Revisions and Drafts folders of the selected meeting (see server/folder_watcher.py). The
+    # interval is reset to the minimum when a folder changes and grows by the backoff factor while it does not
+    watcher_min_interval_s = 30
+    watcher_max_interval_s = 300
+    watcher_backoff_factor = 1.5
 
 
 default_http_proxy = 'http://lanbctest:8080'
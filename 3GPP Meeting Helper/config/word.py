@@ -2,3 +2,5 @@ class WordConfig:
     sensitivity_level_label_id = '55339bf0-f345-473a-9ec8-6ca7c8197055'
     sensitivity_level_label_name = 'OFFEN'
     save_document_after_setting_sensitivity_label = False
+    # Author of the tracked changes in the .docx comparisons generated without Word
+    redline_author = '3GPP Meeting Helper'
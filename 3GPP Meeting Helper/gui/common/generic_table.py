@@ -1,7 +1,10 @@
+import textwrap
 import tkinter
 from tkinter import ttk
 from tkinter.ttk import Treeview
-from typing import List
+from typing import List, Iterable
+
+import pandas as pd
 
 from application.tkinter_config import table_text_color, table_bg_color_odd, table_bg_color_even
 from gui.common.tkinter_widget import TkWidget
@@ -51,6 +54,27 @@ def treeview_sort_column(tree: Treeview, col, reverse=False):
     tree.heading(col, command=lambda: treeview_sort_column(tree, col, not reverse))
 
 
+def wrap_column(values: Iterable, width: int) -> List[str]:
+    """
+    textwrap.fill() for a whole column. Each distinct value is wrapped only once (sources, types, etc. repeat a lot)
+    Args:
+        values: The column values
+        width: The wrap width
+
+    Returns: The wrapped values as strings
+    """
+    wrapped = {}
+    result = []
+    for value in values:
+        text = str(value)
+        wrapped_text = wrapped.get(text)
+        if wrapped_text is None:
+            wrapped_text = textwrap.fill(text, width=width)
+            wrapped[text] = wrapped_text
+        result.append(wrapped_text)
+    return result
+
+
 def treeview_set_row_formatting(tree: Treeview):
 
     tree.tag_configure(
@@ -66,6 +90,9 @@ def treeview_set_row_formatting(tree: Treeview):
 
 
 class GenericTable(TkWidget):
+    # Rows inserted right away in addition to the visible ones. The rest is inserted in chunks when Tk is idle
+    row_buffer = 50
+    chunk_size = 250
 
     def __init__(
             self,
@@ -127,6 +154,11 @@ class GenericTable(TkWidget):
         self.tree.configure(yscrollcommand=self.tree_scroll.set)
         # tree.grid(row=0, column=0)
 
+        # Display values of the rows shown via populate_rows() (used for sorting) and the pending chunked insertion
+        self.rows_df: pd.DataFrame | None = None
+        self.rows_image_column: str | None = None
+        self._fill_job = None
+
     def init_style(self, row_height):
         if self.style is None:
             self.style = get_new_style(self.style_name)
@@ -141,8 +173,75 @@ class GenericTable(TkWidget):
                               [(self.style_name + '.treearea', {'sticky': 'nswe'})])  # Remove the borders
 
     def clear_tree(self):
+        self._cancel_fill()
+        self.rows_df = None
         if self.tree is not None:
             self.tree.delete(*self.tree.get_children())
 
     def set_column(self, col: str, label: str = None, width=None, sort=True, center=True):
-        set_column(self.tree, col=col, label=label, width=width, sort=sort, center=center)
+        set_column(self.tree, col=col, label=label, width=width, sort=False, center=center)
+        if sort:
+            self.tree.heading(col, command=lambda: self.sort_rows(col, False))
+
+    def populate_rows(self, rows_df: pd.DataFrame, image_column: str = None):
+        """
+        Replaces the table content with the given display values. Only the visible rows (plus a buffer) are inserted
+        right away, the rest is inserted in chunks when Tk is idle so that the GUI does not freeze on large tables.
+        Args:
+            rows_df: The (already formatted) values to display. Contains one column per table column
+            image_column: Optional column containing the image to show for each row
+        """
+        self.clear_tree()
+        self.rows_df = rows_df
+        self.rows_image_column = image_column
+
+        values = list(rows_df[self.column_names].itertuples(index=False, name=None))
+        images = rows_df[image_column].tolist() if image_column is not None else None
+        first_rows = int(self.tree.cget('height')) + GenericTable.row_buffer
+        self._insert_rows(values, images, 0, first_rows)
+        if len(values) > first_rows:
+            self._fill_job = self.tk_top.after(1, lambda: self._fill_rows(values, images, first_rows))
+        treeview_set_row_formatting(self.tree)
+
+    def sort_rows(self, col: str, reverse=False):
+        """
+        Sorts the rows by a column (as text, as the Treeview did) and shows them again
+        Args:
+            col: The column to sort by
+            reverse: Whether to sort descending
+        """
+        if self.rows_df is None:
+            # Table not filled via populate_rows()
+            treeview_sort_column(self.tree, col, reverse)
+        else:
+            sorted_df = self.rows_df.sort_values(
+                by=col,
+                ascending=not reverse,
+                kind='stable',
+                key=lambda column: column.astype(str))
+            self.populate_rows(sorted_df, self.rows_image_column)
+
+        # reverse sort next time
+        self.tree.heading(col, command=lambda: self.sort_rows(col, not reverse))
+
+    def _insert_rows(self, values: List[tuple], images: List | None, start: int, end: int):
+        for row_idx in range(start, min(end, len(values))):
+            # First row is 'odd'
+            tag = 'even' if row_idx % 2 else 'odd'
+            if images is None:
+                self.tree.insert("", "end", tags=(tag,), values=values[row_idx])
+            else:
+                self.tree.insert("", "end", tags=(tag,), values=values[row_idx], image=images[row_idx])
+
+    def _fill_rows(self, values: List[tuple], images: List | None, start: int):
+        end = start + GenericTable.chunk_size
+        self._insert_rows(values, images, start, end)
+        if end < len(values):
+            self._fill_job = self.tk_top.after(1, lambda: self._fill_rows(values, images, end))
+        else:
+            self._fill_job = None
+
+    def _cancel_fill(self):
+        if self._fill_job is not None:
+            self.tk_top.after_cancel(self._fill_job)
+            self._fill_job = None
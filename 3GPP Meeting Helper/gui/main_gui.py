@@ -1,4 +1,5 @@
 import os.path
+import platform
 import tkinter
 import tkinter.font
 import tkinter.scrolledtext
@@ -11,6 +12,7 @@ from pyperclip import copy as clipboard_copy
 import application.meeting_helper
 import application.tkinter_config
 import application.word
+import config.ai_names
 import config.networking
 import gui.common.common_elements
 import gui.meetings_table
@@ -25,12 +27,15 @@ import parsing.html.tdocs_by_agenda
 import parsing.word.pywin32
 import server.agenda
 import server.common.server_utils
+import server.folder_watcher
 import server.network
+import server.prefetch
 import server.tdoc
 import server.tdoc_search
 import server.tdocs_by_agenda
 import tdoc.utils
 import utils.local_cache
+import utils.caching.governor
 import utils.threading
 from application.os import startfile, open_url
 from application.tkinter_config import root, font_medium, font_big, ttk_style_tbutton_medium
@@ -39,6 +44,7 @@ from config.networking import NetworkingConfig
 from gui.common.utils import favicon
 from server.network import detect_3gpp_network_state
 from server.specs import get_specs_folder
+from threegpp_common.cache_governor import CacheGovernor
 from server.tdocs_by_agenda import get_tdocs_by_agenda_for_specific_meeting, get_sa2_inbox_tdoc_list
 
 # tkinter initialization
@@ -82,6 +88,8 @@ tkvar_last_tdoc_url = tkinter.StringVar(root)
 tkvar_last_tdoc_status = tkinter.StringVar(root)
 
 tkvar_override_tdocs_by_agenda = tkinter.BooleanVar(root)
+# Compare TDocs with Word's Compare feature instead of the HTML comparison (no Word needed)
+tkvar_word_native_compare = tkinter.BooleanVar(root)
 tkvar_tdocs_by_agenda_path = tkinter.StringVar(root)
 tkvar_tdocs_by_agenda_path.set('')
 
@@ -288,6 +296,8 @@ def open_tdocs_by_agenda(
         except Exception as e:
             print(f'Could not get local TdocsByAgenda {e}')
             return None
+        # Files of the meeting being worked on are never evicted from the local cache
+        CacheGovernor.set_active_meeting(meeting_server_folder)
     # local_file is not needed, so no need to call utils.local_cache.get_tdocs_by_agenda_filename(meeting_server_folder)
 
     # Save opened Tdocs by Agenda file to global application
@@ -305,6 +315,18 @@ def open_tdocs_by_agenda(
         tdocs_by_agenda_data.tdocs_by_agenda_html_bytes,
         meeting_server_folder=meeting_server_folder)
 
+    # Inbox, Revisions and Drafts changes are notified to the prefetcher and the TDocs table
+    server.folder_watcher.watch_meeting(meeting_server_folder, use_private_server=tkvar_3gpp_wifi_available.get())
+
+    # Download in the background the TDocs that are likely to be opened next
+    if application.meeting_helper.current_tdocs_by_agenda is not None:
+        server.prefetch.start_prefetch(
+            meeting_server_folder,
+            application.meeting_helper.current_tdocs_by_agenda.tdocs,
+            revisions_file=tdocs_by_agenda_data.revisions_file_path,
+            use_private_server=tkvar_3gpp_wifi_available.get(),
+            agenda_item_descriptions=config.ai_names.sa2_ai_names_mapping)
+
     return application.meeting_helper.current_tdocs_by_agenda
 
 
@@ -382,6 +404,7 @@ def download_and_open_tdoc(
     meeting_folder_name = meeting_data.get_server_folder_for_meeting_choice(meeting_name)
 
     using_private_server = tkvar_3gpp_wifi_available.get()
+    server.prefetch.notify_tdoc_opened(tdoc_id)
 
     retrieved_files_folder, tdoc_url = server.tdoc.get_tdoc(
         meeting_folder_name=meeting_folder_name,
@@ -446,14 +469,22 @@ def start_main_gui():
     tk_combobox_meetings['font'] = font_big
 
     def compare_tdocs():
+        word_native = tkvar_word_native_compare.get()
         if not tkvar_global_tdoc_search.get():
             # Code when using the current meeting information (SA2)
-            parsing.word.pywin32.compare_tdocs(
-                get_entry_1_fn=tkvar_tdoc_to_compare_1.get,
-                get_entry_2_fn=tkvar_tdoc_to_compare_2.get)
+            if word_native:
+                parsing.word.pywin32.compare_tdocs(
+                    get_entry_1_fn=tkvar_tdoc_to_compare_1.get,
+                    get_entry_2_fn=tkvar_tdoc_to_compare_2.get)
+            else:
+                # Left TDoc as the base document, as in the Word comparison
+                server.tdoc_search.compare_two_tdocs(tkvar_tdoc_to_compare_2.get(), tkvar_tdoc_to_compare_1.get())
         else:
             # Global search
-            server.tdoc_search.compare_two_tdocs(tkvar_tdoc_to_compare_1.get(), tkvar_tdoc_to_compare_2.get())
+            server.tdoc_search.compare_two_tdocs(
+                tkvar_tdoc_to_compare_1.get(),
+                tkvar_tdoc_to_compare_2.get(),
+                word_native=word_native)
 
     compare_tdocs_button_str = "Compare TDocs for{0} meeting (left vs. right)"
     compare_tdocs_button = ttk.Button(
@@ -771,6 +802,20 @@ def start_main_gui():
         padx=10,
         sticky="EW")
 
+    # Compare in Word (Windows only) or as an HTML page
+    if platform.system() == 'Windows':
+        current_row += 1
+        (ttk.Checkbutton(
+            main_frame,
+            text='Compare in Word (otherwise as HTML page)',
+            variable=tkvar_word_native_compare)
+         .grid(
+            row=current_row,
+            column=0,
+            padx=10,
+            sticky=tkinter.W
+        ))
+
     # Override TDocs by Agenda if it is malformed
     current_row += 1
     (ttk.Checkbutton(
@@ -949,6 +994,11 @@ def start_main_gui():
     main_frame.grid_columnconfigure(1, weight=1)
     main_frame.grid_columnconfigure(2, weight=1)
 
+    # Keep the local cache within its quotas (least recently used entries are evicted first)
+    utils.threading.do_something_on_thread(
+        task=lambda: utils.caching.governor.run_cache_maintenance(dry_run=False),
+        on_error_log='Could not run cache maintenance')
+
     # Finish by setting periodic checking of the network status
     root.after(
         ms=NetworkingConfig.network_check_interval_ms,
@@ -17,7 +17,7 @@ from application.excel import open_excel_document
 from application.os import open_url, startfile
 from config.meetings import MeetingConfig
 from gui.common.common_elements import tkvar_3gpp_wifi_available
-from gui.common.generic_table import GenericTable, treeview_set_row_formatting, column_separator_str
+from gui.common.generic_table import GenericTable, column_separator_str
 from gui.common.gui_elements import TTKHoverHelpButton
 from gui.common.icons import refresh_icon, search_icon, compare_icon, table_icon, website_icon
 from gui.tdocs_table_from_excel import TdocsTableFromExcel
@@ -173,11 +173,16 @@ class MeetingsTable(GenericTable):
             state=tkinter.DISABLED
         )
 
+        # Compare in Word (only works in Windows) or as an HTML page
+        self.tkvar_word_native_compare = tkinter.BooleanVar(self.top_frame)
+        self.button_compare_tdoc.pack(side=tkinter.LEFT)
+        ttk.Label(self.top_frame, text=" ").pack(side=tkinter.LEFT)
+        self.tdoc_entry_2.pack(side=tkinter.LEFT)
         if platform.system() == 'Windows':
-            # Only works in Windows
-            self.button_compare_tdoc.pack(side=tkinter.LEFT)
-            ttk.Label(self.top_frame, text=" ").pack(side=tkinter.LEFT)
-            self.tdoc_entry_2.pack(side=tkinter.LEFT)
+            ttk.Checkbutton(
+                self.top_frame,
+                text='Word',
+                variable=self.tkvar_word_native_compare).pack(side=tkinter.LEFT)
 
         # Load meeting data
         ttk.Label(self.top_frame, text=column_separator_str).pack(side=tkinter.LEFT)
@@ -287,17 +292,10 @@ class MeetingsTable(GenericTable):
     def insert_rows(self, tdoc_override=False):
         print('Populating meetings table')
 
-        count = 0
         previous_row: None | MeetingEntry = None
         meetings_to_list = self.meeting_list_to_consider(tdoc_override)
-        for idx, meeting in enumerate(meetings_to_list):
-            count = count + 1
-            mod = count % 2
-            if mod > 0:
-                tag = 'odd'
-            else:
-                tag = 'even'
-
+        rows = []
+        for meeting in meetings_to_list:
             if meeting.meeting_url_docs is None or meeting.meeting_url_docs == '':
                 tdoc_excel_str = '-'
                 tdoc_table_str = '-'
@@ -319,7 +317,7 @@ class MeetingsTable(GenericTable):
                 end_date_str = meeting.end_date.strftime('%Y-%m-%d')
 
             # 'Meeting', 'Location', 'Start', 'End', 'TDoc Start', 'TDoc End', 'Documents'
-            values = (
+            rows.append((
                 meeting.meeting_name,
                 location_str,
                 start_date_str,
@@ -328,17 +326,11 @@ class MeetingsTable(GenericTable):
                 meeting.tdoc_end,
                 tdoc_excel_str,
                 tdoc_table_str
-            )
-            self.tree.insert(
-                "",
-                "end",
-                tags=(tag,),
-                values=values
-            )
+            ))
             previous_row = meeting
 
-        treeview_set_row_formatting(self.tree)
-        self.meeting_count_tk_str.set('{0} meetings'.format(count))
+        self.populate_rows(pd.DataFrame(rows, columns=self.column_names))
+        self.meeting_count_tk_str.set('{0} meetings'.format(len(rows)))
         self.current_meeting_list = meetings_to_list
 
     def clear_filters(self, *args):
@@ -454,7 +446,7 @@ class MeetingsTable(GenericTable):
         # os.startfile(excel_export)
 
     def apply_filters(self, tdoc_override=False):
-        self.tree.delete(*self.tree.get_children())
+        self.clear_tree()
         self.insert_rows(tdoc_override=tdoc_override)
 
     def select_rows(self, *args):
@@ -561,7 +553,8 @@ class MeetingsTable(GenericTable):
         compare_two_tdocs(
             tdoc1_to_open,
             tdoc2_to_open,
-            tkvar_3gpp_wifi_available=tkvar_3gpp_wifi_available
+            tkvar_3gpp_wifi_available=tkvar_3gpp_wifi_available,
+            word_native=self.tkvar_word_native_compare.get()
         )
 
     @property
@@ -1,6 +1,5 @@
 import os
 import re
-import textwrap
 import tkinter
 from tkinter import ttk
 from typing import NamedTuple
@@ -11,15 +10,15 @@ import application
 import application.common
 import application.word
 from application.os import open_url_and_copy_to_clipboard, startfile
-from gui.common.generic_table import GenericTable, treeview_set_row_formatting
+from gui.common.generic_table import GenericTable, treeview_set_row_formatting, wrap_column
 from gui.common.gui_elements import TTKHoverHelpButton
 from gui.common.icons import refresh_icon, folder_icon
-from parsing.html.specs import extract_spec_files_from_spec_folder, cleanup_spec_name
-from parsing.spec_types import get_spec_full_name, SpecType
+from parsing.html.specs import cleanup_spec_name
+from parsing.spec_types import get_spec_full_name, SpecType, SpecFile
 from server import specs
 from server.specs import file_version_to_version, version_to_file_version, download_spec_if_needed, \
     get_url_for_spec_page, get_spec_archive_remote_folder, get_specs_folder, get_url_for_crs_page, \
-    get_spec_page, file_version_to_version_metadata
+    get_spec_page, file_version_to_version_metadata, get_spec_archive_files
 from utils.local_cache import file_exists
 
 
@@ -192,42 +191,24 @@ class SpecsTable(GenericTable):
             keys=['max_version', 'full_name'])
         df_to_plot.sort_index(inplace=True)
 
-        count = 0
-        for idx, row in df_to_plot.iterrows():
-            count = count + 1
-            mod = count % 2
-            if mod > 0:
-                tag = 'odd'
-            else:
-                tag = 'even'
-
-            # Double brackets so that it always returns a series. If not, sometimes a series will be returned,
-            # sometimes a single element
-            # spec_entries = df.loc[[idx], :]
-
-            # Faster alternative
-            if idx in self.spec_metadata:
-                current_spec_metadata = self.spec_metadata[idx]
-                title = current_spec_metadata.title
-                spec_type = current_spec_metadata.type
-                responsible_group = current_spec_metadata.responsible_group
-            else:
-                print('Could not read metadata from spec {0}, skipping'.format(idx))
-                continue
-
-            # 'Spec', 'Title', 'Releases', 'Last'
-            self.tree.insert("", "end", tags=(tag,), values=(
-                row['full_name'],
-                textwrap.fill(title, width=70),
-                'Click',
-                'Click',
-                responsible_group,
-                'Click',
-                'Click'
-            ))
-
-        treeview_set_row_formatting(self.tree)
-        self.spec_count.set('{0} specifications'.format(count))
+        has_metadata = df_to_plot.index.isin(list(self.spec_metadata.keys()))
+        for idx in df_to_plot.index[~has_metadata]:
+            print('Could not read metadata from spec {0}, skipping'.format(idx))
+        df_to_plot = df_to_plot[has_metadata]
+        spec_metadata = [self.spec_metadata[idx] for idx in df_to_plot.index]
+
+        # 'Spec', 'Title', 'Versions', 'Local Cache', 'Group', 'CRs', 'WIs'
+        rows_df = pd.DataFrame({
+            'Spec': df_to_plot['full_name'].tolist(),
+            'Title': wrap_column([m.title for m in spec_metadata], width=70),
+            'Versions': 'Click',
+            'Local Cache': 'Click',
+            'Group': [m.responsible_group for m in spec_metadata],
+            'CRs': 'Click',
+            'WIs': 'Click'
+        })
+        self.populate_rows(rows_df)
+        self.spec_count.set('{0} specifications'.format(len(rows_df)))
 
     def clear_filters(self, *args):
         # Reset filters
@@ -243,7 +224,7 @@ class SpecsTable(GenericTable):
         self.apply_filters()
 
     def apply_filters(self, *args):
-        self.tree.delete(*self.tree.get_children())
+        self.clear_tree()
         self.current_specs = self.all_specs
 
         # Apply all filters
@@ -452,12 +433,8 @@ class SpecVersionsTable(GenericTable):
         returns a DataFrame containing the data from the specification versions
         Returns: DataFrame containing the data from the specification versions
         """
-        spec_markup, archive_page_url, series_number = get_spec_archive_remote_folder(
-            self.spec_id,
-            cache=True,
-            force_download=False)
-        specs_from_archive = extract_spec_files_from_spec_folder(spec_markup, archive_page_url, None, series_number)
-        specs_df = pd.DataFrame(specs_from_archive)
+        specs_from_archive = get_spec_archive_files(self.spec_id)
+        specs_df = pd.DataFrame(specs_from_archive, columns=SpecFile._fields)
         specs_df.set_index("spec", inplace=True)
         return specs_df
 
@@ -1,6 +1,7 @@
 import os
+import platform
 import re
-import textwrap
+import threading
 import tkinter
 import traceback
 import webbrowser
@@ -17,12 +18,16 @@ import gui
 import gui.common.common_elements
 import gui.main_gui
 import parsing.word.pywin32
+import server.folder_watcher
+import server.tdoc_search
 import utils.local_cache
 from application import powerpoint
+from application.os import startfile
 from application.excel import open_excel_document, set_first_row_as_filter, vertically_center_all_text, save_wb, \
     set_column_width, set_wrap_text, hide_column
 from config.ai_names import ai_to_wi_str
-from gui.common.generic_table import GenericTable, treeview_sort_column, treeview_set_row_formatting
+from gui.common.common_elements import tkvar_3gpp_wifi_available
+from gui.common.generic_table import GenericTable, treeview_sort_column, treeview_set_row_formatting, wrap_column
 from parsing.html.revisions import revisions_file_to_dataframe
 from parsing.html.tdocs_by_agenda import TdocsByAgendaData
 from parsing.outlook_utils import search_subject_in_all_outlook_items
@@ -30,10 +35,32 @@ from parsing.word.pywin32 import parse_list_of_crs
 from server.common.server_utils import DownloadedData
 
 
+def get_revision_count_str(rev_number) -> str:
+    """
+    Revision count as shown in the TDocs table
+    Args:
+        rev_number: The "Revisions" value from the revisions list, e.g. "2" or "2*". None if not found
+
+    Returns: The revision count. Zero or unknown counts are left empty
+    """
+    if not isinstance(rev_number, str):
+        return ''
+    try:
+        rev_number_converted = int(rev_number.replace('*', ''))
+    except Exception as e:
+        print(f'Could not convert revision number to int. Set to 0: {e}')
+        return ''
+    if rev_number_converted < 1:
+        return ''
+    return rev_number
+
+
 class TdocsTable(GenericTable):
     current_tdocs = None
     source_width = 200
     title_width = 550
+    # How often the GUI thread checks whether the folder watcher notified new revisions
+    folder_events_check_ms = 2000
 
     meeting_number = '<Meeting number>'
     all_tdocs = None
@@ -113,6 +140,11 @@ class TdocsTable(GenericTable):
         self.reload_revisions = False
         self.insert_current_tdocs()
 
+        # Set from the folder watcher thread. The revision counts are then refreshed from the GUI thread
+        self.revisions_changed = threading.Event()
+        server.folder_watcher.subscribe(self.on_folder_events)
+        self.tk_top.after(TdocsTable.folder_events_check_ms, self.check_folder_events)
+
         # Can also do this:
         # https://stackoverflow.com/questions/33781047/tkinter-drop-down-list-of-check-boxes-combo-boxes
         self.search_text = tkinter.StringVar()
@@ -185,6 +217,11 @@ class TdocsTable(GenericTable):
             text='Export CRs',
             command=self.export_crs).pack(side=tkinter.LEFT)
 
+        ttk.Button(
+            self.top_frame,
+            text='Compare revisions',
+            command=self.compare_revisions).pack(side=tkinter.LEFT)
+
         self.tree.pack(fill='both', expand=True, side='left')
         self.tree_scroll.pack(side=tkinter.RIGHT, fill='y')
 
@@ -269,56 +306,55 @@ class TdocsTable(GenericTable):
             all_ais.extend(list(self.current_tdocs["AI"].unique()))
             self.combo_ai['values'] = all_ais
 
+    def on_folder_events(self, events: list[server.folder_watcher.ListingEvent]):
+        for event in events:
+            if (event.meeting_folder == self.meeting_server_folder and
+                    event.event_type == server.folder_watcher.ListingEventType.NEW_REVISION):
+                self.revisions_changed.set()
+                return
+
+    def check_folder_events(self):
+        try:
+            if not self.tk_top.winfo_exists():
+                server.folder_watcher.unsubscribe(self.on_folder_events)
+                return
+            if self.revisions_changed.is_set():
+                self.revisions_changed.clear()
+                print(f'New revisions for {self.meeting_server_folder}. Updating TDocs table')
+                # The watcher already updated the local revisions and drafts files
+                self.revisions, self.revisions_list = revisions_file_to_dataframe(
+                    revisions_file=utils.local_cache.get_local_revisions_filename(self.meeting_server_folder),
+                    meeting_tdocs=self.all_tdocs,
+                    drafts_file=utils.local_cache.get_local_drafts_filename(self.meeting_server_folder))
+                self.select_ai()
+            self.tk_top.after(TdocsTable.folder_events_check_ms, self.check_folder_events)
+        except tkinter.TclError:
+            # Window closed
+            server.folder_watcher.unsubscribe(self.on_folder_events)
+
     def insert_current_tdocs(self):
         self.insert_rows(self.current_tdocs)
 
     def insert_rows(self, df):
-        count = 0
-
-        for idx, row in df.iterrows():
-            count = count + 1
-            mod = count % 2
-            if mod > 0:
-                tag = 'odd'
-            else:
-                tag = 'even'
-
-            if self.revisions is None:
-                revision_count = ''
-            else:
-                try:
-                    rev_number = self.revisions.loc[idx, 'Revisions']
-                    try:
-                        rev_number_converted = int(rev_number.replace('*', ''))
-                    except Exception as e:
-                        print(f'Could not convert revision number to int. Set to 0: {e}')
-                        rev_number_converted = 0
-                    if rev_number_converted < 1:
-                        revision_count = ''
-                    else:
-                        revision_count = rev_number
-                except KeyError:
-                    # Not found
-                    revision_count = ''  # Zero is left empty
-                    pass
-                except Exception as e:
-                    print(f'Could not set revision count. Sent to empty: {e}')
-                    revision_count = ''  # Error is left empty
-                    traceback.print_exc()
-
-            self.tree.insert("", "end", tags=(tag,), values=(
-                idx,
-                row['AI'],
-                row['Type'],
-                textwrap.fill(row['Title'], width=70),
-                textwrap.fill(row['Source'], width=25),
-                revision_count,
-                'Click',
-                'Click',
-                row['Result']))
-
-        treeview_set_row_formatting(self.tree)
-        self.tdoc_count.set('{0} documents'.format(count))
+        if self.revisions is None:
+            revision_counts = ''
+        else:
+            # Duplicated TDocs in the revisions list are left empty
+            revisions = self.revisions.loc[~self.revisions.index.duplicated(keep=False), 'Revisions']
+            revision_counts = [get_revision_count_str(e) for e in revisions.reindex(df.index).tolist()]
+
+        rows_df = pd.DataFrame({
+            'TDoc': df.index.tolist(),
+            'AI': df['AI'].tolist(),
+            'Type': df['Type'].tolist(),
+            'Title': wrap_column(df['Title'], width=70),
+            'Source': wrap_column(df['Source'], width=25),
+            'Revs': revision_counts,
+            'Emails': 'Click',
+            'Send @': 'Click',
+            'Result': df['Result'].tolist()})
+        self.populate_rows(rows_df)
+        self.tdoc_count.set('{0} documents'.format(len(rows_df)))
 
     def clear_filters(self, *args):
         self.combo_type.set('All')
@@ -437,6 +473,46 @@ class TdocsTable(GenericTable):
 
         return
 
+    def compare_revisions(self, *args):
+        """
+        Compares each revision of the shown TDocs (e.g. the TDocs of the selected AI) with the previous revision,
+        without Word. The comparisons are generated in the background and written to the "Redlines" folder of the
+        meeting
+        """
+        tdoc_ids = list(self.current_tdocs.index)
+        if self.revisions_list is not None:
+            # Drafts ("01*") are not compared
+            revisions = self.revisions_list[self.revisions_list.index.isin(tdoc_ids)]
+            tdoc_ids.extend(
+                f'{tdoc_id}r{str(revision).zfill(2)}'
+                for tdoc_id, revision in zip(revisions.index, revisions['Revisions'])
+                if '*' not in str(revision))
+
+        selected_ai = self.combo_ai.get()
+        output_folder = os.path.join(
+            utils.local_cache.get_meeting_folder(self.meeting_server_folder),
+            'Redlines',
+            selected_ai if selected_ai != 'All' else 'All AIs')
+        print(f'Comparing revisions of {len(self.current_tdocs)} TDocs (AI "{selected_ai}") to {output_folder}')
+        t = threading.Thread(target=lambda: self.compare_revision_chains(tdoc_ids, output_folder))
+        t.start()
+
+    @staticmethod
+    def compare_revision_chains(tdoc_ids: list[str], output_folder: str):
+        try:
+            comparison_files = server.tdoc_search.compare_tdoc_revision_chains(
+                tdoc_ids,
+                tkvar_3gpp_wifi_available=tkvar_3gpp_wifi_available,
+                output_folder=output_folder)
+        except Exception as e:
+            print(f'Could not compare revisions: {e}')
+            traceback.print_exc()
+            return
+        generated_files = [f for f in comparison_files.values() if f is not None]
+        print(f'Generated {len(generated_files)}/{len(comparison_files)} comparisons in {output_folder}')
+        if len(generated_files) > 0:
+            startfile(output_folder)
+
     def select_ai(self, load_data=True, event=None):
         if load_data:
             self.load_data()
@@ -473,7 +549,7 @@ class TdocsTable(GenericTable):
 
         self.current_tdocs = tdocs_for_type
 
-        self.tree.delete(*self.tree.get_children())
+        self.clear_tree()
         self.insert_current_tdocs()
 
         if load_data:
@@ -495,7 +571,7 @@ class TdocsTable(GenericTable):
 
         self.current_tdocs = tdocs_for_result
 
-        self.tree.delete(*self.tree.get_children())
+        self.clear_tree()
         self.insert_current_tdocs()
 
         if load_data:
@@ -531,7 +607,7 @@ class TdocsTable(GenericTable):
         tdocs_for_text = tdocs_for_text[tdocs_for_text['search_column'].str.contains(text_search, regex=is_regex)]
         self.current_tdocs = tdocs_for_text
 
-        self.tree.delete(*self.tree.get_children())
+        self.clear_tree()
         self.insert_current_tdocs()
 
         if load_data:
@@ -630,6 +706,14 @@ class RevisionsTable(GenericTable):
             text='Compare!',
             command=self.compare_tdocs).pack(side=tkinter.LEFT)
 
+        # Compare in Word (only works in Windows) or as an HTML page
+        self.tkvar_word_native_compare = tkinter.BooleanVar(self.bottom_frame)
+        if platform.system() == 'Windows':
+            ttk.Checkbutton(
+                self.bottom_frame,
+                text='Word',
+                variable=self.tkvar_word_native_compare).pack(side=tkinter.LEFT)
+
         # Main frame
         self.insert_rows(revisions)
         self.tree.pack(fill='both', expand=True, side='left')
@@ -717,6 +801,13 @@ class RevisionsTable(GenericTable):
         compare_a = self.compare_a.get()
         compare_b = self.compare_b.get()
         print('Comparing {0} vs. {1}'.format(compare_a, compare_b))
-        parsing.word.pywin32.compare_tdocs(
-            entry_1=compare_a,
-            entry_2=compare_b)
+        if self.tkvar_word_native_compare.get():
+            parsing.word.pywin32.compare_tdocs(
+                entry_1=compare_a,
+                entry_2=compare_b)
+        else:
+            # A as the base document, as in the Word comparison
+            server.tdoc_search.compare_two_tdocs(
+                compare_b,
+                compare_a,
+                tkvar_3gpp_wifi_available=tkvar_3gpp_wifi_available)
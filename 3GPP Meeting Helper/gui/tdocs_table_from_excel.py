@@ -10,6 +10,7 @@ from tkinter import ttk
 from typing import List, NamedTuple
 
 import numpy as np
+import pandas as pd
 import pyperclip
 from pandas import DataFrame
 from pypdf import PdfWriter
@@ -26,7 +27,7 @@ from application.os import open_url, startfile
 from application.word import convert_tdoc_files_to_format
 from config.markdown import MarkdownConfig
 from gui.common.common_elements import tkvar_3gpp_wifi_available
-from gui.common.generic_table import GenericTable, treeview_set_row_formatting, column_separator_str
+from gui.common.generic_table import GenericTable, treeview_set_row_formatting, column_separator_str, wrap_column
 from gui.common.gui_elements import TTKHoverHelpButton
 from gui.common.icons import cloud_icon, cloud_download_icon, folder_icon, share_icon, excel_icon, website_icon, \
     filter_icon, ftp_icon, markdown_icon, share_markdown_icon, merge_icon, list_icon, draft_icon
@@ -50,6 +51,50 @@ def df_boolean_index_for_wi(in_df: DataFrame, wi_str:str):
     return filter_idx
 
 
+def get_tdoc_titles(tdocs_df: DataFrame) -> List[str]:
+    """
+    Generates the TDoc titles shown in the TDocs table, which include the spec, CR number and release if available,
+    e.g. "23.501CR1234: Title (Rel-18, Cat-F)"
+    Args:
+        tdocs_df: The TDocs DataFrame as read from the TDoc list Excel
+
+    Returns: The titles, in the same order as the DataFrame rows
+    """
+    titles = tdocs_df['Title'].tolist()
+    if 'Spec' not in tdocs_df.columns:
+        return titles
+
+    n_rows = len(titles)
+    has_cr = 'CR' in tdocs_df.columns
+    has_release = has_cr and 'Release' in tdocs_df.columns and 'CR category' in tdocs_df.columns
+    specs = tdocs_df['Spec'].tolist()
+    cr_numbers = tdocs_df['CR'].tolist() if has_cr else [''] * n_rows
+    releases = tdocs_df['Release'].tolist() if has_release else [''] * n_rows  # Rel-18
+    cr_categories = [f'Cat-{e}' for e in tdocs_df['CR category']] if has_release else [''] * n_rows  # Cat-F
+
+    tdoc_titles = []
+    for tdoc_title, tdoc_spec, cr_number, tdoc_release, cr_category in zip(
+            titles, specs, cr_numbers, releases, cr_categories):
+        try:
+            cr_number = '' if cr_number is None or cr_number == '' else f"CR{cr_number:.0f}"
+        except Exception as e:
+            print(f'Could not retrieve CR number: {e}')
+            cr_number = ''
+            tdoc_release = ''
+            cr_category = ''
+
+        if tdoc_spec is not None and tdoc_spec != '':
+            tdoc_title = f'{tdoc_spec}{cr_number}: {tdoc_title}'
+
+        if tdoc_release is not None and tdoc_release != '':
+            if cr_category is not None and cr_category != '' and cr_number != '':
+                tdoc_title = f'{tdoc_title} ({tdoc_release}, {cr_category})'
+            else:
+                tdoc_title = f'{tdoc_title} ({tdoc_release})'
+        tdoc_titles.append(tdoc_title)
+    return tdoc_titles
+
+
 def get_markdown_for_tdocs(
         filtered_df: DataFrame,
         column_list,
@@ -1027,86 +1072,37 @@ Please provide a summary of the documents included in the PDF per agenda item.
 
     def insert_rows(self):
         print('(Re-)Populating TDocs table')
-        self.tree.delete(*self.tree.get_children())
-        count = 0
-
-        # Convert to dict for much faster iteration compared to .iterrows()
-        df_records = self.tdocs_current_df.to_dict('index')
-
-        for tdoc_id, row in df_records.items():
-            count += 1
-            tag = 'odd' if count % 2 > 0 else 'even'
-
-            local_file = self.meeting.get_tdoc_local_path(str(tdoc_id))
-
-            # Icon to show if a TDoc was downloaded
-            row_icon = cloud_download_icon if utils.local_cache.file_exists(local_file) else cloud_icon
-
-            # Text including spec number
-            tdoc_title = row['Title']
-            try:
-                tdoc_spec = row['Spec']
-                try:
-                    cr_number = row['CR']
-                    cr_number = '' if cr_number is None or cr_number == '' else f"CR{cr_number:.0f}"
-
-                    try:
-                        tdoc_release = row['Release']  # Rel-18
-                        cr_category = f"Cat-{row['CR category']}"  # F
-                    except Exception as e:
-                        print(f'Could not retrieve Rel/CR category: {e}')
-                        tdoc_release = ''
-                        cr_category = ''
-                except Exception as e:
-                    print(f'Could not retrieve CR number: {e}')
-                    cr_number = ''
-                    tdoc_release = ''
-                    cr_category = ''
-
-                if tdoc_spec is not None and tdoc_spec != '':
-                    tdoc_title = f'{tdoc_spec}{cr_number}: {tdoc_title}'
-
-                if tdoc_release is not None and tdoc_release != '':
-                    if cr_category is not None and cr_category != '' and cr_number != '':
-                        tdoc_title = f'{tdoc_title} ({tdoc_release}, {cr_category})'
-                    else:
-                        tdoc_title = f'{tdoc_title} ({tdoc_release})'
-            except Exception as e:
-                print(f'Could not retrieve TDoc title: {e}')
-
-            self.tree.insert(
-                "",
-                "end",
-                tags=(tag,),
-                values=(
-                    tdoc_id,
-                    row['Agenda item'],
-                    row['Type'],
-                    textwrap.fill(tdoc_title, width=70),
-                    textwrap.fill(str(row['Source']), width=25),
-                    'Click',
-                    textwrap.fill(str(row['Secretary Remarks']), width=50)
-                ),
-                image=row_icon,
-            )
-
-        for tdoc_id in self.selected_tdocs_not_in_excel:
-            count += 1
-            tag = 'odd' if count % 2 > 0 else 'even'
-
-            local_file = self.meeting.get_tdoc_local_path(str(tdoc_id))
-            row_icon = cloud_download_icon if utils.local_cache.file_exists(local_file) else cloud_icon
-
-            self.tree.insert(
-                "",
-                "end",
-                tags=(tag,),
-                values=(tdoc_id, '', '', '', '', 'Click', ''),
-                image=row_icon,
-            )
-
-        treeview_set_row_formatting(self.tree)
-        self.tdoc_count.set(f'{count} documents')
+        df = self.tdocs_current_df
+        tdoc_ids = [str(tdoc_id) for tdoc_id in df.index] + [str(tdoc_id) for tdoc_id in self.selected_tdocs_not_in_excel]
+
+        # TDocs not in the Excel file are appended at the end
+        rows_df = DataFrame({
+            'TDoc': df.index.tolist(),
+            'AI': df['Agenda item'].tolist(),
+            'Type': df['Type'].tolist(),
+            'Title': wrap_column(get_tdoc_titles(df), width=70),
+            'Source': wrap_column(df['Source'], width=25),
+            'Details': 'Click',
+            'Secretary Remarks': wrap_column(df['Secretary Remarks'], width=50)
+        })
+        if len(self.selected_tdocs_not_in_excel) > 0:
+            rows_df = pd.concat([rows_df, DataFrame({
+                'TDoc': self.selected_tdocs_not_in_excel,
+                'AI': '',
+                'Type': '',
+                'Title': '',
+                'Source': '',
+                'Details': 'Click',
+                'Secretary Remarks': ''
+            })], ignore_index=True)
+
+        # Icon to show if a TDoc was downloaded
+        rows_df['Icon'] = [
+            cloud_download_icon if utils.local_cache.file_exists(self.meeting.get_tdoc_local_path(tdoc_id)) else cloud_icon
+            for tdoc_id in tdoc_ids]
+
+        self.populate_rows(rows_df, image_column='Icon')
+        self.tdoc_count.set(f'{len(rows_df)} documents')
 
 class TdocDetailsFromExcel(GenericTable):
     # Class-level constant for clean referencing
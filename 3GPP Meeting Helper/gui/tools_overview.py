@@ -28,8 +28,11 @@ import parsing.word.pywin32 as word_parser
 import server.agenda
 import server.chairnotes
 import server.common.server_utils
+import server.folder_watcher
 import server.tdoc
+import utils.caching.governor
 import utils.local_cache
+from threegpp_common.tracing import Tracing
 from gui.common.tkinter_widget import TkWidget
 from parsing.html.chairnotes import chairnotes_file_to_dataframe
 from parsing.html.revisions import extract_tdoc_revisions_from_html
@@ -151,6 +154,18 @@ class ToolsDialog(TkWidget):
         self.ai_list_entry.insert(0, '')
         self.ai_list_entry.grid(row=6, column=3, columnspan=1, padx=10, pady=10, sticky="EW")
 
+        # Row 7: Local cache size
+        self.cache_report_button = ttk.Button(
+            self.tk_top,
+            text='Local cache usage report (dry run)',
+            command=lambda: self.run_cache_maintenance(dry_run=True))
+        self.cache_report_button.grid(row=7, column=0, columnspan=2, sticky="EW")
+        self.cache_cleanup_button = ttk.Button(
+            self.tk_top,
+            text='Free local cache space (least recently used first)',
+            command=lambda: self.run_cache_maintenance(dry_run=False))
+        self.cache_cleanup_button.grid(row=7, column=2, columnspan=2, sticky="EW")
+
         # Row 8: Replace Author names in active document
         self.replace_author_names_button = ttk.Button(
             self.tk_top,
@@ -307,6 +322,7 @@ class ToolsDialog(TkWidget):
             print('Could not export TDocs by agenda data')
             traceback.print_exc()
 
+    @Tracing.traced('excel.export.tdocs_by_agenda')
     def export_and_open_excel(
             self,
             local_agenda_file,
@@ -410,13 +426,13 @@ class ToolsDialog(TkWidget):
             # Needs Pandas >= 0.24.0
             # Note that xlsxwriter does NOT support append mode
             if os.path.isfile(excel_export):
-                write_mode = 'a'
+                with pandas.ExcelWriter(excel_export, engine='openpyxl', mode='a') as writer:
+                    tdocs_df.to_excel(writer, sheet_name=sheet_name)
+                parsing.excel.apply_comments_coloring_and_hyperlinks(excel_export, fg_color, text_color, server_urls)
             else:
-                write_mode = 'w'
-            with pandas.ExcelWriter(excel_export, engine='openpyxl', mode=write_mode) as writer:
-                tdocs_df.to_excel(writer, sheet_name=sheet_name)
-
-            parsing.excel.apply_comments_coloring_and_hyperlinks(excel_export, fg_color, text_color, server_urls)
+                # Data, hyperlinks and comment colors in one pass
+                parsing.excel.write_tdocs_with_comments_and_hyperlinks(
+                    excel_export, tdocs_df, sheet_name, fg_color, text_color, server_urls)
 
             # Need to reinitialize COM on each thread
             # https://stackoverflow.com/questions/26745617/win32com-client-dispatch-cherrypy-coinitialize-has-not-been-called
@@ -448,8 +464,8 @@ class ToolsDialog(TkWidget):
     def outlook_email_approval(self):
         current_text = self.outlook_button_text.get()
         self.outlook_button_text.set('Processing... DO NOT interrupt Outlook until COMPLETELY finished!')
-        self.email_approval_button.config(state='disabled')
-        self.email_attachments_generate_summary_checkbox.config(state='disabled')
+        self.email_approval_button.config(state=tkinter.DISABLED)
+        self.email_attachments_generate_summary_checkbox.config(state=tkinter.DISABLED)
         t = threading.Thread(target=lambda: self.on_outlook_email_approval(current_text))
         t.start()
 
@@ -530,8 +546,10 @@ class ToolsDialog(TkWidget):
                 meeting_server_folder = application.meeting_helper.current_tdocs_by_agenda.meeting_server_folder
 
                 docs_file = server.tdoc.download_docs_file(meeting_server_folder)
-                revisions_file, revisions_folder_url = server.tdoc.download_revisions_file(meeting_server_folder)
-                drafts_file = server.tdoc.download_drafts_file(meeting_server_folder)
+                revisions_file = server.folder_watcher.get_listing_file(
+                    meeting_server_folder, server.folder_watcher.WatchedFolderType.REVISIONS)
+                drafts_file = server.folder_watcher.get_listing_file(
+                    meeting_server_folder, server.folder_watcher.WatchedFolderType.DRAFTS)
 
                 docs_list = extract_tdoc_revisions_from_html(
                     docs_file,
@@ -574,6 +592,15 @@ class ToolsDialog(TkWidget):
             print(f'General error performing bulk AI caching: {e}')
             traceback.print_exc()
 
+    def run_cache_maintenance(self, dry_run=True):
+        do_something_on_thread(
+            task=lambda: utils.caching.governor.run_cache_maintenance(dry_run=dry_run),
+            before_starting=lambda: (self.cache_report_button.config(state=tkinter.DISABLED),
+                                     self.cache_cleanup_button.config(state=tkinter.DISABLED)),
+            after_task=lambda: (self.cache_report_button.config(state=tkinter.NORMAL),
+                                self.cache_cleanup_button.config(state=tkinter.NORMAL)),
+            on_error_log='Could not run cache maintenance')
+
     def replace_document_revisions_author(self):
         original_author_name_to_replace = self.original_author_name.get()
         final_author_name = self.final_author_name.get()
@@ -1,13 +1,14 @@
 import datetime
 import itertools
-import textwrap
 import tkinter
 from os import startfile
 from tkinter import ttk
 from typing import List
 
+import pandas as pd
+
 from application.os import open_url
-from gui.common.generic_table import GenericTable, treeview_set_row_formatting, column_separator_str
+from gui.common.generic_table import GenericTable, column_separator_str, wrap_column
 from gui.common.gui_elements import TTKHoverHelpButton
 from gui.common.icons import refresh_icon, folder_icon
 from server import tdoc_search
@@ -221,33 +222,16 @@ class WorkItemsTable(GenericTable):
             wi_list = [wi for wi in wi_list if wi is not None and search_text_lower in wi.acronym.lower()]
             self.wi_list = wi_list
 
-        count = 0
-        for wi_data in wi_list:
-            count = count + 1
-            mod = count % 2
-            if mod > 0:
-                tag = 'odd'
-            else:
-                tag = 'even'
-
-            # 'Meeting', 'Location', 'Start', 'End', 'TDoc Start', 'TDoc End', 'Documents'
-            values = (
-                wi_data.acronym,
-                wi_data.work_item_id,
-                textwrap.fill(wi_data.name, width=70),
-                wi_data.latest_wid_version,
-                'Link',
-                'Link'
-            )
-            self.tree.insert(
-                "",
-                "end",
-                tags=(tag,),
-                values=values
-            )
-
-        treeview_set_row_formatting(self.tree)
-        self.meeting_count_tk_str.set('{0} work items'.format(count))
+        rows_df = pd.DataFrame({
+            'WI Code': [wi_data.acronym for wi_data in wi_list],
+            'Acronym': [wi_data.work_item_id for wi_data in wi_list],
+            'Name': wrap_column([wi_data.name for wi_data in wi_list], width=70),
+            'WID': [wi_data.latest_wid_version for wi_data in wi_list],
+            'CRs': 'Link',
+            'Specs': 'Link'
+        })
+        self.populate_rows(rows_df)
+        self.meeting_count_tk_str.set('{0} work items'.format(len(rows_df)))
 
     def clear_filters(self, *args):
         self.combo_groups.set('All Groups')
@@ -262,7 +246,7 @@ class WorkItemsTable(GenericTable):
         self.apply_filters()
 
     def apply_filters(self, text_filter_only=False):
-        self.tree.delete(*self.tree.get_children())
+        self.clear_tree()
         self.insert_rows(text_filter_only)
 
         # ONLY download files if we are changing groups/years, not when typing text
@@ -1,16 +1,20 @@
-import io
+import itertools
 import os
 import os.path
 import re
 import traceback
+from typing import List, Tuple, Dict, Any
 
+import numpy as np
 import openpyxl
 import pandas as pd
-from openpyxl.cell import WriteOnlyCell
+import xlsxwriter
+from python_calamine import CalamineWorkbook
 from openpyxl.styles import Font
 from openpyxl.styles import PatternFill
 
 from application.excel import open_excel_document, set_first_row_as_filter, last_column
+from application.excel_openpyxl import get_active_sheet_zip, read_cell_colors_zip
 
 comments_regex = re.compile(r'Comment[s]? [\(]?([\w]+)[\)]?|(.*Session) [cC]omments')
 comments_filename_regex = re.compile(r'.*[Cc]omments.*\.xlsx')
@@ -19,6 +23,13 @@ session_comments_column = 'Session comments'
 revision_of_column = 'Revision of'
 revised_to_column = 'Revised to'
 
+# Color used when a cell color can not be read
+default_color = '00000000'
+tdoc_hyperlink_font_color = 'FFEA0A8E'
+# Hex values (e.g. 'FF', 'c7', 'A') to their integer value, as int(x, 16)
+hex_values = {''.join(digits): int(''.join(digits), 16)
+              for length in (1, 2) for digits in itertools.product('0123456789abcdefABCDEF', repeat=length)}
+
 
 def adjust_tdocs_by_agenda_column_width(wb):
     try:
@@ -213,6 +224,73 @@ def get_company_name_based_on_email(sender_address):
     return company_name
 
 
+class ExcelFormatCache:
+    """
+    Shares xlsxwriter Format objects between cells with the same formatting (each Format becomes one style entry in
+    the file). By default, all formats are vertically centered and wrap text
+    """
+
+    def __init__(self, workbook: xlsxwriter.Workbook, default_properties: Dict[str, Any] = None):
+        self.workbook = workbook
+        self.formats = {}
+        if default_properties is None:
+            default_properties = {'valign': 'vcenter', 'text_wrap': True}
+        self.default_properties = default_properties
+
+    def get(
+            self,
+            horizontal_alignment: str | None,
+            bold=False,
+            link=False,
+            fg_color: str | None = None,
+            text_color: str | None = None):
+        """
+        Args:
+            horizontal_alignment: e.g. 'center'. None for the default alignment
+            bold: Bold font
+            link: Hyperlink font (overridden by text_color)
+            fg_color: Solid fill color (ARGB, e.g. 'FFFFC7CE')
+            text_color: Font color (ARGB)
+
+        Returns: The (shared) Format object
+        """
+        key = (horizontal_alignment, bold, link, fg_color, text_color)
+        cell_format = self.formats.get(key)
+        if cell_format is None:
+            properties = dict(self.default_properties)
+            if horizontal_alignment is not None:
+                properties['align'] = horizontal_alignment
+            if bold:
+                properties['bold'] = True
+            if link:
+                properties['font_color'] = argb_to_html_color(tdoc_hyperlink_font_color)
+                properties['underline'] = 1
+            if fg_color is not None:
+                properties['pattern'] = 1
+                properties['bg_color'] = argb_to_html_color(fg_color)
+            if text_color is not None:
+                properties['font_color'] = argb_to_html_color(text_color)
+                properties.pop('underline', None)
+            cell_format = self.workbook.add_format(properties)
+            self.formats[key] = cell_format
+        return cell_format
+
+
+def argb_to_html_color(argb_color: str) -> str:
+    """Converts an openpyxl-style ARGB color (e.g. 'FFEA0A8E') to an xlsxwriter color (e.g. '#EA0A8E')"""
+    return '#' + argb_color[-6:]
+
+
+def apply_column_layout(ws, formats: ExcelFormatCache, layout: List[Tuple[int, str | None]]):
+    for column_idx, (width, horizontal_alignment) in enumerate(layout):
+        ws.set_column(column_idx, column_idx, width, formats.get(horizontal_alignment))
+
+
+def write_header_row(ws, formats: ExcelFormatCache, layout: List[Tuple[int, str | None]], header: List[str]):
+    for column_idx, (title, (_, horizontal_alignment)) in enumerate(zip(header, layout)):
+        ws.write_string(0, column_idx, title, formats.get(horizontal_alignment, bold=True))
+
+
 def export_email_approval_list(local_filename, found_attachments, tdocs_without_emails=None, tdoc_data=None):
     if (local_filename is None) or (local_filename == ''):
         return
@@ -221,47 +299,63 @@ def export_email_approval_list(local_filename, found_attachments, tdocs_without_
 
     print('Starting email approval export: {0} emails'.format(len(found_attachments)))
 
-    # Faster variant writing first most data not using VBA
-    wb = openpyxl.Workbook(write_only=True)
-    ws = wb.create_sheet()
-    ws.title = "Revisions"
+    # Faster variant writing first most data (including the layout) not using VBA. Cells sharing the same format
+    # use the same (cached) xlsxwriter Format object
+    wb = xlsxwriter.Workbook(local_filename, {'constant_memory': True, 'strings_to_urls': False})
+    formats = ExcelFormatCache(wb)
+    ws = wb.add_worksheet("Revisions")
+    revisions_layout = [
+        # Column width, horizontal alignment
+        (14, 'center'),  # TD#
+        (18, 'center'),  # Time
+        (30, None),  # Filename mention. Reduced to 30 as we now just send around revision numbers
+        (40, None),  # Sender
+        (17, None),  # Company
+        (9, None),  # Email
+        (25, 'center'),  # AI
+        (60, None),  # Chairman's notes
+    ]
+    apply_column_layout(ws, formats, revisions_layout)
 
     # Add title row
-    ws.append(['TD#', 'Time', 'Filename mention', 'Sender', 'Company', 'Email', 'AI', "Chairman's notes"])
+    write_header_row(ws, formats, revisions_layout,
+                     ['TD#', 'Time', 'Filename mention', 'Sender', 'Company', 'Email', 'AI', "Chairman's notes"])
 
     # Add email entries
-    for idx, item in enumerate(found_attachments, start=2):
-        filename_cell = WriteOnlyCell(ws, value=item.filename)
-        sender_name_cell = WriteOnlyCell(ws, value=item.sender_name)
-        link_cell = WriteOnlyCell(ws, value='Link')
-
+    for row_idx, item in enumerate(found_attachments, start=1):
+        ws.write_string(row_idx, 0, str(item.tdoc), formats.get(revisions_layout[0][1]))
+        ws.write(row_idx, 1, item.time, formats.get(revisions_layout[1][1]))
         # Link to file. May not always be a path
         if item.absolute_url != '':
-            filename_cell.hyperlink = 'file:///' + item.absolute_url
-            filename_cell.font = Font(underline="single", color='00EA0A8E')
+            ws.write_url(row_idx, 2, 'file:///' + item.absolute_url, formats.get(None, link=True), string=item.filename)
+        else:
+            ws.write(row_idx, 2, item.filename, formats.get(None))
         # Link to author
-        sender_name_cell.hyperlink = 'mailto:' + item.sender_address
-        sender_name_cell.font = Font(underline="single", color='00EA0A8E')
+        ws.write_url(row_idx, 3, 'mailto:' + item.sender_address, formats.get(None, link=True),
+                     string=item.sender_name)
+        ws.write(row_idx, 4, get_company_name_based_on_email(item.sender_address), formats.get(None))
         # Link to email
-        link_cell.hyperlink = 'file:///' + item.email_url
-        link_cell.font = Font(underline="single", color='00EA0A8E')
-
-        # Write row
-        ws.append([
-            item.tdoc,
-            item.time,
-            filename_cell,
-            sender_name_cell,
-            get_company_name_based_on_email(item.sender_address),
-            link_cell,
-            str(item.ai_folder),
-            str(item.chairman_notes)
-        ])
+        ws.write_url(row_idx, 5, 'file:///' + item.email_url, formats.get(None, link=True), string='Link')
+        ws.write_string(row_idx, 6, str(item.ai_folder), formats.get(revisions_layout[6][1]))
+        ws.write_string(row_idx, 7, str(item.chairman_notes), formats.get(None))
 
     if tdocs_without_emails is not None and tdoc_data is not None:
-        ws = wb.create_sheet()
-        ws.title = "TDocs without emails"
-        ws.append(['TD#', 'AI', 'Type', 'Doc For', 'Title', 'Source', 'Rel', 'Comments'])
+        ws = wb.add_worksheet("TDocs without emails")
+        # TD, AI, Type, Doc For, Title, source, rel, work item, comments
+        tdocs_without_emails_layout = [
+            (11, 'center'),
+            (7, 'center'),
+            (11, 'center'),
+            (12, 'center'),
+            (50, 'center'),
+            (45, 'center'),
+            (7, 'center'),
+            (7, 'center'),
+            (50, 'center'),
+        ]
+        apply_column_layout(ws, formats, tdocs_without_emails_layout)
+        write_header_row(ws, formats, tdocs_without_emails_layout,
+                         ['TD#', 'AI', 'Type', 'Doc For', 'Title', 'Source', 'Rel', 'Comments'])
 
         # Available columns: ['AI' 'Type' 'Doc For' 'Title' 'Source' 'Rel' 'Comments'
         #  'e-mail_Discussion' 'Result' 'Revision of' 'Revised to' 'Merge of'
@@ -270,22 +364,15 @@ def export_email_approval_list(local_filename, found_attachments, tdocs_without_
         tdocs_info = tdoc_data.tdocs.loc[
             list(tdocs_without_emails), ['AI', 'Type', 'Doc For', 'Title', 'Source', 'Rel', 'Comments']]
         print('{0} TDocs without matching emails'.format(len(tdocs_info.index)))
-        for row_index, row in tdocs_info.iterrows():
-            ws.append([
-                row_index,
-                str(row['AI']),
-                str(row['Type']),
-                str(row['Doc For']),
-                str(row['Title']),
-                str(row['Source']),
-                str(row['Rel']),
-                str(row['Comments'])])
+        tdocs_info = tdocs_info.astype(str)
+        cell_format = formats.get('center')
+        for row_idx, row in enumerate(tdocs_info.itertuples(name=None), start=1):
+            for column_idx, value in enumerate(row):
+                ws.write_string(row_idx, column_idx, str(value), cell_format)
 
     print('Saving Excel table structure')
-    wb.save(filename=local_filename)
-    print('Closing Excel File')
     wb.close()
-    print('Excel File closed')
+    print('Closing Excel File')
 
     # Only necessary things with VBA (much slower)
     try:
@@ -294,22 +381,7 @@ def export_email_approval_list(local_filename, found_attachments, tdocs_without_
         # ws = wb.ActiveSheet
         ws = wb.Sheets("Revisions")
 
-        ws.Range("A:A").ColumnWidth = 14
-        ws.Range("B:B").ColumnWidth = 18
-        ws.Range("C:C").ColumnWidth = 30  # Reduced to 30 as we now just send around revision numbers
-        ws.Range("D:D").ColumnWidth = 40
-        ws.Range("E:E").ColumnWidth = 17
-        ws.Range("F:F").ColumnWidth = 9
-        ws.Range("G:G").ColumnWidth = 25
-        ws.Range("H:H").ColumnWidth = 60
-
-        ws.Range("A:B").HorizontalAlignment = -4108
-        ws.Range("G:G").HorizontalAlignment = -4108
-        ws.Range("A:H").VerticalAlignment = -4108
-        ws.Range("A:H").WrapText = True
-        ws.Range("H:H").WrapText = True
-        ws.Range("A1:H1").Font.Bold = True
-
+        # Column widths, alignment and header are already set in the file
         set_first_row_as_filter(wb, 'Revisions')
 
         ws.AutoFilter.Sort.SortFields.Clear()
@@ -326,23 +398,6 @@ def export_email_approval_list(local_filename, found_attachments, tdocs_without_
 
         if tdocs_without_emails is not None and tdoc_data is not None:
             ws = wb.Sheets("TDocs without emails")
-
-            # TD, AI, Type, Doc For, Title, source, rel, work item, comments
-            ws.Range("A:A").ColumnWidth = 11
-            ws.Range("B:B").ColumnWidth = 7
-            ws.Range("C:C").ColumnWidth = 11
-            ws.Range("D:D").ColumnWidth = 12
-            ws.Range("E:E").ColumnWidth = 50
-            ws.Range("F:F").ColumnWidth = 45
-            ws.Range("G:G").ColumnWidth = 7
-            ws.Range("H:H").ColumnWidth = 7
-            ws.Range("I:I").ColumnWidth = 50
-
-            ws.Range("A:I").HorizontalAlignment = -4108
-            ws.Range("A:I").VerticalAlignment = -4108
-            ws.Range("A:I").WrapText = True
-            ws.Range("A1:I1").Font.Bold = True
-
             set_first_row_as_filter(wb, 'TDocs without emails', already_activated=True)
             ws.AutoFilter.Sort.SortFields.Clear()
             ws.AutoFilter.Sort.SortFields.Add(Order=xlAscending, SortOn=xlSortOnValues, Key=ws.Range("B:B"))  # AI
@@ -372,105 +427,128 @@ def export_email_approval_list(local_filename, found_attachments, tdocs_without_
         traceback.print_exc()
 
 
+def get_comment_columns(column_names) -> List[Tuple[int, str, str | None]]:
+    """
+    Finds the comment columns in a comments file
+    Args:
+        column_names: The header row
+
+    Returns: Column position, matched column name and contributor name (None for session comments) of the comment
+    columns
+    """
+    # Avoid type errors when RegEx-ing
+    column_name_matches = [comments_regex.match(str(column_name)) for column_name in column_names]
+    return [(idx, match.group(0), match.group(1)) for idx, match in enumerate(column_name_matches) if match is not None]
+
+
+def melt_comments(values_df: pd.DataFrame, comment_columns: List[Tuple[int, str, str | None]]) -> pd.DataFrame:
+    """
+    Reshapes the comment columns of a comments file to one row per (non-empty) comment
+    Args:
+        values_df: The comments file values, with positional column labels (0, 1, ...)
+        comment_columns: The comment columns, see get_comment_columns
+
+    Returns: DataFrame with the "row" (position in values_df), "column", "name" (contributor) and "comment" of each
+    comment, sorted by row and then by column
+    """
+    column_positions = [column[0] for column in comment_columns]
+    wide_df = values_df[column_positions].copy()
+    wide_df['row'] = np.arange(len(values_df))
+    long_df = wide_df.melt(id_vars='row', var_name='column', value_name='comment')
+    long_df = long_df[long_df['comment'].notna() & (long_df['comment'] != '')]
+    long_df = long_df.sort_values(by='row', kind='stable')
+    # Not via .map(), which would replace the None (session comments) names with NaN
+    contributor_names = {column[0]: column[2] for column in comment_columns}
+    long_df['name'] = pd.Series([contributor_names[column] for column in long_df['column']], index=long_df.index,
+                                dtype=object)
+    return long_df
+
+
 def read_comments_file(filename):
     try:
-        xl = pd.ExcelFile(filename)
-        ws = xl.sheet_names[0]
-        df = xl.parse(ws, index_col=0)
-        column_names = list(df.columns.values)
-        if session_comments_column not in column_names:
+        df = pd.read_excel(filename, sheet_name=0, index_col=0, engine='calamine')
+        if session_comments_column not in df.columns:
             df[session_comments_column] = ''
-        # Avoid type errors when RegEx-ing
-        column_names = [str(e) for e in column_names]
-        column_name_matches = [comments_regex.match(column_name) for column_name in column_names]
-        cleaned_column_name_matches = [match for match in column_name_matches if match is not None]
-        column_matches = [(match_data.group(0), match_data.group(1)) for match_data in cleaned_column_name_matches]
-        name_columns = [col_data[1] for col_data in column_matches]
-        for idx in df.index.values:
-            try:
-                initial_comments = []
-                for col in column_matches:
-                    comment = df.at[idx, col[0]]
-                    if (comment is not None) and isinstance(comment, str) and (comment != ''):
-                        comment_source = col[1]
-                        # None in the case of Session Comments
-                        if comment_source is not None:
-                            initial_comments.append('[{0}]: {1}'.format(comment_source, comment.strip('\n')))
-                row_full_comments = '\n'.join(initial_comments)
-                session_comments = str(df.at[idx, session_comments_column])
-                if session_comments == 'nan':
-                    session_comments = None
-                if (session_comments is None) or (session_comments == ''):
-                    summary_comments = row_full_comments
-                else:
-                    summary_comments = '\n\n'.join(
-                        [item for item in [row_full_comments, session_comments] if (item is not None) and (item != '')])
-                df.at[idx, comments_summary_column] = summary_comments
-            except:
-                print('Could not import comments for TDoc {1} file {0}'.format(filename, idx))
-                traceback.print_exc()
+
+        # Contributor comments. Session comments do not have a contributor name and are handled separately
+        comment_columns = [(df.columns.get_loc(column), column, name) for _, column, name in
+                           get_comment_columns(df.columns.values) if name is not None and column in df.columns]
+        values_df = df.set_axis(range(len(df.columns)), axis=1)
+        comments_df = melt_comments(values_df, comment_columns)
+        comments_df = comments_df[comments_df['comment'].map(type) == str]
+        comments_df['text'] = '[' + comments_df['name'] + ']: ' + comments_df['comment'].str.strip('\n')
+        row_full_comments = comments_df.groupby('row')['text'].agg('\n'.join).reindex(
+            np.arange(len(df)),
+            fill_value='')
+        row_full_comments.index = df.index
+
+        session_comments = df[session_comments_column].fillna('').astype(str)
+        session_comments = session_comments.where(session_comments != 'nan', '')
+
+        summary_comments = row_full_comments.where(
+            session_comments == '',
+            (row_full_comments + '\n\n' + session_comments).where(row_full_comments != '', session_comments))
+        summary_comments.name = comments_summary_column
+
         # Filter out columns with no comments
-        df = df.loc[(df[comments_summary_column] is not None) & (df[comments_summary_column] != '')]
-        df = df.loc[:, comments_summary_column]
-        return df
+        return summary_comments[summary_comments != '']
     except:
         print('Could not import comments file {0}'.format(filename))
         traceback.print_exc()
         return None
 
 
-def get_comment_data_from_cell(contributor_name, row, idx):
-    if contributor_name is not None:
-        contributor_name = contributor_name.strip()
-    cell = row[idx]
-    if cell is None:
-        return (contributor_name, None, None, None)
-    else:
-        # Foreground color
-        try:
-            fg_color = cell.fill.fgColor.index
-        except:
-            fg_color = '00000000'
-        # Text color
-        try:
-            font_color = cell.font.color.index
-        except:
-            font_color = '00000000'
-
-        # ToDo: calculate closeness to red, yellow and green and set the color accordingly
-        return (contributor_name, cell.value, fg_color, font_color)
-
-
 def read_comments_format(filename):
     try:
-        # As per https://stackoverflow.com/questions/31416842/openpyxl-does-not-close-excel-workbook-in-read-only-mode
-        with open(filename, "rb") as f:
-            in_mem_file = io.BytesIO(f.read())
-
-        book = openpyxl.load_workbook(in_mem_file, read_only=True)
+        # Values are read with calamine and colors directly from the XML. Loading the workbook with openpyxl creates
+        # an object per cell
+        sheet_location = get_active_sheet_zip(filename)
+        book = CalamineWorkbook.from_path(filename)
+        try:
+            rows = book.get_sheet_by_name(sheet_location.sheet_name).to_python(skip_empty_area=False)
+        finally:
+            book.close()
         print('Loaded comments file')
-        ws = book.active
-        comments_row = ws[1]
-
-        column_names = [str(e.value) for e in comments_row]
-        column_name_matches = [comments_regex.match(column_name) for column_name in column_names]
+        if len(rows) < 2:
+            return {}
 
-        comments_to_map = []
-        for idx, match in enumerate(column_name_matches):
-            if match is None:
-                continue
-            comments_to_map.append((match.group(1), idx))
+        comment_columns = get_comment_columns(rows[0])
+        values_df = pd.DataFrame(rows[1:])
+        comment_columns = [column for column in comment_columns if column[0] in values_df.columns]
 
         print('Scanning for comments')
+        cell_colors = read_cell_colors_zip(
+            filename,
+            sheet_location.sheet_path,
+            columns=[column[0] for column in comment_columns])
+        comments_df = melt_comments(values_df, comment_columns)
+        comments_df['name'] = pd.Series([name.strip() if name is not None else None for name in comments_df['name']],
+                                        index=comments_df.index, dtype=object)
+
+        # Data rows start at the second Excel row
+        cell_styles = [cell_colors.cell_styles.get((row_idx + 1, column_idx), 0) for row_idx, column_idx in
+                       zip(comments_df['row'], comments_df['column'])]
+        fill_colors = np.array(cell_colors.fill_colors + [None], dtype=object)
+        font_colors = np.array(cell_colors.font_colors + [None], dtype=object)
+        # Unknown styles use the last (None) entry
+        cell_styles = np.minimum(np.array(cell_styles, dtype=int), len(cell_colors.fill_colors))
+        comments_df['fg_color'] = [default_color if e is None else e for e in fill_colors[cell_styles]]
+        comments_df['font_color'] = [default_color if e is None else e for e in font_colors[cell_styles]]
+
         all_comments = {}
-        for row in ws.iter_rows(min_row=2):
-            tdoc = row[0].value
-            # Fix: cell may be "None"!!!! Replace with loop
-            comments = [get_comment_data_from_cell(comment[0], row, comment[1]) for comment in comments_to_map]
-            comments = [comment for comment in comments if (comment[1] is not None) and (comment[1] != '')]
-            if len(comments) > 0:
-                all_comments[tdoc] = comments
-        book.close()
+        tdocs = values_df[0].tolist()
+        current_row = None
+        current_comments = None
+        for row_idx, comment in zip(
+                comments_df['row'],
+                zip(comments_df['name'], comments_df['comment'], comments_df['fg_color'], comments_df['font_color'])):
+            if row_idx != current_row:
+                tdoc = tdocs[row_idx]
+                current_row = row_idx
+                current_comments = []
+                # Empty cells are read as ''
+                all_comments[tdoc if tdoc != '' else None] = current_comments
+            current_comments.append(comment)
         return all_comments
     except:
         print('Could not import comments file {0}'.format(filename))
@@ -480,7 +558,7 @@ def read_comments_format(filename):
 
 def get_comments_files_in_dir(directory):
     try:
-        all_files = os.listdir(directory)
+        all_files = sorted(os.listdir(directory))
         comments_files = [filename for filename in all_files if
                           (comments_filename_regex.match(filename) is not None) and (not filename.startswith('~$'))]
         return comments_files
@@ -499,11 +577,13 @@ def get_comments_from_dir(directory, merge_comments=False):
         if full_df is None:
             full_df = df
         else:
-            for i, row in df.iteritems():
-                if (i in full_df.index) and merge_comments:
-                    full_df[i] = full_df[i] + '\n\n' + row
-                else:
-                    full_df[i] = row
+            already_there = df.index.isin(full_df.index)
+            existing_comments = df[already_there]
+            if merge_comments:
+                existing_comments = full_df[existing_comments.index] + '\n\n' + existing_comments
+            full_df = full_df.copy()
+            full_df[existing_comments.index] = existing_comments
+            full_df = pd.concat([full_df, df[~already_there]])
     return full_df
 
 
@@ -536,8 +616,8 @@ def get_comments_from_dir_format(directory, merge_comments=False):
                 else:
                     # Add only entries not already here
                     existing_comments = full_comments[tdoc]
-                    existing_texts = [get_comment_full_text(comment_data[0], comment_data[1]) for comment_data in
-                                      existing_comments]
+                    existing_texts = set(get_comment_full_text(comment_data[0], comment_data[1]) for comment_data in
+                                         existing_comments)
                     for comment_to_eval in tdoc_comments:
                         text_to_eval = get_comment_full_text(comment_to_eval[0], comment_to_eval[1])
                         if text_to_eval not in existing_texts:
@@ -546,44 +626,143 @@ def get_comments_from_dir_format(directory, merge_comments=False):
     return full_comments
 
 
+def get_reddest_colors(colors_per_key: Dict[Any, List]) -> Dict[Any, str]:
+    """
+    Vectorized get_reddest_color() for many color lists (e.g. the fill colors of the comments of each TDoc)
+    Args:
+        colors_per_key: ARGB color strings (e.g. 'FFFFC7CE') per key
+
+    Returns: The color with the highest red component per key. If several colors have the same red component, the last
+    one. The default color for keys whose list is empty or contains a value that is not an ARGB string
+    """
+    keys = list(colors_per_key.keys())
+    colors_df = pd.DataFrame({
+        'key': np.repeat(np.arange(len(keys)), [len(colors) for colors in colors_per_key.values()]),
+        'color': pd.Series(list(itertools.chain.from_iterable(colors_per_key.values())), dtype=object)})
+    colors_df['position'] = np.arange(len(colors_df))
+    # Not .str: it raises if the batch only has theme/indexed colors (int or bool), which are not comparable
+    colors_df['red'] = colors_df['color'].map(lambda color: color[2:4] if isinstance(color, str) else None).map(
+        hex_values)
+
+    invalid_keys = colors_df.loc[colors_df['red'].isna(), 'key'].unique()
+    colors_df = colors_df[~colors_df['key'].isin(invalid_keys)]
+    reddest_colors = colors_df.sort_values(by=['red', 'position']).drop_duplicates(subset='key', keep='last')
+    reddest_colors = reddest_colors.set_index('key')['color'].reindex(np.arange(len(keys)), fill_value=default_color)
+    return dict(zip(keys, reddest_colors.tolist()))
+
+
 def get_reddest_color(colors):
-    try:
-        sorted_colors = sorted(colors, key=lambda x: int(x[2:4], 16))
-        return sorted_colors[-1]
-    except:
-        return '00000000'
+    return get_reddest_colors({0: colors})[0]
 
 
 def get_colors_from_comments(comments):
-    fg_colors = {}
-    text_colors = {}
     if comments is None:
-        return fg_colors, text_colors
-    for tdoc, comments in comments.items():
-        fg_colors_comments = [comment_data[2] for comment_data in comments]
-        text_colors_comments = [comment_data[3] for comment_data in comments]
+        return {}, {}
+    fg_colors = get_reddest_colors(
+        {tdoc: [comment_data[2] for comment_data in tdoc_comments] for tdoc, tdoc_comments in comments.items()})
+    text_colors = get_reddest_colors(
+        {tdoc: [comment_data[3] for comment_data in tdoc_comments] for tdoc, tdoc_comments in comments.items()})
+    return fg_colors, text_colors
 
-        reddest_fg_color = get_reddest_color(fg_colors_comments)
-        reddest_text_color = get_reddest_color(text_colors_comments)
 
-        fg_colors[tdoc] = reddest_fg_color
-        text_colors[tdoc] = reddest_text_color
-    return fg_colors, text_colors
+def get_server_url_mapping(server_urls) -> Dict[str, str]:
+    """
+    Args:
+        server_urls: TDoc to URL mapping (anything that can be converted to a dict, e.g. a Series), or None
+
+    Returns: The TDoc to URL mapping as a dict (empty if it could not be generated)
+    """
+    if server_urls is None:
+        return {}
+    try:
+        return dict(server_urls)
+    except:
+        print('Could not generate TDoc URL mapping')
+        traceback.print_exc()
+        return {}
+
+
+def is_comment_color_set(color) -> bool:
+    return (color is not None) and (color != default_color) and (color != 'FFFFFFFF')
+
+
+def write_tdocs_with_comments_and_hyperlinks(filename, tdocs_df: pd.DataFrame, sheet_name, fg_colors, text_colors,
+                                             server_urls):
+    """
+    Writes the TDocs DataFrame, the TDoc hyperlinks and the comment colors in a single pass (same result as
+    to_excel() followed by apply_comments_coloring_and_hyperlinks(), without re-loading the workbook). Cells with
+    the same formatting share one format. Note that xlsxwriter does not support append mode: use
+    apply_comments_coloring_and_hyperlinks() for existing files
+    Args:
+        filename: The Excel file to write
+        tdocs_df: The TDocs (TDoc IDs as index)
+        sheet_name: The sheet name
+        fg_colors: TDoc to comment fill color (ARGB)
+        text_colors: TDoc to comment text color (ARGB)
+        server_urls: TDoc to URL mapping. Any cell (including the index) containing a TDoc in the mapping is linked
+    """
+    server_urls = get_server_url_mapping(server_urls)
+    if fg_colors is None:
+        fg_colors = {}
+    if text_colors is None:
+        text_colors = {}
+    print('Writing TDocs with comment color formatting')
+    with pd.ExcelWriter(
+            filename,
+            engine='xlsxwriter',
+            engine_kwargs={'options': {'strings_to_urls': False}}) as writer:
+        tdocs_df.to_excel(writer, sheet_name=sheet_name)
+        ws = writer.sheets[sheet_name]
+        # Formatting only (no alignment/wrapping, as in the openpyxl variant)
+        formats = ExcelFormatCache(writer.book, default_properties={})
+
+        # Cells to overwrite, as (row, column) -> value. Data starts at row 1 (header) and column 1 (index)
+        all_values = [tdocs_df.index.to_series(index=tdocs_df.index)] + [tdocs_df.iloc[:, i] for i in
+                                                                          range(len(tdocs_df.columns))]
+        url_keys = list(server_urls.keys())
+        linked_cells: Dict[Tuple[int, int], Any] = {}
+        for column_idx, column_values in enumerate(all_values):
+            for row_idx in np.flatnonzero(column_values.isin(url_keys).to_numpy()):
+                linked_cells[(int(row_idx) + 1, column_idx)] = column_values.iat[row_idx]
+
+        colored_cells: Dict[Tuple[int, int], Tuple[Any, str | None, str | None]] = {}
+        if session_comments_column in tdocs_df.columns:
+            comments_column_idx = tdocs_df.columns.get_loc(session_comments_column) + 1
+            comments = tdocs_df[session_comments_column]
+            for row_idx in np.flatnonzero(tdocs_df.index.isin(list(fg_colors.keys()))):
+                tdoc = tdocs_df.index[row_idx]
+                fg_color = fg_colors.get(tdoc)
+                text_color = text_colors.get(tdoc)
+                colored_cells[(int(row_idx) + 1, comments_column_idx)] = (
+                    comments.iat[row_idx],
+                    fg_color if is_comment_color_set(fg_color) else None,
+                    text_color if is_comment_color_set(text_color) else None)
+
+        for (row_idx, column_idx), value in linked_cells.items():
+            fg_color, text_color = None, None
+            if (row_idx, column_idx) in colored_cells:
+                _, fg_color, text_color = colored_cells.pop((row_idx, column_idx))
+            ws.write_url(
+                row_idx,
+                column_idx,
+                server_urls[value],
+                formats.get(None, link=True, fg_color=fg_color, text_color=text_color),
+                string=str(value))
+        for (row_idx, column_idx), (value, fg_color, text_color) in colored_cells.items():
+            if fg_color is None and text_color is None:
+                continue
+            cell_format = formats.get(None, fg_color=fg_color, text_color=text_color)
+            if pd.isna(value) or value == '':
+                ws.write_blank(row_idx, column_idx, None, cell_format)
+            else:
+                ws.write(row_idx, column_idx, value, cell_format)
 
 
 def apply_comments_coloring_and_hyperlinks(filename, fg_colors, text_colors, server_urls, hyperlink_columns=[revision_of_column, revised_to_column]):
     book = openpyxl.load_workbook(filename)
     ws = book.active
     print('Applying comment color formatting')
-    if server_urls is None:
-        server_urls = {}
-    else:
-        try:
-            server_urls = dict(server_urls)
-        except:
-            server_urls = {}
-            print('Could not generate TDoc URL mapping')
-            traceback.print_exc()
+    server_urls = get_server_url_mapping(server_urls)
     # Column 20 is the one with the comments
     header_row = [cell.value for cell in ws[1]]
     try:
@@ -619,9 +798,9 @@ def set_comments_color(tdoc, cell, fg_colors, text_colors):
     try:
         comment_color = fg_colors[tdoc]
         text_color = text_colors[tdoc]
-        if (comment_color != '00000000') and (comment_color != 'FFFFFFFF'):
+        if is_comment_color_set(comment_color):
             cell.fill = PatternFill(start_color=comment_color, end_color=comment_color, fill_type='solid')
-        if (text_color != '00000000') and (text_color != 'FFFFFFFF'):
+        if is_comment_color_set(text_color):
             cell.font = Font(color=text_color)
     except:
         print('Could not set color for TDoc {0}'.format(tdoc))
@@ -633,7 +812,7 @@ def set_tdoc_hyperlink(cell_content, cell, cell_content_to_url_mapping):
         return
     if cell_content in cell_content_to_url_mapping:
         cell.hyperlink = cell_content_to_url_mapping[cell_content]
-        cell.font = Font(color='FFEA0A8E', underline='single')
+        cell.font = Font(color=tdoc_hyperlink_font_color, underline='single')
 
 def generate_emeeting_link_for_tdoc(target_cell):
     pass
\ No newline at end of file
@@ -1,4 +1,3 @@
-import collections
 import datetime
 import os
 import os.path
@@ -8,9 +7,9 @@ from re import Pattern
 from typing import NamedTuple, List, Tuple
 
 from lxml import html as lh
-from lxml.etree import tostring
 
 import utils.local_cache
+from threegpp_common.ftp_listing import parse_listing, ListingEntry
 
 
 class Meeting(NamedTuple):
@@ -45,7 +44,6 @@ class FolderList(NamedTuple):
     folders_with_dates: List[Tuple[str, datetime.datetime]]
 
 
-ftp_list_regex = re.compile(r'(\d?\d\/\d?\d\/\d\d\d\d) *(\d?\d:\d\d) (AM|PM) *(<dir>|\d+) *')
 comment_span = re.compile(r'<span title="(.*)">(.*)')
 current_cache_version = 1.41
 
@@ -86,73 +84,43 @@ def parse_3gpp_http_ftp(html) -> FolderList:
         return parse_3gpp_http_ftp_v1(html)
 
 
-def parse_3gpp_http_ftp_v1(html):
-    parsed = lh.fromstring(html)
-    Result = collections.namedtuple('Http_3GPP_folder', ['location', 'folders', 'files', 'folders_with_dates'])
-    location = parsed.xpath('head/title')[0].text_content().replace('www.3gpp.org - ', '').strip()
-    text = [e.text_content() for e in parsed.xpath('body/pre/a')][1:]
-    full_text = parsed.xpath('body/pre')[0].text_content()
-    for value in text:
-        full_text = full_text.replace(value, '')
-    matches = ftp_list_regex.findall(full_text)
-    folders = []
-    files = []
-    folders_with_dates = []
-    for match_idx in range(0, len(text)):
-        match = matches[match_idx]
-        current_text: str = text[match_idx]
-        if match[-1] == '<dir>':
-            folders.append(current_text)
-            the_time: datetime = datetime.datetime.strptime(match[0], '%m/%d/%Y')
-            folders_with_dates.append((current_text, the_time))
-        else:
-            files.append(current_text)
+listing_title_regex = re.compile(r'<title>(.*?)</title>', re.IGNORECASE | re.DOTALL)
+
 
+def _parse_listing_location(html: str, title_prefix: str) -> str:
+    title_match = listing_title_regex.search(html)
+    if title_match is None:
+        return ''
+    return title_match.group(1).replace(title_prefix, '').strip()
+
+
+def _entries_to_folder_list(location: str, entries: List[ListingEntry]) -> FolderList:
+    folders = [e.name for e in entries if e.is_dir]
+    files = [e.name for e in entries if not e.is_dir]
+    folders_with_dates = [(e.name, e.mtime) for e in entries if e.is_dir and e.mtime is not None]
     return FolderList(location, folders, files, folders_with_dates)
 
 
-def parse_3gpp_http_ftp_v2(html):
-    parsed = lh.fromstring(html)
+def parse_3gpp_http_ftp_v1(html):
+    location = _parse_listing_location(html, 'www.3gpp.org - ')
+    entries = parse_listing(html)
 
-    location = parsed.xpath('head/title')[0].text_content().replace('Directory Listing', '').strip()
+    # The folder dates are given with day resolution
+    entries = [e._replace(mtime=datetime.datetime(e.mtime.year, e.mtime.month, e.mtime.day))
+               if e.is_dir and e.mtime is not None else e
+               for e in entries]
+    return _entries_to_folder_list(location, entries)
 
-    # Examples:
-    #   - ['TSGS2_07', '2008/11/04', '20:21']
-    #   - ['Ad-hoc_meetings', '2011/05/05', '5:35']
-    row_list = [(
-        list(filter(
-            None,
-            e.text_content().replace('\r', '').replace('\n', '').replace('\t', '').strip().split(' '))),
-        '/ftp/geticon.axd?file=' in tostring(e, encoding=str)
-    )
-        for e in parsed.xpath('body/form/table/tbody/tr')]
-
-    folders = []
-    files = []
-    folders_with_dates = []
-
-    parsed_folder_count = 0
-    for row in row_list:
-        row_content = row[0]
-        row_is_dir = row[1]
-
-        entry_name = row_content[0]
-        entry_date = row_content[1]
-        entry_time = row_content[2]
-
-        entry_datetime = f'{entry_date} {entry_time}'
-        if row_is_dir:
-            folders.append(entry_name)
-            try:
-                folders_with_dates.append((entry_name, datetime.datetime.strptime(entry_datetime, '%Y/%m/%d %H:%M')))
-                parsed_folder_count = parsed_folder_count + 1
-            except ValueError as e:
-                print(f'Could not parse time of row {row}: {e}')
-        else:
-            files.append(entry_name)
 
-    print(f'Parsed {parsed_folder_count} folders from HTML file')
-    return FolderList(location, folders, files, folders_with_dates)
+def parse_3gpp_http_ftp_v2(html):
+    location = _parse_listing_location(html, 'Directory Listing')
+
+    # Examples:
+    #   - ('TSGS2_07', 2008/11/04 20:21)
+    #   - ('Ad-hoc_meetings', 2011/05/05 5:35)
+    folder_list = _entries_to_folder_list(location, parse_listing(html))
+    print(f'Parsed {len(folder_list.folders_with_dates)} folders from HTML file')
+    return folder_list
 
 
 def parse_current_document(html):
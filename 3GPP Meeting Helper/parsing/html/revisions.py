@@ -1,16 +1,25 @@
+import datetime
 import os.path
-from typing import Tuple, NamedTuple, List
+import re
+from typing import Tuple, NamedTuple, List, Optional
 
 import html2text
 import pandas as pd
-import re
-import traceback
+
+from threegpp_common.ftp_listing import parse_listing
 
 
 class TdocRevision(NamedTuple):
     """NamedTuple containing the TDoc ID and the revision number (plus a '*' character if it is a draft)"""
     tdoc: str
     revision: str
+    # File size in bytes and modification date, if provided by the server listing
+    size: Optional[int] = None
+    date: Optional[datetime.datetime] = None
+
+
+tdoc_revision_regex = re.compile(r'S2-[\d]{7}r[\d]{2}')
+tdoc_regex = re.compile(r'S2-[\d]{7}')
 
 
 def extract_tdoc_revisions_from_html(
@@ -19,51 +28,81 @@ def extract_tdoc_revisions_from_html(
         is_path=False,
         ignore_revision=False) -> List[TdocRevision]:
     """
-    Extracts TDoc revisions from an HTML TDoc files being mentioned there
+    Extracts TDoc revisions from an HTML TDoc files being mentioned there. The server's file listing is parsed
+    directly, so that the file size and date can also be returned. Pages in another format (e.g. other listings
+    of the meeting server) fall back to searching the page text, without size and date
     Args:
         is_path: Whether html_content is actually a file path
         html_content: The HTML content to parse or a file path if is_path is True
         is_draft: Whether this file lists draft revisions (adds "*" to the revision name)
         ignore_revision: If True, only parses the TDoc number and ignores the revision (empty value)
 
-    Returns: A tuple containing the TDoc number and the revision
+    Returns: A list of TdocRevision objects containing the TDoc number, the revision and, if available, the size
+    and date of the file
 
     """
     if is_path:
         if html_content is None or not os.path.exists(html_content):
             return []
         try:
-            with open(html_content, 'r') as file:
+            with open(html_content, 'rb') as file:
                 html_content = file.read()
         except:
             print('Could not open file "{0}"'.format(html_content))
             return []
 
-    h = html2text.HTML2Text()
-    # Ignore converting links from HTML
-    h.ignore_links = True
-    tdoc_revisions_text = h.handle(html_content)
-    if ignore_revision:
-        tdocs = re.findall(r'S2-[\d]{7}', tdoc_revisions_text)
-    else:
-        tdocs = re.findall(r'S2-[\d]{7}r[\d]{2}', tdoc_revisions_text)
-    tdocs = list(set(tdocs))
+    if html_content is None or len(html_content) == 0:
+        return []
+
+    tdoc_search_regex = tdoc_regex if ignore_revision else tdoc_revision_regex
+    found_tdocs = {}
+    for entry in parse_listing(html_content):
+        if entry.is_dir:
+            continue
+        tdocs = tdoc_search_regex.findall(entry.name)
+        if len(tdocs) == 0:
+            tdocs = tdoc_search_regex.findall(entry.url.rsplit('/', 1)[-1])
+        for tdoc in tdocs:
+            if tdoc not in found_tdocs:
+                found_tdocs[tdoc] = (entry.size, entry.mtime)
+
+    if len(found_tdocs) == 0:
+        for tdoc in extract_tdocs_from_text(html_content, tdoc_search_regex):
+            found_tdocs[tdoc] = (None, None)
 
     print('Extracting TDoc revisions: text length={0}, {1} TDoc revisions found. ignore_revisions={2}, is_draft={3}'.format(
-        len(tdoc_revisions_text),
-        len(tdocs),
+        len(html_content),
+        len(found_tdocs),
         ignore_revision,
         is_draft))
 
     if ignore_revision:
-        tdoc_list = [TdocRevision(tdoc, '') for tdoc in tdocs]
+        tdoc_list = [TdocRevision(tdoc, '', size, date) for tdoc, (size, date) in found_tdocs.items()]
     else:
-        if not is_draft:
-            tdoc_list = [TdocRevision(tdoc[0:-3], tdoc[-2:]) for tdoc in tdocs]
-        else:
-            tdoc_list = [TdocRevision(tdoc[0:-3], tdoc[-2:] + '*') for tdoc in tdocs]
+        draft_suffix = '*' if is_draft else ''
+        tdoc_list = [TdocRevision(tdoc[0:-3], tdoc[-2:] + draft_suffix, size, date)
+                     for tdoc, (size, date) in found_tdocs.items()]
     return tdoc_list
 
+
+def extract_tdocs_from_text(html_content, tdoc_search_regex: re.Pattern) -> List[str]:
+    """
+    Searches TDoc IDs in the text of any HTML page (the original extraction, used if the page is not a file listing)
+    Args:
+        html_content: The HTML content (str or bytes)
+        tdoc_search_regex: The TDoc (or TDoc revision) regex
+
+    Returns: The TDoc IDs found, without duplicates
+
+    """
+    if isinstance(html_content, bytes):
+        html_content = html_content.decode('utf-8', errors='replace')
+    h = html2text.HTML2Text()
+    # Ignore converting links from HTML
+    h.ignore_links = True
+    return list(dict.fromkeys(tdoc_search_regex.findall(h.handle(html_content))))
+
+
 def revisions_file_to_dataframe(
         revisions_file: str,
         meeting_tdocs: pd.DataFrame,
@@ -75,7 +114,8 @@ def revisions_file_to_dataframe(
         meeting_tdocs: A TDoc list to which to add in "Revisions" column the last revision
         drafts_file: An optional drafts file to extract
 
-    Returns:
+    Returns: The TDoc list with the added "Revisions" column and a DataFrame indexed by TDoc containing one row
+    per revision (columns "Revisions", "Size" and "Date")
 
     """
     try:
@@ -90,11 +130,12 @@ def revisions_file_to_dataframe(
             print('Could not open drafts file {0}'.format(drafts_file))
             # traceback.print_exc()
 
-        df = pd.DataFrame(revision_list, columns=['Tdoc', 'Revisions'])
+        df = pd.DataFrame(revision_list, columns=['Tdoc', 'Revisions', 'Size', 'Date'])
         # df["Revisions"] = df[["Revisions"]].apply(pd.to_numeric) # We now also have drafts
         # print(revision_list)
 
-        df_per_tdoc = df.groupby("Tdoc")
+        # Size and date are per-revision information. Only the last revision is added to the TDoc list
+        df_per_tdoc = df[['Tdoc', 'Revisions']].groupby("Tdoc")
         maximums = df_per_tdoc.max()
         maximums.sort_values(by='Revisions', ascending=False, inplace=True)
         maximums = maximums.reset_index()
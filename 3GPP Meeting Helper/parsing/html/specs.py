@@ -2,7 +2,9 @@ import re
 # https://stackoverflow.com/questions/52623204/how-to-specify-method-return-type-list-of-what-in-python
 # Edit: With the new 3.9 version of Python, you can annotate types without importing from the typing module
 from typing import List
+from urllib.parse import unquote
 
+from threegpp_common.ftp_listing import parse_listing
 from parsing.spec_types import SpecType, SpecReleases, SpecSeries, SpecFile, SpecVersionMapping
 from server.common.server_utils import WiEntry
 
@@ -51,7 +53,7 @@ spec_zipfile_regex = re.compile(r'([\d]{5}(-[\d]{1,2})?)-([\d\w]*).zip')
 spec_related_wis_regex = re.compile(r'(?P<uid>\d+) *\| *(?P<acronym>[\w, -_]+) *\| *(?P<name>[\w, -()-]+) *\| *(?P<groups>[\w, ]+) *\|')
 
 def extract_spec_files_from_spec_folder(
-        specs_page_markup: str,
+        specs_page_html: str | bytes,
         base_url: str,
         release: str,
         series: str,
@@ -59,10 +61,11 @@ def extract_spec_files_from_spec_folder(
     """
     Extracts the 3GPP series information from the HTML of a release,
     e.g., https://www.3gpp.org/ftp/Specs/latest/Rel-18/23_series. Also works for spec archive pages, e.g.,
-    https://www.3gpp.org/ftp/Specs/archive/23_series/23.206
+    https://www.3gpp.org/ftp/Specs/archive/23_series/23.206. The folder listing is parsed with the shared listing
+    parser (links of the page if it is not a listing)
     Args:
         auto_fill: Whether the list should auto-fill series based on the spec number
-        specs_page_markup (str): Markup content from which to extract the releases information
+        specs_page_html (str): HTML of the folder listing from which to extract the spec files
         base_url (str): URL where this HTML was extracted. Note that it should NOT end in '/'
         release (str): The release number (not folder) this extraction relates to
         series (str): The series number (not folder) this extraction relates to
@@ -70,13 +73,17 @@ def extract_spec_files_from_spec_folder(
     Returns:
         list(SpecFile): List of specs found in the 3GPP site
     """
-    # Need to account to TR numbers and old release numbers. Examples:
-    # 23700-07-h00.zip, 23003-aa0.zip, 23034-800.zip
-
     print(f'Base URL: {base_url}')
-    versions = [(m.group(0), m.group(1), m.group(3)) for m in spec_zipfile_regex.finditer(specs_page_markup)]
-    versions = [v for v in versions if len(v[1]) > 2]
-    print(f'Versions: {versions}')
+    entries = parse_listing(specs_page_html, base_url=base_url + '/', fallback_to_links=True)
+    versions = []
+    for entry in entries:
+        if entry.is_dir:
+            continue
+        file_name = unquote(entry.url.rsplit('/', 1)[-1])
+        m = spec_zipfile_regex.fullmatch(file_name)
+        if m is not None and len(m.group(1)) > 2:
+            versions.append((m.group(0), m.group(1), m.group(3), entry.url))
+    print(f'Versions: {[v[0:3] for v in versions]}')
     specs = [
         SpecFile(
             v[0],
@@ -85,7 +92,7 @@ def extract_spec_files_from_spec_folder(
             series,
             release,
             base_url,
-            base_url + '/' + v[0]) for v in versions]
+            v[3]) for v in versions]
 
     if auto_fill:
         specs_autofill = []
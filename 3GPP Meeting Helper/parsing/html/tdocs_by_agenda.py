@@ -1,5 +1,4 @@
 import datetime
-import hashlib
 import os
 import pickle
 import re
@@ -15,6 +14,9 @@ from parsing.html.common_tools import parse_tdoc_comments
 from parsing.html.tdocs_by_agenda_v3 import parse_tdocs_by_agenda_v3
 from server.common.server_utils import decode_string
 from tdoc.utils import title_cr_regex
+from threegpp_common.cache_governor import CacheGovernor
+from threegpp_common.fingerprint import Fingerprint
+from threegpp_common.tracing import Tracing
 
 
 class TdocsByAgendaData(object):
@@ -137,6 +139,7 @@ class TdocsByAgendaData(object):
                             if cache['cache_version'] == current_cache_version:
                                 dataframe = cache['tdocs']
                                 dataframe_from_cache = True
+                                CacheGovernor.touch(cache_file_name)
                                 print('Loaded TDocsByAgenda from file cache: {0}'.format(cache_file_name))
                                 remove_old_cache = False
                             else:
@@ -152,8 +155,11 @@ class TdocsByAgendaData(object):
                         'Could not load file cache for meeting {0}, hash {1}'.format(meeting_server_folder, html_hash))
                     traceback.print_exc()
 
+                Tracing.cache_access('tdocs_by_agenda_file_cache', dataframe_from_cache)
+
             if not dataframe_from_cache:
-                dataframe = TdocsByAgendaData.read_tdocs_by_agenda_v2(raw_html, force_html=True)
+                with Tracing.span('parse.tdocs_by_agenda', meeting=meeting_server_folder, bytes=len(raw_html)):
+                    dataframe = TdocsByAgendaData.read_tdocs_by_agenda_v2(raw_html, force_html=True)
 
         # Cleanup Unicode characters (see https://stackoverflow.com/questions/42306755/how-to-remove-illegal-characters-so-a-dataframe-can-write-to-excel)
         if not dataframe_from_cache:
@@ -468,11 +474,9 @@ def get_tdocs_by_agenda_with_cache(path_or_html, meeting_server_folder='') -> Td
     if len(path_or_html) > 1000:
         print('TDocsByAgenda retrieval based on HTML content')
 
-        # Changed to hashlib as it is reinitialized between sessions.
+        # Not hash(), as it is reinitialized between sessions.
         # See https://stackoverflow.com/questions/27522626/hash-function-in-python-3-3-returns-different-results-between-sessions
-        m = hashlib.md5()
-        m.update(path_or_html)
-        html_hash = m.hexdigest()
+        html_hash = Fingerprint.bytes(path_or_html)
 
         # Retrieve
         if html_hash in tdocs_by_document_cache:
@@ -504,6 +508,10 @@ def get_tdocs_by_agenda_with_cache(path_or_html, meeting_server_folder='') -> Td
                         # Pickle the 'data' dictionary using the highest protocol available.
                         pickle.dump(data_to_save, f, pickle.HIGHEST_PROTOCOL)
                         print('Saved TDocsByAgenda cache to file {0}'.format(cache_file_name))
+                    CacheGovernor.register(
+                        cache_file_name,
+                        CacheGovernor.PICKLE,
+                        meeting=meeting_server_folder)
             except:
                 print('Could not cache TDocsByAgenda for meeting {0}'.format(meeting_server_folder))
                 print('Object to serialize:')
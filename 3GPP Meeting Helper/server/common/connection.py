@@ -1,7 +1,10 @@
-import re
+import hashlib
+import threading
+import time
 import traceback
+from contextlib import contextmanager
 from ftplib import FTP
-from typing import NamedTuple, Any, Dict
+from typing import NamedTuple, Any, Dict, Callable
 from urllib.parse import urlparse, quote_plus
 
 import requests
@@ -10,6 +13,12 @@ from cachecontrol import CacheControl
 from cachecontrol.caches import FileCache
 
 import config.networking
+import server.common.network_utils
+from threegpp_common.cache_governor import CacheGovernor
+from threegpp_common.host_concurrency import HostConcurrency
+from threegpp_common.tracing import Tracing
+from threegpp_common.url_resolver import URLResolver
+from threegpp_common.ftp_listing import parse_ftp_list_lines
 from utils.local_cache import get_webcache_file, file_exists
 
 # Trick to not get a 403 forbidden response
@@ -35,17 +44,117 @@ initialized_http_session = False
 http_session: CacheControl = None
 
 
+class GovernedFileCache(FileCache):
+    """
+    HTTP FileCache whose entries are registered in the cache governor (threegpp_common.cache_governor) so that the cache
+    size is limited
+    """
+
+    def get(self, key: str) -> bytes | None:
+        value = super().get(key)
+        if value is not None:
+            CacheGovernor.touch(self._fn(key))
+        return value
+
+    def set(self, key: str, value: bytes, expires=None) -> None:
+        super().set(key, value, expires=expires)
+        CacheGovernor.register(self._fn(key), CacheGovernor.HTTP)
+
+
 def initialize_http_session():
     global initialized_http_session, http_session
 
     # Set cache
     file_cache_path = get_webcache_file()
-    http_session = CacheControl(non_cached_http_session, cache=FileCache(file_cache_path))
+    http_session = CacheControl(non_cached_http_session, cache=GovernedFileCache(file_cache_path))
 
     initialized_http_session = True
     print(f'Created Cached HTTP Session. File cache path: {file_cache_path}')
 
 
+class RateLimiter:
+    """
+    Token bucket limiting the number of requests per minute. Used for background traffic (e.g. TDoc prefetching) so
+    that it does not compete with the downloads requested by the user
+    """
+
+    def __init__(self, requests_per_minute: float, burst: int = 1):
+        self.requests_per_minute = requests_per_minute
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> float:
+        """
+        Takes a token if available
+        Returns: 0 if a token was taken, otherwise the seconds to wait until the next token is available
+        """
+        with self._lock:
+            now = time.monotonic()
+            refill_rate_s = self.requests_per_minute / 60
+            self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * refill_rate_s)
+            self._last_refill = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / refill_rate_s
+
+    def acquire(self, should_stop: Callable[[], bool] | None = None) -> bool:
+        """
+        Blocks until a token is available
+        Args:
+            should_stop: Checked while waiting. Allows cancelling the wait
+
+        Returns: Whether a token was acquired (False if the wait was cancelled)
+        """
+        while True:
+            wait_s = self.try_acquire()
+            if wait_s == 0:
+                return True
+            if should_stop is not None and should_stop():
+                return False
+            time.sleep(min(wait_s, 1))
+
+
+# Shared by all background downloads. Requests per minute can be changed in config.ini ([PREFETCH] section)
+background_rate_limiter = RateLimiter(config.networking.NetworkingConfig.prefetch_downloads_per_minute)
+
+# Requests done within background_requests() do not count as user activity
+_request_context = threading.local()
+last_foreground_request_time = 0.0
+
+
+@contextmanager
+def background_requests():
+    """
+    Marks the requests done by this thread as background (low-priority) traffic
+    """
+    _request_context.background = True
+    try:
+        yield
+    finally:
+        _request_context.background = False
+
+
+def wait_for_foreground_idle(idle_s: float, should_stop: Callable[[], bool] | None = None) -> bool:
+    """
+    Waits until no user-triggered (foreground) request has been sent for idle_s seconds
+    Args:
+        idle_s: The seconds without foreground requests to wait for
+        should_stop: Checked while waiting. Allows cancelling the wait
+
+    Returns: Whether the network is idle (False if the wait was cancelled)
+    """
+    while True:
+        remaining_s = last_foreground_request_time + idle_s - time.monotonic()
+        if remaining_s <= 0:
+            return True
+        if should_stop is not None and should_stop():
+            return False
+        time.sleep(min(remaining_s, 1))
+
+
 # https://stackoverflow.com/questions/60171502/requests-get-is-very-slow
 
 class HttpRequestTimeout(NamedTuple):
@@ -89,6 +198,8 @@ def get_remote_file(
     Returns: The data or if there is an error None
 
     """
+    if use_cached_file_if_available and cached_file_to_return_if_error_or_cache is not None:
+        Tracing.cache_access('local_file', file_exists(cached_file_to_return_if_error_or_cache))
     if (use_cached_file_if_available and
             (cached_file_to_return_if_error_or_cache is not None) and
             file_exists(cached_file_to_return_if_error_or_cache)):
@@ -103,6 +214,9 @@ def get_remote_file(
 
     if cached_file_to_return_if_error_or_cache is not None:
         print(f'Returning {cached_file_to_return_if_error_or_cache} in case of HTTP(s) error')
+    if not getattr(_request_context, 'background', False):
+        global last_foreground_request_time
+        last_foreground_request_time = time.monotonic()
     try:
         o = urlparse(url)
     except Exception as e:
@@ -118,13 +232,19 @@ def get_remote_file(
 
             if not initialized_http_session:
                 initialize_http_session()
+            with (Tracing.span('http.fetch', url=url, cached_session=cache) as trace_span,
+                  HostConcurrency.slot(url) as slot):
+                if cache:
+                    print('HTTP cached GET {0}'.format(url))
+                    # r = requests.get(url, timeout=timeout_tuple)
+                    r = http_session.get(url, timeout=timeout_tuple)
+                else:
+                    print('HTTP non-cached GET {0}'.format(url))
+                    r = non_cached_http_session.get(url, timeout=timeout_tuple)
+                slot.record_response(r)
+                trace_span.set(status=r.status_code, bytes=len(r.content))
             if cache:
-                print('HTTP cached GET {0}'.format(url))
-                # r = requests.get(url, timeout=timeout_tuple)
-                r = http_session.get(url, timeout=timeout_tuple)
-            else:
-                print('HTTP non-cached GET {0}'.format(url))
-                r = non_cached_http_session.get(url, timeout=timeout_tuple)
+                Tracing.cache_access('http_cache', getattr(r, 'from_cache', False))
             if r.status_code != 200:
                 print(f'HTTP GET {url}: {r.status_code}, {r.reason}.\nHeaders: \n{r.headers}\nContent: \n{r.content}')
                 if cached_file_to_return_if_error_or_cache is not None:
@@ -182,10 +302,9 @@ def get_remote_file(
                             try:
                                 ftp.cwd(folder_to_test)
                                 ftp.retrlines('LIST', handle_binary_dir)
-                                folder_content_matches = [folder_ftp_names_regex.match(e) for e in dir_data]
-                                folder_content_matches = ['{0}/{1}'.format(folder_to_test, e.group(1)) for e in
-                                                          folder_content_matches if e is not None]
-                                update_folders.extend(folder_content_matches)
+                                update_folders.extend([
+                                    e.url for e in parse_ftp_list_lines(dir_data, base_url=folder_to_test)
+                                    if e.is_dir and 'update' in e.name.lower()])
                             except Exception as e:
                                 print(f'Could not scan directories in dir {folder_to_test} in FTP server: {e}')
                         found_in_update_folder = False
@@ -209,6 +328,8 @@ def get_remote_file(
             except Exception as e:
                 print(f'FTP {o.netloc} RETR {o.path} ERROR: {e}')
     except Exception as e:
+        if isinstance(e, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+            server.common.network_utils.report_failed_request(url)
         if cached_file_to_return_if_error_or_cache is not None:
             try:
                 # Read from cache
@@ -227,7 +348,108 @@ def get_remote_file(
         return None
 
 
-folder_ftp_names_regex = re.compile(r'[\d-]+[ ]+.*[ ]+<DIR>[ ]+(.*[uU][pP][dD][aA][tT][eE].*)')
+def probe_remote_file(url: str, timeout: HttpRequestTimeout = None) -> int | None:
+    """
+    Checks whether a remote file exists without downloading it (HTTP HEAD)
+    Args:
+        url: The URL of the file (http://, https://)
+        timeout: Timeout value for the HTTP connection
+
+    Returns: The HTTP status code or None if the server could not be reached (or the URL is not HTTP)
+    """
+    try:
+        o = urlparse(url)
+        if o.scheme not in ('http', 'https'):
+            return None
+        if timeout is None:
+            timeout = timeout_values
+        with Tracing.span('http.probe', url=url) as trace_span:
+            r = non_cached_http_session.head(
+                url,
+                timeout=(timeout.connect_timeout, timeout.read_timeout),
+                allow_redirects=True)
+            trace_span.set(status=r.status_code)
+        return r.status_code
+    except Exception as e:
+        print(f'Could not probe {url}: {e}')
+        return None
+
+
+# Probes of the candidate URLs of TDocs (see threegpp_common.url_resolver)
+URLResolver.set_probe_function(lambda url, timeout: probe_remote_file(url, HttpRequestTimeout(*timeout)))
+
+
+class RemoteFileValidators(NamedTuple):
+    """What is needed to check whether a remote file changed since it was last retrieved"""
+    etag: str | None
+    last_modified: str | None
+    # SHA-256 of the content. Used when the server does not answer conditional requests with "304 Not Modified"
+    digest: str | None
+
+
+class ConditionalFetchResult(NamedTuple):
+    """Result of get_remote_file_if_modified"""
+    # HTTP status code. None if the server could not be reached
+    status_code: int | None
+    # Whether the content changed. If False, content is None
+    modified: bool
+    content: bytes | None
+    validators: RemoteFileValidators | None
+
+
+def get_remote_file_if_modified(
+        url: str,
+        validators: RemoteFileValidators | None = None,
+        timeout: HttpRequestTimeout = None) -> ConditionalFetchResult:
+    """
+    Downloads a file (e.g. a folder listing) only if it changed since it was last retrieved (conditional HTTP GET
+    with If-None-Match/If-Modified-Since). If the server returns the content anyway, the content hash is compared
+    Args:
+        url: The URL of the file (http://, https://)
+        validators: The validators returned by the last call for this URL. None to always download the file
+        timeout: Timeout value for the HTTP connection
+
+    Returns: The status code, whether the content changed, the content (if changed) and the new validators
+    """
+    request_headers = {}
+    if validators is not None:
+        if validators.etag is not None:
+            request_headers['If-None-Match'] = validators.etag
+        if validators.last_modified is not None:
+            request_headers['If-Modified-Since'] = validators.last_modified
+    if timeout is None:
+        timeout = timeout_values
+    if not getattr(_request_context, 'background', False):
+        global last_foreground_request_time
+        last_foreground_request_time = time.monotonic()
+    try:
+        with (Tracing.span('http.conditional_fetch', url=url) as trace_span,
+              HostConcurrency.slot(url) as slot):
+            r = non_cached_http_session.get(
+                url,
+                headers=request_headers,
+                timeout=(timeout.connect_timeout, timeout.read_timeout))
+            slot.record_response(r)
+            trace_span.set(status=r.status_code, bytes=len(r.content))
+    except Exception as e:
+        print(f'Could not retrieve {url}: {e}')
+        return ConditionalFetchResult(None, False, None, validators)
+
+    if r.status_code == 304:
+        return ConditionalFetchResult(r.status_code, False, None, validators)
+    if r.status_code != 200:
+        print(f'HTTP GET {url}: {r.status_code}, {r.reason}')
+        return ConditionalFetchResult(r.status_code, False, None, validators)
+
+    content = r.content
+    new_validators = RemoteFileValidators(
+        etag=r.headers.get('ETag'),
+        last_modified=r.headers.get('Last-Modified'),
+        digest=hashlib.sha256(content).hexdigest())
+    if validators is not None and validators.digest == new_validators.digest:
+        return ConditionalFetchResult(r.status_code, False, None, new_validators)
+    return ConditionalFetchResult(r.status_code, True, content, new_validators)
+
 
 def set_http_proxy(in_vpn:bool=False):
     if http_proxies is None:
@@ -3,8 +3,14 @@ import re
 import socket
 import subprocess
 import json
+import threading
+import time
+from urllib.parse import urlparse
+
 import psutil
-from typing import Tuple, List, Dict, Any
+from typing import Tuple, List, Dict, Any, NamedTuple
+
+from config.networking import NetworkingConfig, private_server
 
 
 def _check_windows_vpn() -> Tuple[bool, List[Dict[str, str]]]:
@@ -167,3 +173,77 @@ def we_are_in_meeting_network():
     matches = [match for match in matches if match is not None]
     ip_is_meeting_ip = (len(matches) != 0)
     return ip_is_meeting_ip
+
+
+def get_route_addresses() -> Tuple[str, ...]:
+    """
+    Local addresses used to reach the private server and the Internet. A connected UDP socket does not send any
+    packet, so this is cheap enough to be called every few seconds. The addresses change when joining or leaving a
+    network or when a VPN connects
+    Returns: The local address for each destination. Empty if there is no route
+    """
+    addresses = []
+    for destination in (private_server, '1.1.1.1'):
+        try:
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+                s.connect((destination, 80))
+                addresses.append(s.getsockname()[0])
+        except OSError:
+            addresses.append('')
+    return tuple(addresses)
+
+
+class NetworkStatus(NamedTuple):
+    in_meeting_network: bool
+    vpn_active: bool
+    active_vpns: List[Dict[str, str]]
+
+
+_last_status: NetworkStatus | None = None
+_last_route_addresses: Tuple[str, ...] | None = None
+_last_full_check = 0.0
+_full_check_requested = False
+_status_lock = threading.Lock()
+
+
+def get_network_status() -> NetworkStatus:
+    """
+    Meeting network and VPN state. The full check (is_vpn_active() spawns PowerShell on Windows) only runs when the
+    route addresses changed, after report_failed_request() or every NetworkingConfig.network_full_check_interval_s.
+    Otherwise, the last result is returned
+    Returns: The network status
+    """
+    global _last_status, _last_route_addresses, _last_full_check, _full_check_requested
+    route_addresses = get_route_addresses()
+    with _status_lock:
+        if (_last_status is not None and
+                not _full_check_requested and
+                route_addresses == _last_route_addresses and
+                time.monotonic() - _last_full_check < NetworkingConfig.network_full_check_interval_s):
+            return _last_status
+
+    vpn_active, active_vpns = is_vpn_active()
+    status = NetworkStatus(we_are_in_meeting_network(), vpn_active, active_vpns)
+    with _status_lock:
+        if _last_route_addresses is not None and route_addresses != _last_route_addresses:
+            print(f'Network addresses changed from {_last_route_addresses} to {route_addresses}')
+        _last_status = status
+        _last_route_addresses = route_addresses
+        _last_full_check = time.monotonic()
+        _full_check_requested = False
+    return status
+
+
+def report_failed_request(url: str):
+    """
+    Forces a full network check on the next get_network_status() call if a request to the private server failed
+    (e.g. because the meeting network was left)
+    Args:
+        url: The URL that could not be retrieved (timeout, connection error)
+    """
+    global _full_check_requested
+    if urlparse(url).hostname != private_server:
+        return
+    print(f'Request to {private_server} failed. Checking the network state again')
+    with _status_lock:
+        _full_check_requested = True
@@ -11,6 +11,7 @@ from config.networking import private_server, public_server, wg_folder_public_se
 from server.common.connection import get_remote_file
 from server.common.network_utils import we_are_in_meeting_network
 from server.common.server_enums import ServerType, DocumentType, TdocType, WorkingGroup, DocumentFileType
+from threegpp_common.host_concurrency import HostConcurrency
 from utils.local_cache import get_sa2_root_folder_local_cache, create_folder_if_needed
 
 """Retrieves data from the 3GPP web server"""
@@ -283,7 +284,8 @@ def batch_download_file_to_location(
         files_to_download: List of URLs to download and target local files to download to
     """
     # See https://docs.python.org/3/library/concurrent.futures.html
-    with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
+    # Parallel requests are limited per host by threegpp_common.host_concurrency. The pool is sized to the maximum
+    with concurrent.futures.ThreadPoolExecutor(max_workers=HostConcurrency.MAX_CONCURRENCY) as executor:
         future_to_url = {executor.submit(
             download_file_to_location,
             file_to_download.remote_url,
@@ -0,0 +1,313 @@
+import hashlib
+import os.path
+import threading
+import traceback
+from enum import Enum
+from typing import List, NamedTuple, Callable, Dict
+
+import server.common.connection
+import utils.local_cache
+from config.networking import NetworkingConfig
+from threegpp_common.folder_watcher import FolderWatcher, ListingEvent as FolderListingEvent
+from threegpp_common.ftp_listing import parse_listing
+from server.common.connection import RemoteFileValidators
+from server.common.server_enums import ServerType, DocumentType, TdocType
+from server.common.server_utils import get_document_or_folder_url
+
+# Background watcher for the Inbox, Revisions and Drafts folders of the selected meeting. The folders are polled by
+# threegpp_common.folder_watcher.FolderWatcher with conditional requests (see
+# server.common.connection.get_remote_file_if_modified). This module adds the meeting to the events and keeps the
+# local copies of the Revisions and Drafts listings up to date, so that the listings are not downloaded and parsed
+# again by each of the subscribers (e.g. the prefetcher, the TDocs table).
+
+
+class WatchedFolderType(Enum):
+    INBOX = 1
+    REVISIONS = 2
+    DRAFTS = 3
+
+
+class ListingEventType(Enum):
+    NEW_TDOC = 1
+    NEW_REVISION = 2
+    SIZE_CHANGED = 3
+
+
+_event_types = {
+    FolderWatcher.NEW_TDOC: ListingEventType.NEW_TDOC,
+    FolderWatcher.NEW_REVISION: ListingEventType.NEW_REVISION,
+    FolderWatcher.SIZE_CHANGED: ListingEventType.SIZE_CHANGED,
+}
+
+
+class ListingEvent(NamedTuple):
+    """A change in a watched folder"""
+    event_type: ListingEventType
+    meeting_folder: str
+    folder_type: WatchedFolderType
+    # e.g. S2-2401234
+    tdoc_id: str
+    # e.g. "01", "01*" for drafts (same format as parsing.html.revisions.TdocRevision). Empty for TDocs
+    revision: str
+    size: int | None
+    previous_size: int | None
+    url: str
+
+
+class _WatchedFolder(NamedTuple):
+    """A folder of the watched meeting"""
+    meeting_folder: str
+    folder_type: WatchedFolderType
+    url_candidates: List[str]
+    # The local copy of the listing (e.g. the revisions file), kept up to date for the rest of the application
+    local_file: str | None
+
+    @property
+    def url(self) -> str:
+        """The URL identifying the folder in the watcher"""
+        return FolderWatcher.folder_key(self.url_candidates[0])
+
+
+def _to_revision(revision: str, is_draft: bool) -> str:
+    """'r01' -> '01' ('01*' for drafts)"""
+    if revision == '':
+        return ''
+    return revision[1:] + ('*' if is_draft else '')
+
+
+def get_tdoc_of_file(file_name: str, is_draft: bool = False) -> tuple[str, str] | None:
+    """
+    Gets the TDoc and revision of a file in a listing
+    Args:
+        file_name: The file name, e.g. S2-2401234r01.zip
+        is_draft: Whether the file is in the drafts folder (adds "*" to the revision)
+
+    Returns: A (TDoc, revision) tuple, e.g. ('S2-2401234', '01'), or None if the file is not a TDoc
+    """
+    tdoc_and_revision = FolderWatcher.split_tdoc_file_name(file_name)
+    if tdoc_and_revision is None:
+        return None
+    tdoc_id, revision = tdoc_and_revision
+    return tdoc_id, _to_revision(revision, is_draft)
+
+
+def to_meeting_events(
+        events: List[FolderListingEvent],
+        meeting_folder: str,
+        folder_type: WatchedFolderType) -> List[ListingEvent]:
+    """Adds the meeting and folder type to the events of a folder"""
+    is_draft = folder_type == WatchedFolderType.DRAFTS
+    return [ListingEvent(
+        _event_types[event.kind],
+        meeting_folder,
+        folder_type,
+        event.tdoc,
+        _to_revision(event.revision, is_draft),
+        event.size,
+        event.previous_size,
+        event.url) for event in events]
+
+
+_subscribers: List[Callable[[List[ListingEvent]], None]] = []
+# Meeting folders known to the watcher, by URL (see _WatchedFolder.url). Only the folders of the watched meeting are
+# polled
+_folders: Dict[str, _WatchedFolder] = {}
+_watched_folders: List[_WatchedFolder] = []
+# (meeting folder, whether the private server is used)
+_watched_meeting: tuple[str, bool] | None = None
+_lock = threading.Lock()
+_watcher: FolderWatcher | None = None
+
+
+def subscribe(callback: Callable[[List[ListingEvent]], None]):
+    """
+    Registers a function to be called with the events of each changed folder. Called from the watcher thread, so GUI
+    updates need to be passed to the GUI thread
+    Args:
+        callback: The function to call. Subscribing the same function again has no effect
+    """
+    with _lock:
+        if callback not in _subscribers:
+            _subscribers.append(callback)
+
+
+def unsubscribe(callback: Callable[[List[ListingEvent]], None]):
+    with _lock:
+        if callback in _subscribers:
+            _subscribers.remove(callback)
+
+
+def _publish(folder_url: str, events: List[FolderListingEvent]):
+    with _lock:
+        folder = _folders.get(folder_url)
+        subscribers = list(_subscribers)
+    if folder is None:
+        return
+    meeting_events = to_meeting_events(events, folder.meeting_folder, folder.folder_type)
+    print(f'{len(events)} changes in {folder.folder_type.name} folder of {folder.meeting_folder}')
+    for callback in subscribers:
+        try:
+            callback(meeting_events)
+        except Exception as e:
+            print(f'Could not process folder events: {e}')
+            traceback.print_exc()
+
+
+def _fetch(url: str, fetch_state: dict) -> tuple[bytes | None, dict]:
+    """
+    Fetch function of the watcher: conditional GET of a folder of the watched meeting. The candidate URLs are tried
+    until one answers, which is then used for the next polls. The local copy of the listing is updated
+    """
+    with _lock:
+        folder = _folders.get(url)
+    if 'url' in fetch_state:
+        url_candidates = [fetch_state['url']]
+    elif folder is not None:
+        url_candidates = folder.url_candidates
+    else:
+        url_candidates = [url]
+
+    result = None
+    with server.common.connection.background_requests():
+        for url_candidate in url_candidates:
+            result = server.common.connection.get_remote_file_if_modified(url_candidate, fetch_state.get('validators'))
+            if result.status_code in (200, 304):
+                break
+    if result is None or result.status_code not in (200, 304):
+        raise ConnectionError(f'Could not retrieve {url}: {result.status_code if result is not None else None}')
+
+    new_fetch_state = {'url': url_candidate, 'validators': result.validators}
+    if not result.modified:
+        return None, new_fetch_state
+    if folder is not None and folder.local_file is not None:
+        utils.local_cache.write_data_and_open_file(result.content, folder.local_file)
+    return result.content, new_fetch_state
+
+
+def get_watcher() -> FolderWatcher:
+    """The watcher polling the folders. Created with the polling intervals of the configuration"""
+    global _watcher
+    with _lock:
+        if _watcher is None:
+            _watcher = FolderWatcher(
+                _fetch,
+                min_interval_s=NetworkingConfig.watcher_min_interval_s,
+                max_interval_s=NetworkingConfig.watcher_max_interval_s,
+                backoff_factor=NetworkingConfig.watcher_backoff_factor)
+            _watcher.subscribe(_publish)
+        return _watcher
+
+
+def _get_meeting_folders(meeting_folder: str, use_private_server: bool) -> List[_WatchedFolder]:
+    server_type = ServerType.PRIVATE if use_private_server else ServerType.PUBLIC
+    folders = [
+        _WatchedFolder(
+            meeting_folder,
+            WatchedFolderType.INBOX,
+            get_document_or_folder_url(server_type, DocumentType.INBOX_FOLDER, meeting_folder),
+            local_file=None),
+        _WatchedFolder(
+            meeting_folder,
+            WatchedFolderType.REVISIONS,
+            get_document_or_folder_url(ServerType.PUBLIC, DocumentType.TDOC, meeting_folder, TdocType.REVISION),
+            local_file=utils.local_cache.get_local_revisions_filename(meeting_folder)),
+        _WatchedFolder(
+            meeting_folder,
+            WatchedFolderType.DRAFTS,
+            get_document_or_folder_url(ServerType.PUBLIC, DocumentType.TDOC, meeting_folder, TdocType.DRAFT),
+            local_file=utils.local_cache.get_local_drafts_filename(meeting_folder))
+    ]
+    folders = [folder for folder in folders if len(folder.url_candidates) > 0]
+    with _lock:
+        _folders.update({folder.url: folder for folder in folders})
+    return folders
+
+
+def _set_baseline(watcher: FolderWatcher, folder: _WatchedFolder):
+    # A listing downloaded before (e.g. together with the TdocsByAgenda) is the starting point
+    if folder.local_file is None or not os.path.exists(folder.local_file):
+        return
+    try:
+        with open(folder.local_file, 'rb') as f:
+            local_listing = f.read()
+        watcher.set_baseline(
+            folder.url,
+            entries=parse_listing(local_listing, base_url=folder.url, fallback_to_links=True),
+            fetch_state={'validators': RemoteFileValidators(None, None, hashlib.sha256(local_listing).hexdigest())})
+    except Exception as e:
+        print(f'Could not read {folder.local_file}: {e}')
+
+
+def watch_meeting(meeting_folder: str, use_private_server: bool = False):
+    """
+    Starts watching the Inbox, Revisions and Drafts folders of a meeting. Any other meeting is not watched anymore
+    Args:
+        meeting_folder: The meeting folder name in the 3GPP server
+        use_private_server: Whether to watch the Inbox of the private server (10.10.10.10)
+    """
+    global _watched_meeting
+    if meeting_folder is None:
+        return
+    with _lock:
+        if _watched_meeting == (meeting_folder, use_private_server):
+            return
+    stop_watching()
+    watcher = get_watcher()
+    try:
+        folders = _get_meeting_folders(meeting_folder, use_private_server)
+    except Exception as e:
+        print(f'Could not watch folders of {meeting_folder}: {e}')
+        traceback.print_exc()
+        folders = []
+    with _lock:
+        _watched_meeting = (meeting_folder, use_private_server)
+        _watched_folders.extend(folders)
+    for folder in folders:
+        _set_baseline(watcher, folder)
+        watcher.watch(folder.url)
+    watcher.start()
+    print(f'Watching {len(folders)} folders of {meeting_folder}')
+
+
+def get_listing_file(meeting_folder: str, folder_type: WatchedFolderType) -> str | None:
+    """
+    Retrieves the local copy of the Revisions or Drafts listing of a meeting. The copy of the watched meeting is kept
+    up to date by the watcher and is returned as is. Otherwise, the listing is only downloaded if it changed since the
+    local copy was written (conditional request through the watcher, which also publishes the changes)
+    Args:
+        meeting_folder: The meeting folder name in the 3GPP server
+        folder_type: WatchedFolderType.REVISIONS or WatchedFolderType.DRAFTS
+
+    Returns: The path of the local copy, or None if the listing could not be retrieved
+    """
+    with _lock:
+        watched_folders = [folder for folder in _watched_folders
+                           if folder.meeting_folder == meeting_folder and folder.folder_type == folder_type]
+    if len(watched_folders) > 0 and os.path.exists(watched_folders[0].local_file):
+        return watched_folders[0].local_file
+
+    folders = [folder for folder in _get_meeting_folders(meeting_folder, use_private_server=False)
+               if folder.folder_type == folder_type]
+    if len(folders) == 0 or folders[0].local_file is None:
+        return None
+    folder = folders[0]
+    watcher = get_watcher()
+    _set_baseline(watcher, folder)
+    try:
+        watcher.refresh(folder.url)
+    except Exception as e:
+        print(f'Could not retrieve {folder.folder_type.name} folder of {meeting_folder}: {e}')
+        return None
+    return folder.local_file
+
+
+def stop_watching():
+    """Stops watching the folders of the current meeting"""
+    global _watched_meeting
+    with _lock:
+        folders = list(_watched_folders)
+        _watched_meeting = None
+        _watched_folders.clear()
+    if _watcher is not None:
+        for folder in folders:
+            _watcher.unwatch(folder.url)
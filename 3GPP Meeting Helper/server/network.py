@@ -26,12 +26,11 @@ def detect_3gpp_network_state(
     # some labels accordingly
 
     previous_state = gui.common.common_elements.tkvar_3gpp_wifi_available.get()
-    new_state = server.common.network_utils.we_are_in_meeting_network()
-
     previous_state_vpn = gui.common.common_elements.tkvar_3gpp_vpn_detected.get()
-    new_state_vpn_tuple = server.common.network_utils.is_vpn_active()
-    new_state_vpn = new_state_vpn_tuple[0]
-    active_vpns = new_state_vpn_tuple[1]
+    network_status = server.common.network_utils.get_network_status()
+    new_state = network_status.in_meeting_network
+    new_state_vpn = network_status.vpn_active
+    active_vpns = network_status.active_vpns
 
     if new_state:
         gui.common.common_elements.tkvar_3gpp_wifi_available.set(True)
@@ -86,4 +85,4 @@ def detect_3gpp_network_state(
         server.common.connection.set_http_proxy(new_state_vpn)
 
     if loop:
-        root.after(ms=interval_ms, func=lambda: detect_3gpp_network_state(root))
+        root.after(ms=interval_ms, func=lambda: detect_3gpp_network_state(root, interval_ms=interval_ms))
@@ -0,0 +1,354 @@
+import os.path
+import threading
+import traceback
+from typing import List, NamedTuple, Callable, Iterable, Set
+
+import pandas as pd
+
+import server.common.connection
+import server.folder_watcher
+import server.tdoc
+from config.networking import NetworkingConfig
+from parsing.html.revisions import extract_tdoc_revisions_from_html, TdocRevision
+from server.common.server_enums import ServerType
+from threegpp_common.tdoc_store import TDocStore
+from utils.threading import CancellationToken
+
+# Background prefetch of the TDocs that are likely to be opened next. During a meeting, TDocs are opened roughly in
+# agenda order, so the TDocs of the AI being discussed and of the following AIs are downloaded (low priority, see
+# server.common.connection.background_rate_limiter) into the local cache and the TDoc store.
+
+
+class PrefetchItem(NamedTuple):
+    """A TDoc (or TDoc revision, e.g. S2-2401234r01) to prefetch. Lower priority values are downloaded first"""
+    tdoc_id: str
+    priority: int
+    reason: str
+
+
+def _is_empty(value) -> bool:
+    return value is None or (isinstance(value, float) and pd.isna(value)) or str(value).strip() == ''
+
+
+def get_agenda_item_order(tdocs_df: pd.DataFrame, agenda_item_descriptions: dict[str, str] | None = None) -> List[str]:
+    """
+    Returns the AIs in the order in which they are treated
+    Args:
+        tdocs_df: The TDocs of the meeting (TdocsByAgendaData.tdocs)
+        agenda_item_descriptions: The AIs parsed from the agenda (see parsing.word.docx.import_agenda), in agenda
+        order. If not available, the order of the TdocsByAgenda file is used
+
+    Returns: The list of AIs
+    """
+    ais_in_tdocs = [ai for ai in pd.unique(tdocs_df['AI']) if not _is_empty(ai)]
+    if not agenda_item_descriptions:
+        return ais_in_tdocs
+    ai_order = [ai for ai in agenda_item_descriptions.keys() if ai in set(ais_in_tdocs)]
+    # AIs not in the agenda (e.g. added later) are placed at the end
+    ai_order.extend([ai for ai in ais_in_tdocs if ai not in agenda_item_descriptions])
+    return ai_order
+
+
+def get_current_agenda_item(
+        tdocs_df: pd.DataFrame,
+        ai_order: List[str],
+        last_opened_tdoc: str | None = None) -> str | None:
+    """
+    Guesses the AI being discussed
+    Args:
+        tdocs_df: The TDocs of the meeting (TdocsByAgendaData.tdocs)
+        ai_order: The AIs in agenda order (see get_agenda_item_order)
+        last_opened_tdoc: The TDoc last opened by the user, if any
+
+    Returns: The AI of the last opened TDoc if known. Otherwise, the first AI with TDocs without a result
+    """
+    if last_opened_tdoc is not None:
+        base_tdoc = last_opened_tdoc.replace('*', '')[0:10]
+        if base_tdoc in tdocs_df.index:
+            ai = tdocs_df.at[base_tdoc, 'AI']
+            if isinstance(ai, pd.Series):
+                ai = ai.iloc[0]
+            if not _is_empty(ai):
+                return ai
+
+    if 'Result' not in tdocs_df.columns:
+        return ai_order[0] if len(ai_order) > 0 else None
+    open_tdocs_ais = set(tdocs_df.loc[tdocs_df['Result'].map(_is_empty), 'AI'])
+    for ai in ai_order:
+        if ai in open_tdocs_ais:
+            return ai
+    return None
+
+
+def get_prefetch_plan(
+        tdocs_df: pd.DataFrame,
+        ai_order: List[str],
+        current_ai: str | None,
+        next_agenda_items: int = 2,
+        revisions: Iterable[TdocRevision] = (),
+        new_revisions: Iterable[TdocRevision] = (),
+        is_available: Callable[[str], bool] = lambda tdoc_id: False) -> List[PrefetchItem]:
+    """
+    Prioritizes the TDocs to prefetch:
+      - Priority 0: TDocs of the current AI (latest revision first)
+      - Priority 1..N: TDocs of the N following AIs
+      - Priority N+1: new revisions (since the last listing) of TDocs in other AIs
+    Args:
+        tdocs_df: The TDocs of the meeting (TdocsByAgendaData.tdocs)
+        ai_order: The AIs in agenda order (see get_agenda_item_order)
+        current_ai: The AI being discussed (see get_current_agenda_item)
+        next_agenda_items: How many AIs after the current one to prefetch
+        revisions: All revisions in the Inbox revisions listing
+        new_revisions: Revisions that appeared since the last time the listing was checked
+        is_available: Returns whether a TDoc is already locally available
+
+    Returns: The TDocs to download, sorted by priority
+    """
+    if current_ai is None or current_ai not in ai_order:
+        return []
+
+    current_ai_index = ai_order.index(current_ai)
+    ai_priority = {ai: priority for priority, ai in
+                   enumerate(ai_order[current_ai_index:current_ai_index + next_agenda_items + 1])}
+    other_ai_priority = len(ai_priority)
+
+    # Only the last revision of each TDoc is of interest
+    last_revision = {}
+    for revision in revisions:
+        if '*' not in revision.revision and revision.revision > last_revision.get(revision.tdoc, ''):
+            last_revision[revision.tdoc] = revision.revision
+    new_revision_tdocs = {revision.tdoc for revision in new_revisions if '*' not in revision.revision}
+
+    plan: List[PrefetchItem] = []
+    added: Set[str] = set()
+
+    def add(tdoc_id: str, priority: int, reason: str):
+        if tdoc_id in added or is_available(tdoc_id):
+            return
+        added.add(tdoc_id)
+        plan.append(PrefetchItem(tdoc_id=tdoc_id, priority=priority, reason=reason))
+
+    tdoc_ais = tdocs_df['AI']
+    for tdoc_id, ai in zip(tdoc_ais.index, tdoc_ais.values):
+        priority = ai_priority.get(ai)
+        if priority is None:
+            if tdoc_id in new_revision_tdocs and tdoc_id in last_revision:
+                add(f'{tdoc_id}r{last_revision[tdoc_id]}', other_ai_priority, 'new revision')
+            continue
+        if tdoc_id in last_revision:
+            add(f'{tdoc_id}r{last_revision[tdoc_id]}', priority, f'revision in AI {ai}')
+        add(tdoc_id, priority, f'AI {ai}')
+
+    # Stable sort: agenda order is kept within each priority
+    plan.sort(key=lambda item: item.priority)
+    return plan
+
+
+def is_tdoc_available(meeting_folder: str, tdoc_id: str) -> bool:
+    """
+    Whether a TDoc is already in the local cache or in the TDoc store (also filled by 3GPP Tools)
+    Args:
+        meeting_folder: The meeting folder name in the 3GPP server
+        tdoc_id: The TDoc ID, e.g. S2-2401234 or S2-2401234r01
+
+    Returns: Whether the TDoc needs not be downloaded
+    """
+    local_file = server.tdoc.get_local_filename_for_tdoc(meeting_folder, tdoc_id, create_dir=False)
+    if os.path.exists(local_file):
+        return True
+    return TDocStore.lookup(tdoc_id, meeting=meeting_folder) is not None
+
+
+class _PrefetchState:
+    """State of the prefetch for the meeting selected in the GUI"""
+
+    def __init__(self, meeting_folder: str, tdocs_df: pd.DataFrame, revisions_file: str | None,
+                 use_private_server: bool, agenda_item_descriptions: dict[str, str] | None):
+        self.meeting_folder = meeting_folder
+        self.tdocs_df = tdocs_df
+        self.revisions_file = revisions_file
+        self.use_private_server = use_private_server
+        self.ai_order = get_agenda_item_order(tdocs_df, agenda_item_descriptions)
+        self.revisions: List[TdocRevision] = []
+        self.known_revisions: Set[TdocRevision] | None = None
+        self.new_revisions: Set[TdocRevision] = set()
+        # Failed downloads are not retried for this meeting
+        self.attempted: Set[str] = set()
+        self.cancellation_token = CancellationToken()
+        # Set to refresh the plan before the refresh interval expires (e.g. the user opened a TDoc in another AI)
+        self.wakeup = threading.Event()
+
+    def cancel(self):
+        self.cancellation_token.cancel()
+        self.wakeup.set()
+
+
+_state: _PrefetchState | None = None
+_state_lock = threading.Lock()
+last_opened_tdoc: str | None = None
+
+
+def notify_tdoc_opened(tdoc_id: str | None):
+    """
+    Tells the prefetcher which TDoc the user opened, which is used to know the AI being discussed
+    Args:
+        tdoc_id: The TDoc ID
+    """
+    global last_opened_tdoc
+    if tdoc_id is None or tdoc_id == '':
+        return
+    last_opened_tdoc = tdoc_id
+    with _state_lock:
+        if _state is not None:
+            _state.wakeup.set()
+
+
+def _refresh_revisions(state: _PrefetchState):
+    """
+    Parses the Inbox revisions listing the first time. Afterwards, new revisions are received from the folder watcher
+    (see _on_folder_events), which also keeps the local revisions file up to date
+    """
+    if state.known_revisions is not None:
+        return
+    if state.revisions_file is None:
+        state.revisions_file = server.folder_watcher.get_listing_file(
+            state.meeting_folder, server.folder_watcher.WatchedFolderType.REVISIONS)
+
+    revisions = [TdocRevision(r.tdoc, r.revision) for r in
+                 extract_tdoc_revisions_from_html(state.revisions_file, is_path=True)]
+    state.known_revisions = set(revisions)
+    state.revisions = revisions
+
+
+def _on_folder_events(events: List[server.folder_watcher.ListingEvent]):
+    """Adds the revisions that appeared in the Inbox revisions folder and refreshes the prefetch plan"""
+    with _state_lock:
+        state = _state
+    if state is None or state.known_revisions is None:
+        return
+    new_revisions = [
+        TdocRevision(event.tdoc_id, event.revision) for event in events
+        if event.meeting_folder == state.meeting_folder and
+           event.folder_type == server.folder_watcher.WatchedFolderType.REVISIONS and
+           event.event_type == server.folder_watcher.ListingEventType.NEW_REVISION]
+    new_revisions = [revision for revision in new_revisions if revision not in state.known_revisions]
+    if len(new_revisions) == 0:
+        return
+    # Replaced instead of updated in place, as the prefetch thread may be iterating over them
+    state.revisions = state.revisions + new_revisions
+    state.known_revisions = state.known_revisions | set(new_revisions)
+    state.new_revisions = state.new_revisions | set(new_revisions)
+    state.wakeup.set()
+
+
+def _prefetch_next(state: _PrefetchState) -> PrefetchItem | None:
+    current_ai = get_current_agenda_item(state.tdocs_df, state.ai_order, last_opened_tdoc)
+    plan = get_prefetch_plan(
+        state.tdocs_df,
+        state.ai_order,
+        current_ai,
+        next_agenda_items=NetworkingConfig.prefetch_next_agenda_items,
+        revisions=state.revisions,
+        new_revisions=state.new_revisions,
+        is_available=lambda tdoc_id: tdoc_id in state.attempted or is_tdoc_available(state.meeting_folder, tdoc_id))
+    if len(plan) == 0:
+        return None
+    return plan[0]
+
+
+def _prefetch_task(state: _PrefetchState):
+    should_stop = lambda: state.cancellation_token.is_cancelled
+    connection = server.common.connection
+    with connection.background_requests():
+        _refresh_revisions(state)
+        n_downloaded = 0
+        while not should_stop():
+            # The plan is recalculated for every TDoc, as the current AI changes when the user opens a TDoc
+            next_item = _prefetch_next(state)
+            if next_item is None:
+                break
+            if not connection.wait_for_foreground_idle(NetworkingConfig.prefetch_foreground_idle_s, should_stop):
+                break
+            if not connection.background_rate_limiter.acquire(should_stop):
+                break
+            state.attempted.add(next_item.tdoc_id)
+            try:
+                retrieved_files, tdoc_url = server.tdoc.get_tdoc(
+                    meeting_folder_name=state.meeting_folder,
+                    tdoc_id=next_item.tdoc_id,
+                    server_type=ServerType.PRIVATE if state.use_private_server else ServerType.PUBLIC)
+                if retrieved_files is not None:
+                    n_downloaded += 1
+                    print(f'Prefetched {next_item.tdoc_id} ({next_item.reason})')
+            except Exception as e:
+                print(f'Could not prefetch {next_item.tdoc_id}: {e}')
+    if n_downloaded > 0:
+        print(f'Prefetched {n_downloaded} TDocs for {state.meeting_folder}')
+
+
+def start_prefetch(
+        meeting_folder: str,
+        tdocs_df: pd.DataFrame | None,
+        revisions_file: str | None = None,
+        use_private_server: bool = False,
+        agenda_item_descriptions: dict[str, str] | None = None):
+    """
+    Starts (or restarts with new data) the background prefetch for a meeting. Any prefetch for another meeting is
+    stopped
+    Args:
+        meeting_folder: The meeting folder name in the 3GPP server
+        tdocs_df: The TDocs of the meeting (TdocsByAgendaData.tdocs)
+        revisions_file: The local copy of the Inbox revisions listing, if already downloaded
+        use_private_server: Whether to download from the private server (10.10.10.10)
+        agenda_item_descriptions: The AIs parsed from the agenda, used for the AI order
+    """
+    global _state
+    if not NetworkingConfig.prefetch_enabled:
+        return
+    if meeting_folder is None or tdocs_df is None or 'AI' not in tdocs_df.columns:
+        print('No TDoc data to prefetch')
+        return
+
+    try:
+        new_state = _PrefetchState(meeting_folder, tdocs_df, revisions_file, use_private_server,
+                                   agenda_item_descriptions)
+    except Exception as e:
+        print(f'Could not start TDoc prefetch: {e}')
+        traceback.print_exc()
+        return
+
+    with _state_lock:
+        if _state is not None:
+            _state.cancel()
+            if _state.meeting_folder == meeting_folder:
+                # Keep what is already known for this meeting
+                new_state.revisions = _state.revisions
+                new_state.known_revisions = _state.known_revisions
+                new_state.new_revisions = _state.new_revisions
+                new_state.attempted = _state.attempted
+        _state = new_state
+
+    server.common.connection.background_rate_limiter.requests_per_minute = \
+        NetworkingConfig.prefetch_downloads_per_minute
+    server.folder_watcher.subscribe(_on_folder_events)
+    print(f'Starting TDoc prefetch for {meeting_folder}: {len(new_state.ai_order)} AIs')
+
+    def prefetch_loop():
+        while not new_state.cancellation_token.is_cancelled:
+            new_state.wakeup.clear()
+            try:
+                _prefetch_task(new_state)
+            except Exception as e:
+                print(f'Could not prefetch TDocs for {meeting_folder}: {e}')
+                traceback.print_exc()
+            new_state.wakeup.wait(NetworkingConfig.prefetch_refresh_interval_s)
+
+    # Daemon thread: does not block closing the application
+    threading.Thread(target=prefetch_loop, daemon=True).start()
+
+
+def stop_prefetch():
+    """Stops the background prefetch"""
+    with _state_lock:
+        if _state is not None:
+            _state.cancel()
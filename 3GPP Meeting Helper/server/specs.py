@@ -1,4 +1,5 @@
 import concurrent.futures
+import functools
 import os.path
 import pickle
 import re
@@ -10,10 +11,14 @@ import html2text
 from pandas import DataFrame
 
 import utils.local_cache
+from threegpp_common.cache_governor import CacheGovernor
+from threegpp_common.host_concurrency import HostConcurrency
+from threegpp_common.spec_index import SpecIndex, IndexedSpecVersion
 from parsing.html.specs import extract_releases_from_latest_folder, extract_spec_series_from_spec_folder, \
     extract_spec_files_from_spec_folder, extract_spec_versions_from_spec_file, cleanup_spec_name
 from parsing.spec_types import SpecType, SpecVersionMapping, SpecSeries, SpecFile
-from server.common.server_utils import decode_string, download_file_to_location
+from server.common.server_utils import decode_string, download_file_to_location, batch_download_file_to_location, \
+    FileToDownload
 from application.zip_files import unzip_files_in_zip_file
 from server.common.connection import get_remote_file, HttpRequestTimeout
 from utils.local_cache import create_folder_if_needed, file_exists, get_specs_cache_folder
@@ -132,8 +137,11 @@ def get_markup_file(file_url: str, cache: bool, cache_file: str, force_download=
         print('Loading {0}'.format(cache_file))
         with open(cache_file, mode='r', encoding='utf-8') as file:
             markup = file.read()
+        CacheGovernor.touch(cache_file)
     else:
         markup = get_html_page_and_save_cache(file_url, cache, cache_file, cache_as_markup=True)
+        if cache and markup is not None:
+            CacheGovernor.register(cache_file, CacheGovernor.MARKDOWN)
     if markup is None:
         print('Markup file at {0} could not be retrieved: cache={1}, file exists: {2}'.format(
             cache_file,
@@ -143,6 +151,33 @@ def get_markup_file(file_url: str, cache: bool, cache_file: str, force_download=
     return markup
 
 
+def get_listing_file(file_url: str, cache: bool, cache_file: str, force_download=False) -> bytes | None:
+    """
+    Downloads a folder listing (e.g. the spec files of a series) and returns its HTML, to be parsed with the listing
+    parser. Can optionally use a file cache
+    Args:
+        file_url: The URL to retrieve
+        cache: Whether to cache
+        cache_file: If caching is used, the file path (i.e. file name) where to store the cached HTML
+        force_download: Whether regardless of the cache parameter, the file should be downloaded
+        (e.g. for cache updates)
+
+    Returns:
+        The HTML of the listing, or None if it could not be retrieved
+    """
+    if cache and os.path.exists(cache_file) and (not force_download):
+        print('Loading {0}'.format(cache_file))
+        with open(cache_file, mode='rb') as file:
+            html = file.read()
+        CacheGovernor.touch(cache_file)
+        return html
+
+    html = get_html_page_and_save_cache(file_url, cache, cache_file, cache_as_markup=False)
+    if cache and html is not None:
+        CacheGovernor.register(cache_file, CacheGovernor.SPECS)
+    return html
+
+
 def get_latest_specs_page(cache=False):
     cache_file = os.path.join(get_specs_cache_folder(), 'latest.md')
     markup = get_markup_file(specs_url, cache, cache_file)
@@ -156,17 +191,15 @@ def get_release_folder_page(release_url, release_number, cache=False):
 
 
 def get_drafts_folder_page(cache=False):
-    cache_file = os.path.join(get_specs_cache_folder(), 'drafts.md')
-    markup = get_markup_file(drafts_page, cache, cache_file)
-    return markup
+    cache_file = os.path.join(get_specs_cache_folder(), 'drafts.htm')
+    return get_listing_file(drafts_page, cache, cache_file)
 
 
 def get_series_folder_page(series_url, release_number, series_number, cache=False):
     cache_file = os.path.join(
         get_specs_cache_folder(),
-        'Specs_{0}_series_Rel_{1}.md'.format(series_number, release_number))
-    markup = get_markup_file(series_url, cache, cache_file)
-    return markup
+        'Specs_{0}_series_Rel_{1}.htm'.format(series_number, release_number))
+    return get_listing_file(series_url, cache, cache_file)
 
 
 def get_spec_page(spec_number: str, cache=False, force_download=False):
@@ -282,13 +315,13 @@ def get_specs(
         all_specs_data = []
 
         def task_per_series(series_to_process: SpecSeries) -> List[SpecFile]:
-            markup_series_data = get_series_folder_page(
+            html_series_data = get_series_folder_page(
                 series_data.series_url,
                 series_number=series_data.series,
                 release_number=series_data.release,
                 cache=latest_and_series_cache)
             specs_data_for_series = extract_spec_files_from_spec_folder(
-                markup_series_data,
+                html_series_data,
                 release=series_data.release,
                 series=series_data.series,
                 base_url=series_data.series_url)
@@ -306,7 +339,8 @@ def get_specs(
         # See https://docs.python.org/3/library/concurrent.futures.html
         # For each spec. series in each release, extract data
         # For each release, extract data, e.g. from https://www.3gpp.org/ftp/Specs/latest/Rel-10/23_series
-        with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
+        # Parallel requests are limited per host by threegpp_common.host_concurrency. The pool is sized to the maximum
+        with concurrent.futures.ThreadPoolExecutor(max_workers=HostConcurrency.MAX_CONCURRENCY) as executor:
             future_to_spec = {executor.submit(
                 task_per_series,
                 series_data): series_data for series_data in all_spec_series}
@@ -320,14 +354,15 @@ def get_specs(
 
         # Retrieve Drafts folder
         # Get drafts page: https://www.3gpp.org/ftp/Specs/latest-drafts
-        markup_draft_specs = get_drafts_folder_page(cache=latest_and_series_cache)
+        html_draft_specs = get_drafts_folder_page(cache=latest_and_series_cache)
         specs_data_for_drafts = extract_spec_files_from_spec_folder(
-            markup_draft_specs,
+            html_draft_specs,
             release='Draft',
             series=None,
             base_url=drafts_page,
             auto_fill=True)
         all_specs_data.extend(specs_data_for_drafts)
+        SpecIndex.record_versions([(spec_file.file, spec_file.spec_url) for spec_file in all_specs_data])
 
         # Convert specs data into DataFrame
         specs_df = pd.DataFrame(all_specs_data)
@@ -356,8 +391,9 @@ def get_specs(
         return DownloadedSpecData(spec_key=spec_key_from_markdown, spec_data=spec_data_from_markdown)
 
     # See https://docs.python.org/3/library/concurrent.futures.html
-    # 10 Executor threads because the spec. page is quite slow to load
-    with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
+    # The spec. page is quite slow to load: the per-host limit (threegpp_common.host_concurrency) grows while
+    # additional parallel requests increase the throughput
+    with concurrent.futures.ThreadPoolExecutor(max_workers=HostConcurrency.MAX_CONCURRENCY) as executor:
         future_to_spec = {executor.submit(
             get_spec_data,
             spec_to_download_str,
@@ -437,6 +473,7 @@ def apply_spec_metadata_to_dataframe(specs_df: pd.DataFrame, spec_metadata: Dict
     specs_df['search_column'] = specs_df['search_column'].str.lower()
 
 
+@functools.lru_cache(maxsize=4096)
 def file_version_to_version(file_version: str) -> str:
     """
     Converts the file version of a 3GPP spec, e.g., a00 to a version number, e.g., 10.0.0.
@@ -481,6 +518,7 @@ def file_version_to_version_metadata(file_version: str) -> SpecVersionMetadata:
         minor_version=version_split[2])
 
 
+@functools.lru_cache(maxsize=4096)
 def version_to_file_version(version: str) -> str:
     """
     Converts the  version of a 3GPP spec, e.g., 10.0.0 to a file version number, e.g., a00.
@@ -532,9 +570,13 @@ def download_spec_if_needed(
     if return_only_target_local_filename:
         return local_filename
 
-    if not file_exists(local_filename):
+    if not file_exists(local_filename) and not SpecIndex.place_local_file(local_filename):
         download_file_to_location(file_url, local_filename)
+    if file_exists(local_filename):
+        SpecIndex.record_local_file(local_filename)
     files_in_zip = unzip_files_in_zip_file(local_filename)
+    for spec_file in [local_filename] + files_in_zip:
+        CacheGovernor.register(spec_file, CacheGovernor.SPECS)
     return files_in_zip
 
 
@@ -591,7 +633,7 @@ def get_archive_page_for_spec(spec_number_with_dot: str) -> Tuple[str, str]:
 def get_spec_archive_remote_folder(
         spec_number_with_dot,
         cache=False,
-        force_download=False) -> Tuple[str, str, str]:
+        force_download=False) -> Tuple[bytes | None, str, str]:
     """
     For a given specification, retrieves the 3GPP spec archive page,
     e.g., https://www.3gpp.org/ftp/Specs/archive/23_series/23.206
@@ -601,13 +643,116 @@ def get_spec_archive_remote_folder(
         cache: Whether the file should be cached or not
 
     Returns:
-        A string tuple containing: the markup-converted text of the page remote URL of the page,
-        the specs series number.
+        A tuple containing: the HTML of the page, the remote URL of the page, the specs series number.
     """
     # Clean up the dot as we do not use it as part of the file name
     spec_number = cleanup_spec_name(spec_number_with_dot)
 
     archive_page_url, series_number = get_archive_page_for_spec(spec_number_with_dot)
-    cache_file = os.path.join(get_specs_cache_folder(), 'archive_{0}.md'.format(spec_number))
-    markup = get_markup_file(archive_page_url, cache, cache_file, force_download=force_download)
-    return markup, archive_page_url, series_number
+    cache_file = os.path.join(get_specs_cache_folder(), 'archive_{0}.htm'.format(spec_number))
+    html = get_listing_file(archive_page_url, cache, cache_file, force_download=force_download)
+    if html is not None:
+        spec_files = extract_spec_files_from_spec_folder(html, archive_page_url, None, series_number)
+        SpecIndex.record_versions(
+            [(spec_file.file, spec_file.spec_url) for spec_file in spec_files],
+            archive_of_spec=spec_number_with_dot)
+    return html, archive_page_url, series_number
+
+
+def get_spec_versions(
+        spec_number_with_dot: str,
+        from_version: str = None,
+        to_version: str = None,
+        release: int | str = None,
+        force_download=False) -> List[IndexedSpecVersion]:
+    """
+    Retrieves the versions of a specification from the spec index. The archive folder of the specification is only
+    listed if it was not yet indexed (or if force_download is set)
+    Args:
+        spec_number_with_dot: The specification number including the dot, e.g., 23.501
+        from_version: Lower bound (inclusive), e.g. 17.5 or 17.5.0
+        to_version: Upper bound (inclusive), e.g. 18.2 (includes 18.2.x)
+        release: Only versions of this release, e.g. 18
+        force_download: Whether to list the archive folder regardless of the index status
+
+    Returns: The versions, oldest first
+    """
+    if force_download or not SpecIndex.is_archive_indexed(spec_number_with_dot):
+        get_spec_archive_remote_folder(spec_number_with_dot, cache=True, force_download=force_download)
+    return SpecIndex.get_versions(
+        spec_number_with_dot,
+        from_version=from_version,
+        to_version=to_version,
+        release=release)
+
+
+def get_latest_spec_version(spec_number_with_dot: str, release: int | str = None) -> IndexedSpecVersion | None:
+    """
+    Retrieves the latest version of a specification, e.g. the latest Rel-18 version of 23.501
+    Args:
+        spec_number_with_dot: The specification number including the dot, e.g., 23.501
+        release: If set, the latest version of this release
+
+    Returns: The latest version, or None if not found
+    """
+    versions = get_spec_versions(spec_number_with_dot, release=release)
+    if len(versions) == 0:
+        return None
+    return versions[-1]
+
+
+def get_spec_archive_files(spec_number_with_dot: str, force_download=False) -> List[SpecFile]:
+    """
+    Returns the files in the archive folder of a specification, e.g.,
+    https://www.3gpp.org/ftp/Specs/archive/23_series/23.206, as listed in the spec index
+    Args:
+        spec_number_with_dot: The specification number including the dot, e.g., 23.206
+        force_download: Whether to list the archive folder regardless of the index status
+
+    Returns: The specification files
+    """
+    archive_page_url, series_number = get_archive_page_for_spec(spec_number_with_dot)
+    return [SpecFile(
+        version.file_name,
+        version.spec,
+        version.file_version,
+        series_number,
+        None,
+        archive_page_url,
+        version.url) for version in get_spec_versions(spec_number_with_dot, force_download=force_download)]
+
+
+def download_spec_versions(
+        spec_number_with_dot: str,
+        versions: List[IndexedSpecVersion]) -> Dict[str, List[str]]:
+    """
+    Downloads several versions of a specification in parallel (e.g. to compare them). Versions already downloaded
+    by either application are not downloaded again
+    Args:
+        spec_number_with_dot: The specification number including the dot, e.g., 23.501
+        versions: The versions to download, e.g. from get_spec_versions()
+
+    Returns: The downloaded (and unzipped) files for each version (e.g. 18.2.0)
+    """
+    local_files = {
+        version.version: download_spec_if_needed(
+            spec_number_with_dot,
+            version.url,
+            return_only_target_local_filename=True) for version in versions}
+    files_to_download = [
+        FileToDownload(version.url, local_files[version.version], force_download=False)
+        for version in versions
+        if not file_exists(local_files[version.version]) and
+        not SpecIndex.place_local_file(local_files[version.version])]
+    if len(files_to_download) > 0:
+        print(f'Downloading {len(files_to_download)} versions of {spec_number_with_dot}')
+        batch_download_file_to_location(files_to_download)
+
+    downloaded_files = {}
+    for version in versions:
+        if file_exists(local_files[version.version]):
+            downloaded_files[version.version] = download_spec_if_needed(spec_number_with_dot, version.url)
+        else:
+            print(f'Could not download {spec_number_with_dot} {version.version}')
+            downloaded_files[version.version] = []
+    return downloaded_files
@@ -3,7 +3,7 @@ import os
 import os.path
 import re
 import traceback
-from typing import List, Tuple
+from typing import List
 
 import server.common.server_utils
 import tdoc.utils
@@ -13,8 +13,11 @@ from application.zip_files import unzip_files_in_zip_file
 from server.common.server_utils import get_remote_meeting_folder, get_inbox_root, get_document_or_folder_url
 from server.common.server_utils import ServerType, DocumentType, TdocType
 from server.common.connection import get_remote_file
-from utils.local_cache import get_cache_folder, get_local_revisions_filename, get_local_drafts_filename, \
-    get_meeting_folder
+from threegpp_common.cache_governor import CacheGovernor
+from threegpp_common.host_concurrency import HostConcurrency
+from threegpp_common.tdoc_store import TDocStore
+from threegpp_common.url_resolver import URLResolver
+from utils.local_cache import get_cache_folder, get_meeting_folder
 
 agenda_regex = re.compile(r'.*(?P<type>([Aa]genda|[Ss]ession( |%20)Plan)).*[-_]([ ]|%20)*([vr])?(?P<version>\d*).*\..*')
 agenda_docx_regex = re.compile(
@@ -22,7 +25,6 @@ agenda_docx_regex = re.compile(
 agenda_version_regex = re.compile(r'.*(?P<type>([Aa]genda|[Ss]ession [Pp]lan)).*[-_]?([ ]|%20)*([vr])(?P<version>\d*).*\..*')
 agenda_draft_docx_regex = re.compile(
     r'.*(?P<type>([Aa]genda|[Ss]ession [Pp]lan)).*[-_]([ ]|%20)*([vr])?(?P<version>\d*).*\.(docx|doc|zip)')
-folder_ftp_names_regex = re.compile(r'[\d-]+[ ]+.*[ ]+<DIR>[ ]+(.*[uU][pP][dD][aA][tT][eE].*)')
 
 
 # tdoc_url = 'https://portal.3gpp.org/ngppapp/DownloadTDoc.aspx?contributionUid=S2-2202451'
@@ -42,17 +44,6 @@ def get_sa2_docs_tdoc_list(meeting_folder, save_file_to=None):
     return returned_html
 
 
-def get_sa2_drafts_tdoc_list(meeting_folder):
-    remote_folder = get_remote_meeting_folder(meeting_folder)
-    url = remote_folder + 'INBOX/DRAFTS'
-    returned_html = get_remote_file(url)
-
-    # In this case, we also need to retrieve all sub-pages
-    # TO-DO!!!!
-
-    return returned_html
-
-
 def get_tdoc(
         meeting_folder_name,
         tdoc_id,
@@ -90,28 +81,50 @@ def get_tdoc(
         is_draft=is_draft)
     zip_file_url = None
 
+    if not os.path.exists(tdoc_local_filename) and not is_draft:
+        # Already downloaded for another meeting folder, from another server or by 3GPP Tools. Drafts are not
+        # stored, as they may be overwritten in the server under the same name
+        stored_tdoc = TDocStore.lookup(tdoc_id, meeting=meeting_folder_name)
+        if stored_tdoc is not None and TDocStore.materialize(stored_tdoc, tdoc_local_filename):
+            print(f'Retrieved {tdoc_id} from local TDoc store')
+
     if not os.path.exists(tdoc_local_filename):
         # Try all the candidates until we find a working one (e.g. in /Docs and /Inbox)
         print(f'Downloading from: {zip_file_list}')
         tdoc_file = None
 
-        for zip_file_url in zip_file_list:
+        for zip_file_url in URLResolver.resolve(zip_file_list, meeting_folder_name):
             tdoc_file = get_remote_file(zip_file_url, cache=False)
             if tdoc_file is not None:
+                URLResolver.record_found(zip_file_url, meeting_folder_name)
                 break
         if tdoc_file is None:
             # No need to retry. Additional download folders are now implemented outside of this fuction
             return_value = None
             return return_value, zip_file_url
         # Drive zip file to disk
-        with open(tdoc_local_filename, 'wb') as output:
-            output.write(tdoc_file)
+        stored_tdoc = None
+        if not is_draft:
+            stored_tdoc = TDocStore.put_bytes(
+                tdoc_file,
+                tdoc_id,
+                meeting=meeting_folder_name,
+                source_url=zip_file_url)
+        if stored_tdoc is None or not TDocStore.materialize(stored_tdoc, tdoc_local_filename):
+            with open(tdoc_local_filename, 'wb') as output:
+                output.write(tdoc_file)
 
     # If the file does not now exist, there was an error (e.g. not found)
     if not os.path.exists(tdoc_local_filename):
         return None, None
 
-    return unzip_files_in_zip_file(tdoc_local_filename), zip_file_url
+    files_in_zip = unzip_files_in_zip_file(tdoc_local_filename)
+    # The TDoc folder (zip, revisions, drafts and extracted files) is evicted as a whole
+    CacheGovernor.register(
+        get_local_folder_for_tdoc(meeting_folder_name, tdoc_id, create_dir=False),
+        CacheGovernor.TDOCS,
+        meeting=meeting_folder_name)
+    return files_in_zip, zip_file_url
 
 
 def cache_tdocs(tdoc_list, download_from_private_server: bool, meeting_folder_name: str):
@@ -119,7 +132,8 @@ def cache_tdocs(tdoc_list, download_from_private_server: bool, meeting_folder_na
         return
 
     # See https://docs.python.org/3/library/concurrent.futures.html
-    with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
+    # Parallel requests are limited per host by threegpp_common.host_concurrency. The pool is sized to the maximum
+    with concurrent.futures.ThreadPoolExecutor(max_workers=HostConcurrency.MAX_CONCURRENCY) as executor:
         future_to_url = {executor.submit(
             lambda tdoc_to_download_lambda: server.tdoc.get_tdoc(
                 meeting_folder_name=meeting_folder_name,
@@ -280,70 +294,3 @@ def download_docs_file(meeting) -> str | None:
         print(f'Could get not docs file for {meeting}: {e}')
         traceback.print_exc()
         return None
-
-
-def download_revisions_file(meeting) -> Tuple[str, str] | Tuple[None, None]:
-    """
-    Downloads the revisions list for a given meeting,
-    e.g. https://www.3gpp.org/ftp/tsg_sa/WG2_Arch/TSGS2_156E_Electronic_2023-04/INBOX/Revisions
-    Args:
-        meeting: The folder name in the 3GPP server, e.g. TSGS2_156E_Electronic_2023-04
-
-    Returns: The file (path) where the HTML was saved to
-
-    """
-    try:
-        meeting_server_folder = meeting  # e.g. TSGS2_144E_Electronic
-        print('Retrieving revisions for {0} meeting'.format(meeting))
-        local_file = get_local_revisions_filename(meeting_server_folder)
-        folder_candidates_for_revisions = get_document_or_folder_url(
-            server_type=ServerType.PUBLIC,
-            document_type=DocumentType.TDOC,
-            meeting_folder_in_server=meeting,
-            tdoc_type=TdocType.REVISION
-        )
-        html = None
-        folder_url = None
-        for folder_candidate_for_revisions in folder_candidates_for_revisions:
-            html = get_remote_file(
-                url=folder_candidate_for_revisions,
-                cached_file_to_return_if_error_or_cache=local_file)
-            if html is not None:
-                folder_url = folder_candidate_for_revisions
-                break
-        if html is None:
-            print('Revisions file for {0} not found'.format(meeting))
-            return None, None
-        utils.local_cache.write_data_and_open_file(html, local_file)
-        print(f'Found revisions file under {folder_url}. Saved to {local_file}')
-        return local_file, folder_url
-    except Exception as e:
-        print(f'Could get not revisions file for {meeting}: {e}')
-        traceback.print_exc()
-        return None, None
-
-
-def download_drafts_file(meeting) -> str | None:
-    """
-    Downloads the drafts list for a given meeting,
-    e.g. https://www.3gpp.org/ftp/tsg_sa/WG2_Arch/TSGS2_156E_Electronic_2023-04/INBOX/DRAFTS
-    Args:
-        meeting: The folder name in the 3GPP server, e.g. TSGS2_156E_Electronic_2023-04
-
-    Returns: The file (path) where the HTML was saved to
-
-    """
-    try:
-        meeting_server_folder = meeting  # e.g. TSGS2_144E_Electronic
-        print('Retrieving drafts for {0} meeting'.format(meeting))
-        local_file = get_local_drafts_filename(meeting_server_folder)
-        html = get_sa2_drafts_tdoc_list(meeting_server_folder)
-        if html is None:
-            print('Drafts file for {0} not found'.format(meeting))
-            return None
-        utils.local_cache.write_data_and_open_file(html, local_file)
-        return local_file
-    except Exception as e:
-        print(f'Could not get drafts file for {meeting}: {e}')
-        traceback.print_exc()
-        return None
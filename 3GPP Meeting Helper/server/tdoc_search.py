@@ -12,6 +12,10 @@ from application.common import ExportType
 from application.os import startfile
 from application.zip_files import unzip_files_in_zip_file
 from config.meetings import MeetingConfig
+from config.word import WordConfig
+from threegpp_common.host_concurrency import HostConcurrency
+from threegpp_common.redline import DocxRedline
+from threegpp_common.url_resolver import URLResolver
 from server.common.MeetingEntry import MeetingEntry, MeetingPastPresent, get_most_recent_meeting
 from server.common.server_utils import (download_file_to_location, FileToDownload, batch_download_file_to_location, \
                                         meeting_pages_per_group,
@@ -610,10 +614,11 @@ def search_download_and_open_tdoc(
     # Only download file if needed
     downloaded_tdoc_url = ''
     if not file_exists(local_target):
-        for tdoc_url in tdoc_urls:
+        for tdoc_url in URLResolver.resolve(tdoc_urls, tdoc_meeting.meeting_folder):
             print(f'Downloading {tdoc_url} to {local_target}')
             if download_file_to_location(tdoc_url, local_target):
                 print('File successfully downloaded')
+                URLResolver.record_found(tdoc_url, tdoc_meeting.meeting_folder)
                 downloaded_tdoc_url = tdoc_url
                 break
     else:
@@ -671,7 +676,8 @@ def batch_search_and_download_tdocs(
 
     # See https://docs.python.org/3/library/concurrent.futures.html
     all_downloads = []
-    with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
+    # Parallel requests are limited per host by threegpp_common.host_concurrency. The pool is sized to the maximum
+    with concurrent.futures.ThreadPoolExecutor(max_workers=HostConcurrency.MAX_CONCURRENCY) as executor:
         future_to_dl = {
             executor.submit(
                 search_download_and_open_tdoc,
@@ -699,21 +705,91 @@ def batch_search_and_download_tdocs(
 def compare_two_tdocs(
         original_tdoc: str,
         new_tdoc: str,
-        tkvar_3gpp_wifi_available: BooleanVar|None=None):
+        tkvar_3gpp_wifi_available: BooleanVar|None=None,
+        word_native: bool = False,
+        output_format: str = 'html'):
+    """
+    Compares two TDocs. .docx files are compared without Word (see threegpp_common.redline) and the comparison is
+    opened. Word is only used if word_native is set or for legacy .doc files
+    Args:
+        original_tdoc: TDoc ID
+        new_tdoc: TDoc ID, used as the base document of the comparison
+        tkvar_3gpp_wifi_available: Whether to use the 10.10.10.10 server
+        word_native: Whether to generate the comparison with Word's Compare feature (the TDocs are also opened)
+        output_format: Comparison without Word: 'html' (HTML page) or 'docx' (tracked changes)
+    """
     print(f'Comparing {new_tdoc}  (original) vs. {original_tdoc}')
     opened_docs1_folder, metadata1 = search_download_and_open_tdoc(
         original_tdoc,
-        skip_open=False,
+        skip_open=not word_native,
         tkvar_3gpp_wifi_available=tkvar_3gpp_wifi_available
     )
     opened_docs2_folder, metadata2 = search_download_and_open_tdoc(
         new_tdoc,
-        skip_open=False,
+        skip_open=not word_native,
         tkvar_3gpp_wifi_available=tkvar_3gpp_wifi_available
     )
     doc_1 = metadata1[0].path
     doc_2 = metadata2[0].path
     print(f'Comparing {doc_2} vs. {doc_1}')
+    if not word_native and doc_1.lower().endswith('.docx') and doc_2.lower().endswith('.docx'):
+        comparison_file = DocxRedline.compare(
+            doc_2,
+            doc_1,
+            output_format=output_format,
+            author=WordConfig.redline_author)
+        print(f'Comparison saved to {comparison_file}')
+        startfile(str(comparison_file))
+        return
     parsing.word.pywin32.compare_documents(doc_2, doc_1)
 
 
+def compare_tdoc_revision_chains(
+        tdoc_ids: List[str],
+        tkvar_3gpp_wifi_available: BooleanVar | None = None,
+        tdoc_meeting: MeetingEntry = None,
+        output_format: str = 'html',
+        output_folder: str = None) -> Dict[Tuple[str, str], str | None]:
+    """
+    Compares every revision with its previous revision (e.g. r00->r01->r02) for a list of TDocs, e.g. all TDocs of
+    an Agenda Item. TDocs are downloaded in parallel and compared in a process pool, without Word
+    Args:
+        tdoc_ids: TDoc IDs, including revisions
+        tkvar_3gpp_wifi_available: Whether to use the 10.10.10.10 server
+        tdoc_meeting: If available, the 3GPP meeting for the requested files
+        output_format: 'html' or 'docx'
+        output_folder: Where to write the comparisons. By default, in the export folder of each revised TDoc
+
+    Returns: The comparison file for each (original, revised) TDoc pair (None if it could not be generated)
+    """
+    tdoc_pairs = DocxRedline.get_revision_chains(tdoc_ids)
+    if len(tdoc_pairs) == 0:
+        print('No revision chains to compare')
+        return {}
+
+    tdocs_to_download = sorted({tdoc_id for tdoc_pair in tdoc_pairs for tdoc_id in tdoc_pair})
+    downloads = batch_search_and_download_tdocs(
+        tdocs_to_download,
+        tkvar_3gpp_wifi_available=tkvar_3gpp_wifi_available,
+        tdoc_meeting=tdoc_meeting)
+    docx_files: Dict[str, str] = {}
+    for downloaded_data in downloads:
+        for document in (downloaded_data.downloaded_word_documents or []):
+            if document.path is not None and document.path.lower().endswith('.docx'):
+                docx_files.setdefault(document.tdoc_id.upper(), document.path)
+
+    file_pairs = {
+        tdoc_pair: (docx_files.get(tdoc_pair[0].upper()), docx_files.get(tdoc_pair[1].upper()))
+        for tdoc_pair in tdoc_pairs}
+    comparable_pairs = [file_pair for file_pair in file_pairs.values() if None not in file_pair]
+    print(f'Comparing {len(comparable_pairs)}/{len(tdoc_pairs)} revision pairs')
+    comparison_files = DocxRedline.batch_compare(
+        comparable_pairs,
+        output_format=output_format,
+        output_folder=output_folder,
+        author=WordConfig.redline_author)
+    return {
+        tdoc_pair: str(comparison_files[file_pair]) if comparison_files.get(file_pair) is not None else None
+        for tdoc_pair, file_pair in file_pairs.items()}
+
+
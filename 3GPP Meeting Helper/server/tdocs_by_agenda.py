@@ -1,12 +1,13 @@
 from typing import NamedTuple
 
 import server.common.connection
-import server.tdoc
+import server.folder_watcher
 import utils.local_cache
 from application.os import startfile
 from server.common.server_utils import get_inbox_root, get_document_or_folder_url
 from server.common.server_utils import ServerType, DocumentType
 from server.common.connection import get_remote_file
+from server.folder_watcher import WatchedFolderType
 from server.tdoc import get_inbox_tdocs_list_cache_local_cache
 
 
@@ -40,23 +41,14 @@ def get_tdocs_by_agenda_for_specific_meeting(
         use_private_server=use_private_server,
         open_tdocs_by_agenda_in_browser=open_tdocs_by_agenda_in_browser)
 
-    # Optional download of revisions
+    # Optional revisions and drafts. Only downloaded if they changed (not all meetings have revisions or drafts)
     revisions_file = None
     if get_revisions_file:
-        try:
-            revisions_file, revisions_folder_url = server.tdoc.download_revisions_file(meeting_folder)
-        except Exception as e:
-            # Not all meetings have revisions
-            print(f'Exception downloading revisions file for {meeting_folder}: {e}')
+        revisions_file = server.folder_watcher.get_listing_file(meeting_folder, WatchedFolderType.REVISIONS)
 
-    # Optional download of drafts
     drafts_file = None
     if get_drafts_file:
-        try:
-            drafts_file = server.tdoc.download_drafts_file(meeting_folder)
-        except Exception as e:
-            # Not all meetings have drafts
-            print(f'Could not download drafts folder for {meeting_folder}: {e}')
+        drafts_file = server.folder_watcher.get_listing_file(meeting_folder, WatchedFolderType.DRAFTS)
 
     return TdocsByAgendaDownloadResults(
         tdocs_by_agenda_html_bytes=return_data,
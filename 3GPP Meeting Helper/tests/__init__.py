@@ -1 +1,8 @@
+import os
+import sys
 
+try:
+    import threegpp_common
+except ImportError:
+    # Not installed (pip install -e "../3GPP Common"): use the package next to this application
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '3GPP Common')))
@@ -0,0 +1,580 @@
+"""
+Offline mock of the 3GPP servers (www.3gpp.org, portal.3gpp.org and the 10.10.10.10 meeting server) for
+reproducible end-to-end and performance tests of the download and crawl pipelines.
+
+The server runs on localhost and serves:
+  - A synthetic but realistically sized FTP tree (/ftp/...): WG folders, meeting folders, Docs/Inbox/Revisions
+    with TDoc zip files, rendered as "Directory Listing" (v2) pages like the real server
+  - TdocsByAgenda.htm pages (taken from the tests/tdocs_by_agenda fixtures)
+  - DynaReport pages (/dynareport?code=...): meeting lists, spec pages, WI list
+  - The portal TDoc list Excel export (/ngppapp/GenerateDocumentList.aspx?meetingId=...)
+  - Spec folder listings (taken from the tests/specs fixtures)
+
+Latency, bandwidth limits and 404/5xx rates can be injected (see FaultProfile). Requests to the real hosts are
+redirected to the mock server by mounting a transport adapter on a requests.Session, so the code under test does
+not need to be changed:
+
+    with Mock3gppServer(faults=FaultProfile(latency=0.05, server_error_rate=0.01)) as mock_server:
+        with mock_server.redirect(server.common.connection.non_cached_http_session):
+            ...
+
+Run standalone with "python -m tests.mock_3gpp_server --port 8080 --latency 0.1" for manual load tests.
+"""
+import argparse
+import datetime
+import html
+import io
+import os
+import random
+import threading
+import time
+import zipfile
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import NamedTuple, Optional, Dict, List, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qs, unquote
+
+import requests
+from requests.adapters import HTTPAdapter
+
+fixtures_folder = os.path.dirname(os.path.abspath(__file__))
+public_host = 'www.3gpp.org'
+redirected_hosts = ['www.3gpp.org', 'portal.3gpp.org', '10.10.10.10']
+
+# Sent back in chunks of this size so that bandwidth limits are applied smoothly
+response_chunk_size = 16 * 1024
+
+
+class FaultProfile(NamedTuple):
+    """Network conditions to emulate. Rates are probabilities (0-1) per request"""
+    latency: float = 0.0
+    bandwidth: Optional[int] = None
+    not_found_rate: float = 0.0
+    server_error_rate: float = 0.0
+    seed: Optional[int] = 0
+
+
+class MockTreeConfig(NamedTuple):
+    """Size of the synthetic FTP tree"""
+    working_groups: Tuple[str, ...] = ('S2', 'S1', 'C1')
+    meetings_per_wg: int = 4
+    tdocs_per_meeting: int = 1500
+    revisions_per_meeting: int = 300
+    min_tdoc_size: int = 20 * 1024
+    max_tdoc_size: int = 400 * 1024
+    first_meeting_number: int = 160
+    seed: int = 0
+
+
+class MockEntry(NamedTuple):
+    name: str
+    is_dir: bool
+    size: int
+    mtime: datetime.datetime
+
+
+# Same folders as server_utils.ftp_pages_per_group (subset used by the synthetic tree)
+wg_folders = {
+    'SP': 'tsg_sa/TSG_SA',
+    'S1': 'tsg_sa/WG1_Serv',
+    'S2': 'tsg_sa/WG2_Arch',
+    'S3': 'tsg_sa/WG3_Security',
+    'S4': 'tsg_sa/WG4_CODEC',
+    'S5': 'tsg_sa/WG5_TM',
+    'S6': 'tsg_sa/WG6_MissionCritical',
+    'CP': 'tsg_ct/TSG_CT',
+    'C1': 'tsg_ct/WG1_mm-cc-sm_ex-CN1',
+    'C3': 'tsg_ct/WG3_interworking_ex-CN3',
+    'C4': 'tsg_ct/WG4_protocollars_ex-CN4',
+    'RP': 'tsg_ran/TSG_RAN',
+    'R1': 'tsg_ran/WG1_RL1',
+    'R2': 'tsg_ran/WG2_RL2',
+}
+
+meeting_cities = ['Goteborg', 'Sophia_Antipolis', 'Xiamen', 'Fukuoka', 'Maastricht', 'Dallas', 'Athens', 'Jeju']
+agenda_items = ['4.1', '5.1', '5.2', '6.1', '7.1', '8.1', '8.2', '9.1', '9.2', '19']
+
+
+class MockTree:
+    """
+    The synthetic FTP tree. Folders are kept in memory as entry lists. File contents are generated on request
+    (deterministically from the file name), so that large trees do not need large amounts of memory
+    """
+
+    def __init__(self, config: MockTreeConfig = MockTreeConfig()):
+        self.config = config
+        self.folders: Dict[str, List[MockEntry]] = {}
+        self.static_files: Dict[str, Tuple[bytes, str]] = {}
+        self.meetings: List[Tuple[str, str, int, str]] = []
+        self.tdocs_by_agenda_fixture = self._read_fixture('tdocs_by_agenda', '2024.08.19 TdocsByAgenda SA2-164.htm')
+        self._build()
+
+    @staticmethod
+    def _read_fixture(*path) -> bytes:
+        try:
+            with open(os.path.join(fixtures_folder, *path), 'rb') as f:
+                return f.read()
+        except OSError:
+            return b'<html><body></body></html>'
+
+    def _add_entry(self, folder: str, entry: MockEntry):
+        self.folders.setdefault(folder, []).append(entry)
+        if entry.is_dir:
+            self.folders.setdefault(f'{folder}/{entry.name}', [])
+
+    def _build(self):
+        rng = random.Random(self.config.seed)
+        base_date = datetime.datetime(2024, 1, 15, 8, 0)
+        for wg_idx, wg in enumerate(self.config.working_groups):
+            wg_folder = '/ftp/' + wg_folders.get(wg, f'tsg_xx/WG_{wg}')
+            wg_name = wg_folder.rsplit('/', 1)[-1]
+            self._add_entry(wg_folder.rsplit('/', 1)[0], MockEntry(wg_name, True, 0, base_date))
+            for m_idx in range(self.config.meetings_per_wg):
+                number = self.config.first_meeting_number + m_idx
+                city = meeting_cities[(wg_idx + m_idx) % len(meeting_cities)]
+                prefix = 'TSGS' if wg.startswith('S') else 'TSGC' if wg.startswith('C') else 'TSGR'
+                meeting_folder = f'{prefix}{wg[1:]}_{number}_{city}'
+                meeting_date = base_date + datetime.timedelta(days=60 * m_idx + 3 * wg_idx)
+                meeting_path = f'{wg_folder}/{meeting_folder}'
+                self.meetings.append((wg, meeting_folder, number, meeting_path))
+
+                self._add_entry(wg_folder, MockEntry(meeting_folder, True, 0, meeting_date))
+                for sub_folder in ['Agenda', 'Docs', 'Inbox', 'Report']:
+                    self._add_entry(meeting_path, MockEntry(sub_folder, True, 0, meeting_date))
+                self._add_entry(
+                    meeting_path,
+                    MockEntry('TdocsByAgenda.htm', False, len(self.tdocs_by_agenda_fixture), meeting_date))
+                self._add_entry(f'{meeting_path}/Inbox', MockEntry('Revisions', True, 0, meeting_date))
+                self._add_entry(f'{meeting_path}/Inbox', MockEntry('Drafts', True, 0, meeting_date))
+
+                year = meeting_date.year % 100
+                first_tdoc = 10000 * (m_idx % 9 + 1)
+                tdocs = [f'{wg}-{year:02d}{first_tdoc + i:05d}' for i in range(self.config.tdocs_per_meeting)]
+                for i, tdoc in enumerate(tdocs):
+                    self._add_entry(f'{meeting_path}/Docs', MockEntry(
+                        f'{tdoc}.zip', False,
+                        rng.randint(self.config.min_tdoc_size, self.config.max_tdoc_size),
+                        meeting_date + datetime.timedelta(minutes=i)))
+                for i in range(min(self.config.revisions_per_meeting, len(tdocs))):
+                    self._add_entry(f'{meeting_path}/Inbox/Revisions', MockEntry(
+                        f'{tdocs[i]}r0{1 + i % 3}.zip', False,
+                        rng.randint(self.config.min_tdoc_size, self.config.max_tdoc_size),
+                        meeting_date + datetime.timedelta(days=2, minutes=i)))
+
+        # Specs folders, as captured from the real server
+        for fixture_name, path in [
+            ('ftp_Specs_latest_.htm', '/ftp/Specs/latest'),
+            ('ftp_Specs_latest_Rel-16_.htm', '/ftp/Specs/latest/Rel-16'),
+            ('ftp_Specs_latest_Rel-16_23_series_.htm', '/ftp/Specs/latest/Rel-16/23_series')]:
+            self.static_files[path] = (self._read_fixture('specs', fixture_name), 'text/html; charset=utf-8')
+
+    def find_entry(self, path: str) -> Optional[MockEntry]:
+        folder, name = path.rsplit('/', 1)
+        for entry in self.folders.get(folder, []):
+            if entry.name.lower() == name.lower():
+                return entry
+        return None
+
+    def find_folder(self, path: str) -> Optional[str]:
+        # The real server is case-insensitive (e.g. Inbox/INBOX)
+        if path in self.folders:
+            return path
+        lower_path = path.lower()
+        for folder in self.folders:
+            if folder.lower() == lower_path:
+                return folder
+        return None
+
+    def file_content(self, path: str, entry: MockEntry) -> bytes:
+        if entry.name.lower() == 'tdocsbyagenda.htm':
+            return self.tdocs_by_agenda_fixture
+        if entry.name.lower().endswith('.zip'):
+            # Incompressible payload of the announced size (approx.) inside a real zip file
+            doc_name = entry.name[:-4] + '.docx'
+            payload = random.Random(entry.name).randbytes(max(entry.size - 200, 0))
+            buffer = io.BytesIO()
+            with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_STORED) as zip_file:
+                zip_file.writestr(doc_name, payload)
+            return buffer.getvalue()
+        return random.Random(entry.name).randbytes(entry.size)
+
+
+def render_listing(folder: str, entries: List[MockEntry]) -> bytes:
+    """Renders a folder as in the (v2) 3GPP server "Directory Listing" page"""
+    rows = []
+    for entry in entries:
+        url = html.escape(f'https://{public_host}{folder}/{entry.name}')
+        extension = '' if entry.is_dir else entry.name.rsplit('.', 1)[-1].lower()
+        size = '' if entry.is_dir else f'{entry.size / 1024:.1f} KB'.replace('.', ',')
+        rows.append(f'''
+                            <tr>
+                                <td>
+                                    <img class="icon" alt="icon" src="/ftp/geticon.axd?file={extension}" />
+                                </td>
+                                <td style="padding-right:10px">
+                                    <a href="{url}">{html.escape(entry.name)}</a>
+                                </td>
+                                <td style="padding-right:10px">
+                                    {entry.mtime.year}/{entry.mtime.month:02d}/{entry.mtime.day:02d} {entry.mtime.hour}:{entry.mtime.minute:02d}
+                                </td>
+                                <td>
+                                    {size}
+                                </td>
+                            </tr>''')
+    parent = html.escape(f'https://{public_host}{folder.rsplit("/", 1)[0]}')
+    page = f'''<!DOCTYPE html>
+<html><head><title>Directory Listing {html.escape(folder)}</title></head>
+<body>
+    <h1>Directory Listing {html.escape(folder)}</h1>
+    <a href="{parent}">[To Parent Directory]</a>
+    <table>
+        <thead>
+            <tr>
+                <th>&nbsp;</th>
+                <th><a href="?sortby=name">sort by name</a>/<a href="?sortby=namerev">desc</a></th>
+                <th><a href="?sortby=date">sort by date</a>/<a href="?sortby=daterev">desc</a></th>
+                <th><a href="?sortby=size">sort by size</a>/<a href="?sortby=sizerev">desc</a></th>
+            </tr>
+        </thead>
+        <tbody>{''.join(rows)}
+        </tbody>
+    </table>
+</body></html>'''
+    return page.encode('utf-8')
+
+
+def render_meetings_page(tree: MockTree, wg: str) -> bytes:
+    """DynaReport meeting list for a group (e.g. dynareport?code=Meetings-S2.htm)"""
+    rows = []
+    for meeting_wg, meeting_folder, number, meeting_path in tree.meetings:
+        if meeting_wg != wg:
+            continue
+        entry = tree.find_entry(meeting_path)
+        start = entry.mtime.date()
+        end = start + datetime.timedelta(days=4)
+        tdocs = [e.name[:-4] for e in tree.folders.get(f'{meeting_path}/Docs', [])]
+        location = meeting_folder.split('_', 2)[-1].replace('_', ' ')
+        rows.append(f'''
+        <tr>
+            <td><a href="https://portal.3gpp.org/Home.aspx#/meeting?MtgId={60000 + number}">{wg}-{number}</a></td>
+            <td>{html.escape(location)}</td>
+            <td>{start:%Y-%m-%d}</td>
+            <td>{end:%Y-%m-%d}</td>
+            <td><a href="/../../..//ftp/{meeting_path[5:]}/Docs/">{tdocs[0] if tdocs else ''}</a>
+                - <a href="/../../..//ftp/{meeting_path[5:]}/Docs/">{tdocs[-1] if tdocs else ''}</a></td>
+            <td><a href="/../../..//ftp/{meeting_path[5:]}/">files</a></td>
+        </tr>''')
+    return (f'<html><body><h1>Meetings {wg}</h1><table>{"".join(rows)}\n</table></body></html>').encode('utf-8')
+
+
+def render_spec_page(spec_number: str) -> bytes:
+    """DynaReport specification page (e.g. dynareport?code=23501.htm)"""
+    series = spec_number[0:2]
+    dotted = f'{spec_number[0:2]}.{spec_number[2:]}'
+    versions = []
+    for major, letter in [(17, 'h'), (18, 'i')]:
+        for minor in range(3):
+            versions.append(
+                f'<tr><td><a href="https://{public_host}/ftp/Specs/archive/{series}_series/{dotted}/'
+                f'{spec_number}-{letter}{minor}0.zip">{major}.{minor}.0</a></td><td>&nbsp;2024-0{minor + 1}-15&nbsp;</td><td></td></tr>')
+    metadata = [
+        ('Title', f'Synthetic specification {dotted}'),
+        ('Status', 'Under change control'),
+        ('Type', 'Technical specification (TS)'),
+        ('Initial planned Release', 'Release 15'),
+        ('Internal', 'False'),
+        ('Primary responsible group', 'S2'),
+        ('Secondary responsible groups', 'S1')]
+    rows = ''.join(f'<tr><td>{k}:&nbsp;</td><td>&nbsp;{v}</td></tr>' for k, v in metadata)
+    page = f'''<html><body>
+<h2>Specification #: {dotted}</h2>
+<ul><li>General</li><li>Responsibility</li><li>Related</li><li>Versions</li></ul>
+<table>{rows}</table>
+<table>{"".join(versions)}</table>
+</body></html>'''
+    return page.encode('utf-8')
+
+
+def render_wi_list(tree: MockTree) -> bytes:
+    """DynaReport work item list (dynareport?code=WI-List.htm)"""
+    rows = [f'<tr><td>{1000000 + i}</td><td>FS_Item{i}</td><td>Study on item {i}</td><td>Rel-19</td>'
+            f'<td>{tree.config.working_groups[i % len(tree.config.working_groups)]}</td></tr>'
+            for i in range(200)]
+    return f'<html><body><table>{"".join(rows)}</table></body></html>'.encode('utf-8')
+
+
+def render_tdoc_list_excel(tree: MockTree, meeting_id: str) -> Optional[bytes]:
+    """Portal TDoc list export (GenerateDocumentList.aspx?meetingId=...) as an Excel file"""
+    import openpyxl
+    try:
+        number = int(meeting_id) - 60000
+    except ValueError:
+        return None
+    meeting = next((m for m in tree.meetings if m[2] == number), None)
+    if meeting is None:
+        return None
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(['TDoc', 'Title', 'Source', 'Contact', 'Type', 'For', 'Abstract', 'Secretary Remarks',
+               'Agenda item sort order', 'Agenda item', 'Agenda item description', 'TDoc Status'])
+    rng = random.Random(meeting_id)
+    for i, entry in enumerate(tree.folders.get(f'{meeting[3]}/Docs', [])):
+        ai = agenda_items[i % len(agenda_items)]
+        ws.append([entry.name[:-4], f'Synthetic TDoc title {i}', rng.choice(['Company A', 'Company B, Company C']),
+                   'Delegate', rng.choice(['CR', 'pCR', 'discussion', 'LS in']), 'Approval', '', '',
+                   i % len(agenda_items), ai, f'Agenda item {ai}', rng.choice(['agreed', 'noted', 'revised', ''])])
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    server_version = 'Mock3GPP/1.0'
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._handle(send_body=True)
+
+    def do_HEAD(self):
+        self._handle(send_body=False)
+
+    def _handle(self, send_body: bool):
+        mock_server: 'Mock3gppServer' = self.server.mock_server
+        faults = mock_server.faults
+        mock_server.count_request(self.path)
+
+        if faults.latency:
+            time.sleep(faults.latency)
+        injected_status = mock_server.draw_fault()
+        if injected_status is not None:
+            self._send(injected_status, b'Injected error', 'text/plain', send_body=send_body)
+            return
+
+        status, content, content_type, extra_headers = mock_server.resolve(self.path)
+        self._send(status, content, content_type, extra_headers, send_body=send_body)
+
+    def _send(
+            self,
+            status: int,
+            content: bytes,
+            content_type: str,
+            extra_headers: Dict[str, str] = None,
+            send_body=True):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(content)))
+        for k, v in (extra_headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        if not send_body:
+            return
+
+        bandwidth = self.server.mock_server.faults.bandwidth
+        try:
+            for start in range(0, len(content), response_chunk_size):
+                chunk = content[start:start + response_chunk_size]
+                self.wfile.write(chunk)
+                if bandwidth:
+                    time.sleep(len(chunk) / bandwidth)
+        except (BrokenPipeError, ConnectionResetError):
+            return
+        self.server.mock_server.count_bytes(len(content))
+
+
+class Mock3gppServer:
+    """
+    Local HTTP server emulating the 3GPP servers. Use as a context manager or call start()/stop()
+    """
+
+    def __init__(
+            self,
+            tree: MockTree = None,
+            faults: FaultProfile = FaultProfile(),
+            host: str = '127.0.0.1',
+            port: int = 0):
+        self.tree = tree if tree is not None else MockTree()
+        self._faults = faults
+        self._rng = random.Random(faults.seed)
+        self._lock = threading.Lock()
+        self.request_counts: Dict[str, int] = {}
+        self.bytes_served = 0
+        self._content_cache: Dict[str, bytes] = {}
+        self._httpd = ThreadingHTTPServer((host, port), _RequestHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.mock_server = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[0:2]
+        return f'http://{host}:{port}'
+
+    @property
+    def faults(self) -> FaultProfile:
+        return self._faults
+
+    @faults.setter
+    def faults(self, faults: FaultProfile):
+        with self._lock:
+            self._faults = faults
+            self._rng = random.Random(faults.seed)
+
+    @property
+    def total_requests(self) -> int:
+        with self._lock:
+            return sum(self.request_counts.values())
+
+    def count_request(self, path: str):
+        with self._lock:
+            self.request_counts[path] = self.request_counts.get(path, 0) + 1
+
+    def count_bytes(self, n_bytes: int):
+        with self._lock:
+            self.bytes_served += n_bytes
+
+    def draw_fault(self) -> Optional[int]:
+        with self._lock:
+            value = self._rng.random()
+        if value < self._faults.not_found_rate:
+            return 404
+        if value < self._faults.not_found_rate + self._faults.server_error_rate:
+            return 503
+        return None
+
+    def resolve(self, raw_path: str) -> Tuple[int, bytes, str, Dict[str, str]]:
+        """Maps a request path (including query) to (status, content, content type, extra headers)"""
+        split_path = urlsplit(raw_path)
+        path = unquote(split_path.path).rstrip('/') or '/'
+        query = {k.lower(): v[0] for k, v in parse_qs(split_path.query).items()}
+        html_type = 'text/html; charset=utf-8'
+
+        if path.lower() == '/dynareport':
+            code = query.get('code', '').removesuffix('.htm')
+            if code.startswith('Meetings-'):
+                return 200, render_meetings_page(self.tree, code[len('Meetings-'):]), html_type, {}
+            if code == 'WI-List':
+                return 200, render_wi_list(self.tree), html_type, {}
+            if code.isdigit() or code.replace('-', '').isdigit():
+                return 200, render_spec_page(code), html_type, {}
+            return 404, b'Not found', 'text/plain', {}
+
+        if path.lower() == '/ngppapp/generatedocumentlist.aspx':
+            meeting_id = query.get('meetingid', '')
+            content = self._cached(f'excel:{meeting_id}', lambda: render_tdoc_list_excel(self.tree, meeting_id))
+            if content is None:
+                return 404, b'Not found', 'text/plain', {}
+            return 200, content, 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', {
+                'Content-Disposition': f'attachment;filename="TDoc_List_Meeting_{meeting_id}.xlsx"'}
+
+        if path in self.tree.static_files:
+            content, content_type = self.tree.static_files[path]
+            return 200, content, content_type, {}
+
+        # The meeting server (10.10.10.10) has no /ftp prefix
+        ftp_path = path if path.lower().startswith('/ftp') else '/ftp' + path
+        folder = self.tree.find_folder(ftp_path)
+        if folder is not None:
+            content = self._cached(f'listing:{folder}', lambda: render_listing(folder, self.tree.folders[folder]))
+            return 200, content, html_type, {}
+        entry = self.tree.find_entry(ftp_path) if '/' in ftp_path else None
+        if entry is not None and not entry.is_dir:
+            content = self._cached(f'file:{ftp_path.lower()}', lambda: self.tree.file_content(ftp_path, entry))
+            content_type = html_type if entry.name.lower().endswith('.htm') else 'application/x-zip-compressed'
+            return 200, content, content_type, {}
+        return 404, b'Not found', 'text/plain', {}
+
+    def _cached(self, key: str, generate) -> Optional[bytes]:
+        with self._lock:
+            content = self._content_cache.get(key)
+        if content is None:
+            content = generate()
+            if content is not None:
+                with self._lock:
+                    self._content_cache[key] = content
+        return content
+
+    def start(self) -> 'Mock3gppServer':
+        self._thread = threading.Thread(target=self._httpd.serve_forever, args=(0.05,), name='Mock3gppServer', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> 'Mock3gppServer':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def url_for(self, url: str) -> str:
+        """Rewrites a URL of one of the 3GPP hosts to point to this server"""
+        parts = urlsplit(url)
+        if parts.hostname not in redirected_hosts:
+            return url
+        base = urlsplit(self.base_url)
+        return urlunsplit((base.scheme, base.netloc, parts.path, parts.query, parts.fragment))
+
+    @contextmanager
+    def redirect(self, session: requests.Session):
+        """
+        Redirects all requests of the session to the 3GPP hosts to this server. The session's existing adapters
+        (e.g. CacheControl's) still handle the request
+        """
+        previous_adapters = dict(session.adapters)
+        for scheme in ['http://', 'https://']:
+            session.mount(scheme, _RedirectingAdapter(self, session.get_adapter(scheme + 'localhost')))
+        try:
+            yield session
+        finally:
+            session.adapters.clear()
+            session.adapters.update(previous_adapters)
+
+
+class _RedirectingAdapter(HTTPAdapter):
+    def __init__(self, mock_server: Mock3gppServer, inner_adapter):
+        super().__init__()
+        self.mock_server = mock_server
+        self.inner_adapter = inner_adapter
+
+    def send(self, request, **kwargs):
+        original_url = request.url
+        request.url = self.mock_server.url_for(original_url)
+        kwargs['verify'] = False
+        response = self.inner_adapter.send(request, **kwargs)
+        response.url = original_url
+        return response
+
+    def close(self):
+        self.inner_adapter.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline mock of the 3GPP servers')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every request')
+    parser.add_argument('--bandwidth', type=int, default=None, help='Bytes/s per response')
+    parser.add_argument('--not-found-rate', type=float, default=0.0)
+    parser.add_argument('--server-error-rate', type=float, default=0.0)
+    parser.add_argument('--tdocs-per-meeting', type=int, default=MockTreeConfig().tdocs_per_meeting)
+    args = parser.parse_args()
+
+    mock_server = Mock3gppServer(
+        tree=MockTree(MockTreeConfig(tdocs_per_meeting=args.tdocs_per_meeting)),
+        faults=FaultProfile(args.latency, args.bandwidth, args.not_found_rate, args.server_error_rate),
+        port=args.port)
+    print(f'Serving mock 3GPP server on {mock_server.base_url}')
+    try:
+        mock_server.start()._thread.join()
+    except KeyboardInterrupt:
+        mock_server.stop()
+
+
+if __name__ == '__main__':
+    main()
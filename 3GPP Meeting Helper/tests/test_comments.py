@@ -1,6 +1,11 @@
+import os.path
+import tempfile
 import unittest
+
+import openpyxl
+import pandas as pd
+
 import parsing.excel
-import os.path
 
 class Test_test_comments(unittest.TestCase):
     def test_read_comments(self):
@@ -124,5 +129,57 @@ class Test_test_comments(unittest.TestCase):
 
         self.assertEqual(fg_color['S2-190XXXX'], 'FFB2FFFF')
         self.assertEqual(text_color['S2-190XXXX'], 'FF02FFFF')
+
+    def test_get_reddest_colors(self):
+        colors = parsing.excel.get_reddest_colors({
+            'S2-1900001': ['FF01FFFF', 'FFB2FFFF', 'FF00FFFF'],
+            'S2-1900002': ['FFB2FFFF', 'FFB2AAAA'],
+            'S2-1900003': ['FFB2FFFF', 1],
+            'S2-1900004': [],
+            None: ['ffc7ce00']})
+
+        self.assertEqual(colors['S2-1900001'], 'FFB2FFFF')
+        # Same red component: last one
+        self.assertEqual(colors['S2-1900002'], 'FFB2AAAA')
+        # Theme/indexed colors can not be compared
+        self.assertEqual(colors['S2-1900003'], '00000000')
+        self.assertEqual(colors['S2-1900004'], '00000000')
+        self.assertEqual(colors[None], 'ffc7ce00')
+
+    def test_get_reddest_colors_theme_colors_only(self):
+        # Theme/indexed fonts (e.g. the default theme="1") return ints or bools, not ARGB strings
+        colors = parsing.excel.get_reddest_colors({'S2-1900001': [1, 1], 'S2-1900002': [True], 'S2-1900003': []})
+        self.assertEqual(colors, {'S2-1900001': '00000000', 'S2-1900002': '00000000', 'S2-1900003': '00000000'})
+        self.assertEqual(parsing.excel.get_reddest_color([1]), '00000000')
+        self.assertEqual(parsing.excel.get_reddest_color([]), '00000000')
+
+    def test_write_tdocs_with_comments_and_hyperlinks(self):
+        tdocs_df = pd.DataFrame({
+            'AI': ['1', '2'],
+            'Revision of': ['S2-1900001', ''],
+            'Session comments': ['Approved', None]},
+            index=pd.Index(['S2-1900002', 'S2-1900003'], name='TD#'))
+        server_urls = {'S2-1900001': 'https://www.3gpp.org/1', 'S2-1900002': 'https://www.3gpp.org/2'}
+        fg_colors = {'S2-1900002': 'FFFFC7CE', 'S2-1900003': '00000000'}
+        text_colors = {'S2-1900002': 'FF9C0006', 'S2-1900003': '00000000'}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_name = os.path.join(temp_dir, 'tdocs.xlsx')
+            parsing.excel.write_tdocs_with_comments_and_hyperlinks(
+                file_name, tdocs_df, 'TDocs', fg_colors, text_colors, server_urls)
+            wb = openpyxl.load_workbook(file_name)
+            ws = wb['TDocs']
+
+            self.assertEqual(ws['A2'].value, 'S2-1900002')
+            self.assertEqual(ws['A2'].hyperlink.target, 'https://www.3gpp.org/2')
+            self.assertEqual(ws['A2'].font.color.rgb, 'FFEA0A8E')
+            self.assertEqual(ws['C2'].hyperlink.target, 'https://www.3gpp.org/1')
+            self.assertIsNone(ws['A3'].hyperlink)
+            self.assertEqual(ws['D2'].value, 'Approved')
+            self.assertEqual(ws['D2'].fill.fgColor.rgb, 'FFFFC7CE')
+            self.assertEqual(ws['D2'].font.color.rgb, 'FF9C0006')
+            self.assertIsNone(ws['D3'].fill.fill_type)
+            wb.close()
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,166 @@
+import hashlib
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+import server.common.connection as connection
+import server.folder_watcher as folder_watcher
+import server.prefetch as prefetch
+import threegpp_common.folder_watcher
+from threegpp_common.folder_watcher import FolderWatcher
+from parsing.html.revisions import TdocRevision
+from server.common.connection import ConditionalFetchResult, RemoteFileValidators
+from server.folder_watcher import ListingEventType, WatchedFolderType
+
+meeting_folder = 'TSGS2_160_Hyderabad_2024-02'
+revisions_url = f'https://www.3gpp.org/ftp/tsg_sa/WG2_Arch/{meeting_folder}/INBOX/Revisions/'
+
+
+def listing_html(entries) -> bytes:
+    rows = ''.join(
+        f'<tr><td><img src="/ftp/geticon.axd?file=zip"></td><td><a href="{revisions_url}{name}">{name}</a></td>'
+        f'<td>2024/02/26 10:30</td><td>{size} bytes</td></tr>' for name, size in entries)
+    return f'<html><body><table>{rows}</table></body></html>'.encode('utf-8')
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, content: bytes = b'', headers: dict | None = None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers if headers is not None else {}
+        self.reason = ''
+
+
+class Test_test_folder_watcher(unittest.TestCase):
+    def test_tdoc_of_file(self):
+        self.assertEqual(folder_watcher.get_tdoc_of_file('S2-2401234r01.zip'), ('S2-2401234', '01'))
+        self.assertEqual(folder_watcher.get_tdoc_of_file('S2-2401234r01.zip', is_draft=True), ('S2-2401234', '01*'))
+        self.assertEqual(folder_watcher.get_tdoc_of_file('S2-2401234.zip'), ('S2-2401234', ''))
+        self.assertIsNone(folder_watcher.get_tdoc_of_file('Chair_Notes.docx'))
+
+    def test_meeting_events(self):
+        events = [
+            threegpp_common.folder_watcher.ListingEvent(
+                FolderWatcher.SIZE_CHANGED, 'S2-2401235', 'r01', 2000, 1000, revisions_url + 'S2-2401235r01.zip'),
+            threegpp_common.folder_watcher.ListingEvent(
+                FolderWatcher.NEW_TDOC, 'S2-2401236', '', 1000, None, revisions_url + 'S2-2401236.zip')]
+        meeting_events = folder_watcher.to_meeting_events(events, meeting_folder, WatchedFolderType.DRAFTS)
+        self.assertEqual(
+            [(e.event_type, e.meeting_folder, e.folder_type, e.tdoc_id, e.revision) for e in meeting_events],
+            [(ListingEventType.SIZE_CHANGED, meeting_folder, WatchedFolderType.DRAFTS, 'S2-2401235', '01*'),
+             (ListingEventType.NEW_TDOC, meeting_folder, WatchedFolderType.DRAFTS, 'S2-2401236', '')])
+        self.assertEqual(meeting_events[0].previous_size, 1000)
+
+    def test_conditional_fetch(self):
+        content = listing_html([('S2-2401234r01.zip', 1000)])
+        with mock.patch.object(connection.non_cached_http_session, 'get') as get:
+            get.return_value = FakeResponse(200, content, {'ETag': '"abc"'})
+            result = connection.get_remote_file_if_modified(revisions_url)
+            self.assertTrue(result.modified)
+            self.assertEqual(result.validators.etag, '"abc"')
+
+            # Validators are sent back to the server
+            get.return_value = FakeResponse(304)
+            not_modified = connection.get_remote_file_if_modified(revisions_url, result.validators)
+            self.assertFalse(not_modified.modified)
+            self.assertEqual(get.call_args.kwargs['headers'], {'If-None-Match': '"abc"'})
+
+            # Servers ignoring conditional requests: the content is compared
+            get.return_value = FakeResponse(200, content)
+            same_content = connection.get_remote_file_if_modified(revisions_url, result.validators)
+            self.assertEqual(same_content.status_code, 200)
+            self.assertFalse(same_content.modified)
+            self.assertIsNone(same_content.content)
+
+    def test_watch_meeting_folder(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            revisions_file = os.path.join(temp_dir, 'Revisions.htm')
+            folder = folder_watcher._WatchedFolder(
+                meeting_folder, WatchedFolderType.REVISIONS, ['http://10.10.10.10/Revisions/', revisions_url],
+                revisions_file)
+            first_listing = listing_html([('S2-2401234r01.zip', 1000)])
+            second_listing = listing_html([('S2-2401234r01.zip', 1000), ('S2-2401234r02.zip', 1000)])
+            validators = RemoteFileValidators(None, None, 'digest')
+            responses = [
+                ConditionalFetchResult(None, False, None, None),
+                ConditionalFetchResult(200, True, first_listing, validators),
+                ConditionalFetchResult(304, False, None, validators),
+                ConditionalFetchResult(200, True, second_listing, validators)]
+            published = []
+            watcher = FolderWatcher(folder_watcher._fetch)
+            watcher.subscribe(folder_watcher._publish)
+            with mock.patch.object(connection, 'get_remote_file_if_modified', side_effect=responses) as get, \
+                    mock.patch.dict(folder_watcher._folders, {folder.url: folder}), \
+                    mock.patch.object(folder_watcher, '_subscribers', [published.extend]):
+                # The first candidate URL that answers is used from then on
+                watcher.refresh(folder.url)
+                self.assertEqual([c.args[0] for c in get.call_args_list],
+                                 ['http://10.10.10.10/Revisions/', revisions_url])
+                with open(revisions_file, 'rb') as f:
+                    self.assertEqual(f.read(), first_listing)
+
+                watcher.refresh(folder.url)
+                self.assertEqual(get.call_args.args, (revisions_url, validators))
+                watcher.refresh(folder.url)
+
+            self.assertEqual([(e.folder_type, e.tdoc_id, e.revision) for e in published],
+                             [(WatchedFolderType.REVISIONS, 'S2-2401234', '02')])
+            with open(revisions_file, 'rb') as f:
+                self.assertEqual(f.read(), second_listing)
+
+    def test_listing_file_only_downloaded_if_changed(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            revisions_file = os.path.join(temp_dir, 'Revisions.htm')
+            listing = listing_html([('S2-2401234r01.zip', 1000)])
+            with open(revisions_file, 'wb') as f:
+                f.write(listing)
+            validators = RemoteFileValidators('"abc"', None, 'digest')
+            responses = [
+                ConditionalFetchResult(304, False, None, validators),
+                ConditionalFetchResult(304, False, None, validators)]
+            with mock.patch.object(connection, 'get_remote_file_if_modified', side_effect=responses) as get, \
+                    mock.patch.object(folder_watcher.utils.local_cache, 'get_local_revisions_filename',
+                                      return_value=revisions_file), \
+                    mock.patch.object(folder_watcher.utils.local_cache, 'get_local_drafts_filename',
+                                      return_value=os.path.join(temp_dir, 'Drafts.htm')), \
+                    mock.patch.object(folder_watcher, '_watcher', FolderWatcher(folder_watcher._fetch)), \
+                    mock.patch.dict(folder_watcher._folders, {}):
+                # The local copy is the baseline: its digest is sent, so that the server does not send it again
+                self.assertEqual(
+                    folder_watcher.get_listing_file(meeting_folder, WatchedFolderType.REVISIONS), revisions_file)
+                self.assertEqual(get.call_args.args[1].digest, hashlib.sha256(listing).hexdigest())
+                self.assertEqual(
+                    folder_watcher.get_listing_file(meeting_folder, WatchedFolderType.REVISIONS), revisions_file)
+                self.assertEqual(get.call_args.args[1], validators)
+
+                # The watched meeting: the watcher keeps the local copy up to date
+                with mock.patch.object(folder_watcher, '_watched_folders',
+                                       list(folder_watcher._get_meeting_folders(meeting_folder, False))):
+                    self.assertEqual(
+                        folder_watcher.get_listing_file(meeting_folder, WatchedFolderType.REVISIONS), revisions_file)
+                self.assertEqual(get.call_count, 2)
+
+            with open(revisions_file, 'rb') as f:
+                self.assertEqual(f.read(), listing)
+
+    def test_prefetch_consumes_events(self):
+        tdocs_df = pd.DataFrame({'AI': ['6.1']}, index=['S2-2401234'])
+        state = prefetch._PrefetchState(meeting_folder, tdocs_df, None, False, None)
+        state.revisions = [TdocRevision('S2-2401234', '01')]
+        state.known_revisions = set(state.revisions)
+        new_revision = folder_watcher.ListingEvent(
+            ListingEventType.NEW_REVISION, meeting_folder, WatchedFolderType.REVISIONS, 'S2-2401234', '02', 1000,
+            None, revisions_url + 'S2-2401234r02.zip')
+        other_meeting = new_revision._replace(meeting_folder='TSGS2_161_Athens_2024-02', revision='03')
+        with mock.patch.object(prefetch, '_state', state):
+            prefetch._on_folder_events([new_revision, other_meeting])
+        self.assertEqual(state.new_revisions, {TdocRevision('S2-2401234', '02')})
+        self.assertEqual(len(state.revisions), 2)
+        self.assertTrue(state.wakeup.is_set())
+
+
+if __name__ == '__main__':
+    unittest.main()
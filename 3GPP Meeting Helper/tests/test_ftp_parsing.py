@@ -1,5 +1,7 @@
+import datetime
 import unittest
 import parsing.html.common as html_parser
+import threegpp_common.ftp_listing as ftp_listing
 import os.path
 
 class Test_test_ftp_parsing(unittest.TestCase):
@@ -152,5 +154,21 @@ class Test_test_ftp_parsing(unittest.TestCase):
         self.assertEqual(parsed.location, '/ftp/tsg_sa/WG2_Arch/TSGS2_137e_Electronic/')
         self.assertListEqual(parsed.folders, [ 'Agenda', 'Docs', 'Inbox', 'Invitation', 'Report' ])
         self.assertListEqual(parsed.files, [ 'S2-137E_Agenda.htm', 'SA2-137E_Index_2020.zip', 'TdocsByAgenda.htm', 'TdocsByAgenda_02-24-0000.doc' ])
+
+    def test_listing_entries_v2(self):
+        html_file = '2020.02.24 Tdocs by Agenda.htm'
+        file_name = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'ftp_server', html_file)
+        with open(file_name, 'r') as content_file:
+            html = content_file.read()
+        entries = ftp_listing.parse_listing(html)
+        self.assertEqual(len(entries), 9)
+        self.assertEqual(entries[0], ftp_listing.ListingEntry(
+            'Agenda', True, None, datetime.datetime(2020, 2, 24, 6, 2),
+            'https://www.3gpp.org/ftp/tsg_sa/WG2_Arch/TSGS2_137e_Electronic/Agenda'))
+        self.assertEqual(entries[5], ftp_listing.ListingEntry(
+            'S2-137E_Agenda.htm', False, int(20.3 * 1024), datetime.datetime(2020, 2, 21, 7, 20),
+            'https://www.3gpp.org/ftp/tsg_sa/WG2_Arch/TSGS2_137e_Electronic/S2-137E_Agenda.htm'))
+
+
 if __name__ == '__main__':
     unittest.main()
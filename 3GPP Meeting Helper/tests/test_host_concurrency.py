@@ -0,0 +1,62 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import server.common.connection as connection
+from threegpp_common.host_concurrency import HostConcurrency
+from tests.mock_3gpp_server import Mock3gppServer, MockTree, MockTreeConfig, FaultProfile
+
+
+class Test_test_host_concurrency_mock_server(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tree = MockTree(MockTreeConfig(
+            working_groups=('S2',),
+            meetings_per_wg=1,
+            tdocs_per_meeting=200,
+            revisions_per_meeting=0,
+            min_tdoc_size=1024,
+            max_tdoc_size=2 * 1024))
+
+    def setUp(self):
+        HostConcurrency._controllers.clear()
+        self.mock_server = Mock3gppServer(self.tree).start()
+        self.session_patch = mock.patch.object(connection, 'initialize_http_session')
+        self.session_patch.start()
+        self.redirect = self.mock_server.redirect(connection.non_cached_http_session)
+        self.redirect.__enter__()
+        self.docs_url = 'https://www.3gpp.org/ftp/tsg_sa/WG2_Arch/TSGS2_160_Goteborg/Docs/'
+
+    def tearDown(self):
+        self.redirect.__exit__(None, None, None)
+        self.session_patch.stop()
+        self.mock_server.stop()
+        HostConcurrency._controllers.clear()
+
+    def download_all(self, n_tdocs: int):
+        urls = [f'{self.docs_url}S2-24{10000 + i}.zip' for i in range(n_tdocs)]
+        with ThreadPoolExecutor(max_workers=HostConcurrency.MAX_CONCURRENCY) as executor:
+            return list(executor.map(lambda url: connection.get_remote_file(url, cache=False), urls))
+
+    def test_limit_grows_with_latency(self):
+        # High latency and no bandwidth limit: more parallel requests means more throughput
+        self.mock_server.faults = FaultProfile(latency=0.05)
+        results = self.download_all(150)
+        self.assertTrue(all(result is not None for result in results))
+        controller = HostConcurrency.get_controller(self.docs_url)
+        self.assertGreater(controller.limit, HostConcurrency.INITIAL_CONCURRENCY)
+        self.assertEqual(controller.active, 0)
+
+    def test_circuit_breaker(self):
+        self.mock_server.faults = FaultProfile(server_error_rate=1.0)
+        results = self.download_all(20)
+        self.assertTrue(all(result is None for result in results))
+        controller = HostConcurrency.get_controller(self.docs_url)
+        self.assertEqual(controller.limit, HostConcurrency.MIN_CONCURRENCY)
+        self.assertTrue(controller.is_open())
+        # Requests to the paused host are not sent
+        self.assertLess(self.mock_server.total_requests, 20)
+
+
+if __name__ == '__main__':
+    unittest.main()
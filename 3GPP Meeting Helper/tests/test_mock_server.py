@@ -0,0 +1,105 @@
+import io
+import os
+import tempfile
+import time
+import unittest
+import zipfile
+from unittest import mock
+
+import openpyxl
+
+import server.common.connection as connection
+import server.common.server_utils as server_utils
+from threegpp_common.ftp_listing import parse_listing
+from tests.mock_3gpp_server import Mock3gppServer, MockTree, MockTreeConfig, FaultProfile
+
+
+class Test_test_mock_server(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tree = MockTree(MockTreeConfig(
+            working_groups=('S2',),
+            meetings_per_wg=2,
+            tdocs_per_meeting=200,
+            revisions_per_meeting=20,
+            min_tdoc_size=1024,
+            max_tdoc_size=8 * 1024))
+
+    def setUp(self):
+        self.mock_server = Mock3gppServer(self.tree).start()
+        # Non-cached requests only: the HTTP file cache is not used
+        self.session_patch = mock.patch.object(connection, 'initialize_http_session')
+        self.session_patch.start()
+        self.redirect = self.mock_server.redirect(connection.non_cached_http_session)
+        self.redirect.__enter__()
+
+    def tearDown(self):
+        self.redirect.__exit__(None, None, None)
+        self.session_patch.stop()
+        self.mock_server.stop()
+
+    def get(self, url):
+        return connection.get_remote_file(url, cache=False)
+
+    def test_crawl_ftp_tree(self):
+        meetings = parse_listing(self.get('https://www.3gpp.org/ftp/tsg_sa/WG2_Arch/'))
+        self.assertEqual([e.name for e in meetings], ['TSGS2_160_Goteborg', 'TSGS2_161_Sophia_Antipolis'])
+        self.assertTrue(all(e.is_dir for e in meetings))
+
+        docs = parse_listing(self.get(meetings[0].url + '/Docs/'))
+        self.assertEqual(len(docs), 200)
+        self.assertEqual(docs[0].name, 'S2-2410000.zip')
+
+        zip_content = self.get(docs[0].url)
+        self.assertEqual(zipfile.ZipFile(io.BytesIO(zip_content)).namelist(), ['S2-2410000.docx'])
+
+        revisions = parse_listing(self.get(meetings[0].url + '/INBOX/Revisions'))
+        self.assertEqual(len(revisions), 20)
+        self.assertEqual(revisions[0].name, 'S2-2410000r01.zip')
+
+    def test_private_server(self):
+        html = self.get('http://10.10.10.10/tsg_sa/WG2_Arch/TSGS2_160_Goteborg/TdocsByAgenda.htm')
+        self.assertEqual(html, self.tree.tdocs_by_agenda_fixture)
+
+    def test_tdoc_list_excel(self):
+        content = self.get('https://portal.3gpp.org/ngppapp/GenerateDocumentList.aspx?meetingId=60161')
+        rows = list(openpyxl.load_workbook(io.BytesIO(content), read_only=True).active.iter_rows(values_only=True))
+        self.assertEqual(rows[0][0:3], ('TDoc', 'Title', 'Source'))
+        self.assertEqual(len(rows), 201)
+        self.assertEqual(rows[1][0], 'S2-2420000')
+
+    def test_dynareport_pages(self):
+        self.assertIn(b'S2-161', self.get(server_utils.meeting_pages_per_group['S2']))
+        self.assertIn(b'23501-i20.zip', self.get('https://www.3gpp.org/dynareport?code=23501.htm'))
+        self.assertIsNone(self.get('https://www.3gpp.org/dynareport?code=Unknown.htm'))
+
+    def test_latency(self):
+        self.mock_server.faults = FaultProfile(latency=0.2)
+        start = time.perf_counter()
+        self.get('https://www.3gpp.org/ftp/tsg_sa/WG2_Arch/')
+        self.assertGreaterEqual(time.perf_counter() - start, 0.2)
+
+    def test_bandwidth(self):
+        self.mock_server.faults = FaultProfile(bandwidth=400 * 1024)
+        url = 'https://www.3gpp.org/ftp/tsg_sa/WG2_Arch/TSGS2_160_Goteborg/Docs/'
+        start = time.perf_counter()
+        content = self.get(url)
+        self.assertGreaterEqual(time.perf_counter() - start, 0.9 * len(content) / (400 * 1024))
+
+    def test_injected_errors_in_batch_download(self):
+        self.mock_server.faults = FaultProfile(not_found_rate=0.3, server_error_rate=0.2, seed=1)
+        docs_url = 'https://www.3gpp.org/ftp/tsg_sa/WG2_Arch/TSGS2_160_Goteborg/Docs'
+        with tempfile.TemporaryDirectory() as temp_dir:
+            files_to_download = [
+                server_utils.FileToDownload(f'{docs_url}/S2-24{10000 + i}.zip', os.path.join(temp_dir, f'{i}.zip'), True)
+                for i in range(40)]
+            server_utils.batch_download_file_to_location(files_to_download)
+            downloaded = len(os.listdir(temp_dir))
+
+        self.assertEqual(self.mock_server.total_requests, 40)
+        self.assertGreater(downloaded, 5)
+        self.assertLess(downloaded, 35)
+
+
+if __name__ == '__main__':
+    unittest.main()
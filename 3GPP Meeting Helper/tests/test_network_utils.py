@@ -0,0 +1,60 @@
+import unittest
+from unittest import mock
+
+import server.common.network_utils as network_utils
+from config.networking import NetworkingConfig
+
+
+class Test_test_network_utils(unittest.TestCase):
+    def setUp(self):
+        network_utils._last_status = None
+        network_utils._last_route_addresses = None
+        network_utils._last_full_check = 0.0
+        network_utils._full_check_requested = False
+        self.addresses = ('192.168.1.10', '192.168.1.10')
+        self.patches = [
+            mock.patch.object(network_utils, 'get_route_addresses', side_effect=lambda: self.addresses),
+            mock.patch.object(network_utils, 'is_vpn_active', return_value=(False, [])),
+            mock.patch.object(network_utils, 'we_are_in_meeting_network', return_value=False)]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+
+    def test_route_addresses(self):
+        self.patches[0].stop()
+        addresses = network_utils.get_route_addresses()
+        self.patches[0].start()
+        self.assertEqual(len(addresses), 2)
+
+    def test_full_check_only_on_changes(self):
+        self.assertFalse(network_utils.get_network_status().in_meeting_network)
+        network_utils.get_network_status()
+        self.assertEqual(network_utils.is_vpn_active.call_count, 1)
+
+        # Joining the meeting network
+        self.addresses = ('10.10.1.20', '10.10.1.20')
+        network_utils.we_are_in_meeting_network.return_value = True
+        self.assertTrue(network_utils.get_network_status().in_meeting_network)
+        self.assertEqual(network_utils.is_vpn_active.call_count, 2)
+
+        # Periodic full check
+        network_utils._last_full_check -= NetworkingConfig.network_full_check_interval_s
+        network_utils.get_network_status()
+        self.assertEqual(network_utils.is_vpn_active.call_count, 3)
+
+    def test_failed_request_to_private_server(self):
+        network_utils.get_network_status()
+        network_utils.report_failed_request('https://www.3gpp.org/ftp/tsg_sa/WG2_Arch/')
+        network_utils.get_network_status()
+        self.assertEqual(network_utils.is_vpn_active.call_count, 1)
+
+        network_utils.report_failed_request('http://10.10.10.10/ftp/SA/SA2/Inbox/S2-2401234.zip')
+        network_utils.get_network_status()
+        self.assertEqual(network_utils.is_vpn_active.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
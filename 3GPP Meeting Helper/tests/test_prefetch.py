@@ -0,0 +1,88 @@
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+import server.common.connection
+import server.prefetch as prefetch
+from parsing.html.revisions import TdocRevision
+
+
+class Test_test_prefetch(unittest.TestCase):
+    def setUp(self):
+        self.tdocs_df = pd.DataFrame(
+            data={
+                'AI': ['6.1', '6.1', '6.2', '6.3', '6.4', '7.1'],
+                'Result': ['Agreed', 'Noted', '', '', '', ''],
+            },
+            index=['S2-2400001', 'S2-2400002', 'S2-2400003', 'S2-2400004', 'S2-2400005', 'S2-2400006'])
+        self.ai_order = prefetch.get_agenda_item_order(self.tdocs_df)
+
+    def test_agenda_item_order(self):
+        self.assertEqual(self.ai_order, ['6.1', '6.2', '6.3', '6.4', '7.1'])
+        # Agenda order takes precedence over TdocsByAgenda order. AIs not in the agenda go last
+        self.assertEqual(
+            prefetch.get_agenda_item_order(self.tdocs_df, {'7.1': '', '6.4': '', '6.3': '', '6.2': ''}),
+            ['7.1', '6.4', '6.3', '6.2', '6.1'])
+
+    def test_current_agenda_item(self):
+        # First AI with TDocs without a result
+        self.assertEqual(prefetch.get_current_agenda_item(self.tdocs_df, self.ai_order), '6.2')
+        # AI of the last opened TDoc (also for revisions)
+        self.assertEqual(prefetch.get_current_agenda_item(self.tdocs_df, self.ai_order, 'S2-2400005r02'), '6.4')
+        self.assertEqual(prefetch.get_current_agenda_item(self.tdocs_df, self.ai_order, 'S2-2499999'), '6.2')
+
+    def test_plan_current_and_next_agenda_items(self):
+        plan = prefetch.get_prefetch_plan(self.tdocs_df, self.ai_order, '6.2', next_agenda_items=1)
+        self.assertEqual(
+            [(item.tdoc_id, item.priority) for item in plan],
+            [('S2-2400003', 0), ('S2-2400004', 1)])
+
+    def test_plan_revisions(self):
+        revisions = [
+            TdocRevision('S2-2400003', '01'),
+            TdocRevision('S2-2400003', '02'),
+            TdocRevision('S2-2400003', '03*'),
+            TdocRevision('S2-2400006', '01'),
+            TdocRevision('S2-2400001', '01'),
+        ]
+        plan = prefetch.get_prefetch_plan(
+            self.tdocs_df,
+            self.ai_order,
+            '6.2',
+            next_agenda_items=1,
+            revisions=revisions,
+            new_revisions=[TdocRevision('S2-2400006', '01')],
+            is_available=lambda tdoc_id: tdoc_id == 'S2-2400003')
+        # Last (non-draft) revision in the current AI first, new revisions in other AIs last. Revisions without
+        # changes outside the prefetched AIs are skipped. Available TDocs are skipped
+        self.assertEqual(
+            [(item.tdoc_id, item.priority) for item in plan],
+            [('S2-2400003r02', 0), ('S2-2400004', 1), ('S2-2400006r01', 2)])
+
+    def test_plan_no_current_agenda_item(self):
+        self.assertEqual(prefetch.get_prefetch_plan(self.tdocs_df, self.ai_order, None), [])
+
+    def test_rate_limiter(self):
+        with mock.patch('server.common.connection.time.monotonic', return_value=100.0):
+            rate_limiter = server.common.connection.RateLimiter(requests_per_minute=6, burst=2)
+            self.assertEqual(rate_limiter.try_acquire(), 0)
+            self.assertEqual(rate_limiter.try_acquire(), 0)
+            self.assertAlmostEqual(rate_limiter.try_acquire(), 10)
+        with mock.patch('server.common.connection.time.monotonic', return_value=110.0):
+            self.assertEqual(rate_limiter.try_acquire(), 0)
+            self.assertFalse(rate_limiter.acquire(should_stop=lambda: True))
+
+    def test_background_requests(self):
+        with mock.patch.object(server.common.connection, 'last_foreground_request_time', 0.0):
+            with server.common.connection.background_requests():
+                with mock.patch.object(server.common.connection, 'urlparse', side_effect=ValueError()):
+                    server.common.connection.get_remote_file('https://www.3gpp.org')
+            self.assertEqual(server.common.connection.last_foreground_request_time, 0.0)
+            with mock.patch.object(server.common.connection, 'urlparse', side_effect=ValueError()):
+                server.common.connection.get_remote_file('https://www.3gpp.org')
+            self.assertGreater(server.common.connection.last_foreground_request_time, 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+import datetime
+import os
+import re
+import tempfile
+import unittest
+import unittest.mock
+
+import html2text
+import pandas as pd
+
+import parsing.html.revisions as revisions
+
+revisions_html_v1 = '''<html><head><title>www.3gpp.org - /ftp/tsg_sa/WG2_Arch/TSGS2_136_Reno/Inbox/Revisions/</title></head><body><H1>www.3gpp.org - /ftp/tsg_sa/WG2_Arch/TSGS2_136_Reno/Inbox/Revisions/</H1><hr>
+<pre><A HREF="/ftp/tsg_sa/WG2_Arch/TSGS2_136_Reno/Inbox/">[To Parent Directory]</A><br><br>11/19/2019  8:36 AM        &lt;dir&gt; <A HREF="/ftp/tsg_sa/WG2_Arch/TSGS2_136_Reno/Inbox/Revisions/Old/">Old</A><br>11/19/2019 11:02 AM        71373 <A HREF="/ftp/tsg_sa/WG2_Arch/TSGS2_136_Reno/Inbox/Revisions/S2-1911100r01.zip">S2-1911100r01.zip</A><br>11/20/2019  4:42 PM        82211 <A HREF="/ftp/tsg_sa/WG2_Arch/TSGS2_136_Reno/Inbox/Revisions/S2-1911100r02.zip">S2-1911100r02.zip</A><br> 11/9/2019  1:07 PM       105830 <A HREF="/ftp/tsg_sa/WG2_Arch/TSGS2_136_Reno/Inbox/Revisions/S2-1911234r01.zip">S2-1911234r01.zip</A><br></pre><hr></body></html>'''
+
+revisions_html_v2 = '''<html><head><title>Directory Listing /tsg_sa/WG2_Arch/TSGS2_137e_Electronic/Inbox/Revisions</title></head>
+<body><form><table><thead><tr><th>&nbsp;</th><th><a href="?sortby=name">sort by name</a></th><th><a href="?sortby=date">sort by date</a></th><th><a href="?sortby=size">sort by size</a></th></tr></thead>
+<tbody>
+<tr>
+    <td><img class="icon" alt="icon" src="/ftp/geticon.axd?file=" /></td>
+    <td style="padding-right:10px"><a href="https://www.3gpp.org/ftp/tsg_sa/WG2_Arch/TSGS2_137e_Electronic/Inbox/Revisions/Old">Old</a></td>
+    <td style="padding-right:10px">2020/02/24 6:02</td>
+    <td></td>
+</tr>
+<tr>
+    <td><img class="icon" alt="icon" src="/ftp/geticon.axd?file=.zip" /></td>
+    <td style="padding-right:10px"><a href="https://www.3gpp.org/ftp/tsg_sa/WG2_Arch/TSGS2_137e_Electronic/Inbox/Revisions/S2-2001234r03.zip">S2-2001234r03.zip</a></td>
+    <td style="padding-right:10px">
+        2020/02/21 7:20
+    </td>
+    <td>
+        20,3 KB
+    </td>
+</tr>
+<tr>
+    <td><img class="icon" alt="icon" src="/ftp/geticon.axd?file=.zip" /></td>
+    <td style="padding-right:10px"><a href="https://www.3gpp.org/ftp/tsg_sa/WG2_Arch/TSGS2_137e_Electronic/Inbox/Revisions/S2-2001567r01.zip">S2-2001567r01.zip</a></td>
+    <td style="padding-right:10px">2020/02/24 17:45</td>
+    <td>1048,9 KB</td>
+</tr>
+</tbody></table></form></body></html>'''
+
+# Neither the IIS nor the "Directory Listing" format (e.g. a page generated by another server)
+revisions_html_other = '''<html><head><title>Revisions</title></head><body>
+<h2>Revisions uploaded today</h2>
+<ul>
+<li>S2-2401234r01 (Nokia) uploaded</li>
+<li>S2-2401234r02 (Nokia) uploaded</li>
+<li>S2-2401500r01 (Ericsson) uploaded</li>
+</ul></body></html>'''
+
+
+
+def extract_with_html2text(html: str, ignore_revision=False):
+    """The original extraction, based on converting the whole page to text"""
+    h = html2text.HTML2Text()
+    h.ignore_links = True
+    regex = r'S2-[\d]{7}' if ignore_revision else r'S2-[\d]{7}r[\d]{2}'
+    return set(re.findall(regex, h.handle(html)))
+
+
+class Test_test_revisions(unittest.TestCase):
+    def test_revisions_v1_same_as_html2text(self):
+        parsed = revisions.extract_tdoc_revisions_from_html(revisions_html_v1)
+        self.assertSetEqual(
+            {'{0}r{1}'.format(e.tdoc, e.revision) for e in parsed},
+            extract_with_html2text(revisions_html_v1))
+
+    def test_revisions_v2_same_as_html2text(self):
+        parsed = revisions.extract_tdoc_revisions_from_html(revisions_html_v2)
+        self.assertSetEqual(
+            {'{0}r{1}'.format(e.tdoc, e.revision) for e in parsed},
+            extract_with_html2text(revisions_html_v2))
+
+    def test_revisions_ignore_revision(self):
+        parsed = revisions.extract_tdoc_revisions_from_html(revisions_html_v1, ignore_revision=True)
+        self.assertSetEqual({e.tdoc for e in parsed}, extract_with_html2text(revisions_html_v1, ignore_revision=True))
+        self.assertSetEqual({e.revision for e in parsed}, {''})
+
+    def test_revisions_other_format(self):
+        parsed = revisions.extract_tdoc_revisions_from_html(revisions_html_other)
+        self.assertSetEqual(
+            {'{0}r{1}'.format(e.tdoc, e.revision) for e in parsed},
+            {'S2-2401234r01', 'S2-2401234r02', 'S2-2401500r01'})
+        self.assertSetEqual({(e.size, e.date) for e in parsed}, {(None, None)})
+
+    def test_revisions_other_format_from_file(self):
+        with tempfile.TemporaryDirectory() as folder:
+            file_path = os.path.join(folder, 'revisions.htm')
+            with open(file_path, 'w') as file:
+                file.write(revisions_html_other)
+            parsed = revisions.extract_tdoc_revisions_from_html(file_path, is_path=True, ignore_revision=True)
+        self.assertSetEqual({e.tdoc for e in parsed}, {'S2-2401234', 'S2-2401500'})
+
+    def test_revisions_drafts(self):
+        parsed = revisions.extract_tdoc_revisions_from_html(revisions_html_v2, is_draft=True)
+        self.assertSetEqual({e.revision for e in parsed}, {'03*', '01*'})
+
+    def test_revisions_v1_size_and_date(self):
+        parsed = {(e.tdoc, e.revision): e for e in revisions.extract_tdoc_revisions_from_html(revisions_html_v1)}
+        revision = parsed[('S2-1911100', '02')]
+        self.assertEqual(revision.size, 82211)
+        self.assertEqual(revision.date, datetime.datetime(2019, 11, 20, 16, 42))
+        revision = parsed[('S2-1911234', '01')]
+        self.assertEqual(revision.size, 105830)
+        self.assertEqual(revision.date, datetime.datetime(2019, 11, 9, 13, 7))
+
+    def test_revisions_v2_size_and_date(self):
+        parsed = {(e.tdoc, e.revision): e for e in revisions.extract_tdoc_revisions_from_html(revisions_html_v2)}
+        revision = parsed[('S2-2001234', '03')]
+        self.assertEqual(revision.size, int(20.3 * 1024))
+        self.assertEqual(revision.date, datetime.datetime(2020, 2, 21, 7, 20))
+        revision = parsed[('S2-2001567', '01')]
+        self.assertEqual(revision.size, int(1048.9 * 1024))
+        self.assertEqual(revision.date, datetime.datetime(2020, 2, 24, 17, 45))
+
+    def test_revisions_file_to_dataframe(self):
+        meeting_tdocs = pd.DataFrame(index=['S2-1911100', 'S2-1911234', 'S2-1911999'], data={'AI': ['1', '2', '3']})
+        revision_list = revisions.extract_tdoc_revisions_from_html(revisions_html_v1)
+        with unittest.mock.patch.object(revisions, 'extract_tdoc_revisions_from_html', return_value=revision_list):
+            tdocs, revisions_df = revisions.revisions_file_to_dataframe('revisions.htm', meeting_tdocs)
+        self.assertEqual(tdocs.at['S2-1911100', 'Revisions'], '02')
+        self.assertEqual(tdocs.at['S2-1911999', 'Revisions'], 0)
+        self.assertNotIn('Size', tdocs.columns)
+        self.assertListEqual(list(revisions_df.columns), ['Revisions', 'Size', 'Date'])
+        self.assertEqual(len(revisions_df.loc['S2-1911100']), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import server.specs as specs
+from parsing.html.specs import extract_spec_files_from_spec_folder
+from threegpp_common.config import CommonConfig
+
+archive_url = 'https://www.3gpp.org/ftp/Specs/archive/23_series/23.501'
+archive_file_versions = ['h40', 'h50', 'h60', 'i00', 'i10', 'i20', 'i30', 'j00']
+
+
+class Test_test_spec_index(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root_patch = mock.patch.object(CommonConfig, 'root', CommonConfig.DEFAULT_ROOT)
+        self.root_patch.start()
+        CommonConfig.configure(os.path.join(self.temp_dir.name, 'cache_root'))
+
+    def tearDown(self):
+        self.root_patch.stop()
+        self.temp_dir.cleanup()
+
+    def test_archive_listed_once(self):
+        html = ''.join(f'<a href="{archive_url}/23501-{v}.zip">23501-{v}.zip</a><br>' for v in archive_file_versions)
+        with mock.patch.object(specs, 'get_listing_file', return_value=html) as get_listing_file:
+            versions = specs.get_spec_versions('23.501', release=17)
+            self.assertEqual([v.version for v in versions], ['17.4.0', '17.5.0', '17.6.0'])
+            self.assertEqual(specs.get_latest_spec_version('23.501').file_version, 'j00')
+            archive_files = specs.get_spec_archive_files('23.501')
+            self.assertEqual(get_listing_file.call_count, 1)
+
+        self.assertEqual(len(archive_files), len(archive_file_versions))
+        self.assertEqual(archive_files[0].spec_url, f'{archive_url}/23501-h40.zip')
+        self.assertEqual(archive_files[0].series, '23')
+
+    def test_series_folder_listing(self):
+        series_url = 'https://www.3gpp.org/ftp/Specs/latest/Rel-16/23_series'
+        with open(os.path.join(os.path.dirname(__file__), 'specs', 'ftp_Specs_latest_Rel-16_23_series_.htm'), 'rb') as f:
+            html = f.read()
+        spec_files = {spec_file.file: spec_file for spec_file in
+                      extract_spec_files_from_spec_folder(html, series_url, release='16', series='23')}
+        self.assertEqual(spec_files['23216-g00.zip'].spec, '23.216')
+        self.assertEqual(spec_files['23216-g00.zip'].version, 'g00')
+        self.assertEqual(spec_files['23216-g00.zip'].spec_url, f'{series_url}/23216-g00.zip')
+        self.assertTrue(all(spec_file.release == '16' for spec_file in spec_files.values()))
+
+
+if __name__ == '__main__':
+    unittest.main()
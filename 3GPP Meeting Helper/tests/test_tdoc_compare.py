@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+import zipfile
+from unittest import mock
+
+import docx
+
+import server.tdoc_search
+from config.word import WordConfig
+from server.common.server_utils import DownloadedData, DownloadedTdocDocument
+
+
+class Test_test_tdoc_compare(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.files = {
+            'S2-2400001': self.create_docx('S2-2400001.docx', 'The UE shall send the request to the AMF.'),
+            'S2-2400001r01': self.create_docx('S2-2400001r01.docx', 'The UE shall send the request to the SMF.'),
+        }
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def create_docx(self, file_name, text):
+        document = docx.Document()
+        document.add_paragraph(text)
+        file_path = os.path.join(self.temp_dir.name, file_name)
+        document.save(file_path)
+        return file_path
+
+    def download(self, tdoc_list, **kwargs):
+        return [DownloadedData(
+            self.temp_dir.name,
+            [DownloadedTdocDocument(None, None, None, tdoc_id, self.files.get(tdoc_id))]) for tdoc_id in tdoc_list]
+
+    def test_compare_revision_chains(self):
+        output_folder = os.path.join(self.temp_dir.name, 'Redlines')
+        with mock.patch.object(server.tdoc_search, 'batch_search_and_download_tdocs', side_effect=self.download):
+            comparison_files = server.tdoc_search.compare_tdoc_revision_chains(
+                ['S2-2400001', 'S2-2400001r01', 'S2-2400001r02', 'S2-2400002'],
+                output_format='docx',
+                output_folder=output_folder)
+
+        self.assertEqual(
+            comparison_files[('S2-2400001', 'S2-2400001r01')],
+            os.path.join(output_folder, 'S2-2400001r01_vs_S2-2400001.docx'))
+        # Not downloaded
+        self.assertIsNone(comparison_files[('S2-2400001r01', 'S2-2400001r02')])
+        with zipfile.ZipFile(comparison_files[('S2-2400001', 'S2-2400001r01')]) as zf:
+            document_xml = zf.read('word/document.xml').decode('utf-8')
+        self.assertIn(f'w:author="{WordConfig.redline_author}"', document_xml)
+
+
+if __name__ == '__main__':
+    unittest.main()
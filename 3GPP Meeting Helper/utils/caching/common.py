@@ -1,38 +1,24 @@
-import hashlib
 import os
 import pickle
 from typing import Any
 
+from threegpp_common.cache_governor import CacheGovernor
+from threegpp_common.fingerprint import Fingerprint
+
 export_subfolder = 'export'
 
-def hash_file(file_path: str, chunk_size=4096) -> str|None:
+def hash_file(file_path: str) -> str|None:
     """
-    Calculates the MD5 hash of a file by reading it in chunks.
+    Calculates the fingerprint of a file (see threegpp_common.fingerprint). The file is only read if it changed since
+    the last time it was hashed.
 
     Args:
         file_path (str): The path to the file.
-        chunk_size (int): The size of chunks to read from the file (in bytes).
-                          Larger chunks can be faster for large files, but
-                          use more memory. 4096 or 8192 are common values.
 
     Returns:
-        str: The 32-character hexadecimal MD5 digest of the file, or None if an error occurs.
+        str: The 32-character hexadecimal digest of the file, or None if an error occurs.
     """
-    md5_hasher = hashlib.md5()
-    try:
-        with open(file_path, 'rb') as f:  # Open in binary read mode ('rb')
-            while True:
-                chunk = f.read(chunk_size)
-                if not chunk:  # End of file
-                    break
-                md5_hasher.update(chunk)
-        return md5_hasher.hexdigest()
-    except FileNotFoundError:
-        print(f"Error: File not found at '{file_path}'")
-        return None
-    except Exception as e:
-        print(f"An error occurred while hashing the file: {e}")
-        return None
+    return Fingerprint.file(file_path)
 
 
 def store_pickle_cache_for_file(
@@ -51,6 +37,7 @@ def store_pickle_cache_for_file(
             with open(target_file, 'wb') as file:
                 pickle.dump(data, file)
             print(f"Object successfully saved to '{target_file}'")
+            CacheGovernor.register(target_file, CacheGovernor.PICKLE)
         except Exception as e:
             print(f"Error saving object: {e}")
 
@@ -69,6 +56,7 @@ def retrieve_pickle_cache_for_file(
     try:
         with open(target_file, 'rb') as file:
             loaded_object = pickle.load(file)
+        CacheGovernor.touch(target_file)
         print(f"Object successfully loaded from '{target_file}'")
         print(f"Type of loaded object: {type(loaded_object)}")
         return loaded_object
@@ -0,0 +1,59 @@
+import os
+from typing import Iterator, Optional, Tuple
+
+from threegpp_common.cache_governor import CacheGovernor
+
+# Cache maintenance of the Meeting Helper. Quotas, eviction and the catalogue are handled by
+# threegpp_common.cache_governor.CacheGovernor: cache writers register their entries there and cache readers touch
+# them. This module adds the cache folders specific to this application (the HTTP cache and the specs folder) to the
+# first scan of files cached before the catalogue existed.
+http_and_specs_scan_key = 'scanned:http_and_specs'
+
+
+def _get_http_and_specs_entries() -> Iterator[Tuple[str, str, Optional[str]]]:
+    # Imported here to avoid circular imports (utils.local_cache imports many modules)
+    import utils.local_cache
+
+    webcache_folder = utils.local_cache.get_webcache_file()
+    if os.path.isdir(webcache_folder):
+        for folder, _, files in os.walk(webcache_folder):
+            for file in files:
+                yield os.path.join(folder, file), CacheGovernor.HTTP, None
+
+    specs_folder = utils.local_cache.get_spec_folder(create_dir=False)
+    if os.path.isdir(specs_folder):
+        for folder, _, files in os.walk(specs_folder):
+            for file in files:
+                file_path = os.path.join(folder, file)
+                if file.endswith('.zip'):
+                    yield file_path, CacheGovernor.SPECS, None
+                elif file.endswith('.md'):
+                    yield file_path, CacheGovernor.MARKDOWN, None
+                elif file.endswith('.pickle'):
+                    yield file_path, CacheGovernor.PICKLE, None
+
+
+def scan_existing_entries(force=False):
+    """
+    Registers the cache files written before the catalogue existed (once, unless forced)
+    Args:
+        force: Scan even if the cache was already scanned
+    """
+    import utils.local_cache
+    CacheGovernor.scan_existing_entries(utils.local_cache.get_cache_folder(create_dir=False), force=force)
+    if force or not CacheGovernor.is_scanned(http_and_specs_scan_key):
+        CacheGovernor.register_existing(http_and_specs_scan_key, _get_http_and_specs_entries())
+
+
+def run_cache_maintenance(dry_run=False) -> str:
+    """
+    Registers pre-existing cache files (first run only) and enforces the quotas
+    Args:
+        dry_run: Only report what would be evicted
+
+    Returns: The report
+    """
+    scan_existing_entries()
+    report = CacheGovernor.run_maintenance(dry_run=dry_run)
+    print(report)
+    return report
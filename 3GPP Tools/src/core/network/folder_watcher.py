@@ -0,0 +1,42 @@
+# --- File: core/network/folder_watcher.py ---
+import threading
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from threegpp_common import folder_watcher
+from core.network.session import NetworkSession
+
+
+class _ListingSignals(QObject):
+    # Emits (folder_url, [ListingEvent]). Queued to the receivers' (GUI) thread by Qt
+    listing_changed = pyqtSignal(str, list)
+
+
+class FolderWatcher(folder_watcher.FolderWatcher):
+    """
+    Single poller for the meeting folders (see threegpp_common.folder_watcher). Listings are fetched with
+    NetworkSession.fetch_if_changed and the changes are emitted by listing_changed.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        super().__init__(NetworkSession.fetch_if_changed)
+        self._signals = _ListingSignals()
+        self.listing_changed = self._signals.listing_changed
+        self.subscribe(self.listing_changed.emit)
+
+    @classmethod
+    def get_instance(cls) -> "FolderWatcher":
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+                cls._instance.start()
+            return cls._instance
+
+    @classmethod
+    def stop_instance(cls):
+        with cls._instance_lock:
+            if cls._instance is not None:
+                cls._instance.stop()
+                cls._instance = None
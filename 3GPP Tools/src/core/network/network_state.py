@@ -1,12 +1,27 @@
 # --- File: src/core/network/network_state.py ---
+import errno
+import logging
+import select
+import socket
 import threading
+import time
+from urllib.parse import urlparse
+
 
 class NetworkState:
     """
     A thread-safe Singleton that holds the current status of the user's network connection.
     This allows any part of the application to instantly check if the local 3GPP server
-    is reachable.
+    is reachable. Kept up to date by the WifiMonitorThread, which re-probes the local server
+    when PROBE_TTL_S expires or right away after report_local_failure().
     """
+    LOCAL_SERVER = "10.10.10.10"
+    LOCAL_PORT = 80
+    PROBE_TIMEOUT_S = 1.0
+    # ---> Reachable: confirmed every 30s. Not reachable on the meeting network: retried sooner
+    PROBE_TTL_S = 30
+    UNREACHABLE_RETRY_S = 10
+
     _instance = None
     _lock = threading.Lock()
 
@@ -17,6 +32,8 @@ class NetworkState:
                 cls._instance.network_name = ""
                 cls._instance.is_3gpp_wifi = False
                 cls._instance.is_local_reachable = False
+                cls._instance.probed_at = 0.0
+                cls._instance._reprobe = threading.Event()
         return cls._instance
 
     @classmethod
@@ -28,8 +45,57 @@ class NetworkState:
             self.network_name = name
             self.is_3gpp_wifi = is_3gpp
             self.is_local_reachable = reachable
+            self.probed_at = time.monotonic()
 
     def is_local_active(self) -> bool:
-        """Returns True only if connected to 3GPPWIFI AND 10.10.10.10 is pingable."""
+        """Returns True only if connected to the meeting network AND 10.10.10.10 accepts connections."""
+        with self._lock:
+            return self.is_3gpp_wifi and self.is_local_reachable
+
+    def is_probe_due(self) -> bool:
+        """Whether the cached probe result of the local server expired."""
         with self._lock:
-            return self.is_3gpp_wifi and self.is_local_reachable
\ No newline at end of file
+            if not self.is_3gpp_wifi:
+                return False
+            ttl_s = self.PROBE_TTL_S if self.is_local_reachable else self.UNREACHABLE_RETRY_S
+            return time.monotonic() - self.probed_at >= ttl_s
+
+    def request_reprobe(self):
+        """Wakes up the monitor to check the network and probe the local server now."""
+        self._reprobe.set()
+
+    def wait_for_reprobe(self, timeout_s: float) -> bool:
+        """Blocks until request_reprobe() is called or the timeout expires. Returns whether a re-probe was requested."""
+        requested = self._reprobe.wait(timeout_s)
+        self._reprobe.clear()
+        return requested
+
+    def report_local_failure(self, url: str):
+        """Call when a request failed with a connection error or timeout. Only local server URLs trigger a re-probe."""
+        if urlparse(url).hostname != self.LOCAL_SERVER:
+            return
+        logging.info(f"📡 [Network State] Request to {self.LOCAL_SERVER} failed. Re-probing the local server...")
+        self.request_reprobe()
+
+    @staticmethod
+    def probe_tcp(host: str, port: int, timeout_s: float) -> bool:
+        """Non-blocking TCP connect. True if the host accepted the connection within the timeout."""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            sock.setblocking(False)
+            result = sock.connect_ex((host, port))
+            if result == 0:
+                return True
+            in_progress = (errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EALREADY,
+                           getattr(errno, 'WSAEWOULDBLOCK', errno.EWOULDBLOCK))
+            if result not in in_progress:
+                return False
+            # ---> Windows reports a refused connection in the exception set, POSIX as writable + SO_ERROR
+            _, writable, failed = select.select([], [sock], [sock], timeout_s)
+            if failed or not writable:
+                return False
+            return sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0
+        except OSError:
+            return False
+        finally:
+            sock.close()
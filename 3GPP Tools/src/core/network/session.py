@@ -7,12 +7,16 @@ from pathlib import Path
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
-from typing import Optional, Dict, Union
+from typing import Optional, Dict, Union, Callable
 
 from PyQt5.QtWidgets import QDialog, QVBoxLayout, QFormLayout, QDoubleSpinBox, QCheckBox, QLineEdit, QDialogButtonBox
 from PyQt5.QtCore import Qt
 
 from core.utils.utils import get_proxies
+from threegpp_common.tracing import Tracing
+from threegpp_common.fingerprint import Fingerprint
+from threegpp_common.host_concurrency import HostConcurrency
+from core.network.network_state import NetworkState
 
 # ==========================================
 # --- HUMANNESS CONFIGURATION ---
@@ -155,20 +159,82 @@ class NetworkSession:
     def get_html(cls, url: str, timeout: int = 20) -> str:
         session = cls.get_instance()
         cls.apply_humanness(session)
-        response: requests.Response = session.get(url, timeout=timeout)
+        with Tracing.span("http.fetch", url=url) as span, HostConcurrency.slot(url) as slot:
+            response: requests.Response = session.get(url, timeout=timeout)
+            slot.record_response(response)
+            span.set(status=response.status_code, bytes=len(response.content))
+            response.raise_for_status()
+            return response.text
+
+    @classmethod
+    def probe(cls, url: str, timeout: tuple) -> Optional[int]:
+        """HEAD request: the status code, or None if the server could not be reached. Used by the URLResolver."""
+        try:
+            # ---> No humanness delay here: HEAD probes are cheap and the whole point is latency
+            with Tracing.span("http.probe", url=url) as span:
+                response = cls.get_instance().head(url, timeout=timeout, allow_redirects=True)
+                span.set(status=response.status_code)
+            return response.status_code
+        except Exception as e:
+            logging.debug(f"Probe failed for {url}: {e}")
+            if isinstance(e, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+                NetworkState.get_instance().report_local_failure(url)
+            return None
+
+    @classmethod
+    def fetch_if_changed(cls, url: str, state: dict, normalize: Callable[[str], str] = None, timeout: int = 30):
+        """
+        Conditional GET (If-None-Match/If-Modified-Since).
+        Returns (None, state) if the page did not change since the stored state (304, or same content hash),
+        otherwise (html_text, new_state). normalize strips volatile markup before hashing.
+        """
+        state = state or {}
+        headers = {}
+        if state.get('etag'):
+            headers['If-None-Match'] = state['etag']
+        if state.get('last_modified'):
+            headers['If-Modified-Since'] = state['last_modified']
+
+        session = cls.get_instance()
+        cls.apply_humanness(session)
+        with Tracing.span("http.conditional_fetch", url=url) as span, HostConcurrency.slot(url) as slot:
+            response: requests.Response = session.get(url, timeout=timeout, headers=headers)
+            slot.record_response(response)
+            span.set(status=response.status_code, bytes=len(response.content))
+        if response.status_code == 304:
+            logging.debug(f"Not modified (304): {url}")
+            return None, state
         response.raise_for_status()
-        return response.text
+
+        new_state = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'content_hash': Fingerprint.bytes(normalize(response.text) if normalize else response.text)
+        }
+        if state.get('content_hash') == new_state['content_hash']:
+            logging.debug(f"Content unchanged: {url}")
+            return None, new_state
+        return response.text, new_state
 
     @classmethod
     def download_file(cls, url: str, dest_path: Union[str, Path], timeout: int = 30) -> None:
         session = cls.get_instance()
         cls.apply_humanness(session)
-        response: requests.Response = session.get(url, stream=True, timeout=timeout)
-        response.raise_for_status()
+        with Tracing.span("http.fetch", url=url, stream=True) as span, HostConcurrency.slot(url) as slot:
+            response: requests.Response = session.get(url, stream=True, timeout=timeout)
+            span.set(status=response.status_code)
+            if not response.ok:
+                slot.record_response(response, n_bytes=0)
+            response.raise_for_status()
 
-        with open(dest_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk: f.write(chunk)
+            n_bytes = 0
+            with open(dest_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=8192):
+                    if chunk:
+                        f.write(chunk)
+                        n_bytes += len(chunk)
+            slot.record_response(response, n_bytes=n_bytes)
+            span.set(bytes=n_bytes)
 
     @staticmethod
     def _create_session() -> requests.Session:
@@ -189,7 +255,8 @@ class NetworkSession:
             status_forcelist=[429, 500, 502, 504],  # REMOVED 503 so Cloudflare doesn't trap us
             allowed_methods=["GET"]
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # ---> One pooled connection per parallel request allowed by HostConcurrency
+        adapter = HTTPAdapter(max_retries=retry_strategy, pool_maxsize=HostConcurrency.MAX_CONCURRENCY)
         session.mount("http://", adapter)
         session.mount("https://", adapter)
         return session
\ No newline at end of file
@@ -1,44 +1,195 @@
 # --- File: src/core/network/wifi_monitor.py ---
+import select
+import socket
 import subprocess
-import time
+import sys
 import logging
+from typing import Optional, Tuple
 from PyQt5.QtCore import QThread, pyqtSignal
 from core.network.network_state import NetworkState
 
+
+class _WindowsAddressChangeNotifier:
+    """IP address table changes via NotifyAddrChange (iphlpapi), waited on with an event."""
+    ERROR_IO_PENDING = 997
+    WAIT_OBJECT_0 = 0
+
+    def __init__(self):
+        import ctypes
+        from ctypes import wintypes
+
+        class OVERLAPPED(ctypes.Structure):
+            _fields_ = [("Internal", ctypes.c_void_p), ("InternalHigh", ctypes.c_void_p),
+                        ("Offset", wintypes.DWORD), ("OffsetHigh", wintypes.DWORD), ("hEvent", wintypes.HANDLE)]
+
+        self._ctypes = ctypes
+        self._kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        self._iphlpapi = ctypes.WinDLL('iphlpapi')
+        self._kernel32.CreateEventW.restype = wintypes.HANDLE
+        self._kernel32.CreateEventW.argtypes = [ctypes.c_void_p, wintypes.BOOL, wintypes.BOOL, wintypes.LPCWSTR]
+        self._kernel32.WaitForSingleObject.argtypes = [wintypes.HANDLE, wintypes.DWORD]
+        self._kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+
+        self._overlapped = OVERLAPPED()
+        # ---> Auto-reset event: reset by the wait that consumes the notification
+        self._overlapped.hEvent = self._kernel32.CreateEventW(None, False, False, None)
+        if not self._overlapped.hEvent:
+            raise OSError(f"CreateEventW failed: {ctypes.get_last_error()}")
+        self._handle = wintypes.HANDLE()
+        self._arm()
+
+    def _arm(self):
+        result = self._iphlpapi.NotifyAddrChange(self._ctypes.byref(self._handle), self._ctypes.byref(self._overlapped))
+        if result != self.ERROR_IO_PENDING:
+            raise OSError(f"NotifyAddrChange failed: {result}")
+
+    def wait(self, timeout_s: float) -> bool:
+        if self._kernel32.WaitForSingleObject(self._overlapped.hEvent, int(timeout_s * 1000)) != self.WAIT_OBJECT_0:
+            return False
+        self._arm()
+        return True
+
+    def close(self):
+        self._iphlpapi.CancelIPChangeNotify(self._ctypes.byref(self._overlapped))
+        self._kernel32.CloseHandle(self._overlapped.hEvent)
+
+
+class _NetlinkAddressChangeNotifier:
+    """Link, address and route changes via a NETLINK_ROUTE socket (Linux)."""
+    RTMGRP_LINK = 0x1
+    RTMGRP_IPV4_IFADDR = 0x10
+    RTMGRP_IPV4_ROUTE = 0x40
+
+    def __init__(self):
+        self._sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+        self._sock.bind((0, self.RTMGRP_LINK | self.RTMGRP_IPV4_IFADDR | self.RTMGRP_IPV4_ROUTE))
+        self._sock.setblocking(False)
+
+    def wait(self, timeout_s: float) -> bool:
+        readable, _, _ = select.select([self._sock], [], [], timeout_s)
+        if not readable:
+            return False
+        # ---> A network change comes as a burst of messages: consume them all as one notification
+        try:
+            while self._sock.recv(65536):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
+        return True
+
+    def close(self):
+        self._sock.close()
+
+
 class WifiMonitorThread(QThread):
+    """
+    Keeps the NetworkState up to date without periodic process spawning:
+        1. Network changes are detected with OS notifications (Windows: NotifyAddrChange, Linux: netlink) or,
+           where not available, by comparing the local route addresses every FALLBACK_INTERVAL_S.
+        2. The network name (PowerShell) is only read when the network changed.
+        3. 10.10.10.10 is probed with a non-blocking TCP connect. The result is cached for
+           NetworkState.PROBE_TTL_S, or re-probed right away after NetworkState.report_local_failure().
+    """
     status_updated = pyqtSignal(str, bool, bool)
 
+    # ---> With OS notifications: how often re-probe requests and the probe TTL are checked
+    NOTIFIER_INTERVAL_S = 0.5
+    FALLBACK_INTERVAL_S = 2
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.running = True
         self.target_keyword = "3GPPWIFI"
-        self.target_server = "10.10.10.10"
+        self.target_server = NetworkState.LOCAL_SERVER
         self.CREATE_NO_WINDOW = 0x08000000
+        self._last_status = None
+
+    @staticmethod
+    def _create_notifier():
+        try:
+            if sys.platform == "win32":
+                return _WindowsAddressChangeNotifier()
+            if sys.platform.startswith("linux"):
+                return _NetlinkAddressChangeNotifier()
+        except Exception as e:
+            logging.warning(f"[WiFi Monitor] Network change notifications not available: {e}")
+        return None
 
     def run(self):
         # Grab the singleton instance
         net_state = NetworkState.get_instance()
+        notifier = self._create_notifier()
+        logging.info(f"📡 [WiFi Monitor] Watching network changes via "
+                     f"{type(notifier).__name__ if notifier else 'address polling'}")
 
-        while self.running:
-            try:
-                network_name = self._get_network_profile_name()
-                is_3gpp = (self.target_keyword in network_name.upper())
-                server_reachable = False
+        addresses: Optional[Tuple[str, ...]] = None
+        network_name = ""
+        changed = True
+        reprobe = True
+
+        try:
+            while self.running:
+                try:
+                    if changed or reprobe or notifier is None or net_state.is_probe_due():
+                        new_addresses = self.get_route_addresses()
+                        if new_addresses != addresses:
+                            # ---> Only on network changes: reading the profile name spawns PowerShell
+                            network_name = self._get_network_profile_name()
+                            addresses = new_addresses
+                            changed = True
+                        if changed or reprobe or net_state.is_probe_due():
+                            self._update_state(net_state, network_name, addresses)
+
+                except Exception as e:
+                    logging.error(f"[WiFi Monitor] Loop error: {e}")
 
-                if is_3gpp:
-                    server_reachable = self._ping_server(self.target_server)
+                if notifier is not None:
+                    changed = notifier.wait(self.NOTIFIER_INTERVAL_S)
+                    reprobe = net_state.wait_for_reprobe(0)
+                else:
+                    changed = False
+                    reprobe = net_state.wait_for_reprobe(self.FALLBACK_INTERVAL_S)
+        finally:
+            if notifier is not None:
+                notifier.close()
 
-                # ---> NEW: Update the global state synchronously
-                net_state.update_state(network_name, is_3gpp, server_reachable)
+    def _update_state(self, net_state: NetworkState, network_name: str, addresses: Tuple[str, ...]):
+        # ---> Meeting network: known Wi-Fi profile, or a 10.10.x.x address towards the local server (as the
+        # Meeting Helper does, also works without the profile name outside Windows)
+        is_3gpp = self.target_keyword in network_name.upper() or addresses[0].startswith("10.10.")
+        server_reachable = False
+        if is_3gpp:
+            server_reachable = NetworkState.probe_tcp(
+                self.target_server, NetworkState.LOCAL_PORT, NetworkState.PROBE_TIMEOUT_S)
 
-                self.status_updated.emit(network_name, is_3gpp, server_reachable)
+        display_name = network_name or ("3GPP Meeting Network" if is_3gpp else "")
+        net_state.update_state(display_name, is_3gpp, server_reachable)
 
-            except Exception as e:
-                logging.error(f"[WiFi Monitor] Loop error: {e}")
+        status = (display_name, is_3gpp, server_reachable)
+        if status != self._last_status:
+            logging.info(f"📡 [WiFi Monitor] {display_name or 'No network name'}: meeting network={is_3gpp}, "
+                         f"local server reachable={server_reachable}")
+            self._last_status = status
+            self.status_updated.emit(*status)
 
-            time.sleep(10)  # Safe 10-second polling interval
+    def get_route_addresses(self) -> Tuple[str, ...]:
+        """
+        Local addresses used to reach the local server and the Internet. A connected UDP socket sends no packets,
+        so this is cheap. Empty strings where there is no route.
+        """
+        addresses = []
+        for destination in (self.target_server, "1.1.1.1"):
+            try:
+                with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+                    s.connect((destination, 80))
+                    addresses.append(s.getsockname()[0])
+            except OSError:
+                addresses.append("")
+        return tuple(addresses)
 
     def _get_network_profile_name(self) -> str:
+        if sys.platform != "win32":
+            return ""
         try:
             output = subprocess.check_output(
                 ['powershell', '-NoProfile', '-Command', '(Get-NetConnectionProfile).Name'],
@@ -57,19 +208,7 @@ class WifiMonitorThread(QThread):
             logging.error(f"[WiFi Monitor] Unexpected error getting network name: {e}")
         return ""
 
-    def _ping_server(self, ip: str) -> bool:
-        try:
-            result = subprocess.run(
-                ["ping", "-n", "1", "-w", "1000", ip],
-                creationflags=self.CREATE_NO_WINDOW,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                timeout=3
-            )
-            return result.returncode == 0
-        except Exception:
-            return False
-
     def stop(self):
         self.running = False
-        self.wait()
\ No newline at end of file
+        NetworkState.get_instance().request_reprobe()
+        self.wait()
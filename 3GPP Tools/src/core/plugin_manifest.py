@@ -0,0 +1,105 @@
+# --- File: core/plugin_manifest.py ---
+import importlib
+import logging
+import time
+from typing import NamedTuple, Dict, List
+
+from core.queue_manager import register_lazy_task
+
+
+class PluginSpec(NamedTuple):
+    name: str
+    module: str
+    register_function: str
+    # target_format -> display name. Must match what the plugin's register function registers.
+    tasks: Dict[str, str]
+
+
+# ==========================================
+# --- PLUGIN MANIFEST ---
+# ==========================================
+# The plugins are NOT imported at startup (they pull in pandas, lxml, docx, win32com...).
+# Their tasks are announced to the QueueManager from this manifest and the module is imported
+# the first time one of its tasks is queued.
+PLUGINS: List[PluginSpec] = [
+    PluginSpec("PlantUML / Visio", "modules.puml2visio.plugin_loader", "register_puml2visio_plugin", {
+        "vsdx": "To .VSDX",
+        "svg": "To .SVG",
+        "pptx": "To .PPTX",
+        "ascii": "To .TXT",
+        "pptx_to_visio": "PowerPoint to Visio",
+        "vsdx_to_pptx": "Visio to PowerPoint",
+    }),
+    PluginSpec("Word", "modules.word_tools.plugin_loader", "register_word_plugin", {
+        "extract_visio": "EXTRACT OLE",
+        "split_docx": "SPLIT CLAUSES",
+        "compare_docx": "COMPARE DOCS",
+        "word_convert": "Format Conversion",
+    }),
+    PluginSpec("Specifications", "modules.specifications.plugin_loader", "register_specs_plugin", {
+        "update_specs_db": "UPDATE 3GPP DB",
+    }),
+    PluginSpec("Meetings", "modules.meetings.plugin_loader", "register_meetings_plugin", {
+        "update_meetings_db": "Sync 3GPP Meetings",
+    }),
+]
+
+
+class StartupTimer:
+    """Collects the startup phases (and lazily loaded plugins) for the time-to-window report."""
+    TARGET_SECONDS = 1.0
+
+    _t0 = time.perf_counter()
+    _last = _t0
+    _phases: List[tuple] = []
+
+    @classmethod
+    def start(cls, t0: float = None):
+        cls._t0 = cls._last = t0 if t0 is not None else time.perf_counter()
+        cls._phases = []
+
+    @classmethod
+    def mark(cls, phase: str):
+        """Closes the current phase (time since the previous mark)."""
+        now = time.perf_counter()
+        cls._phases.append((phase, now - cls._last))
+        cls._last = now
+
+    @classmethod
+    def record(cls, phase: str, seconds: float):
+        cls._phases.append((phase, seconds))
+
+    @classmethod
+    def elapsed(cls) -> float:
+        return time.perf_counter() - cls._t0
+
+    @classmethod
+    def report(cls, title: str = "Time-to-window"):
+        total = cls.elapsed()
+        lines = [f"⏱️ {title}: {total * 1000:.0f} ms"]
+        lines += [f"    {phase:<32} {seconds * 1000:8.0f} ms" for phase, seconds in cls._phases]
+        level = logging.INFO if total <= cls.TARGET_SECONDS else logging.WARNING
+        logging.log(level, "\n".join(lines))
+
+
+_LOADED_PLUGINS = set()
+
+
+def load_plugin(plugin: PluginSpec):
+    """Imports a plugin and lets it register its real task factories (replacing the lazy ones)."""
+    if plugin.module in _LOADED_PLUGINS:
+        return
+    start = time.perf_counter()
+    module = importlib.import_module(plugin.module)
+    getattr(module, plugin.register_function)()
+    _LOADED_PLUGINS.add(plugin.module)
+
+    seconds = time.perf_counter() - start
+    StartupTimer.record(f"plugin: {plugin.name}", seconds)
+    logging.info(f"🔌 Plugin Loaded: {plugin.name} ({seconds * 1000:.0f} ms)")
+
+
+def register_plugin_manifest():
+    for plugin in PLUGINS:
+        for target_format, display_name in plugin.tasks.items():
+            register_lazy_task(target_format, display_name, lambda p=plugin: load_plugin(p))
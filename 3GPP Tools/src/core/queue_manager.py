@@ -1,8 +1,11 @@
 import logging
+import os
 import re
 from pathlib import Path
 from PyQt5.QtCore import QObject, pyqtSignal, QThread
 
+from threegpp_common.tracing import Tracing
+
 # ==========================================
 # --- GLOBAL TASK REGISTRY ---
 # ==========================================
@@ -27,6 +30,44 @@ def register_task(target_format: str, display_name: str, thread_factory: callabl
     }
 
 
+# Set TGPP_PROFILE_TASK=<target_format> (together with TGPP_TRACE=1) to capture a cProfile of that task type
+PROFILE_TASK_ENV_VARIABLE = "TGPP_PROFILE_TASK"
+
+
+def _instrument_task_thread(thread: QThread, target_format: str, file_path: Path):
+    """Wraps the thread's run() in a queue.task span (and optionally a cProfile capture) when tracing is on."""
+    if not Tracing.enabled:
+        return
+    original_run = thread.run
+    profile_this_task = os.environ.get(PROFILE_TASK_ENV_VARIABLE, "") == target_format
+
+    def traced_run():
+        with Tracing.span("queue.task", task=target_format, file=file_path.name):
+            if profile_this_task:
+                with Tracing.profile(f"task_{target_format}"):
+                    original_run()
+            else:
+                original_run()
+
+    # ---> sip looks up the virtual run() on the instance first, so the worker thread executes the wrapper
+    thread.run = traced_run
+
+
+def register_lazy_task(target_format: str, display_name: str, loader: callable):
+    """
+    Registers a task whose plugin has not been imported yet (see core/plugin_manifest.py).
+    On first use, loader() imports the plugin, which replaces this entry via register_task().
+    """
+    def lazy_factory(file_path, params, app_context):
+        loader()
+        entry = _TASK_REGISTRY.get(target_format)
+        if entry is None or entry["factory"] is lazy_factory:
+            raise RuntimeError(f"Plugin did not register task '{target_format}'")
+        return entry["factory"](file_path, params, app_context)
+
+    register_task(target_format, display_name, lazy_factory)
+
+
 # ==========================================
 # --- QUEUE MANAGER (THE MODEL) ---
 # ==========================================
@@ -163,6 +204,7 @@ class QueueManager(QObject):
             # We call the registered factory function, blindly passing the data.
             # The plugin module decides which thread class to create and how to map these parameters.
             self.conv_thread = registry_entry["factory"](next_file, params, self.app_context)
+            _instrument_task_thread(self.conv_thread, target_format, next_file)
 
             # Duck-Typing: Connect standard signals if the thread implements them
             if hasattr(self.conv_thread, 'ui_log_msg'):
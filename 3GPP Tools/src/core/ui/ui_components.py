@@ -1,10 +1,12 @@
+import logging
+import time
 from pathlib import Path
 
 from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QPainter, QColor, QIcon, QPixmap, QFont, QPen
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QLabel, QFormLayout,
                              QLineEdit, QCheckBox, QHBoxLayout, QPushButton,
-                             QApplication, QMessageBox)
+                             QApplication, QMessageBox, QWidget)
 
 from core.network.session import NetworkSession
 
@@ -380,4 +382,43 @@ class InteractiveDropLabel(QLabel):
             if any(file_path.lower().endswith(ext) for ext in self.accepted_extensions):
                 valid_files.append(file_path)
         if valid_files:
-            self.file_dropped.emit(valid_files)
\ No newline at end of file
+            self.file_dropped.emit(valid_files)
+
+
+class LazyTab(QWidget):
+    """
+    Tab placeholder. The real tab (and the modules it imports) is only built on first activation,
+    which keeps heavy plugins (pandas, lxml, win32com...) out of the startup path.
+    """
+    loaded = pyqtSignal(QWidget)
+
+    def __init__(self, name: str, factory: callable, parent=None):
+        super().__init__(parent)
+        self.name = name
+        self.factory = factory
+        self.widget = None
+
+        self._layout = QVBoxLayout(self)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+        self._placeholder = QLabel(f"⏳ Loading {name}...")
+        self._placeholder.setAlignment(Qt.AlignCenter)
+        self._layout.addWidget(self._placeholder)
+
+    def ensure_loaded(self):
+        if self.widget is None:
+            QApplication.setOverrideCursor(Qt.WaitCursor)
+            start = time.perf_counter()
+            try:
+                self.widget = self.factory()
+            except Exception as e:
+                logging.error(f"❌ Could not load the {self.name} tab: {e}")
+                self._placeholder.setText(f"❌ Could not load {self.name}. Check log for details.")
+                return None
+            finally:
+                QApplication.restoreOverrideCursor()
+            self._layout.removeWidget(self._placeholder)
+            self._placeholder.deleteLater()
+            self._layout.addWidget(self.widget)
+            logging.info(f"🔌 {self.name} tab loaded ({(time.perf_counter() - start) * 1000:.0f} ms)")
+            self.loaded.emit(self.widget)
+        return self.widget
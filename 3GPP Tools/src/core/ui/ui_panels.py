@@ -9,10 +9,11 @@ from PyQt5.QtWidgets import (
     QTextEdit, QListWidget, QDialog, QTreeWidget, QTreeWidgetItem,
     QHeaderView, QTableWidget, QTableWidgetItem, QMessageBox, QApplication
 )
-from PyQt5.QtCore import pyqtSignal, Qt, QObject
+from PyQt5.QtCore import pyqtSignal, Qt, QObject, QThread
 from PyQt5.QtGui import QColor, QBrush, QFont
 
 from core.process_manager import ProcessManager
+from threegpp_common.cache_governor import CacheGovernor
 from core.utils.paths import get_project_root
 
 
@@ -52,6 +53,22 @@ class GuiLogHandler(logging.Handler, QObject):
 # ==========================================
 # --- DATABASE MAINTENANCE DIALOG ---
 # ==========================================
+class CacheMaintenanceThread(QThread):
+    """Runs CacheGovernor.run_maintenance() (folder scans and evictions) off the UI thread."""
+    report_ready = pyqtSignal(str)
+
+    def __init__(self, dry_run: bool, parent=None):
+        super().__init__(parent)
+        self.dry_run = dry_run
+
+    def run(self):
+        try:
+            self.report_ready.emit(CacheGovernor.run_maintenance(dry_run=self.dry_run))
+        except Exception as e:
+            logging.error(f"❌ Cache maintenance failed: {e}")
+            self.report_ready.emit(f"❌ Cache maintenance failed: {e}")
+
+
 class DatabaseMaintenanceDialog(QDialog):
     """
     Provides inspection, space calculation, and manual VACUUM / WAL compaction
@@ -150,7 +167,20 @@ class DatabaseMaintenanceDialog(QDialog):
         close_btn.setStyleSheet("font-size: 11px; padding: 2px 10px;")
         close_btn.clicked.connect(self.accept)
 
+        # ---> Local cache quotas (TDoc folders, LLM Markdown exports, spec zips)
+        self.cache_report_btn = QPushButton("📦 Cache Report (Dry Run)")
+        self.cache_report_btn.setFixedHeight(26)
+        self.cache_report_btn.setStyleSheet("font-size: 11px; padding: 2px 10px;")
+        self.cache_report_btn.clicked.connect(lambda: self._run_cache_maintenance(dry_run=True))
+
+        self.cache_evict_btn = QPushButton("🧽 Enforce Cache Quotas")
+        self.cache_evict_btn.setFixedHeight(26)
+        self.cache_evict_btn.setStyleSheet("font-size: 11px; padding: 2px 10px;")
+        self.cache_evict_btn.clicked.connect(lambda: self._run_cache_maintenance(dry_run=False))
+
         btn_layout.addWidget(self.vacuum_all_btn)
+        btn_layout.addWidget(self.cache_report_btn)
+        btn_layout.addWidget(self.cache_evict_btn)
         btn_layout.addStretch()
         btn_layout.addWidget(refresh_btn)
         btn_layout.addWidget(close_btn)
@@ -272,6 +302,18 @@ class DatabaseMaintenanceDialog(QDialog):
                 lbl_none.setAlignment(Qt.AlignCenter)
                 self.table.setCellWidget(row_idx, 4, lbl_none)
 
+    def _run_cache_maintenance(self, dry_run: bool):
+        self.cache_report_btn.setEnabled(False)
+        self.cache_evict_btn.setEnabled(False)
+        self.cache_thread = CacheMaintenanceThread(dry_run, self)
+        self.cache_thread.report_ready.connect(self._on_cache_maintenance_finished)
+        self.cache_thread.start()
+
+    def _on_cache_maintenance_finished(self, report: str):
+        self.cache_report_btn.setEnabled(True)
+        self.cache_evict_btn.setEnabled(True)
+        QMessageBox.information(self, "Local Cache", report)
+
     def _vacuum_database_file(self, db_path: Path) -> Tuple[bool, int, int, str]:
         """
         Executes WAL checkpointing and VACUUM on the specified SQLite database file.
@@ -1,22 +1,21 @@
+import time
+
+_STARTUP_T0 = time.perf_counter()
+
 import sys
 import logging
-import urllib.request
+import multiprocessing
 import os
 from pathlib import Path
 
-from PyQt5.QtWidgets import QApplication, QDialog
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QApplication
 
-from core.ui.ui_components import GLOBAL_STYLE, ProxyDialog, create_app_icon
-from core.utils.utils import get_best_java
+from core.plugin_manifest import register_plugin_manifest, StartupTimer
+from core.ui.ui_components import GLOBAL_STYLE, create_app_icon
 from core.utils.paths import get_project_root
-from modules.meetings.plugin_loader import register_meetings_plugin
-from modules.puml2visio.plugin_loader import register_puml2visio_plugin
 from main_window import DragDropUI
-from modules.puml2visio.config.paths import PLANTUML_JAR_NAME
-from modules.puml2visio.utils.paths import get_puml2visio_asset_path
-from modules.specifications.plugin_loader import register_specs_plugin
-
-from modules.word_tools.plugin_loader import register_word_plugin
+from modules.meetings.core.settings import MeetingsSettings
 
 # ==========================================
 # --- PATH RESOLUTION ---
@@ -41,55 +40,36 @@ logging.basicConfig(
 )
 
 if __name__ == '__main__':
+    # Required for the email parsing process pool in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
+
     # This prevents Windows from grouping our app under the generic Python snake logo!
     if os.name == 'nt':
         import ctypes
         myappid = '3GPP Delegate Tools.1.0'
         ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(myappid)
 
-    register_puml2visio_plugin()
-    register_word_plugin()
-    register_specs_plugin()
-    register_meetings_plugin()
+    StartupTimer.start(_STARTUP_T0)
+    StartupTimer.mark("imports")
+
+    # ---> Configures the shared caches (threegpp_common) before any tab uses them
+    MeetingsSettings()
+    StartupTimer.mark("settings")
+
+    # ---> LAZY PLUGINS: only the manifest is registered, modules are imported on first use
+    register_plugin_manifest()
+    StartupTimer.mark("plugin manifest")
 
     app = QApplication(sys.argv)
     app.setWindowIcon(create_app_icon())
     app.setStyle("Fusion")
     app.setStyleSheet(GLOBAL_STYLE)
+    StartupTimer.mark("QApplication")
 
-    # --- POINT TO THE TEMPLATES FOLDER ---
-    jar_path = get_puml2visio_asset_path(PLANTUML_JAR_NAME)
-    version_file = jar_path.with_suffix('.version')
-
-    # --- SMART PROXY CHECK ---
-    needs_download = False
-    if not jar_path.exists():
-        needs_download = True
-    else:
-        _, java_major = get_best_java()
-        if java_major > 0:
-            required_type = "modern" if java_major >= 11 else "legacy"
-            current_type = None
-            if version_file.exists():
-                try:
-                    current_type = version_file.read_text(encoding="utf-8").strip()
-                except:
-                    pass
-            if current_type != required_type:
-                needs_download = True
-
-    if needs_download:
-        proxy_dialog = ProxyDialog()
-        if proxy_dialog.exec_() == QDialog.Accepted:
-            http_val, https_val = proxy_dialog.get_proxies()
-            proxies = {}
-            if http_val: proxies['http'] = http_val
-            if https_val: proxies['https'] = https_val
-            if proxies:
-                proxy_handler = urllib.request.ProxyHandler(proxies)
-                opener = urllib.request.build_opener(proxy_handler)
-                urllib.request.install_opener(opener)
-
+    # The Java/PlantUML checks (and the proxy dialog if the jar cannot be downloaded)
+    # run in the window's InitializationThread, so they no longer delay the first paint
     window = DragDropUI()
+    StartupTimer.mark("main window")
     window.show()
-    sys.exit(app.exec_())
\ No newline at end of file
+    QTimer.singleShot(0, lambda: (StartupTimer.mark("first paint"), StartupTimer.report()))
+    sys.exit(app.exec_())
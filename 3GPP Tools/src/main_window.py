@@ -15,13 +15,14 @@ from PyQt5.QtWidgets import (
 from core.config.config import HELP_URL
 from core.network.session import NetworkConfigDialog
 from core.network.wifi_monitor import WifiMonitorThread
+from core.network.folder_watcher import FolderWatcher
 from core.queue_manager import QueueManager
-from core.ui.ui_components import ProxyDialog, create_app_icon
+from core.ui.ui_components import ProxyDialog, create_app_icon, LazyTab
 from core.ui.ui_panels import (
-    ConsolePanel, QueuePanel, ProcessManagerDialog, DatabaseMaintenanceDialog, GuiLogHandler
+    ConsolePanel, QueuePanel, ProcessManagerDialog, DatabaseMaintenanceDialog, GuiLogHandler,
+    CacheMaintenanceThread
 )
 from core.utils.paths import get_project_root
-from modules.meetings.ui.ui_tabs import MeetingsTab
 from modules.puml2visio.config.paths import PLANTUML_JAR_NAME
 from modules.puml2visio.core.live_preview import LivePreviewManager
 from modules.puml2visio.core.visio_converter import VisioReaderThread
@@ -29,10 +30,6 @@ from modules.puml2visio.templates.plantuml_templates import PLANTUML_TYPES
 from modules.puml2visio.ui.ui_tabs import CodeEditorTab, BatchConvertTab
 from modules.puml2visio.utils.paths import get_puml2visio_asset_path
 from modules.puml2visio.utils.utils import encode_plantuml, InitializationThread
-from modules.specifications.ui.ui_tabs import SpecificationsTab
-from modules.word_tools.ui.word_tabs import WordExtractorTab
-from modules.work_items.ui.ui_tabs import WorkItemsTab
-from modules.nas.ui.nas_tabs import NASTab
 
 
 class DragDropUI(QMainWindow):
@@ -83,6 +80,9 @@ class DragDropUI(QMainWindow):
 
         self._launch_init_thread(check_updates=False)
 
+        # ---> Deferred: keep the local caches within their quotas once the UI has settled
+        QTimer.singleShot(60000, self._start_cache_maintenance)
+
         # Background WiFi Monitor
         self.wifi_monitor = WifiMonitorThread(self)
         self.wifi_monitor.status_updated.connect(self._update_network_indicator)
@@ -116,6 +116,86 @@ class DragDropUI(QMainWindow):
             lambda paths, fmt: self.queue_manager.add_batch(paths, target_format=fmt)
         )
 
+        # ---> LAZY TABS: built (and their modules imported) on first activation
+        self.db_path = get_project_root() / "3gpp_data.db"
+        self.word_tab_host = LazyTab("Word", self._create_word_tab)
+        self.specs_tab_host = LazyTab("Specifications", self._create_specs_tab)
+        self.work_items_tab_host = LazyTab("Work Items", self._create_work_items_tab)
+        self.meetings_tab_host = LazyTab("Meetings", self._create_meetings_tab)
+        self.nas_tab_host = LazyTab("Protocols", self._create_nas_tab)
+
+        self.tabs.addTab(self.code_tab, "📝 PlantUML")
+        self.tabs.addTab(self.batch_tab, "🔄 Visio")
+        self.tabs.addTab(self.word_tab_host, "📘 Word")
+        self.tabs.addTab(self.specs_tab_host, "📚 Specifications")
+        self.tabs.addTab(self.work_items_tab_host, "📋 Work Items")
+        self.tabs.addTab(self.meetings_tab_host, "🗓️ Meetings")
+        self.tabs.addTab(self.nas_tab_host, "🔬 Protocols")
+        self.tabs.currentChanged.connect(self._on_tab_activated)
+
+        # Only the tabs that need Java/PlantUML/Visio wait for the background system checks
+        self._set_java_tabs_enabled(False)
+
+        # Tab corner help link
+        self.help_btn = QPushButton("📖 Help (F1)")
+        self.help_btn.setStyleSheet("""
+            QPushButton { border: none; background: transparent; color: #395396; font-weight: bold; padding: 4px 15px; }
+            QPushButton:hover { color: #1E5C99; text-decoration: underline; }
+        """)
+        self.help_btn.setCursor(Qt.PointingHandCursor)
+        self.help_btn.clicked.connect(self.open_documentation)
+        self.tabs.setCornerWidget(self.help_btn, Qt.TopRightCorner)
+
+        self.help_shortcut = QShortcut(QKeySequence("F1"), self)
+        self.help_shortcut.activated.connect(self.open_documentation)
+
+        self.splitter.addWidget(self.tabs)
+
+        # --- BOTTOM HALF: PANELS ---
+        self.bottom_splitter = QSplitter(Qt.Horizontal)
+
+        self.console_panel = ConsolePanel()
+        self.console_panel.proxy_requested.connect(self.open_proxy_settings)
+        self.console_panel.network_config_requested.connect(lambda: NetworkConfigDialog(self).exec_())
+        self.console_panel.update_requested.connect(self.check_for_jar_updates)
+        self.console_panel.task_manager_requested.connect(self.open_task_manager)
+        # ---> Wire Database Maintenance Dialog Signal <---
+        self.console_panel.db_maintenance_requested.connect(self.open_db_maintenance)
+
+        self.queue_panel = QueuePanel()
+
+        self.bottom_splitter.addWidget(self.console_panel)
+        self.bottom_splitter.addWidget(self.queue_panel)
+        self.bottom_splitter.setSizes([650, 250])
+
+        self.splitter.addWidget(self.bottom_splitter)
+        self.splitter.setSizes([700, 100])
+        main_layout.addWidget(self.splitter)
+
+        central_widget.setLayout(main_layout)
+        self.setCentralWidget(central_widget)
+
+        self.status_bar = QStatusBar()
+        self.setStatusBar(self.status_bar)
+        self.status_bar.showMessage("⏳ Initializing...")
+
+        self.network_indicator = QLabel("📶 Checking Network...")
+        self.network_indicator.setStyleSheet("color: gray; padding: 0 10px;")
+        self.status_bar.addPermanentWidget(self.network_indicator)
+
+    # --- LAZY TAB FACTORIES ---
+    def _on_tab_activated(self, index: int):
+        page = self.tabs.widget(index)
+        if isinstance(page, LazyTab):
+            page.ensure_loaded()
+
+    def _set_java_tabs_enabled(self, enabled: bool):
+        self.code_tab.setEnabled(enabled)
+        self.batch_tab.setEnabled(enabled)
+
+    def _create_word_tab(self):
+        from modules.word_tools.ui.word_tabs import WordExtractorTab
+
         self.word_tab = WordExtractorTab()
         self.word_tab.extract_visio_requested.connect(
             lambda fp: self.queue_manager.add_item(Path(fp), "extract_visio")
@@ -126,10 +206,10 @@ class DragDropUI(QMainWindow):
             )
         )
         self.word_tab.compare_doc_requested.connect(
-            lambda a, b, keep_open: self.queue_manager.add_item(
+            lambda a, b, keep_open, output_format: self.queue_manager.add_item(
                 Path("Word_Comparison_Task"),
                 "compare_docx",
-                {"doc_a": a, "doc_b": b, "keep_open": keep_open}
+                {"doc_a": a, "doc_b": b, "keep_open": keep_open, "output_format": output_format}
             )
         )
         self.word_tab.convert_doc_requested.connect(
@@ -139,8 +219,12 @@ class DragDropUI(QMainWindow):
                 {"fmt": target_fmt}
             )
         )
+        return self.word_tab
 
-        db_path = get_project_root() / "3gpp_data.db"
+    def _create_specs_tab(self):
+        from modules.specifications.ui.ui_tabs import SpecificationsTab
+
+        db_path = self.db_path
         self.specs_tab = SpecificationsTab(db_path)
         self.specs_tab.update_db_requested.connect(
             lambda force_meta: self.queue_manager.add_item(
@@ -156,11 +240,27 @@ class DragDropUI(QMainWindow):
                 {"db_path": db_path, "force_metadata": force_meta, "target_specs": target_specs}
             )
         )
+        self.specs_tab.log_msg.connect(self.console_panel.log_message)
+        return self.specs_tab
 
-        self.meetings_tab = MeetingsTab(db_path)
-        self.work_items_tab = WorkItemsTab(db_path)
-        self.work_items_tab.global_action_requested.connect(self.meetings_tab._handle_global_action_from_window)
+    def _create_work_items_tab(self):
+        from modules.work_items.ui.ui_tabs import WorkItemsTab
 
+        self.work_items_tab = WorkItemsTab(self.db_path)
+        # Actions on TDocs are handled by the Meetings tab, which is built on demand
+        self.work_items_tab.global_action_requested.connect(
+            lambda tdoc_str, action: self._get_meetings_tab()._handle_global_action_from_window(tdoc_str, action)
+        )
+        return self.work_items_tab
+
+    def _get_meetings_tab(self):
+        return self.meetings_tab_host.ensure_loaded()
+
+    def _create_meetings_tab(self):
+        from modules.meetings.ui.ui_tabs import MeetingsTab
+
+        db_path = self.db_path
+        self.meetings_tab = MeetingsTab(db_path)
         self.meetings_tab.update_db_requested.connect(
             lambda wg, docs, dyna: self.queue_manager.add_item(
                 Path("3GPP_Meetings"),
@@ -181,68 +281,15 @@ class DragDropUI(QMainWindow):
                 }
             )
         )
+        return self.meetings_tab
 
-        nas_db_path = get_project_root() / "3gpp_protocol_data.db"
-        self.nas_tab = NASTab(nas_db_path, db_path)
-
-        self.tabs.addTab(self.code_tab, "📝 PlantUML")
-        self.tabs.addTab(self.batch_tab, "🔄 Visio")
-        self.tabs.addTab(self.word_tab, "📘 Word")
-        self.tabs.addTab(self.specs_tab, "📚 Specifications")
-        self.tabs.addTab(self.work_items_tab, "📋 Work Items")
-        self.tabs.addTab(self.meetings_tab, "🗓️ Meetings")
-        self.tabs.addTab(self.nas_tab, "🔬 Protocols")
-        self.tabs.setEnabled(False)
-
-        # Tab corner help link
-        self.help_btn = QPushButton("📖 Help (F1)")
-        self.help_btn.setStyleSheet("""
-            QPushButton { border: none; background: transparent; color: #395396; font-weight: bold; padding: 4px 15px; }
-            QPushButton:hover { color: #1E5C99; text-decoration: underline; }
-        """)
-        self.help_btn.setCursor(Qt.PointingHandCursor)
-        self.help_btn.clicked.connect(self.open_documentation)
-        self.tabs.setCornerWidget(self.help_btn, Qt.TopRightCorner)
-
-        self.help_shortcut = QShortcut(QKeySequence("F1"), self)
-        self.help_shortcut.activated.connect(self.open_documentation)
+    def _create_nas_tab(self):
+        from modules.nas.ui.nas_tabs import NASTab
 
-        self.splitter.addWidget(self.tabs)
-
-        # --- BOTTOM HALF: PANELS ---
-        self.bottom_splitter = QSplitter(Qt.Horizontal)
-
-        self.console_panel = ConsolePanel()
-        self.console_panel.proxy_requested.connect(self.open_proxy_settings)
-        self.console_panel.network_config_requested.connect(lambda: NetworkConfigDialog(self).exec_())
-        self.console_panel.update_requested.connect(self.check_for_jar_updates)
-        self.console_panel.task_manager_requested.connect(self.open_task_manager)
-        # ---> Wire Database Maintenance Dialog Signal <---
-        self.console_panel.db_maintenance_requested.connect(self.open_db_maintenance)
-
-        self.specs_tab.log_msg.connect(self.console_panel.log_message)
+        nas_db_path = get_project_root() / "3gpp_protocol_data.db"
+        self.nas_tab = NASTab(nas_db_path, self.db_path)
         self.nas_tab.log_msg.connect(self.console_panel.log_message)
-
-        self.queue_panel = QueuePanel()
-
-        self.bottom_splitter.addWidget(self.console_panel)
-        self.bottom_splitter.addWidget(self.queue_panel)
-        self.bottom_splitter.setSizes([650, 250])
-
-        self.splitter.addWidget(self.bottom_splitter)
-        self.splitter.setSizes([700, 100])
-        main_layout.addWidget(self.splitter)
-
-        central_widget.setLayout(main_layout)
-        self.setCentralWidget(central_widget)
-
-        self.status_bar = QStatusBar()
-        self.setStatusBar(self.status_bar)
-        self.status_bar.showMessage("⏳ Initializing...")
-
-        self.network_indicator = QLabel("📶 Checking Network...")
-        self.network_indicator.setStyleSheet("color: gray; padding: 0 10px;")
-        self.status_bar.addPermanentWidget(self.network_indicator)
+        return self.nas_tab
 
     # --- DIALOG & THREAD MANAGEMENT ---
     def open_db_maintenance(self):
@@ -259,20 +306,26 @@ class DragDropUI(QMainWindow):
             self.task_manager_dialog.activateWindow()
 
     def _launch_init_thread(self, check_updates=False):
+        # ---> ASYNC: Java/PlantUML/Visio checks run in the background, results go to the status bar
+        self.status_bar.showMessage("☕ Checking Java and PlantUML in the background...")
         self.init_thread = InitializationThread(self.jar_path, check_updates=check_updates)
         self.init_thread.ui_log_msg.connect(self.log_message)
         self.init_thread.init_complete.connect(self.on_init_complete)
         self.init_thread.network_error.connect(self.open_proxy_settings)
         self.init_thread.start()
 
+    def _start_cache_maintenance(self):
+        self.cache_maintenance_thread = CacheMaintenanceThread(dry_run=False, parent=self)
+        self.cache_maintenance_thread.start()
+
     def on_init_complete(self, success: bool):
         if success:
-            self.tabs.setEnabled(True)
+            self._set_java_tabs_enabled(True)
             self._update_system_status(False, "🟢 System Idle.")
             self.log_message("🚀 System Ready. Paste code or drop files to begin.\n" + "-" * 45)
         else:
             self.batch_tab.set_state("error", "❌ Initialization Failed.")
-            self.status_bar.showMessage("❌ Initialization Failed. Check log for details.")
+            self.status_bar.showMessage("❌ PlantUML/Visio unavailable. Other tabs can still be used. Check log for details.")
 
     # --- AUTO-SAVE LOGIC ---
     def _load_cache(self):
@@ -374,14 +427,14 @@ class DragDropUI(QMainWindow):
 
             self.batch_tab.set_state("ready", "⏳ Re-initializing system checks...")
             self.status_bar.showMessage("⏳ Re-initializing...")
-            self.tabs.setEnabled(False)
+            self._set_java_tabs_enabled(False)
             self._launch_init_thread(check_updates=False)
 
     def check_for_jar_updates(self):
         self.log_message("\n🔄 Initiating manual update check...", logging.INFO)
         self.batch_tab.set_state("ready", "⏳ Checking online for updates...")
         self.status_bar.showMessage("⏳ Checking for updates...")
-        self.tabs.setEnabled(False)
+        self._set_java_tabs_enabled(False)
         self._launch_init_thread(check_updates=True)
 
     def extract_code_from_visio(self, file_path):
@@ -506,4 +559,5 @@ class DragDropUI(QMainWindow):
         self.save_cache()
         if hasattr(self, 'wifi_monitor'):
             self.wifi_monitor.stop()
+        FolderWatcher.stop_instance()
         super().closeEvent(event)
\ No newline at end of file
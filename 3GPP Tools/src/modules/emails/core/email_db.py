@@ -2,6 +2,8 @@
 import sqlite3
 from pathlib import Path
 
+from threegpp_common.tracing import Tracing
+
 class EmailDatabase:
     def __init__(self, db_path: Path):
         self.db_path = db_path
@@ -29,6 +31,22 @@ class EmailDatabase:
             cursor.execute('CREATE TABLE IF NOT EXISTS starred_tdocs (tdoc_id TEXT PRIMARY KEY)')
             cursor.execute('CREATE TABLE IF NOT EXISTS followed_ais (agenda_item TEXT PRIMARY KEY)')
 
+            # Incremental sync: per-folder high-water mark plus the IDs already processed
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    folder_key TEXT PRIMARY KEY,
+                    date_window TEXT,
+                    high_water_mark TEXT
+                )
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS sync_seen (
+                    folder_key TEXT,
+                    item_id TEXT,
+                    PRIMARY KEY (folder_key, item_id)
+                )
+            ''')
+
             cursor.execute("PRAGMA table_info(emails)")
             columns = [info[1] for info in cursor.fetchall()]
             if 'outlook_location' not in columns:
@@ -64,6 +82,7 @@ class EmailDatabase:
             cursor.execute('UPDATE emails SET outlook_location = ? WHERE id = ?', (new_location, entry_id))
             conn.commit()
 
+    @Tracing.traced("db.emails.save_batch")
     def save_emails_batch(self, emails_data: list):
         if not emails_data: return
         with sqlite3.connect(self.db_path) as conn:
@@ -153,4 +172,41 @@ class EmailDatabase:
                 updated_data.get('short_text'),
                 email_id
             ))
-            conn.commit()
\ No newline at end of file
+            conn.commit()
+
+    def get_sync_state(self, folder_key: str) -> dict:
+        """Returns the stored high-water mark of a mail folder, or {} if it was never synced."""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            cursor.execute('SELECT * FROM sync_state WHERE folder_key = ?', (folder_key,))
+            row = cursor.fetchone()
+            return dict(row) if row else {}
+
+    def get_seen_ids(self, folder_key: str) -> set:
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT item_id FROM sync_seen WHERE folder_key = ?', (folder_key,))
+            return {row[0] for row in cursor.fetchall()}
+
+    def save_sync_state(self, folder_key: str, date_window: str, high_water_mark: str, seen_ids: list,
+                        reset: bool = False):
+        """Persists the high-water mark. With reset=True the previously seen IDs are discarded first."""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            if reset:
+                cursor.execute('DELETE FROM sync_seen WHERE folder_key = ?', (folder_key,))
+            cursor.execute('''
+                INSERT OR REPLACE INTO sync_state (folder_key, date_window, high_water_mark)
+                VALUES (?, ?, ?)
+            ''', (folder_key, date_window, high_water_mark))
+            cursor.executemany('INSERT OR IGNORE INTO sync_seen (folder_key, item_id) VALUES (?, ?)',
+                               [(folder_key, item_id) for item_id in seen_ids])
+            conn.commit()
+
+    def get_stored_msg_paths(self) -> dict:
+        """Maps email ID -> saved message path for every stored email."""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT id, msg_path FROM emails WHERE msg_path IS NOT NULL AND msg_path != ''")
+            return {row[0]: row[1] for row in cursor.fetchall()}
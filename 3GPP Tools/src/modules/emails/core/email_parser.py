@@ -11,11 +11,28 @@ class EmailParser:
     TDOC_REGEX = re.compile(r'(S2-\d{6,8})', re.IGNORECASE)
     START_END_REGEX = re.compile(r'<<START>>(.*?)<<END>>', re.DOTALL | re.IGNORECASE)
     REVISION_REGEX = re.compile(r'\b(?:r|rev\s*)0?([1-9])\b', re.IGNORECASE)
+    BODY_FROM_REGEX = re.compile(
+        r'From:\s*([^\n<\[]+?)\s*[<\[](?:mailto:)?([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})[>\]]',
+        re.IGNORECASE)
 
     @classmethod
     def parse_outlook_item(cls, mail_item, ai_lookup_dict: dict) -> Dict:
+        fields = cls.extract_fields(mail_item)
+        return cls.parse_fields(fields, ai_lookup_dict) if fields else {}
+
+    @classmethod
+    def extract_fields(cls, mail_item) -> Dict:
+        """
+        Reads everything the parser needs from a mail item (COM or local) into a plain, picklable dict.
+        This is the only step that touches the mail item and must run on the thread that owns it.
+        """
         try:
             subject = getattr(mail_item, "Subject", "")
+
+            # Cheap pre-filter: without a TDoc in the subject the body is never needed
+            if not cls.TDOC_REGEX.search(subject):
+                return {"subject": subject}
+
             body = getattr(mail_item, "Body", "")
             sender_name = getattr(mail_item, "SenderName", "")
 
@@ -68,6 +85,27 @@ class EmailParser:
                 except Exception as e:
                     logging.warning(f"Error extracting EX sender email address: {e}")
 
+            return {
+                "id": getattr(mail_item, "EntryID", ""),
+                "subject": subject,
+                "body": body,
+                "sender_name": sender_name,
+                "sender_email": sender_email,
+                "date_received": str(getattr(mail_item, "ReceivedTime", "")),
+            }
+        except Exception as e:
+            logging.error(f"Error parsing email '{getattr(mail_item, 'Subject', 'Unknown')}': {e}")
+            return {}
+
+    @classmethod
+    def parse_fields(cls, fields: Dict, ai_lookup_dict: dict) -> Dict:
+        """Pure parsing step over the output of extract_fields. Safe to run in a worker process."""
+        try:
+            subject = fields.get("subject", "")
+            body = fields.get("body", "")
+            sender_name = fields.get("sender_name", "")
+            sender_email = fields.get("sender_email", "")
+
             # 3. TDoc Extraction & Strict Meeting Enforcement
             tdoc_match = cls.TDOC_REGEX.search(subject)
             if not tdoc_match:
@@ -86,9 +124,7 @@ class EmailParser:
                    ["3gpp", "list", "emeet", "on behalf of", "dmarc"]) or not sender_email:
                 body_head = body[:1500]  # Check a larger chunk at the top of the email
 
-                dmarc_match = re.search(
-                    r'From:\s*([^\n<\[]+?)\s*[<\[](?:mailto:)?([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})[>\]]',
-                    body_head, re.IGNORECASE)
+                dmarc_match = cls.BODY_FROM_REGEX.search(body_head)
 
                 if dmarc_match:
                     sender_name = dmarc_match.group(1).strip(' \t"\'')
@@ -119,13 +155,13 @@ class EmailParser:
                 rev_mentions.append(normalized)
 
             return {
-                "id": getattr(mail_item, "EntryID", ""),
+                "id": fields.get("id", ""),
                 "tdoc_id": base_tdoc,
                 "agenda_item": agenda_item,
                 "sender_name": sender_name,
                 "sender_email": sender_email,
                 "company": company,
-                "date_received": str(getattr(mail_item, "ReceivedTime", "")),
+                "date_received": fields.get("date_received", ""),
                 "subject": subject,
                 "revisions_mentioned": ", ".join(list(set(rev_mentions))),
                 "short_text": short_text,
@@ -133,7 +169,7 @@ class EmailParser:
                 "msg_path": ""
             }
         except Exception as e:
-            logging.error(f"Error parsing email '{getattr(mail_item, 'Subject', 'Unknown')}': {e}")
+            logging.error(f"Error parsing email '{fields.get('subject', 'Unknown')}': {e}")
             return {}
 
     @staticmethod
@@ -154,4 +190,18 @@ class EmailParser:
         for line in lines:
             if any(marker in line for marker in cut_markers): break
             clean_lines.append(line)
-        return '\n'.join(clean_lines).strip()
\ No newline at end of file
+        return '\n'.join(clean_lines).strip()
+
+
+# --- Process pool helpers (module level so they can be pickled by ProcessPoolExecutor) ---
+_WORKER_AI_LOOKUP = {}
+
+
+def init_parse_worker(ai_lookup_dict: dict):
+    global _WORKER_AI_LOOKUP
+    _WORKER_AI_LOOKUP = ai_lookup_dict
+
+
+def parse_fields_chunk(fields_chunk: list) -> list:
+    """Parses a chunk of extracted fields inside a worker process initialised with init_parse_worker."""
+    return [EmailParser.parse_fields(fields, _WORKER_AI_LOOKUP) for fields in fields_chunk]
@@ -0,0 +1,136 @@
+# --- File: modules/emails/core/email_pipeline.py ---
+import logging
+import os
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from modules.emails.core.email_db import EmailDatabase
+from modules.emails.core.email_parser import EmailParser, init_parse_worker, parse_fields_chunk
+
+
+class EmailParsePipeline:
+    """
+    Parses extracted email fields in a process pool while the calling thread keeps driving COM.
+
+    Fields are submitted in chunks; results come back in submission order and are handed to
+    `on_parsed(parsed)` on the calling thread. Only the plain fields are kept while a chunk is in flight, never the
+    mail items (up to CHUNK_SIZE x MAX_IN_FLIGHT live COM objects otherwise): `on_parsed` re-fetches an item by its
+    EntryID (MailSource.get_item) if it has to be saved to disk.
+    Whatever `on_parsed` returns is pushed through a bounded queue to a writer thread that calls
+    `save_emails_batch`. Small scans never start the pool and are parsed inline.
+    """
+    CHUNK_SIZE = 100
+    MAX_IN_FLIGHT = 4
+    QUEUE_SIZE = 500
+    DB_BATCH_SIZE = 50
+
+    def __init__(self, ai_lookup: dict, db: EmailDatabase, on_parsed, max_workers: int = None):
+        self.ai_lookup = ai_lookup
+        self.db = db
+        self.on_parsed = on_parsed
+        self.max_workers = max_workers or max(1, min(4, (os.cpu_count() or 2) - 1))
+
+        self._executor = None
+        self._chunk_fields = []
+        self._in_flight = deque()
+
+        self._queue = queue.Queue(maxsize=self.QUEUE_SIZE)
+        self._writer_error = None
+        self._writer = threading.Thread(target=self._write_loop, name="EmailDbWriter", daemon=True)
+        self._writer.start()
+
+    # --- Producer side (calling thread) ---
+    def submit(self, fields: dict):
+        self._chunk_fields.append(fields)
+        if len(self._chunk_fields) >= self.CHUNK_SIZE:
+            self._flush_chunk()
+
+    def _flush_chunk(self):
+        if not self._chunk_fields:
+            return
+        fields = self._chunk_fields
+        self._chunk_fields = []
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=init_parse_worker,
+                                                 initargs=(self.ai_lookup,))
+        self._in_flight.append((self._executor.submit(parse_fields_chunk, fields), fields))
+
+        while len(self._in_flight) >= self.MAX_IN_FLIGHT:
+            self._drain_oldest()
+
+    def _drain_oldest(self):
+        future, fields = self._in_flight.popleft()
+        try:
+            results = future.result()
+        except BrokenProcessPool as e:
+            # e.g. frozen builds without freeze_support or an AV killing the workers: parse inline instead
+            logging.warning(f"Email parse pool unavailable, parsing inline: {e}")
+            results = [EmailParser.parse_fields(f, self.ai_lookup) for f in fields]
+        self._handle_results(results)
+
+    def _handle_results(self, results: list):
+        for parsed in results:
+            record = self.on_parsed(parsed)
+            if record:
+                self._put(record)
+
+    def _put(self, record: dict):
+        while True:
+            if self._writer_error:
+                raise self._writer_error
+            try:
+                self._queue.put(record, timeout=1)
+                return
+            except queue.Full:
+                continue
+
+    def finish(self):
+        """Parses the remaining items, waits for the writer and shuts the pool down."""
+        try:
+            if self._executor is None:
+                # Never filled a chunk: not worth spawning processes
+                results = [EmailParser.parse_fields(f, self.ai_lookup) for f in self._chunk_fields]
+                self._handle_results(results)
+                self._chunk_fields = []
+            else:
+                self._flush_chunk()
+            while self._in_flight:
+                self._drain_oldest()
+        finally:
+            self.close()
+
+        if self._writer_error:
+            raise self._writer_error
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+
+    # --- Consumer side (writer thread) ---
+    def _write_loop(self):
+        batch = []
+        try:
+            while True:
+                record = self._queue.get()
+                if record is None:
+                    break
+                batch.append(record)
+                if len(batch) >= self.DB_BATCH_SIZE:
+                    self.db.save_emails_batch(batch)
+                    batch = []
+            if batch:
+                self.db.save_emails_batch(batch)
+        except Exception as e:
+            logging.error(f"Email DB writer failed: {e}")
+            self._writer_error = e
+            # Keep draining so the producer never blocks on a full queue
+            while self._queue.get() is not None:
+                pass
@@ -1,21 +1,61 @@
 # --- File: modules/emails/core/email_threads.py ---
+import datetime
 from pathlib import Path
 from PyQt5.QtCore import QThread, pyqtSignal
 from modules.emails.core.outlook_client import OutlookClient
 from modules.emails.core.email_parser import EmailParser
 from modules.emails.core.email_db import EmailDatabase
+from modules.emails.core.email_pipeline import EmailParsePipeline
+from modules.emails.core.mail_source import open_mail_source, naive_received_time
 import logging
 
 
+def _date_window(start_date: str, end_date: str):
+    """Meeting dates with a +/- 3 day buffer, or (None, None) if no dates are configured."""
+    if not (start_date and end_date):
+        return None, None
+    start_dt = datetime.datetime.strptime(start_date, "%Y-%m-%d")
+    end_dt = datetime.datetime.strptime(end_date, "%Y-%m-%d")
+    # +4 ensures we cover the end of the final day
+    return start_dt - datetime.timedelta(days=3), end_dt + datetime.timedelta(days=4)
+
+
+def _store_parsed_email(parsed_data: dict, source, stored_paths: dict, meeting_dir: Path):
+    """
+    Attaches the saved message path to a parsed TDoc email. Returns None for non-TDoc emails.
+    The mail item is only fetched again (by EntryID) if the message is not on disk yet.
+    """
+    if not (parsed_data and parsed_data.get('tdoc_id')):
+        return None
+
+    existing_path = stored_paths.get(parsed_data['id'])
+    if existing_path and Path(existing_path).exists():
+        # Already on disk from an earlier sync, do not write a duplicate
+        parsed_data['msg_path'] = existing_path
+    else:
+        mail_item = source.get_item(parsed_data['id'])
+        if mail_item is None:
+            logging.warning(f"Could not fetch email {parsed_data.get('subject', '')} again to save it")
+            parsed_data['msg_path'] = ""
+        else:
+            parsed_data['msg_path'] = source.save_item(mail_item, parsed_data['tdoc_id'], meeting_dir)
+    parsed_data['outlook_location'] = 'Source'
+    return parsed_data
+
+
 class EmailSyncThread(QThread):
     # Signals to update the UI safely
     log_msg = pyqtSignal(str, int)
     progress_update = pyqtSignal(int, int)  # (current, total)
     finished = pyqtSignal(bool, str)
 
+    # Items up to this long before the high-water mark are re-listed (and de-duplicated via the seen IDs)
+    # so late-delivered emails with a slightly older ReceivedTime are not missed
+    HWM_OVERLAP = datetime.timedelta(hours=1)
+
     # ---> FIX: Added start_date and end_date to the parameters!
     def __init__(self, source_path: str, meeting_dir: Path, ai_lookup: dict, db: EmailDatabase, start_date: str = "",
-                 end_date: str = ""):
+                 end_date: str = "", full_resync: bool = False):
         super().__init__()
         self.source_path = source_path
         self.meeting_dir = meeting_dir
@@ -23,91 +63,84 @@ class EmailSyncThread(QThread):
         self.db = db
         self.start_date = start_date
         self.end_date = end_date
+        self.full_resync = full_resync
 
     def run(self):
-        import pythoncom
-        import datetime
-        pythoncom.CoInitialize()
         try:
-            # ---> NEW: Parse Dates and apply +/- 3 day buffer
-            filter_start, filter_end = None, None
-            if self.start_date and self.end_date:
-                start_dt = datetime.datetime.strptime(self.start_date, "%Y-%m-%d")
-                end_dt = datetime.datetime.strptime(self.end_date, "%Y-%m-%d")
-                filter_start = start_dt - datetime.timedelta(days=3)
-                filter_end = end_dt + datetime.timedelta(days=4)  # +4 ensures we cover the end of the final day
-
-            self.log_msg.emit(f"Connecting to Outlook folder: {self.source_path}...", logging.INFO)
-            source_folder = OutlookClient.get_folder_by_path(self.source_path)
-
-            if not source_folder:
-                self.finished.emit(False, "Could not find the specified Source Outlook folder.")
-                return
-
-            items = source_folder.Items
-            total_items = len(items)
-            self.log_msg.emit(f"Found {total_items} items. Scanning for 3GPP eMeeting emails...", logging.INFO)
-
-            items.Sort("[ReceivedTime]", True)
-
-            processed_count = 0
-            valid_count = 0
-            batch_data = []
-
-            for i in range(1, total_items + 1):
-                mail_item = items.Item(i)
-
-                # ---> NEW: Date Range Enforcement logic
-                if filter_start and filter_end:
-                    mail_date = getattr(mail_item, "ReceivedTime", None)
-                    if mail_date:
-                        try:
-                            # Strip out pywintypes timezone data to create a naive comparable datetime
-                            dt = datetime.datetime(mail_date.year, mail_date.month, mail_date.day,
-                                                   mail_date.hour, mail_date.minute, mail_date.second)
-                            if dt > filter_end:
-                                continue  # Email arrived after the meeting ended, skip to next.
-                            if dt < filter_start:
-                                # FAST EXIT: Because we sorted Newest->Oldest, if this email is older
-                                # than our start buffer, ALL remaining emails are even older! Terminate loop!
-                                break
-                        except Exception:
-                            pass
-
-                if i % 10 == 0: self.progress_update.emit(i, total_items)
-                if mail_item.Class != 43: continue
-
-                parsed_data = EmailParser.parse_outlook_item(mail_item, self.ai_lookup)
-
-                if parsed_data and parsed_data.get('tdoc_id'):
-                    msg_path = OutlookClient.save_email_to_disk(mail_item, parsed_data['tdoc_id'], self.meeting_dir)
-                    parsed_data['msg_path'] = msg_path
-                    parsed_data['outlook_location'] = 'Source'
-
-                    # Add to our buffer instead of hitting the database directly
-                    batch_data.append(parsed_data)
-                    valid_count += 1
-
-                # Flush the batch to SQLite every 50 valid emails
-                if len(batch_data) >= 50:
-                    self.db.save_emails_batch(batch_data)
-                    batch_data.clear()
-
-                processed_count += 1
-
-            # Flush any remaining emails in the buffer at the end
-            if batch_data:
-                self.db.save_emails_batch(batch_data)
+            filter_start, filter_end = _date_window(self.start_date, self.end_date)
+
+            self.log_msg.emit(f"Connecting to mail folder: {self.source_path}...", logging.INFO)
+            with open_mail_source(self.source_path) as source:
+                if not source.open():
+                    self.finished.emit(False, "Could not find the specified Source mail folder.")
+                    return
+
+                # ---> INCREMENTAL SYNC: Only list items newer than the last sync's high-water mark
+                date_window = f"{self.start_date}|{self.end_date}"
+                state = self.db.get_sync_state(source.key)
+                is_incremental = bool(state) and not self.full_resync and state.get("date_window") == date_window
+
+                received_after = filter_start
+                seen_ids = set()
+                high_water_mark = None
+                if is_incremental and state.get("high_water_mark"):
+                    high_water_mark = datetime.datetime.fromisoformat(state["high_water_mark"])
+                    since = high_water_mark - self.HWM_OVERLAP
+                    received_after = max(filter_start, since) if filter_start else since
+                    seen_ids = self.db.get_seen_ids(source.key)
+                    self.log_msg.emit(f"Incremental sync from {high_water_mark:%Y-%m-%d %H:%M}...", logging.INFO)
+
+                stored_paths = self.db.get_stored_msg_paths()
+
+                total_items = 0
+                valid_count = 0
+                skipped_count = 0
+                new_seen = []
+
+                def on_parsed(parsed_data):
+                    nonlocal valid_count
+                    record = _store_parsed_email(parsed_data, source, stored_paths, self.meeting_dir)
+                    if record:
+                        valid_count += 1
+                    return record
+
+                # Regex/company parsing runs in worker processes, DB writes in a writer thread;
+                # this thread only reads the items (COM) and saves the message files (re-fetched by EntryID)
+                pipeline = EmailParsePipeline(self.ai_lookup, self.db, on_parsed)
+                try:
+                    for position, total_items, mail_item in source.iter_items(received_after, filter_end):
+                        if position % 10 == 0: self.progress_update.emit(position, total_items)
+
+                        entry_id = getattr(mail_item, "EntryID", "")
+                        if entry_id in seen_ids:
+                            skipped_count += 1
+                            continue
+                        new_seen.append(entry_id)
+
+                        dt = naive_received_time(mail_item)
+                        if dt and (high_water_mark is None or dt > high_water_mark):
+                            high_water_mark = dt
+
+                        pipeline.submit(EmailParser.extract_fields(mail_item))
+
+                    pipeline.finish()
+                finally:
+                    pipeline.close()
+
+                self.db.save_sync_state(source.key, date_window,
+                                        high_water_mark.isoformat() if high_water_mark else "",
+                                        new_seen, reset=not is_incremental)
 
             self.progress_update.emit(total_items, total_items)
-            self.log_msg.emit(f"✅ Sync complete! Extracted {valid_count} valid TDoc emails.", logging.INFO)
+            msg = f"✅ Sync complete! Extracted {valid_count} valid TDoc emails."
+            if skipped_count:
+                msg += f" ({skipped_count} already synced)"
+            self.log_msg.emit(msg, logging.INFO)
             self.finished.emit(True, f"Successfully synced {valid_count} emails.")
 
         except Exception as e:
             self.log_msg.emit(f"Fatal error during sync: {str(e)}", logging.ERROR)
             self.finished.emit(False, str(e))
-        finally:
-            pythoncom.CoUninitialize()
 
 
 class EmailMoveThread(QThread):
@@ -185,96 +218,40 @@ class EmailTargetRescanThread(QThread):
         self.end_date = end_date
 
     def run(self):
-        import pythoncom
-        pythoncom.CoInitialize()
         try:
-            # ---> NEW: Parse Dates and apply +/- 3 day buffer
-            filter_start, filter_end = None, None
-            if self.start_date and self.end_date:
-                import datetime
-                start_dt = datetime.datetime.strptime(self.start_date, "%Y-%m-%d")
-                end_dt = datetime.datetime.strptime(self.end_date, "%Y-%m-%d")
-                filter_start = start_dt - datetime.timedelta(days=3)
-                filter_end = end_dt + datetime.timedelta(days=4)  # +4 ensures we cover the end of the final day
+            filter_start, filter_end = _date_window(self.start_date, self.end_date)
 
             self.log_msg.emit(f"Scanning Target folder: {self.target_path}...", logging.INFO)
-            target_base = OutlookClient.get_folder_by_path(self.target_path)
-
-            if not target_base:
-                self.finished.emit(False, "Could not find the specified Target folder in Outlook.")
-                return
-
-            folders_to_scan = [target_base]
-            for sub in target_base.Folders:
-                folders_to_scan.append(sub)
-
-            total_items_to_scan = 0
-            for folder in folders_to_scan:
-                total_items_to_scan += len(folder.Items)
-
-            self.log_msg.emit(f"Found {total_items_to_scan} total items. Scanning...", logging.INFO)
-
-            processed_count = 0
-            valid_count = 0
-            batch_data = []
-
-            for folder in folders_to_scan:
-                items = folder.Items
-                items.Sort("[ReceivedTime]", True)  # Sort newest first!
-                total_in_folder = len(items)
-
-                for i in range(1, total_in_folder + 1):
-                    processed_count += 1
-
-                    if processed_count % 10 == 0:
-                        self.progress_update.emit(processed_count, total_items_to_scan)
-
-                    mail_item = items.Item(i)
-
-                    # ---> NEW: Date Range Enforcement logic
-                    if filter_start and filter_end:
-                        mail_date = getattr(mail_item, "ReceivedTime", None)
-                        if mail_date:
-                            try:
-                                dt = datetime.datetime(mail_date.year, mail_date.month, mail_date.day,
-                                                       mail_date.hour, mail_date.minute, mail_date.second)
-                                if dt > filter_end:
-                                    continue  # Skip future/newer emails
-                                if dt < filter_start:
-                                    break  # FAST EXIT: Stop scanning this specific subfolder!
-                            except Exception:
-                                pass
-
-                    if mail_item.Class != 43: continue
-
-                    parsed_data = EmailParser.parse_outlook_item(mail_item, self.ai_lookup)
-
-                    if parsed_data and parsed_data.get('tdoc_id'):
-                        # ---> NEW: Check if email is already in the database
-                        existing = self.db.get_email(parsed_data['id'])
-
-                        if existing and existing.get('msg_path') and Path(existing['msg_path']).exists():
-                            # Skip saving to disk, reuse existing path
-                            parsed_data['msg_path'] = existing['msg_path']
-                        else:
-                            # Save new .msg file to disk
-                            msg_path = OutlookClient.save_email_to_disk(mail_item, parsed_data['tdoc_id'],
-                                                                        self.meeting_dir)
-                            parsed_data['msg_path'] = msg_path
-
-                        parsed_data['outlook_location'] = 'Source'
-
-                        # Add to our buffer. The DB's "INSERT OR REPLACE" will seamlessly
-                        # update the sender and company fields for existing emails!
-                        batch_data.append(parsed_data)
+            with open_mail_source(self.target_path, include_subfolders=True) as source:
+                if not source.open():
+                    self.finished.emit(False, "Could not find the specified Target mail folder.")
+                    return
+
+                stored_paths = self.db.get_stored_msg_paths()
+
+                total_items_to_scan = 0
+                valid_count = 0
+
+                def on_parsed(parsed_data):
+                    nonlocal valid_count
+                    # The DB's "INSERT OR REPLACE" will seamlessly update the sender and company
+                    # fields for existing emails!
+                    record = _store_parsed_email(parsed_data, source, stored_paths, self.meeting_dir)
+                    if record:
                         valid_count += 1
+                    return record
 
-                        if len(batch_data) >= 50:
-                            self.db.save_emails_batch(batch_data)
-                            batch_data.clear()
+                pipeline = EmailParsePipeline(self.ai_lookup, self.db, on_parsed)
+                try:
+                    for position, total_items_to_scan, mail_item in source.iter_items(filter_start, filter_end):
+                        if position % 10 == 0:
+                            self.progress_update.emit(position, total_items_to_scan)
 
-            if batch_data:
-                self.db.save_emails_batch(batch_data)
+                        pipeline.submit(EmailParser.extract_fields(mail_item))
+
+                    pipeline.finish()
+                finally:
+                    pipeline.close()
 
             self.progress_update.emit(total_items_to_scan, total_items_to_scan)
             self.log_msg.emit(f"✅ Rescan complete! Updated {valid_count} emails.", logging.INFO)
@@ -283,7 +260,3 @@ class EmailTargetRescanThread(QThread):
         except Exception as e:
             self.log_msg.emit(f"Error during rescan: {str(e)}", logging.ERROR)
             self.finished.emit(False, str(e))
-        finally:
-            pythoncom.CoUninitialize()
-
-
@@ -0,0 +1,284 @@
+# --- File: modules/emails/core/mail_source.py ---
+import abc
+import datetime
+import email.message
+import email.parser
+import email.policy
+import email.utils
+import hashlib
+import logging
+import mailbox
+import os
+import re
+import shutil
+from types import SimpleNamespace
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+from modules.emails.core.outlook_client import OutlookClient
+
+OL_MAIL_ITEM_CLASS = 43
+
+
+def naive_received_time(mail_item) -> Optional[datetime.datetime]:
+    """Returns the ReceivedTime of an item as a naive datetime (pywintypes timezone data stripped)."""
+    mail_date = getattr(mail_item, "ReceivedTime", None)
+    if not mail_date:
+        return None
+    try:
+        return datetime.datetime(mail_date.year, mail_date.month, mail_date.day,
+                                 mail_date.hour, mail_date.minute, mail_date.second)
+    except Exception:
+        return None
+
+
+def unique_target_path(meeting_dir: Path, tdoc_id: str, subject: str, extension: str) -> Path:
+    """[Meeting Dir]/[TDoc]/email approval/[clean subject].[ext], suffixed with _N if it already exists."""
+    target_dir = meeting_dir / tdoc_id / "email approval"
+    target_dir.mkdir(parents=True, exist_ok=True)
+
+    clean_subject = "".join(c for c in subject if c.isalnum() or c in " -_").strip()[:100]
+    file_path = target_dir / f"{clean_subject}{extension}"
+    counter = 1
+    while file_path.exists():
+        file_path = target_dir / f"{clean_subject}_{counter}{extension}"
+        counter += 1
+    return file_path
+
+
+class MailSource(abc.ABC):
+    """
+    A folder of emails the sync threads read from. Items are yielded newest first and expose the
+    Outlook MailItem attributes used by EmailParser (Subject, Body, SenderName, ReceivedTime, EntryID...).
+    Sources must implement all abstract methods, otherwise they can not be instantiated.
+    """
+
+    def __init__(self, path: str, include_subfolders: bool = False):
+        self.path = path
+        self.include_subfolders = include_subfolders
+
+    @property
+    def key(self) -> str:
+        """Stable identifier used to persist the sync high-water mark of this folder."""
+        return f"{type(self).__name__}:{self.path}"
+
+    @abc.abstractmethod
+    def open(self) -> bool:
+        """Connects to the folder. Returns whether it was found."""
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @abc.abstractmethod
+    def iter_items(self, received_after: datetime.datetime = None,
+                   received_before: datetime.datetime = None) -> Iterator[Tuple[int, int, object]]:
+        """Yields (position, total, item) for every mail item inside the date window, newest first."""
+
+    @abc.abstractmethod
+    def get_item(self, entry_id: str):
+        """Fetches an item yielded by iter_items() again by its EntryID. None if it no longer exists."""
+
+    @abc.abstractmethod
+    def save_item(self, mail_item, tdoc_id: str, meeting_dir: Path) -> str:
+        """Stores a copy of the item in the email approval folder of the TDoc. Returns the stored file path."""
+
+
+class OutlookMailSource(MailSource):
+    def __init__(self, path: str, include_subfolders: bool = False):
+        super().__init__(path, include_subfolders)
+        self._com_initialized = False
+        self._root = None
+
+    def open(self) -> bool:
+        import pythoncom
+        pythoncom.CoInitialize()
+        self._com_initialized = True
+        self._root = OutlookClient.get_folder_by_path(self.path)
+        return self._root is not None
+
+    def close(self):
+        self._root = None
+        if self._com_initialized:
+            import pythoncom
+            pythoncom.CoUninitialize()
+            self._com_initialized = False
+
+    def _restricted_items(self, folder, received_after):
+        items = folder.Items
+        if received_after:
+            # Let Outlook filter server-side so old items are never marshalled over COM.
+            # The filter only has minute resolution, callers de-duplicate with the seen IDs.
+            try:
+                items = items.Restrict(f"[ReceivedTime] >= '{received_after.strftime('%m/%d/%Y %I:%M %p')}'")
+            except Exception as e:
+                logging.warning(f"Outlook Restrict failed, scanning the full folder: {e}")
+                items = folder.Items
+        items.Sort("[ReceivedTime]", True)
+        return items
+
+    def iter_items(self, received_after=None, received_before=None):
+        folders = [self._root]
+        if self.include_subfolders:
+            folders.extend(sub for sub in self._root.Folders)
+
+        collections = [self._restricted_items(folder, received_after) for folder in folders]
+        total = sum(len(items) for items in collections)
+
+        position = 0
+        for items in collections:
+            for i in range(1, len(items) + 1):
+                position += 1
+                mail_item = items.Item(i)
+
+                dt = naive_received_time(mail_item)
+                if dt and received_before and dt > received_before:
+                    continue
+                if dt and received_after and dt < received_after:
+                    # FAST EXIT: Items are sorted Newest->Oldest, everything left in this folder is older
+                    break
+
+                if mail_item.Class != OL_MAIL_ITEM_CLASS:
+                    continue
+                yield position, total, mail_item
+
+    def get_item(self, entry_id: str):
+        if not entry_id or self._root is None:
+            return None
+        try:
+            # ---> Subfolders are in the same store as the root folder
+            return self._root.Session.GetItemFromID(entry_id, self._root.StoreID)
+        except Exception as e:
+            logging.warning(f"Could not fetch Outlook item {entry_id[-10:]}: {e}")
+            return None
+
+    def save_item(self, mail_item, tdoc_id: str, meeting_dir: Path) -> str:
+        return OutlookClient.save_email_to_disk(mail_item, tdoc_id, meeting_dir)
+
+
+class LocalMailItem:
+    """A parsed .eml / mbox message exposing the subset of the Outlook MailItem interface the parser uses."""
+    Class = OL_MAIL_ITEM_CLASS
+
+    def __init__(self, message: email.message.EmailMessage, raw: bytes, origin: str):
+        self._raw = raw
+        self.Subject = str(message.get("Subject", "") or "")
+
+        sender_name, sender_email = email.utils.parseaddr(str(message.get("From", "") or ""))
+        self.SenderName = sender_name or sender_email
+        self.SenderEmailAddress = sender_email
+        self.SenderEmailType = "SMTP"
+
+        reply_name, reply_email = email.utils.parseaddr(str(message.get("Reply-To", "") or ""))
+        self.ReplyRecipientNames = reply_name
+        self.ReplyRecipients = [SimpleNamespace(Address=reply_email, AddressEntry=None)] if reply_email else []
+
+        self.ReceivedTime = None
+        try:
+            received = email.utils.parsedate_to_datetime(str(message.get("Date", "")))
+            if received.tzinfo is not None:
+                received = received.astimezone().replace(tzinfo=None)
+            self.ReceivedTime = received
+        except Exception:
+            pass
+
+        message_id = str(message.get("Message-ID", "") or "").strip()
+        self.EntryID = message_id or hashlib.sha1(raw).hexdigest()
+        self.origin = origin
+        self.Body = self._extract_body(message)
+
+    @staticmethod
+    def _extract_body(message) -> str:
+        try:
+            part = message.get_body(preferencelist=("plain", "html"))
+            if part is None:
+                return ""
+            content = part.get_content()
+            if part.get_content_subtype() == "html":
+                content = re.sub(r"<br\s*/?>|</p>", "\n", content, flags=re.IGNORECASE)
+                content = re.sub(r"<[^>]+>", "", content)
+            return content.replace("\r\n", "\n")
+        except Exception as e:
+            logging.warning(f"Could not extract body of local email: {e}")
+            return ""
+
+    def SaveAs(self, path: str, _fmt=None):
+        with open(path, "wb") as f:
+            f.write(self._raw)
+
+
+class LocalMailSource(MailSource):
+    """Reads a directory of .eml files and/or mbox files. Works on any platform."""
+    EML_SUFFIXES = (".eml",)
+    MBOX_SUFFIXES = (".mbox", ".mbx")
+
+    def __init__(self, path: str, include_subfolders: bool = False):
+        super().__init__(path, include_subfolders)
+        # ---> Local items are all loaded anyway (no COM objects), get_item() is a lookup
+        self._items_by_id = {}
+
+    def open(self) -> bool:
+        return os.path.isdir(self.path)
+
+    def _iter_files(self):
+        root = Path(self.path)
+        files = root.rglob("*") if self.include_subfolders else root.glob("*")
+        return sorted(p for p in files if p.is_file())
+
+    def _load_all(self) -> list:
+        parser = email.parser.BytesParser(policy=email.policy.default)
+        items = []
+        for file_path in self._iter_files():
+            suffix = file_path.suffix.lower()
+            try:
+                if suffix in self.EML_SUFFIXES:
+                    raw = file_path.read_bytes()
+                    items.append(LocalMailItem(parser.parsebytes(raw), raw, str(file_path)))
+                elif suffix in self.MBOX_SUFFIXES or file_path.name.lower() == "mbox":
+                    for key, msg in mailbox.mbox(str(file_path), create=False).iteritems():
+                        raw = msg.as_bytes()
+                        items.append(LocalMailItem(parser.parsebytes(raw), raw, f"{file_path}#{key}"))
+            except Exception as e:
+                logging.warning(f"Skipping unreadable mail file {file_path}: {e}")
+
+        items.sort(key=lambda it: it.ReceivedTime or datetime.datetime.min, reverse=True)
+        return items
+
+    def iter_items(self, received_after=None, received_before=None):
+        items = self._load_all()
+        self._items_by_id = {mail_item.EntryID: mail_item for mail_item in items}
+        total = len(items)
+        for position, mail_item in enumerate(items, 1):
+            dt = mail_item.ReceivedTime
+            if dt and received_before and dt > received_before:
+                continue
+            if dt and received_after and dt < received_after:
+                break
+            yield position, total, mail_item
+
+    def get_item(self, entry_id: str):
+        return self._items_by_id.get(entry_id)
+
+    def save_item(self, mail_item, tdoc_id: str, meeting_dir: Path) -> str:
+        try:
+            file_path = unique_target_path(meeting_dir, tdoc_id, mail_item.Subject, ".eml")
+            if os.path.isfile(mail_item.origin):
+                shutil.copyfile(mail_item.origin, file_path)
+            else:
+                mail_item.SaveAs(str(file_path))
+            return str(file_path.absolute())
+        except Exception as e:
+            logging.error(f"Failed to save .eml file for {tdoc_id}: {e}")
+            return ""
+
+
+def open_mail_source(path: str, include_subfolders: bool = False) -> MailSource:
+    """A path to an existing directory is read as local .eml/mbox files, anything else as an Outlook folder."""
+    if path and os.path.isdir(path):
+        return LocalMailSource(path, include_subfolders)
+    return OutlookMailSource(path, include_subfolders)
@@ -118,6 +118,7 @@ class EmailConfigDialog(QDialog):
         src_layout = QHBoxLayout()
         self.txt_source = QLineEdit(current_source)
         self.txt_source.setPlaceholderText("e.g. user@domain.com/Inbox/3GPP List")
+        self.txt_source.setToolTip("Outlook folder path, or a local directory containing .eml / mbox files.")
         btn_src_browse = QPushButton("Browse Outlook...")
         btn_src_browse.clicked.connect(lambda: self._browse_folder(self.txt_source))
         src_layout.addWidget(QLabel("Source:"))
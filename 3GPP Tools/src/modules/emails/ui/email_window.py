@@ -215,7 +215,13 @@ class EmailManagerWindow(QWidget):
         self.btn_sync = QPushButton("🔄 Sync Source")
         self.btn_sync.setStyleSheet(get_btn_style(primary=True))
         self.btn_sync.setToolTip("Scan your configured Outlook Source folder to download and index new emails.")
-        self.btn_sync.clicked.connect(self._run_sync)
+        self.btn_sync.clicked.connect(lambda: self._run_sync())
+
+        self.btn_full_resync = QPushButton("♻️ Full Resync")
+        self.btn_full_resync.setStyleSheet(get_btn_style())
+        self.btn_full_resync.setToolTip(
+            "Re-read the whole Source folder inside the date range, ignoring what earlier syncs already indexed.")
+        self.btn_full_resync.clicked.connect(lambda: self._run_sync(full_resync=True))
 
         self.btn_move = QPushButton("➡️ Move Selected")
         self.btn_move.setStyleSheet(get_btn_style())
@@ -249,7 +255,8 @@ class EmailManagerWindow(QWidget):
         self.lbl_count.setStyleSheet(
             "font-size: 13px; color: #0078D7; font-weight: bold; padding-left: 10px; border: none;")
 
-        for btn in [self.btn_sync, self.btn_move, self.btn_move_all, self.btn_rescan, self.btn_stats, self.btn_config]:
+        for btn in [self.btn_sync, self.btn_full_resync, self.btn_move, self.btn_move_all, self.btn_rescan, self.btn_stats,
+                    self.btn_config]:
             row1_layout.addWidget(btn)
         row1_layout.addWidget(self.lbl_status)
         row1_layout.addStretch()
@@ -775,15 +782,16 @@ class EmailManagerWindow(QWidget):
     # -------------------------------------------------------------------------
     # THREADING (Sync, Move, Scan, Stats)
     # -------------------------------------------------------------------------
-    def _run_sync(self):
+    def _run_sync(self, full_resync: bool = False):
         if not self.source_folder:
             QMessageBox.warning(self, "Setup Required", "Please configure the Outlook Source Folder first.")
             return
         self._set_buttons_enabled(False)
-        self.btn_sync.setText("⏳ Syncing...")
+        (self.btn_full_resync if full_resync else self.btn_sync).setText("⏳ Syncing...")
         sd = self.dt_start.date().toString(Qt.ISODate)
         ed = self.dt_end.date().toString(Qt.ISODate)
-        self.sync_thread = EmailSyncThread(self.source_folder, self.meeting_dir, self.ai_lookup, self.db, sd, ed)
+        self.sync_thread = EmailSyncThread(self.source_folder, self.meeting_dir, self.ai_lookup, self.db, sd, ed,
+                                           full_resync=full_resync)
         self.sync_thread.log_msg.connect(lambda m, _: self.lbl_status.setText(m))
         self.sync_thread.progress_update.connect(
             lambda c, t: self.lbl_status.setText(f"Scanning Source: {c} / {t} items..."))
@@ -793,6 +801,7 @@ class EmailManagerWindow(QWidget):
     def _on_sync_finished(self, success: bool, msg: str):
         self._set_buttons_enabled(True)
         self.btn_sync.setText("🔄 Sync Source")
+        self.btn_full_resync.setText("♻️ Full Resync")
         self.lbl_status.setText(msg)
         self._refresh_table()
 
@@ -907,6 +916,7 @@ class EmailManagerWindow(QWidget):
 
     def _set_buttons_enabled(self, state: bool):
         self.btn_sync.setEnabled(state)
+        self.btn_full_resync.setEnabled(state)
         self.btn_move.setEnabled(state)
         self.btn_move_all.setEnabled(state)
         self.btn_rescan.setEnabled(state)
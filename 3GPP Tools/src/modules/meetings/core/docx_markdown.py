@@ -0,0 +1,318 @@
+# --- File: src/modules/meetings/core/docx_markdown.py ---
+import logging
+import re
+import zipfile
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from lxml import etree as ET
+
+from threegpp_common.cache_governor import CacheGovernor
+from threegpp_common.config import CommonConfig
+
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+TAG_BODY = f"{W_NS}body"
+TAG_P = f"{W_NS}p"
+TAG_TBL = f"{W_NS}tbl"
+TAG_TR = f"{W_NS}tr"
+TAG_TC = f"{W_NS}tc"
+TAG_T = f"{W_NS}t"
+TAG_DEL_TEXT = f"{W_NS}delText"
+TAG_TAB = f"{W_NS}tab"
+TAG_BR = f"{W_NS}br"
+TAG_CR = f"{W_NS}cr"
+TAG_HYPHEN = f"{W_NS}noBreakHyphen"
+TAG_INS = f"{W_NS}ins"
+TAG_DEL = f"{W_NS}del"
+TAG_MOVE_TO = f"{W_NS}moveTo"
+TAG_MOVE_FROM = f"{W_NS}moveFrom"
+TAG_COMMENT_REFERENCE = f"{W_NS}commentReference"
+TAG_SDT = f"{W_NS}sdt"
+TAG_SDT_CONTENT = f"{W_NS}sdtContent"
+TAG_PPR = f"{W_NS}pPr"
+TAG_PSTYLE = f"{W_NS}pStyle"
+TAG_TCPR = f"{W_NS}tcPr"
+TAG_GRIDSPAN = f"{W_NS}gridSpan"
+TAG_VMERGE = f"{W_NS}vMerge"
+ATTR_VAL = f"{W_NS}val"
+ATTR_ID = f"{W_NS}id"
+ATTR_AUTHOR = f"{W_NS}author"
+
+# Properties (w:pPr, w:rPr, w:tblPr...) also hold w:ins/w:del, but for paragraph marks and formatting only
+PROPERTY_TAG_REGEX = re.compile(r'Pr(Change)?$')
+
+# 2.x: .docx files are read directly (tables, comments) instead of through Word
+LLM_EXTRACTOR_VERSION = "2.0.0"
+
+
+class DocxMarkdownExtractor:
+    """
+    COM-free replacement of LLMExporterThread._extract_from_word for .docx files: reads the WordprocessingML
+    directly, so it runs on any OS and in worker processes.
+    Produces the same markup as the Word path (headings, [ADDED BLOCK], [INSERTED]/[DELETED] for CRs), plus
+    tables rendered as Markdown tables and Word comments as [COMMENT <author>: <text>].
+    """
+    ALL_NEW_TRIGGER = re.compile(r'(?i)all (?:new )?text (?:is )?(?:new|added)')
+    PLACEHOLDER_CLAUSE_TRIGGER = re.compile(r'^(\d+\.)+[a-zA-Z]$')
+    NUMERIC_CLAUSE_TRIGGER = re.compile(r'^(\d+\.)+\d+$')
+    BOUNDARY_TRIGGER = re.compile(r'(?i)<[-\s]*(next|end of)\s*change')
+
+    @staticmethod
+    def _read_part(zf: zipfile.ZipFile, name: str) -> Optional[ET._Element]:
+        if name not in zf.namelist():
+            return None
+        return ET.fromstring(zf.read(name))
+
+    @staticmethod
+    def _get_style_names(styles_root) -> Dict[str, str]:
+        """styleId -> style name (e.g. 'Heading1' -> 'heading 1')."""
+        style_names = {}
+        if styles_root is None:
+            return style_names
+        for style in styles_root.iter(f"{W_NS}style"):
+            name = style.find(f"{W_NS}name")
+            style_names[style.get(f"{W_NS}styleId")] = name.get(ATTR_VAL) if name is not None else ""
+        return style_names
+
+    @classmethod
+    def _get_comments(cls, comments_root) -> Dict[str, str]:
+        """comment ID -> '[COMMENT <author>: <text>]'"""
+        comments = {}
+        if comments_root is None:
+            return comments
+        for comment in comments_root.iter(f"{W_NS}comment"):
+            text = " ".join(t for t in (cls._get_paragraph(p)['text'] for p in comment.iter(TAG_P)) if t)
+            comments[comment.get(ATTR_ID)] = f"[COMMENT {comment.get(ATTR_AUTHOR, '')}: {text}]"
+        return comments
+
+    @classmethod
+    def _get_paragraph(cls, p_elem) -> dict:
+        """
+        Text of a <w:p> as displayed with all changes accepted, plus the inserted/deleted runs and comment IDs.
+        """
+        pieces, inserted, deleted, comment_ids = [], [], [], []
+
+        def walk(elem, revision: Optional[list]):
+            for child in elem:
+                tag = child.tag
+                if not isinstance(tag, str):
+                    continue
+                if PROPERTY_TAG_REGEX.search(tag) or tag.endswith('}Fallback'):
+                    # ---> mc:Fallback duplicates the mc:Choice content (text boxes)
+                    continue
+                if tag in (TAG_INS, TAG_MOVE_TO):
+                    run_text = []
+                    walk(child, run_text)
+                    if "".join(run_text).strip():
+                        inserted.append("".join(run_text).strip())
+                elif tag in (TAG_DEL, TAG_MOVE_FROM):
+                    run_text = []
+                    walk(child, run_text)
+                    if "".join(run_text).strip():
+                        deleted.append("".join(run_text).strip())
+                elif tag == TAG_DEL_TEXT:
+                    if revision is not None and child.text:
+                        revision.append(child.text)
+                elif tag == TAG_T:
+                    if child.text:
+                        pieces.append(child.text)
+                        if revision is not None:
+                            revision.append(child.text)
+                elif tag in (TAG_TAB, TAG_BR, TAG_CR):
+                    pieces.append(" ")
+                elif tag == TAG_HYPHEN:
+                    pieces.append("-")
+                elif tag == TAG_COMMENT_REFERENCE:
+                    comment_ids.append(child.get(ATTR_ID))
+                else:
+                    walk(child, revision)
+
+        walk(p_elem, None)
+
+        style_id = ""
+        p_pr = p_elem.find(TAG_PPR)
+        if p_pr is not None:
+            p_style = p_pr.find(TAG_PSTYLE)
+            if p_style is not None:
+                style_id = p_style.get(ATTR_VAL, "")
+
+        text = "".join(pieces).replace("\u00a0", " ").strip('\r\x07\x0b ')
+        return {'text': text, 'inserted': inserted, 'deleted': deleted, 'comment_ids': comment_ids,
+                'style_id': style_id}
+
+    @staticmethod
+    def _format_changes_inline(paragraph: dict) -> str:
+        text = paragraph['text']
+        for inserted_text in paragraph['inserted']:
+            text = text.replace(inserted_text, f"[INSERTED: {inserted_text}]", 1)
+        if paragraph['deleted']:
+            text += " " + " ".join(f"[DELETED: {d}]" for d in paragraph['deleted'])
+        return text.strip()
+
+    @classmethod
+    def _table_to_markdown(cls, tbl_elem, is_cr: bool, comments: Dict[str, str]) -> str:
+        rows = []
+        for tr in tbl_elem.iter(TAG_TR):
+            # ---> Nested tables are flattened into their parent cell
+            if tr.getparent() is not tbl_elem:
+                continue
+            row = []
+            for tc in tr.findall(TAG_TC):
+                span = 1
+                is_merged_continuation = False
+                tc_pr = tc.find(TAG_TCPR)
+                if tc_pr is not None:
+                    grid_span = tc_pr.find(TAG_GRIDSPAN)
+                    if grid_span is not None:
+                        span = int(grid_span.get(ATTR_VAL, "1"))
+                    v_merge = tc_pr.find(TAG_VMERGE)
+                    is_merged_continuation = v_merge is not None and v_merge.get(ATTR_VAL) != "restart"
+
+                cell_lines = []
+                if not is_merged_continuation:
+                    for p in tc.iter(TAG_P):
+                        paragraph = cls._get_paragraph(p)
+                        line = cls._format_changes_inline(paragraph) if is_cr else paragraph['text']
+                        line += "".join(f" {comments[c]}" for c in paragraph['comment_ids'] if c in comments)
+                        if line.strip():
+                            cell_lines.append(line.strip())
+                cell_text = "<br>".join(cell_lines).replace("|", "\\|")
+                row.extend([cell_text] + [""] * (span - 1))
+            rows.append(row)
+
+        if not rows:
+            return ""
+        n_columns = max(len(row) for row in rows)
+        rows = [row + [""] * (n_columns - len(row)) for row in rows]
+        md_rows = ["| " + " | ".join(rows[0]) + " |", "|" + "---|" * n_columns]
+        md_rows.extend("| " + " | ".join(row) + " |" for row in rows[1:])
+        return "\n".join(md_rows)
+
+    @staticmethod
+    def _iter_blocks(container):
+        """Body-level paragraphs and tables in document order (content controls are unwrapped)."""
+        for child in container:
+            if child.tag in (TAG_P, TAG_TBL):
+                yield child
+            elif child.tag == TAG_SDT:
+                content = child.find(TAG_SDT_CONTENT)
+                if content is not None:
+                    yield from DocxMarkdownExtractor._iter_blocks(content)
+
+    @classmethod
+    def extract(cls, doc_path: Path, doc_type: str) -> str:
+        """Converts a .docx into the LLM Markdown format."""
+        with zipfile.ZipFile(doc_path, "r") as zf:
+            document_root = cls._read_part(zf, "word/document.xml")
+            if document_root is None:
+                raise ValueError(f"{Path(doc_path).name} has no word/document.xml")
+            style_names = cls._get_style_names(cls._read_part(zf, "word/styles.xml"))
+            comments = cls._get_comments(cls._read_part(zf, "word/comments.xml"))
+
+        body = document_root.find(TAG_BODY)
+        if body is None:
+            return ""
+
+        is_cr = "CR" in doc_type
+        md_lines: List[str] = []
+        in_new_block = False
+
+        for block in cls._iter_blocks(body):
+            if block.tag == TAG_TBL:
+                table_md = cls._table_to_markdown(block, is_cr, comments)
+                if table_md:
+                    md_lines.append(f"[ADDED BLOCK]:\n{table_md}" if in_new_block else table_md)
+                continue
+
+            paragraph = cls._get_paragraph(block)
+            text = paragraph['text']
+            if not text and not (is_cr and paragraph['deleted']):
+                continue
+            style_name = style_names.get(paragraph['style_id'], paragraph['style_id'])
+            is_heading = "heading" in style_name.lower()
+            first_word = text.split()[0] if text else ""
+            comment_suffix = "".join(f" {comments[c]}" for c in paragraph['comment_ids'] if c in comments)
+
+            if cls.BOUNDARY_TRIGGER.search(text):
+                in_new_block = False
+                md_lines.append(f"\n*[{text.strip()}]*\n")
+                continue
+
+            if in_new_block and is_heading and cls.NUMERIC_CLAUSE_TRIGGER.match(first_word):
+                in_new_block = False
+
+            if cls.ALL_NEW_TRIGGER.search(text):
+                in_new_block = True
+                md_lines.append(f"\n> **Note to LLM:** Entering 'All Text New' block.\n")
+                continue
+
+            if is_heading and cls.PLACEHOLDER_CLAUSE_TRIGGER.match(first_word):
+                in_new_block = True
+                md_lines.append(f"\n> **Note to LLM:** Entering placeholder clause '{first_word}'.\n")
+
+            if in_new_block:
+                md_lines.append(f"[ADDED BLOCK]: {text}{comment_suffix}")
+            elif is_cr:
+                prefix = ""
+                if paragraph['inserted']:
+                    prefix += f"[INSERTED: {', '.join(paragraph['inserted'])}] "
+                if paragraph['deleted']:
+                    prefix += f"[DELETED: {', '.join(paragraph['deleted'])}] "
+                md_lines.append(f"{prefix}{text}{comment_suffix}")
+            elif is_heading:
+                depth = ''.join(filter(str.isdigit, style_name))
+                prefix = "#" * int(depth) if depth else "##"
+                md_lines.append(f"\n{prefix} {text}{comment_suffix}\n")
+            else:
+                md_lines.append(f"{text}{comment_suffix}")
+
+        return "\n\n".join(md_lines)
+
+
+class LLMMarkdownCache:
+    """
+    Extracted Markdown keyed by the content hash of the Word document, so that the same file is only converted
+    once, whatever the TDoc folder or meeting it is found in.
+        <cache root>/llm_markdown/<2 hex chars>/<digest>_v<LLM_EXTRACTOR_VERSION>_<cr|doc>.md
+    """
+    @staticmethod
+    def get_folder() -> Path:
+        return CommonConfig.path("llm_markdown")
+
+    @classmethod
+    def get_path(cls, digest: str, doc_type: str) -> Path:
+        # ---> Tracked changes are only rendered for CRs, so the output depends on the document type
+        mode = "cr" if "CR" in doc_type else "doc"
+        return cls.get_folder() / digest[:2] / f"{digest}_v{LLM_EXTRACTOR_VERSION}_{mode}.md"
+
+    @classmethod
+    def get(cls, digest: str, doc_type: str):
+        if not digest:
+            return None
+        path = cls.get_path(digest, doc_type)
+        try:
+            md_content = path.read_text(encoding="utf-8")
+        except OSError:
+            return None
+        CacheGovernor.touch(path)
+        return md_content
+
+    @classmethod
+    def put(cls, digest: str, doc_type: str, md_content: str):
+        if not digest or not md_content:
+            return
+        path = cls.get_path(digest, doc_type)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(md_content, encoding="utf-8")
+            CacheGovernor.register(path, CacheGovernor.MARKDOWN)
+        except OSError as e:
+            logging.warning(f"[LLM Exporter] Could not write Markdown cache {path}: {e}")
+
+
+# --- Process pool helper (module level so it can be pickled by ProcessPoolExecutor) ---
+def extract_docx_markdown(doc_path: str, doc_type: str) -> str:
+    try:
+        return DocxMarkdownExtractor.extract(Path(doc_path), doc_type)
+    except Exception as e:
+        return f"Error parsing document: {str(e)}"
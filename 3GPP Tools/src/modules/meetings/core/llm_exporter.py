@@ -1,21 +1,24 @@
 # --- File: src/modules/meetings/core/llm_exporter.py ---
+import concurrent.futures
 import os
 import re
-import pythoncom
-import win32com.client
 import logging
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 from PyQt5.QtCore import QThread, pyqtSignal
 
+from threegpp_common.cache_governor import CacheGovernor
+from threegpp_common.fingerprint import Fingerprint
+from modules.meetings.core.docx_markdown import (DocxMarkdownExtractor, LLMMarkdownCache, LLM_EXTRACTOR_VERSION,
+                                                  extract_docx_markdown)
 from modules.meetings.core.tdoc_file_handler import TDocFileHandler
 
-LLM_EXTRACTOR_VERSION = "1.0.0"
-
-
 class LLMExporterThread(QThread):
     finished = pyqtSignal(bool, str)
     progress = pyqtSignal(str)
 
+    MAX_PARALLEL_DOWNLOADS = 4
+
     # ---> THE FIX: Add system_prompt parameter to the initialization
     def __init__(self, meeting_dir: Path, tdocs_list: list, docs_ftp_url: str, revisions_url: str,
                  is_bulk: bool = True, max_chars: int = 200000, system_prompt: str = ""):
@@ -40,75 +43,200 @@ class LLMExporterThread(QThread):
             "**Structural Rules for parsing this text:**\n"
             "- `[ADDED BLOCK]:` Denotes entirely new text inserted into the specification where tracking wasn't explicitly isolated.\n"
             "- `[INSERTED: <text>]`: Denotes specific inline text additions explicitly marked via Word Track Changes.\n"
-            "- `[DELETED: <text>]`: Denotes specific inline text removals explicitly marked via Word Track Changes.\n\n"
+            "- `[DELETED: <text>]`: Denotes specific inline text removals explicitly marked via Word Track Changes.\n"
+            "- `[COMMENT <author>: <text>]`: Denotes a Word comment attached to the preceding text.\n"
+            "- Tables are rendered as Markdown tables; `<br>` separates paragraphs within a cell.\n\n"
             "**Your Task:** Please use this corpus to analyze technical agreements, architectural changes, or contradictions within this specific Agenda Item."
         )
 
-    def run(self):
+    def _make_job(self, tdoc_data: dict):
+        tdoc_id = str(tdoc_data.get("TDoc", "")).strip()
+        if not tdoc_id:
+            return None
+
+        base_match = re.search(r'^(.*?)-?(?:r|rev)\d{1,2}[a-zA-Z]?$', tdoc_id, re.IGNORECASE)
+        base_tdoc = base_match.group(1).upper() if base_match else tdoc_id.upper()
+        doc_type = str(tdoc_data.get("Type", "Other"))
+
+        if "CR" in doc_type or "pCR" in doc_type:
+            category = "CRs"
+        elif "LS" in doc_type:
+            category = "LSs"
+        else:
+            category = "Discussion_Papers"
+
+        tdoc_folder = self.meeting_dir / base_tdoc
+        return {
+            "tdoc_id": tdoc_id,
+            "tdoc_data": tdoc_data,
+            "ai": str(tdoc_data.get("Agenda Item", "Unknown")).replace(" ", "_"),
+            "doc_type": doc_type,
+            "category": category,
+            "tdoc_folder": tdoc_folder,
+            "cache_file": tdoc_folder / f"{tdoc_id}_LLM_v{LLM_EXTRACTOR_VERSION}.md",
+            "doc_path": None,
+            "digest": None,
+            "md_content": None,
+        }
+
+    def _load_cached(self, job: dict) -> bool:
+        """Local Word document with an already converted content hash, or a per-TDoc export. True if found."""
+        job["doc_path"] = self._find_word_doc(job["tdoc_folder"], job["tdoc_id"])
+        if job["doc_path"]:
+            job["digest"] = Fingerprint.file(job["doc_path"])
+            md_content = LLMMarkdownCache.get(job["digest"], job["doc_type"])
+            if md_content is not None:
+                logging.info(f"[LLM Exporter] Found content cache for {job['tdoc_id']}")
+                job["md_content"] = md_content
+                if not job["cache_file"].exists():
+                    self._save_tdoc_export(job)
+                return True
+        elif job["cache_file"].exists():
+            logging.info(f"[LLM Exporter] Found local cache for {job['tdoc_id']}")
+            with open(job["cache_file"], "r", encoding="utf-8") as f:
+                job["md_content"] = f.read()
+            CacheGovernor.touch(job["tdoc_folder"])
+            return True
+        return False
+
+    def _save_tdoc_export(self, job: dict):
+        with open(job["cache_file"], "w", encoding="utf-8") as f:
+            f.write(job["md_content"])
+        # ---> Charged to the TDoc folder it is written to (re-registered so that its size is measured again)
+        CacheGovernor.register(job["tdoc_folder"], CacheGovernor.TDOCS, meeting=self.meeting_dir.name)
+
+    def _finish_extraction(self, job: dict, md_content: str):
+        job["md_content"] = md_content
+        if md_content and not md_content.startswith("Error parsing document"):
+            self._save_tdoc_export(job)
+            LLMMarkdownCache.put(job["digest"], job["doc_type"], md_content)
+
+    def _download_missing(self, jobs: list):
+        """Downloads the TDocs without a local Word document, at most MAX_PARALLEL_DOWNLOADS at a time."""
+        if not jobs:
+            return
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.MAX_PARALLEL_DOWNLOADS) as executor:
+            future_to_job = {}
+            for job in jobs:
+                dl_msg = f"Downloading missing TDoc: {job['tdoc_id']}..."
+                logging.info(f"[LLM Exporter] {dl_msg}")
+                future_to_job[executor.submit(self._download_and_extract_tdoc, job["tdoc_id"], job["tdoc_folder"])] = job
+            for future in concurrent.futures.as_completed(future_to_job):
+                job = future_to_job[future]
+                job["doc_path"] = future.result()
+                self.progress.emit(f"Downloaded {job['tdoc_id']}")
+                if job["doc_path"]:
+                    job["digest"] = Fingerprint.file(job["doc_path"])
+                    md_content = LLMMarkdownCache.get(job["digest"], job["doc_type"])
+                    if md_content is not None:
+                        job["md_content"] = md_content
+                        self._save_tdoc_export(job)
+
+    def _extract_with_word(self, jobs: list):
+        """Legacy .doc files: Word (COM) is the only reader. Runs on this thread while the pool converts .docx."""
+        if not jobs:
+            return
+        try:
+            import pythoncom
+            import win32com.client
+        except ImportError:
+            for job in jobs:
+                job["md_content"] = f"> ⚠️ {job['doc_path'].name} is a legacy .doc file and requires Microsoft Word.\n"
+            return
+
         word_app = None
+        pythoncom.CoInitialize()
+        try:
+            for job in jobs:
+                if not word_app:
+                    word_app = win32com.client.DispatchEx("Word.Application")
+                    word_app.Visible = False
+                    word_app.DisplayAlerts = 0
+
+                ext_msg = f"Extracting {job['tdoc_id']} (Word)..."
+                self.progress.emit(ext_msg)
+                logging.info(f"[LLM Exporter] {ext_msg}")
+                self._finish_extraction(job, self._extract_from_word(word_app, job["doc_path"], job["doc_type"]))
+        finally:
+            if word_app:
+                try:
+                    word_app.Quit()
+                except:
+                    pass
+            pythoncom.CoUninitialize()
+
+    def _extract_all(self, jobs: list):
+        """.docx files are converted in a process pool, .doc files through Word."""
+        docx_jobs = [job for job in jobs if job["doc_path"].suffix.lower() == ".docx"]
+        doc_jobs = [job for job in jobs if job["doc_path"].suffix.lower() != ".docx"]
+
+        executor = None
+        future_to_job = {}
+        if len(docx_jobs) > 1:
+            max_workers = max(1, min(len(docx_jobs), (os.cpu_count() or 2) - 1))
+            executor = concurrent.futures.ProcessPoolExecutor(max_workers=max_workers)
+            for job in docx_jobs:
+                future_to_job[executor.submit(extract_docx_markdown, str(job["doc_path"]), job["doc_type"])] = job
+
+        try:
+            self._extract_with_word(doc_jobs)
+
+            if executor is None:
+                # Single document: not worth spawning processes
+                for job in docx_jobs:
+                    self.progress.emit(f"Extracting {job['tdoc_id']}...")
+                    self._finish_extraction(job, extract_docx_markdown(str(job["doc_path"]), job["doc_type"]))
+                return
+
+            for future in concurrent.futures.as_completed(future_to_job):
+                job = future_to_job[future]
+                try:
+                    md_content = future.result()
+                except BrokenProcessPool as e:
+                    # e.g. frozen builds without freeze_support or an AV killing the workers: convert inline instead
+                    logging.warning(f"[LLM Exporter] Conversion pool unavailable, converting inline: {e}")
+                    md_content = extract_docx_markdown(str(job["doc_path"]), job["doc_type"])
+                self.progress.emit(f"Extracted {job['tdoc_id']}")
+                logging.info(f"[LLM Exporter] Extracted {job['tdoc_id']}")
+                self._finish_extraction(job, md_content)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+    def run(self):
         try:
-            pythoncom.CoInitialize()
             self.export_dir.mkdir(parents=True, exist_ok=True)
 
             corpus = {}
             saved_files = []
+            cache_file = None
 
-            for tdoc_data in self.tdocs_list:
-                tdoc_id = str(tdoc_data.get("TDoc", "")).strip()
-                if not tdoc_id: continue
+            jobs = [job for job in (self._make_job(tdoc_data) for tdoc_data in self.tdocs_list) if job]
 
-                base_match = re.search(r'^(.*?)-?(?:r|rev)\d{1,2}[a-zA-Z]?$', tdoc_id, re.IGNORECASE)
-                base_tdoc = base_match.group(1).upper() if base_match else tdoc_id.upper()
+            # 1. Cached exports (per content hash or per TDoc)
+            self.progress.emit(f"Checking cache for {len(jobs)} TDocs...")
+            pending = [job for job in jobs if not self._load_cached(job)]
 
-                ai = str(tdoc_data.get("Agenda Item", "Unknown")).replace(" ", "_")
-                doc_type = str(tdoc_data.get("Type", "Other"))
+            # 2. Bounded parallel downloads
+            self._download_missing([job for job in pending if not job["doc_path"]])
+            pending = [job for job in pending if job["md_content"] is None]
 
-                if "CR" in doc_type or "pCR" in doc_type:
-                    category = "CRs"
-                elif "LS" in doc_type:
-                    category = "LSs"
-                else:
-                    category = "Discussion_Papers"
+            # 3. Conversion
+            self._extract_all([job for job in pending if job["doc_path"]])
 
-                msg = f"Processing {tdoc_id}..."
-                self.progress.emit(msg)
-                logging.info(f"[LLM Exporter] {msg}")
+            for job in jobs:
+                tdoc_id = job["tdoc_id"]
+                tdoc_data = job["tdoc_data"]
+                ai = job["ai"]
+                category = job["category"]
+                cache_file = job["cache_file"]
 
-                tdoc_folder = self.meeting_dir / base_tdoc
-                cache_file = tdoc_folder / f"{tdoc_id}_LLM_v{LLM_EXTRACTOR_VERSION}.md"
-
-                md_content = ""
-                if cache_file.exists():
-                    logging.info(f"[LLM Exporter] Found local cache for {tdoc_id}")
-                    with open(cache_file, "r", encoding="utf-8") as f:
-                        md_content = f.read()
-                else:
-                    doc_path = self._find_word_doc(tdoc_folder, tdoc_id)
-                    if not doc_path:
-                        dl_msg = f"Downloading missing TDoc: {tdoc_id}..."
-                        self.progress.emit(dl_msg)
-                        logging.info(f"[LLM Exporter] {dl_msg}")
-                        doc_path = self._download_and_extract_tdoc(tdoc_id, tdoc_folder)
-
-                    if doc_path:
-                        if not word_app:
-                            word_app = win32com.client.DispatchEx("Word.Application")
-                            word_app.Visible = False
-                            word_app.DisplayAlerts = 0
-
-                        ext_msg = f"Extracting {tdoc_id}..."
-                        self.progress.emit(ext_msg)
-                        logging.info(f"[LLM Exporter] {ext_msg}")
-                        md_content = self._extract_from_word(word_app, doc_path, doc_type)
-
-                        if md_content:
-                            with open(cache_file, "w", encoding="utf-8") as f:
-                                f.write(md_content)
-                    else:
-                        warn_msg = f"> ⚠️ Could not locate or download an unzipped Word document for {tdoc_id}.\n"
-                        self.progress.emit(f"Failed to find Word doc for {tdoc_id}")
-                        logging.warning(f"[LLM Exporter] {warn_msg}")
-                        md_content = warn_msg
+                md_content = job["md_content"]
+                if md_content is None:
+                    warn_msg = f"> ⚠️ Could not locate or download an unzipped Word document for {tdoc_id}.\n"
+                    self.progress.emit(f"Failed to find Word doc for {tdoc_id}")
+                    logging.warning(f"[LLM Exporter] {warn_msg}")
+                    md_content = warn_msg
 
                 if ai not in corpus: corpus[ai] = {}
                 if category not in corpus[ai]: corpus[ai][category] = []
@@ -171,13 +299,6 @@ class LLMExporterThread(QThread):
         except Exception as e:
             logging.error(f"[LLM Exporter] Critical thread failure: {e}", exc_info=True)
             self.finished.emit(False, str(e))
-        finally:
-            if word_app:
-                try:
-                    word_app.Quit()
-                except:
-                    pass
-            pythoncom.CoUninitialize()
 
     def _find_word_doc(self, folder: Path, tdoc_id: str):
         if not folder.exists(): return None
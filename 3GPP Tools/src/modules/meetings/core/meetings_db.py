@@ -5,6 +5,8 @@ import logging
 import re
 from pathlib import Path
 
+from threegpp_common.tracing import Tracing
+
 
 class MeetingsDatabase:
     def __init__(self, db_path: Path):
@@ -75,6 +77,15 @@ class MeetingsDatabase:
                 cursor.execute("ALTER TABLE meetings ADD COLUMN mtg_id TEXT")
             except sqlite3.OperationalError:
                 pass
+            # Incremental crawling: fingerprint of the Docs listing, frozen meetings are no longer crawled
+            try:
+                cursor.execute("ALTER TABLE meetings ADD COLUMN docs_listing_hash TEXT")
+            except sqlite3.OperationalError:
+                pass
+            try:
+                cursor.execute("ALTER TABLE meetings ADD COLUMN is_frozen INTEGER DEFAULT 0")
+            except sqlite3.OperationalError:
+                pass
 
             conn.commit()
 
@@ -114,6 +125,7 @@ class MeetingsDatabase:
             ''', (wg_id, folder_name, meeting_number, sort_num, is_ad_hoc, is_electronic, url_key))
             conn.commit()
 
+    @Tracing.traced("db.meetings.insert_bulk")
     def insert_meetings_bulk(self, meetings_data: list):
         if not meetings_data: return
         wg_map = {}
@@ -149,6 +161,7 @@ class MeetingsDatabase:
             ''', insert_data)
             conn.commit()
 
+    @Tracing.traced("db.meetings.update_docs_bulk")
     def update_meeting_docs_bulk(self, docs_data: list):
         if not docs_data: return
         formatted_data = [
@@ -170,6 +183,28 @@ class MeetingsDatabase:
             ''', formatted_data)
             conn.commit()
 
+    def get_crawl_states(self) -> dict:
+        """Maps url_key -> {end_date, docs_listing_hash, is_frozen} for every meeting folder."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT url_key, end_date, docs_listing_hash, is_frozen FROM meetings
+                WHERE url_key IS NOT NULL AND url_key != ''
+            ''')
+            return {
+                row[0]: {"end_date": row[1] or "", "docs_listing_hash": row[2], "is_frozen": bool(row[3])}
+                for row in cursor.fetchall()
+            }
+
+    @Tracing.traced("db.meetings.update_crawl_states_bulk")
+    def update_crawl_states_bulk(self, states: list):
+        """states: (docs_listing_hash, is_frozen, url_key) tuples."""
+        if not states: return
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany('UPDATE meetings SET docs_listing_hash = ?, is_frozen = ? WHERE url_key = ?', states)
+            conn.commit()
+
     def update_meeting_metadata_bulk(self, metadata_data: list):
         if not metadata_data: return
         wg_map = {}
@@ -0,0 +1,73 @@
+# --- File: src/modules/meetings/core/revision_comparator.py ---
+import concurrent.futures
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from threegpp_common.redline import DocxRedline
+from modules.meetings.core.tdoc_file_handler import TDocFileHandler
+from modules.word_tools.core.word_comparator import WordComparatorThread
+
+
+class RevisionChainsComparatorThread(QThread):
+    """
+    Compares every revision of a list of TDocs with its previous revision (r00 -> r01 -> r02), e.g. all visible TDocs
+    of an Agenda Item. Missing TDocs are downloaded, the comparisons run in DocxRedline's process pool (no Word).
+    """
+    finished = pyqtSignal(bool, str)
+    progress = pyqtSignal(str)
+
+    MAX_PARALLEL_DOWNLOADS = 4
+
+    def __init__(self, meeting_dir: Path, tdoc_ids: List[str], docs_ftp_url: str, revisions_url: str,
+                 output_dir: Path, output_format: str = "html"):
+        super().__init__()
+        self.meeting_dir = meeting_dir
+        self.tdoc_ids = tdoc_ids
+        self.docs_ftp_url = docs_ftp_url
+        self.revisions_url = revisions_url
+        self.output_dir = output_dir
+        self.output_format = output_format
+
+    def _get_docx(self, tdoc_id: str) -> Optional[Path]:
+        """The .docx of a TDoc or revision, downloaded to the TDoc folder if needed. None for .doc or failures."""
+        base_tdoc, revision = DocxRedline.REVISION_CHAIN_REGEX.match(tdoc_id).group('tdoc', 'revision')
+        is_revision = revision is not None
+        base_url = self.revisions_url if (is_revision and self.revisions_url) else self.docs_ftp_url
+        if not base_url:
+            return None
+        try:
+            extracted_files = TDocFileHandler.download_and_extract_tdoc(
+                tdoc_id, base_url, self.meeting_dir / base_tdoc.upper())
+        except Exception as e:
+            logging.warning(f"[Revision Compare] Could not download {tdoc_id}: {e}")
+            return None
+        return next((Path(f) for f in extracted_files if str(f).lower().endswith(".docx")), None)
+
+    def run(self):
+        try:
+            pairs = DocxRedline.get_revision_chains(self.tdoc_ids)
+            if not pairs:
+                self.finished.emit(False, "No revisions to compare in the visible TDocs.")
+                return
+
+            tdocs_to_download = sorted({tdoc_id for pair in pairs for tdoc_id in pair})
+            self.progress.emit(f"Downloading {len(tdocs_to_download)} TDocs...")
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.MAX_PARALLEL_DOWNLOADS) as executor:
+                docx_files: Dict[str, Optional[Path]] = dict(
+                    zip(tdocs_to_download, executor.map(self._get_docx, tdocs_to_download)))
+
+            file_pairs = [(docx_files[original], docx_files[revised]) for original, revised in pairs
+                          if docx_files[original] and docx_files[revised]]
+            self.progress.emit(f"Comparing {len(file_pairs)} revisions...")
+            results = DocxRedline.batch_compare(file_pairs, output_format=self.output_format,
+                                                output_folder=self.output_dir,
+                                                author=WordComparatorThread.REDLINE_AUTHOR)
+            n_compared = sum(1 for output_path in results.values() if output_path is not None)
+            self.finished.emit(n_compared > 0, f"Compared {n_compared} of {len(pairs)} revisions "
+                                               f"(the others could not be retrieved as .docx).")
+        except Exception as e:
+            logging.error(f"[Revision Compare] {e}", exc_info=True)
+            self.finished.emit(False, str(e))
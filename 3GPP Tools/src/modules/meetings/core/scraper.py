@@ -1,14 +1,17 @@
 # --- File: modules/meetings/core/scraper.py ---
+import datetime
 import logging
 import re
 import time
 from pathlib import Path
 from urllib.parse import urljoin, unquote
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from bs4 import BeautifulSoup
 from PyQt5.QtCore import QThread, pyqtSignal
 
 from core.network.session import NetworkSession
+from threegpp_common.host_concurrency import HostConcurrency
+from threegpp_common.fingerprint import Fingerprint
 from modules.meetings.core.meetings_db import MeetingsDatabase
 
 MEETING_SOURCES = {
@@ -60,6 +63,13 @@ class MeetingsCrawlerThread(QThread):
     finished = pyqtSignal()
     finished_path = pyqtSignal(str)
 
+    # Every phase hits www.3gpp.org: one shared pool, sized to the maximum. HostConcurrency adapts the number of
+    # requests actually running to the host's response
+    HOST_CONCURRENCY = HostConcurrency.MAX_CONCURRENCY
+    # A meeting is frozen (no longer crawled) once it ended this long ago and its Docs listing did not change
+    # between two crawls
+    FREEZE_AFTER_DAYS = 30
+
     def __init__(self, db_path: Path, target_meetings: list = None, sync_wg=True, sync_docs=True, sync_dyna=True):
         super().__init__()
         self.db = MeetingsDatabase(db_path)
@@ -157,12 +167,15 @@ class MeetingsCrawlerThread(QThread):
                 parsed.sort(key=lambda x: (x["num"], x["clean"]))
             return parsed
 
+        listing_hash = None
         try:
             parsed_list = fetch_and_parse(base_docs_url)
             if not parsed_list and "Docs/" in base_docs_url:
                 fallback_url = base_docs_url.replace("Docs/", "docs/")
                 parsed_list = fetch_and_parse(fallback_url)
                 if parsed_list: final_docs_url = fallback_url
+            # ---> Only set when the listing was actually retrieved: a timeout must not look like a stable folder
+            listing_hash = Fingerprint.bytes("\n".join(p["clean"] for p in parsed_list))
         except Exception:
             parsed_list = []
 
@@ -172,7 +185,21 @@ class MeetingsCrawlerThread(QThread):
             last_tdoc, last_pfx, last_num = parsed_list[-1]["clean"], parsed_list[-1]["prefix"], parsed_list[-1]["num"]
 
         docs_data = (final_docs_url, first_tdoc, first_pfx, first_num, last_tdoc, last_pfx, last_num, task["url_key"])
-        return docs_data, tdoc_count
+        return docs_data, tdoc_count, listing_hash
+
+    def should_freeze(self, crawl_state: dict, listing_hash: str, today: datetime.date) -> bool:
+        """True if the meeting ended more than FREEZE_AFTER_DAYS ago and its Docs listing is unchanged."""
+        end_date = crawl_state.get("end_date", "")
+        if not end_date or listing_hash is None:
+            return False
+        cutoff = (today - datetime.timedelta(days=self.FREEZE_AFTER_DAYS)).strftime("%Y-%m-%d")
+        return end_date < cutoff and listing_hash == crawl_state.get("docs_listing_hash")
+
+    def is_frozen(self, task: dict, crawl_states: dict) -> bool:
+        # ---> Explicitly requested meetings are always crawled
+        if self.target_meetings:
+            return False
+        return crawl_states.get(task["url_key"], {}).get("is_frozen", False)
 
     def process_dynareport(self, wg_name: str, dyna_url: str) -> list:
         results = []
@@ -296,125 +323,150 @@ class MeetingsCrawlerThread(QThread):
     def run(self):
         start_time = time.time()
         try:
-            all_tasks = []
-
-            if self.sync_wg:
-                self.ui_log_msg.emit("⏳ [Phase 1/3] Mapping WG directories...", logging.INFO)
-                mapped = set()
-
-                with ThreadPoolExecutor(max_workers=15) as executor:
-                    futures = {}
+            crawl_states = self.db.get_crawl_states()
+            today = datetime.date.today()
+
+            all_tasks, mapped = [], set()
+            all_docs_data, crawl_updates, all_metadata = [], [], []
+            docs_total, docs_completed, tdocs_found, frozen_skipped = 0, 0, 0, 0
+            wg_pending, dyna_pending, dyna_total = 0, 0, 0
+            phase_2_done = False
+            p2_start = time.time()
+
+            # ---> One pipelined scheduler: Docs folders of a WG are scanned as soon as its directory is mapped,
+            # while the DynaReports are fetched, all within the same host limit
+            with ThreadPoolExecutor(max_workers=self.HOST_CONCURRENCY) as executor:
+                pending = {}
+
+                def submit_docs(tasks: list):
+                    nonlocal docs_total, frozen_skipped
+                    if not self.sync_docs:
+                        return
+                    for meeting_task in tasks:
+                        if self.is_frozen(meeting_task, crawl_states):
+                            frozen_skipped += 1
+                            continue
+                        pending[executor.submit(self.process_individual_meeting, meeting_task)] = ("docs", meeting_task)
+                        docs_total += 1
+
+                if self.sync_wg:
+                    self.ui_log_msg.emit("⏳ [Phase 1/3] Mapping WG directories...", logging.INFO)
                     for wg_name, source_info in MEETING_SOURCES.items():
                         urls = source_info["ftp"] if isinstance(source_info["ftp"], list) else [source_info["ftp"]]
                         for url in urls:
                             is_ah = "AH" in url
-                            future = executor.submit(self.fetch_wg_directories, wg_name, url, is_ah)
-                            futures[future] = wg_name
-
-                    for future in as_completed(futures):
-                        if res := future.result():
-                            all_tasks.extend(res)
-                            for t in res:
-                                mapped.add(f"{t['wg_name']}:{t['meeting_num']}")
-
-                if all_tasks:
-                    self.ui_log_msg.emit(f"⏳ Bulk-saving {len(all_tasks)} folders to local Database... (This is fast)",
-                                         logging.INFO)
-                    self.db.insert_meetings_bulk(all_tasks)
-                    self.ui_log_msg.emit(f"✅ [Phase 1/3] Successfully mapped & saved {len(all_tasks)} meeting folders.",
-                                         logging.INFO)
-
-                if self.target_meetings:
-                    for t in self.target_meetings:
-                        if f"{t['wg']}:{t['meeting']}" not in mapped:
-                            self.ui_log_msg.emit(f"⚠️ Target {t['wg']}:{t['meeting']} not found on FTP!",
-                                                 logging.WARNING)
-            else:
-                self.ui_log_msg.emit("⏭️ [Phase 1/3] Skipping Directory Mapping (loading DB)...", logging.INFO)
-                for m in self.db.search_meetings():
-                    if self.target_meetings and not any(
-                            t["wg"] == m["wg_name"] and t["meeting"] == m["meeting_number"] for t in
-                            self.target_meetings):
-                        continue
-                    if m.get('url_key'):
-                        all_tasks.append({
-                            "wg_name": m["wg_name"], "folder_name": m.get("folder_name", m["meeting_number"]),
-                            "meeting_num": m["meeting_number"], "url_key": m["url_key"],
-                            "absolute_url": f"https://www.3gpp.org/ftp/{m['url_key']}"
-                        })
-
-            self.finished_path.emit("MEETINGS_DB_PHASE_1")
-
-            if self.sync_docs:
-                if not all_tasks:
-                    self.ui_log_msg.emit("⚠️ No meetings available to scan for Docs.", logging.WARNING)
+                            pending[executor.submit(self.fetch_wg_directories, wg_name, url, is_ah)] = ("wg", wg_name)
+                            wg_pending += 1
                 else:
-                    self.ui_log_msg.emit(f"⏳ [Phase 2/3] Deep scraping Docs for {len(all_tasks)} meetings...",
-                                         logging.INFO)
-                    completed, tdocs_found = 0, 0
-                    p2_start = time.time()
-
-                    all_docs_data = []
+                    self.ui_log_msg.emit("⏭️ [Phase 1/3] Skipping Directory Mapping (loading DB)...", logging.INFO)
+                    for m in self.db.search_meetings():
+                        if self.target_meetings and not any(
+                                t["wg"] == m["wg_name"] and t["meeting"] == m["meeting_number"] for t in
+                                self.target_meetings):
+                            continue
+                        if m.get('url_key'):
+                            all_tasks.append({
+                                "wg_name": m["wg_name"], "folder_name": m.get("folder_name", m["meeting_number"]),
+                                "meeting_num": m["meeting_number"], "url_key": m["url_key"],
+                                "absolute_url": f"https://www.3gpp.org/ftp/{m['url_key']}"
+                            })
+                    self.finished_path.emit("MEETINGS_DB_PHASE_1")
+                    submit_docs(all_tasks)
+
+                if self.sync_dyna:
+                    wgs_to_fetch = {t["wg"] for t in
+                                    self.target_meetings} if self.target_meetings else MEETING_SOURCES.keys()
+                    for wg_name in wgs_to_fetch:
+                        dyna_url = MEETING_SOURCES[wg_name]["dyna"]
+                        pending[executor.submit(self.process_dynareport, wg_name, dyna_url)] = ("dyna", wg_name)
+                        dyna_pending += 1
+                    dyna_total = dyna_pending
 
-                    with ThreadPoolExecutor(max_workers=10) as executor:
-                        future_to_task = {}
-                        for task in all_tasks:
-                            future = executor.submit(self.process_individual_meeting, task)
-                            future_to_task[future] = task
+                if self.sync_docs:
+                    self.ui_log_msg.emit("⏳ [Phase 2/3] Deep scraping Docs folders as they are mapped...",
+                                         logging.INFO)
 
-                        for future in as_completed(future_to_task):
-                            task = future_to_task[future]
-                            completed += 1
+                while pending or not phase_2_done:
+                    if pending:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    else:
+                        done = []
+
+                    for future in done:
+                        kind, payload = pending.pop(future)
+
+                        if kind == "wg":
+                            wg_pending -= 1
+                            if res := future.result():
+                                # Rows must exist before their Docs/metadata updates
+                                self.db.insert_meetings_bulk(res)
+                                all_tasks.extend(res)
+                                for t in res:
+                                    mapped.add(f"{t['wg_name']}:{t['meeting_num']}")
+                                submit_docs(res)
+
+                            if wg_pending == 0:
+                                self.ui_log_msg.emit(
+                                    f"✅ [Phase 1/3] Successfully mapped & saved {len(all_tasks)} meeting folders.",
+                                    logging.INFO)
+                                if self.target_meetings:
+                                    for t in self.target_meetings:
+                                        if f"{t['wg']}:{t['meeting']}" not in mapped:
+                                            self.ui_log_msg.emit(f"⚠️ Target {t['wg']}:{t['meeting']} not found on FTP!",
+                                                                 logging.WARNING)
+                                self.finished_path.emit("MEETINGS_DB_PHASE_1")
+
+                        elif kind == "docs":
+                            docs_completed += 1
                             try:
-                                docs_tuple, count = future.result()
+                                docs_tuple, count, listing_hash = future.result()
                                 tdocs_found += count
                                 all_docs_data.append(docs_tuple)
+                                if listing_hash is not None:
+                                    crawl_state = crawl_states.get(payload["url_key"], {})
+                                    is_frozen = self.should_freeze(crawl_state, listing_hash, today)
+                                    crawl_updates.append((listing_hash, int(is_frozen), payload["url_key"]))
                             except Exception as e:
-                                self.ui_log_msg.emit(f"❌ Error scraping {task['folder_name']}: {e}", logging.ERROR)
+                                self.ui_log_msg.emit(f"❌ Error scraping {payload['folder_name']}: {e}", logging.ERROR)
 
-                            if completed % 10 == 0 or completed == len(all_tasks):
+                            if docs_completed % 10 == 0 or (docs_completed == docs_total and wg_pending == 0):
                                 elapsed = time.time() - p2_start
-                                rate = completed / elapsed if elapsed > 0 else 0
+                                rate = docs_completed / elapsed if elapsed > 0 else 0
                                 self.ui_log_msg.emit(
-                                    f"⏳ Scanned {completed}/{len(all_tasks)} Docs folders "
+                                    f"⏳ Scanned {docs_completed}/{docs_total} Docs folders "
                                     f"| TDocs: {tdocs_found} | Speed: {rate:.1f} mtg/sec",
                                     logging.INFO
                                 )
 
-                    if all_docs_data:
-                        self.db.update_meeting_docs_bulk(all_docs_data)
-
-                    self.ui_log_msg.emit(f"✅ Pass 2 Complete. Indexed {tdocs_found} total TDocs.", logging.INFO)
-            else:
-                self.ui_log_msg.emit("⏭️ [Phase 2/3] Skipping Docs folder deep scrape...", logging.INFO)
-
-            self.finished_path.emit("MEETINGS_DB_PHASE_2")
+                        elif kind == "dyna":
+                            dyna_pending -= 1
+                            if res := future.result():
+                                all_metadata.extend(res)
+                            self.ui_log_msg.emit(
+                                f"⏳ DynaReports: {dyna_total - dyna_pending}/{dyna_total} pages processed...",
+                                logging.INFO)
+
+                    # Phase 2 is complete once every directory is mapped and every submitted Docs scan returned
+                    if not phase_2_done and wg_pending == 0 and docs_completed == docs_total:
+                        phase_2_done = True
+                        if self.sync_docs:
+                            if all_docs_data:
+                                self.db.update_meeting_docs_bulk(all_docs_data)
+                                self.db.update_crawl_states_bulk(crawl_updates)
+                            n_frozen = sum(1 for update in crawl_updates if update[1])
+                            self.ui_log_msg.emit(
+                                f"✅ Pass 2 Complete. Indexed {tdocs_found} total TDocs "
+                                f"({frozen_skipped} frozen meetings skipped, {n_frozen} newly frozen).",
+                                logging.INFO)
+                        else:
+                            self.ui_log_msg.emit("⏭️ [Phase 2/3] Skipping Docs folder deep scrape...", logging.INFO)
+                        self.finished_path.emit("MEETINGS_DB_PHASE_2")
 
             if self.sync_dyna:
-                self.ui_log_msg.emit("⏳ [Phase 3/3] Updating metadata from DynaReports...", logging.INFO)
-                wgs_to_fetch = {t["wg"] for t in
-                                self.target_meetings} if self.target_meetings else MEETING_SOURCES.keys()
-
-                completed_dyna = 0
-                total_dyna = len(wgs_to_fetch)
-
-                all_metadata = []
-
-                with ThreadPoolExecutor(max_workers=5) as executor:
-                    dyna_futures = []
-                    for wg_name in wgs_to_fetch:
-                        urls = MEETING_SOURCES[wg_name]["ftp"]
-                        dyna_url = MEETING_SOURCES[wg_name]["dyna"]
-                        future = executor.submit(self.process_dynareport, wg_name, dyna_url)
-                        dyna_futures.append(future)
-
-                    for future in as_completed(dyna_futures):
-                        if res := future.result():
-                            all_metadata.extend(res)
-                        completed_dyna += 1
-                        self.ui_log_msg.emit(f"⏳ DynaReports: {completed_dyna}/{total_dyna} pages processed...",
-                                             logging.INFO)
-
+                # Metadata of frozen meetings cannot change anymore
+                frozen_keys = {key.rstrip('/').lower() for key, state in crawl_states.items() if state["is_frozen"]}
+                if not self.target_meetings:
+                    all_metadata = [m for m in all_metadata if not m[2] or m[2].rstrip('/').lower() not in frozen_keys]
                 if all_metadata:
                     self.ui_log_msg.emit(f"⏳ Bulk-saving metadata for {len(all_metadata)} meetings...", logging.INFO)
                     self.db.update_meeting_metadata_bulk(all_metadata)
@@ -429,4 +481,4 @@ class MeetingsCrawlerThread(QThread):
         except Exception as e:
             self.ui_log_msg.emit(f"❌ Critical Failure: {str(e)}", logging.ERROR)
         finally:
-            self.finished.emit()
\ No newline at end of file
+            self.finished.emit()
@@ -1,6 +1,9 @@
 # --- File: modules/meetings/core/settings.py ---
 import json
 from pathlib import Path
+from threegpp_common import CommonConfig
+from threegpp_common.cache_governor import CacheGovernor
+
 import core.utils.paths
 
 class MeetingsSettings:
@@ -8,6 +11,12 @@ class MeetingsSettings:
         self.config_file = core.utils.paths.get_project_root() / "meetings_config.json"
         self.config_file.parent.mkdir(parents=True, exist_ok=True)
         self.cache_dir = self._load_settings()
+        self._apply_cache_root()
+        CacheGovernor.add_scan_folder(self.cache_dir)
+
+    def _apply_cache_root(self):
+        """The shared caches (TDoc store, spec index, cache catalogue) live next to the download folder."""
+        CommonConfig.configure(Path(self.cache_dir).parent, app_name="3gpp_tools")
 
     def _load_settings(self) -> str:
         fallback = str(Path.home() / "3GPP_Delegate_Helper" / "cache")
@@ -32,6 +41,8 @@ class MeetingsSettings:
             with open(self.config_file, 'w', encoding='utf-8') as f:
                 json.dump(data, f, indent=4)
             self.cache_dir = download_dir
+            self._apply_cache_root()
+            CacheGovernor.add_scan_folder(download_dir)
         except Exception as e:
             print(f"Error saving config: {e}")
 
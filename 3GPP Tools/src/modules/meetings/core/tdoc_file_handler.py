@@ -4,9 +4,17 @@ import zipfile
 from pathlib import Path
 
 from core.network.session import NetworkSession
+from threegpp_common.host_concurrency import HostConcurrency
+from threegpp_common.cache_governor import CacheGovernor
+from threegpp_common.tdoc_store import TDocStore
 
 
 class TDocFileHandler:
+    @staticmethod
+    def get_zip_url(base_url: str, target_filename: str) -> str:
+        """URL of the TDoc zip in a server folder, e.g. .../Inbox/S2-260123r01.zip"""
+        return base_url.rstrip('/') + f"/{target_filename}.zip"
+
     @staticmethod
     def download_and_extract_tdoc(target_filename: str, base_url: str, tdoc_dir: Path) -> list:
         """
@@ -20,22 +28,35 @@ class TDocFileHandler:
         """
         zip_path = tdoc_dir / f"{target_filename}.zip"
 
-        # 1. Download if missing
+        # 1. Reuse the zip if it was already downloaded for another meeting folder or by the Meeting Helper
+        if not zip_path.exists():
+            stored = TDocStore.lookup(target_filename, meeting=tdoc_dir.parent.name)
+            if stored:
+                TDocStore.materialize(stored, zip_path)
+
+        # 2. Download if missing
         if not zip_path.exists():
             tdoc_dir.mkdir(parents=True, exist_ok=True)
-            dl_url = base_url.rstrip('/') + f"/{target_filename}.zip"
+            dl_url = TDocFileHandler.get_zip_url(base_url, target_filename)
 
             session = NetworkSession.get_instance()
             NetworkSession.apply_humanness(session)
-            response = session.get(dl_url, stream=True, timeout=30)
-            response.raise_for_status()
+            with HostConcurrency.slot(dl_url) as slot:
+                response = session.get(dl_url, stream=True, timeout=30)
+                if not response.ok:
+                    slot.record_response(response, n_bytes=0)
+                response.raise_for_status()
 
-            with open(zip_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=16384):
-                    if chunk:
-                        f.write(chunk)
+                n_bytes = 0
+                with open(zip_path, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=16384):
+                        if chunk:
+                            f.write(chunk)
+                            n_bytes += len(chunk)
+                slot.record_response(response, n_bytes=n_bytes)
+            TDocStore.put_file(zip_path, target_filename, meeting=tdoc_dir.parent.name, source_url=dl_url)
 
-        # 2. Extract and Rename
+        # 3. Extract and Rename
         extracted_files = []
         with zipfile.ZipFile(zip_path, 'r') as z:
             for info in z.infolist():
@@ -58,4 +79,6 @@ class TDocFileHandler:
 
                     extracted_files.append(out_path)
 
+        # 4. The TDoc folder (zip and extracted files) is evicted as a whole by the cache governor
+        CacheGovernor.register(tdoc_dir, CacheGovernor.TDOCS, meeting=tdoc_dir.parent.name)
         return extracted_files
\ No newline at end of file
@@ -2,11 +2,15 @@
 import logging
 import re
 from pathlib import Path
-from urllib.parse import urljoin, unquote
+from urllib.parse import unquote
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from PyQt5.QtCore import QThread, pyqtSignal
 from core.network.session import NetworkSession
+from threegpp_common.host_concurrency import HostConcurrency
+from core.network.folder_watcher import FolderWatcher
+from threegpp_common.cache_governor import CacheGovernor
+from threegpp_common.tdoc_store import TDocStore
 
 
 class TDocsCacherThread(QThread):
@@ -23,24 +27,20 @@ class TDocsCacherThread(QThread):
         try:
             logging.info(f"🔍 Fetching TDoc directory listing from: {self.docs_url}")
 
-            # 1. Fetch the HTML of the Docs folder
-            html = NetworkSession.get_html(self.docs_url)
+            # 1. Fetch and parse the Docs folder listing (files only). Shared with the background folder watcher
+            entries = [e for e in FolderWatcher.get_instance().refresh(self.docs_url) if not e.is_dir]
 
-            # 2. Extract all .zip hrefs from the FTP page
-            href_pattern = re.compile(r'href=["\']([^"\'>]+\.zip)["\']', re.IGNORECASE)
-            hrefs = href_pattern.findall(html)
-
-            # 3. Filter strictly for files named like TDocs (e.g., S2-2605693.zip or revisions like S2-2605693r1.zip)
+            # 2. Filter strictly for files named like TDocs (e.g., S2-2605693.zip or revisions like S2-2605693r1.zip)
             # The regex captures the file name without the .zip extension
             tdoc_pattern = re.compile(r'^([A-Za-z0-9]+-\d+.*)\.zip$', re.IGNORECASE)
 
             download_tasks = []
-            for href in hrefs:
-                filename = unquote(href.split('/')[-1])
+            for entry in entries:
+                filename = unquote(entry.url.split('/')[-1])
                 match = tdoc_pattern.match(filename)
                 if match:
                     folder_name = match.group(1)  # Name without .zip (e.g., S2-2605693)
-                    file_url = urljoin(self.docs_url, href)
+                    file_url = entry.url
 
                     target_dir = self.local_path / folder_name
                     target_file = target_dir / filename
@@ -64,8 +64,8 @@ class TDocsCacherThread(QThread):
 
             session = NetworkSession.get_instance()
 
-            # 4. Use a moderate thread pool to speed up caching without overloading 3GPP's firewall
-            with ThreadPoolExecutor(max_workers=5) as executor:
+            # 3. Parallel downloads, adapted to the server's response by HostConcurrency (see _download_file)
+            with ThreadPoolExecutor(max_workers=HostConcurrency.MAX_CONCURRENCY) as executor:
                 future_to_task = {}
                 for task in download_tasks:
                     future = executor.submit(self._download_file, session, *task)
@@ -92,7 +92,7 @@ class TDocsCacherThread(QThread):
                         processed += 1
                         logging.error(f"❌ [{processed}/{total_files}] Failed to download {filename}: {e}")
 
-            # 5. Output Summary
+            # 4. Output Summary
             summary = f"Caching Complete! Downloaded: {downloaded}, Skipped: {skipped}, Total: {total_files}"
             logging.info(f"🏁 {summary}")
             self.finished.emit(True, summary)
@@ -106,6 +106,14 @@ class TDocsCacherThread(QThread):
         """Worker function to download a single file."""
         # ONLY download if the file is not present
         if target_file.exists():
+            CacheGovernor.touch(target_dir)
+            return False
+
+        # Already downloaded for another meeting folder or by the Meeting Helper: no network needed
+        tdoc_name = filename[:-len(".zip")]
+        stored = TDocStore.lookup(tdoc_name, meeting=self.local_path.name)
+        if stored and TDocStore.materialize(stored, target_file):
+            CacheGovernor.register(target_dir, CacheGovernor.TDOCS, meeting=self.local_path.name)
             return False
 
             # Create subfolders if necessary
@@ -113,13 +121,22 @@ class TDocsCacherThread(QThread):
 
         # Inherit humanness and proxy rules
         NetworkSession.apply_humanness(session)
-        response = session.get(file_url, stream=True, timeout=60)
-        response.raise_for_status()
-
-        with open(target_file, 'wb') as f:
-            # ---> OPTIMIZATION: Increased chunk size from 16KB to 64KB
-            for chunk in response.iter_content(chunk_size=65536):
-                if chunk:
-                    f.write(chunk)
-
+        # ---> The pool is sized to the maximum; the host controller decides how many downloads actually run
+        with HostConcurrency.slot(file_url) as slot:
+            response = session.get(file_url, stream=True, timeout=60)
+            if not response.ok:
+                slot.record_response(response, n_bytes=0)
+            response.raise_for_status()
+
+            n_bytes = 0
+            with open(target_file, 'wb') as f:
+                # ---> OPTIMIZATION: Increased chunk size from 16KB to 64KB
+                for chunk in response.iter_content(chunk_size=65536):
+                    if chunk:
+                        f.write(chunk)
+                        n_bytes += len(chunk)
+            slot.record_response(response, n_bytes=n_bytes)
+
+        TDocStore.put_file(target_file, tdoc_name, meeting=self.local_path.name, source_url=file_url)
+        CacheGovernor.register(target_dir, CacheGovernor.TDOCS, meeting=self.local_path.name)
         return True
\ No newline at end of file
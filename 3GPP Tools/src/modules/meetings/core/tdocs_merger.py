@@ -12,6 +12,7 @@ from openpyxl.styles.fills import Stop
 from openpyxl.utils import get_column_letter
 
 from core.network.session import NetworkSession
+from threegpp_common.tracing import Tracing
 from modules.meetings.core.tdocs_parser import TDocsParser
 
 
@@ -69,8 +70,8 @@ class TDocsMergerThread(QThread):
                 if not parsed_data:
                     continue
 
-                # Convert to a DataFrame
-                df = pd.DataFrame(parsed_data)
+                # Convert to a DataFrame straight from the columnar data
+                df = parsed_data.to_dataframe()
 
                 # Inject the 4 new columns at the very front of the table
                 df.insert(0, "WG", wg)
@@ -90,10 +91,11 @@ class TDocsMergerThread(QThread):
             master_df = pd.concat(all_dfs, ignore_index=True)
 
             # Save the raw data using pandas
-            master_df.to_excel(self.save_path, index=False)
+            with Tracing.span("excel.export.tdocs_merge", rows=len(master_df)):
+                master_df.to_excel(self.save_path, index=False)
 
-            self.progress.emit("Applying precise 3GPP TDoc formatting...")
-            self._format_excel(self.save_path)
+                self.progress.emit("Applying precise 3GPP TDoc formatting...")
+                self._format_excel(self.save_path)
 
             self.finished.emit(True,
                                f"Successfully merged {len(master_df)} TDocs across {len(all_dfs)} meetings!\n\nSaved to:\n{self.save_path}")
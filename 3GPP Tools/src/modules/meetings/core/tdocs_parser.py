@@ -1,4 +1,6 @@
 # --- File: src/modules/meetings/core/tdocs_parser.py ---
+import datetime
+from collections.abc import MutableMapping, Sequence
 import io
 import re
 import openpyxl
@@ -6,91 +8,299 @@ import logging
 import json
 import os
 
+from threegpp_common.fingerprint import Fingerprint
+from threegpp_common.tracing import Tracing
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:
+    CalamineWorkbook = None
+
+# Bump whenever the header mapping or cell normalisation changes so stale caches are rebuilt
+TDOCS_PARSER_VERSION = 2
+
+_MISSING = object()
+
+
+class TDocsRow(MutableMapping):
+    """
+    Dict-like view over a single row of a TDocsTable. Reads and writes go straight to the columns.
+    The row is addressed by its storage slot, not by its position, so it keeps showing the same TDoc after the
+    table is sorted or extended.
+    """
+    __slots__ = ("_table", "_slot")
+
+    def __init__(self, table, slot: int):
+        self._table = table
+        self._slot = slot
+
+    def __getitem__(self, key):
+        col = self._table._columns.get(key)
+        if col is None or col[self._slot] is _MISSING:
+            raise KeyError(key)
+        return col[self._slot]
+
+    def __setitem__(self, key, value):
+        self._table._column_for_write(key)[self._slot] = value
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self._table._columns[key][self._slot] = _MISSING
+
+    def __contains__(self, key):
+        col = self._table._columns.get(key)
+        return col is not None and col[self._slot] is not _MISSING
+
+    def __iter__(self):
+        slot = self._slot
+        return iter([k for k, col in self._table._columns.items() if col[slot] is not _MISSING])
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def get(self, key, default=None):
+        col = self._table._columns.get(key)
+        if col is None:
+            return default
+        val = col[self._slot]
+        return default if val is _MISSING else val
+
+    def __repr__(self):
+        return f"TDocsRow({dict(self.items())!r})"
+
+
+class TDocsTable(Sequence):
+    """
+    Columnar TDoc list. Behaves like a list of row dicts (len, index, iterate, extend, sort)
+    but rows are only lightweight views, so large meetings never materialise thousands of dicts.
+    Columns are append-only: sort() only permutes _order (position -> storage slot), so rows handed out
+    before a sort or extend stay valid.
+    """
+
+    def __init__(self, headers: list = None, columns: list = None):
+        self._columns = dict(zip(headers or [], columns or []))
+        self._n_slots = len(columns[0]) if columns else 0
+        self._order = list(range(self._n_slots))
+
+    @property
+    def headers(self) -> list:
+        return list(self._columns.keys())
+
+    def column(self, name: str) -> list:
+        """Returns the raw column list in table order (missing cells are None)."""
+        col = self._columns.get(name)
+        if col is None:
+            return [None] * len(self._order)
+        return [None if col[i] is _MISSING else col[i] for i in self._order]
+
+    def _column_for_write(self, name: str) -> list:
+        col = self._columns.get(name)
+        if col is None:
+            col = self._columns[name] = [_MISSING] * self._n_slots
+        return col
+
+    def __len__(self):
+        return len(self._order)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [TDocsRow(self, slot) for slot in self._order[idx]]
+        return TDocsRow(self, self._order[idx])
+
+    def __iter__(self):
+        for slot in self._order:
+            yield TDocsRow(self, slot)
+
+    def append(self, row: dict):
+        self.extend([row])
+
+    def extend(self, rows):
+        rows = [dict(r.items()) for r in rows]
+        if not rows:
+            return
+        for row in rows:
+            for key in row:
+                self._column_for_write(key)
+        for key, col in self._columns.items():
+            col.extend(row.get(key, _MISSING) for row in rows)
+        self._order.extend(range(self._n_slots, self._n_slots + len(rows)))
+        self._n_slots += len(rows)
+
+    def sort(self, key, reverse=False):
+        self._order.sort(key=lambda slot: key(TDocsRow(self, slot)), reverse=reverse)
+
+    def to_dataframe(self):
+        import pandas as pd
+        return pd.DataFrame({name: self.column(name) for name in self._columns})
+
+    def to_cache(self) -> dict:
+        return {"headers": self.headers, "columns": [self.column(h) for h in self.headers]}
+
 
 class TDocsParser:
     @staticmethod
-    def parse_tdocs_excel(filepath: str) -> list:
-        json_cache = filepath + ".json"
-        try:
-            if os.path.exists(json_cache) and os.path.getmtime(json_cache) >= os.path.getmtime(filepath):
-                with open(json_cache, "r", encoding="utf-8") as f:
-                    return json.load(f)
-        except Exception as e:
-            logging.warning(f"Could not read JSON cache: {e}")
+    def _cache_path(filepath: str) -> str:
+        return filepath + (".cache.msgpack" if msgpack else ".cache.json")
 
-        data = []
-        try:
-            with open(filepath, "rb") as f:
-                in_mem_file = io.BytesIO(f.read())
+    @staticmethod
+    def _load_cache(cache_path: str):
+        with open(cache_path, "rb") as f:
+            raw = f.read()
+        return msgpack.unpackb(raw, raw=False) if msgpack else json.loads(raw.decode("utf-8"))
+
+    @staticmethod
+    def _save_cache(cache_path: str, payload: dict):
+        if msgpack:
+            raw = msgpack.packb(payload, use_bin_type=True)
+        else:
+            raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(raw)
+        os.replace(tmp_path, cache_path)
 
-            wb = openpyxl.load_workbook(in_mem_file, data_only=True, read_only=True)
+    @staticmethod
+    def _normalise_cell(value) -> str:
+        if value is None:
+            return ""
+        # Calamine returns whole numbers as floats and date-only cells as dates; match openpyxl's rendering
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        elif isinstance(value, datetime.date) and not isinstance(value, datetime.datetime):
+            value = datetime.datetime.combine(value, datetime.time())
+        return str(value).strip()
+
+    @staticmethod
+    def _read_rows(file_bytes: bytes):
+        """Returns all sheet rows as value tuples. Prefers calamine, falls back to openpyxl."""
+        if CalamineWorkbook is not None:
+            try:
+                wb = CalamineWorkbook.from_filelike(io.BytesIO(file_bytes))
+                sheet_name = "TDoc_List" if "TDoc_List" in wb.sheet_names else wb.sheet_names[0]
+                return wb.get_sheet_by_name(sheet_name).to_python(skip_empty_area=False)
+            except Exception as e:
+                logging.warning(f"Calamine could not read TDocs Excel, falling back to openpyxl: {e}")
+
+        wb = openpyxl.load_workbook(io.BytesIO(file_bytes), data_only=True, read_only=True)
+        try:
             sheet = wb["TDoc_List"] if "TDoc_List" in wb.sheetnames else wb.worksheets[0]
+            return list(sheet.iter_rows(values_only=True))
+        finally:
+            wb.close()
 
-            headers = []
-            header_row_idx = 1
-
-            for row_idx, row in enumerate(sheet.iter_rows(min_row=1, max_row=15, values_only=True), start=1):
-                row_strs = [str(c).strip() if c is not None else "" for c in row]
-
-                hits = 0
-                for c in row_strs:
-                    cu = c.upper()
-                    if cu in ["TDOC", "TD#", "TDOC#"]: hits += 1
-                    if cu == "TITLE": hits += 1
-                    if cu == "SOURCE": hits += 1
-                    if cu == "TYPE": hits += 1
-                    if cu == "FOR": hits += 1
-                    if "AGENDA ITEM" in cu or cu in ["AI", "AI#", "AI #"]: hits += 1
-                    if "STATUS" in cu: hits += 1
-
-                if hits >= 3:
-                    header_row_idx = row_idx
-                    for val in row_strs:
-                        val_clean = re.sub(r'\s+', ' ', val).strip()
-                        val_up = val_clean.upper()
-
-                        if ("AGENDA ITEM" in val_up or val_up in ["AI", "AI#",
-                                                                  "AI #"]) and "SORT" not in val_up and "DESCRIPTION" not in val_up:
-                            val = "Agenda Item"
-                        elif val_up in ["TD#", "TDOC#", "TDOC"]:
-                            val = "TDoc"
-                        # ---> THE FIX: Force the Excel column to map to "TDoc Status"
-                        elif "STATUS" in val_up or "RESULT" in val_up:
-                            val = "TDoc Status"
-
-                        headers.append(val)
-                    break
+    @staticmethod
+    def _find_headers(rows: list):
+        for row_idx, row in enumerate(rows[:15]):
+            row_strs = [str(c).strip() if c is not None else "" for c in row]
+
+            hits = 0
+            for c in row_strs:
+                cu = c.upper()
+                if cu in ["TDOC", "TD#", "TDOC#"]: hits += 1
+                if cu == "TITLE": hits += 1
+                if cu == "SOURCE": hits += 1
+                if cu == "TYPE": hits += 1
+                if cu == "FOR": hits += 1
+                if "AGENDA ITEM" in cu or cu in ["AI", "AI#", "AI #"]: hits += 1
+                if "STATUS" in cu: hits += 1
+
+            if hits >= 3:
+                headers = []
+                for val in row_strs:
+                    val_clean = re.sub(r'\s+', ' ', val).strip()
+                    val_up = val_clean.upper()
+
+                    if ("AGENDA ITEM" in val_up or val_up in ["AI", "AI#",
+                                                              "AI #"]) and "SORT" not in val_up and "DESCRIPTION" not in val_up:
+                        val = "Agenda Item"
+                    elif val_up in ["TD#", "TDOC#", "TDOC"]:
+                        val = "TDoc"
+                    # ---> THE FIX: Force the Excel column to map to "TDoc Status"
+                    elif "STATUS" in val_up or "RESULT" in val_up:
+                        val = "TDoc Status"
+
+                    headers.append(val)
+                return row_idx, headers
+        return -1, []
 
-            if not headers:
-                logging.warning("Could not find a valid header row in the TDocs Excel file.")
-                wb.close()
-                return []
+    @classmethod
+    def _rows_to_table(cls, rows: list):
+        header_row_idx, headers = cls._find_headers(rows)
+        if not headers:
+            return None
+
+        # Duplicate header names keep the right-most column, same as the old dict-per-row behaviour
+        col_of = {}
+        for i, h in enumerate(headers):
+            if h:
+                col_of[h] = i
+        names = list(col_of.keys())
+        indices = [col_of[n] for n in names]
+        columns = [[] for _ in names]
+        normalise = cls._normalise_cell
+
+        for row in rows[header_row_idx + 1:]:
+            row_len = len(row)
+            cells = [normalise(row[i]) if i < row_len else "" for i in indices]
+            if any(cells):
+                for col, val in zip(columns, cells):
+                    col.append(val)
+
+        return TDocsTable(names, columns)
 
-            for row in sheet.iter_rows(min_row=header_row_idx + 1, values_only=True):
-                row_dict = {}
-                is_empty = True
-                for i, value in enumerate(row):
-                    if i < len(headers) and headers[i]:
-                        val_str = str(value).strip() if value is not None else ""
-                        row_dict[headers[i]] = val_str
-                        if val_str: is_empty = False
+    @classmethod
+    def parse_tdocs_excel(cls, filepath: str) -> TDocsTable:
+        # ---> Fingerprint index: an unchanged file is recognised from its size/mtime, without reading it
+        content_hash = Fingerprint.file(filepath)
+        if content_hash is None:
+            logging.error(f"Failed to read Excel file {filepath}")
+            return TDocsTable()
+
+        cache_path = cls._cache_path(filepath)
+        try:
+            if os.path.exists(cache_path):
+                cached = cls._load_cache(cache_path)
+                if cached.get("parser_version") == TDOCS_PARSER_VERSION and cached.get("hash") == content_hash:
+                    Tracing.cache_access("tdocs_excel_cache", True)
+                    return TDocsTable(cached["headers"], cached["columns"])
+        except Exception as e:
+            logging.warning(f"Could not read TDocs cache: {e}")
+        Tracing.cache_access("tdocs_excel_cache", False)
 
-                if not is_empty:
-                    data.append(row_dict)
+        try:
+            with open(filepath, "rb") as f:
+                file_bytes = f.read()
+        except Exception as e:
+            logging.error(f"Failed to read Excel file {filepath}: {e}")
+            return TDocsTable()
+        # The file may have changed since it was fingerprinted: the cache must describe the bytes actually parsed
+        content_hash = Fingerprint.bytes(file_bytes)
 
-            wb.close()
+        try:
+            with Tracing.span("parse.tdocs_excel", bytes=len(file_bytes)):
+                table = cls._rows_to_table(cls._read_rows(file_bytes))
+            if table is None:
+                logging.warning("Could not find a valid header row in the TDocs Excel file.")
+                return TDocsTable()
 
             try:
-                with open(json_cache, "w", encoding="utf-8") as f:
-                    json.dump(data, f, indent=2)
+                payload = table.to_cache()
+                payload.update({"parser_version": TDOCS_PARSER_VERSION, "hash": content_hash})
+                cls._save_cache(cache_path, payload)
             except Exception as e:
-                logging.warning(f"Could not save JSON cache: {e}")
+                logging.warning(f"Could not save TDocs cache: {e}")
 
-            return data
+            return table
 
         except Exception as e:
             logging.error(f"Failed to parse Excel file {filepath}: {e}")
-            return []
+            return TDocsTable()
 
     @classmethod
     def parse_tdocs_by_agenda(cls, filepath: str, ui_logger=None) -> dict:
@@ -3,14 +3,21 @@ import logging
 import re
 import json
 from pathlib import Path
+from urllib.parse import unquote
 
 import requests
 from PyQt5.QtCore import QThread, pyqtSignal
 
+from core.network.network_state import NetworkState
 from core.network.session import NetworkSession
+from core.network.folder_watcher import FolderWatcher
+from threegpp_common.tdoc_store import TDocStore
+from threegpp_common.url_resolver import URLResolver
 from modules.meetings.core.tdocs_parser import TDocsParser
 from modules.meetings.core.tdoc_file_handler import TDocFileHandler
 
+URLResolver.set_probe_function(NetworkSession.probe)
+
 
 class TDocsRevisionsFetcherThread(QThread):
     finished = pyqtSignal(bool, dict, str)
@@ -20,39 +27,45 @@ class TDocsRevisionsFetcherThread(QThread):
         self.url = url
         self.meeting_dir = meeting_dir
 
+    @staticmethod
+    def revisions_from_entries(entries) -> dict:
+        """{base TDoc: sorted revisions}, e.g. {'S2-2401234': ['r01', 'r02']}"""
+        revisions = {}
+        for e in entries:
+            if e.is_dir:
+                continue
+            split_name = FolderWatcher.split_tdoc_file_name(unquote(e.url.rsplit('/', 1)[-1]))
+            if not split_name or not split_name[1]:
+                continue
+            base_tdoc, rev_str = split_name
+            if base_tdoc not in revisions:
+                revisions[base_tdoc] = []
+            if rev_str not in revisions[base_tdoc]:
+                revisions[base_tdoc].append(rev_str)
+
+        for k in revisions:
+            revisions[k].sort()
+        return revisions
+
+    @staticmethod
+    def save_revisions(meeting_dir: Path, revisions: dict):
+        try:
+            agenda_dir = meeting_dir / "Agenda"
+            agenda_dir.mkdir(parents=True, exist_ok=True)
+            rev_file = agenda_dir / "revisions.json"
+            with open(rev_file, "w", encoding="utf-8") as f:
+                json.dump(revisions, f, indent=4)
+        except Exception as e:
+            logging.warning(f"Failed to cache revisions locally: {e}")
+
     def run(self):
         try:
-            session = NetworkSession.get_instance()
-            NetworkSession.apply_humanness(session)
-            response = session.get(self.url, timeout=30)
-            response.raise_for_status()
-
-            html = response.text
-            pattern = re.compile(r'href=["\']?(?:[^"\'>]*/)?(([A-Za-z0-9\-]+)(r\d+[a-zA-Z]?)\.zip)["\']?',
-                                 re.IGNORECASE)
-            matches = pattern.findall(html)
-
-            revisions = {}
-            for full_file, base_tdoc, rev_str in matches:
-                base_tdoc = base_tdoc.upper()
-                rev_str = rev_str.lower()
-                if base_tdoc not in revisions:
-                    revisions[base_tdoc] = []
-                if rev_str not in revisions[base_tdoc]:
-                    revisions[base_tdoc].append(rev_str)
-
-            for k in revisions:
-                revisions[k].sort()
+            # ---> Shared with the background watcher: a 304 if nothing changed since the last check
+            entries = FolderWatcher.get_instance().refresh(self.url)
+            revisions = self.revisions_from_entries(entries)
 
             if self.meeting_dir:
-                try:
-                    agenda_dir = self.meeting_dir / "Agenda"
-                    agenda_dir.mkdir(parents=True, exist_ok=True)
-                    rev_file = agenda_dir / "revisions.json"
-                    with open(rev_file, "w", encoding="utf-8") as f:
-                        json.dump(revisions, f, indent=4)
-                except Exception as e:
-                    logging.warning(f"Failed to cache revisions locally: {e}")
+                self.save_revisions(self.meeting_dir, revisions)
 
             self.finished.emit(True, revisions, "Success")
 
@@ -82,21 +95,41 @@ class TDocActionThread(QThread):
     def run(self):
         success = False
         last_err = "No valid URLs provided."
-
-        for url in self.base_urls:
+        meeting = self.tdoc_dir.parent.name
+
+        # ---> Already local (or in the TDoc store): no need to find it on the servers
+        is_local = ((self.tdoc_dir / f"{self.target_filename}.zip").exists()
+                    or TDocStore.lookup(self.target_filename, meeting=meeting) is not None)
+        if is_local:
+            urls_to_try = self.base_urls
+        else:
+            # ---> The resolver works on the zip URLs: map them back to the folders
+            folder_by_zip_url = {TDocFileHandler.get_zip_url(u, self.target_filename): u for u in self.base_urls if u}
+            urls_to_try = (folder_by_zip_url[zip_url]
+                           for zip_url in URLResolver.resolve(list(folder_by_zip_url), meeting))
+
+        for url in urls_to_try:
             try:
                 self.extracted_doc_paths = TDocFileHandler.download_and_extract_tdoc(
                     self.target_filename, url, self.tdoc_dir
                 )
                 if self.extracted_doc_paths:
                     success = True
+                    if not is_local:
+                        URLResolver.record_found(TDocFileHandler.get_zip_url(url, self.target_filename), meeting)
                     break  # Break out of the fallback loop on success!
             except requests.exceptions.HTTPError as e:
                 if e.response.status_code == 404:
                     last_err = f"404 Not Found at {url}"
+                    URLResolver.record_not_found(TDocFileHandler.get_zip_url(url, self.target_filename))
                     continue  # File isn't here, try the next fallback URL!
                 last_err = str(e)
                 continue
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                # ---> The local server may be gone (e.g. the meeting network was left): re-probe it right away
+                NetworkState.get_instance().report_local_failure(url)
+                last_err = str(e)
+                continue
             except Exception as e:
                 last_err = str(e)
                 continue
@@ -131,15 +164,11 @@ class TdocsByAgendaThread(QThread):
             self.ui_log_msg.emit("⏳ Initiating TdocsByAgenda Sync...", logging.INFO)
             clean_base_url = self.meeting_ftp_url.rstrip('/')
 
-            session = NetworkSession.get_instance()
-            NetworkSession.apply_humanness(session)
-
             self.ui_log_msg.emit("🔍 Searching FTP for TdocsByAgenda file...", logging.INFO)
-            response = session.get(clean_base_url, timeout=30)
-            response.raise_for_status()
+            entries = FolderWatcher.get_instance().refresh(clean_base_url + '/')
 
-            pattern = re.compile(r'href=["\']?([^"\'>]*tdocsbyagenda[^"\'>]*\.html?)["\']?', re.IGNORECASE)
-            matches = pattern.findall(response.text)
+            pattern = re.compile(r'tdocsbyagenda.*\.html?$', re.IGNORECASE)
+            matches = [e.url for e in entries if not e.is_dir and pattern.search(e.url.rsplit('/', 1)[-1])]
 
             if not matches:
                 self.ui_log_msg.emit("❌ Could not find any TdocsByAgenda file on the FTP server.", logging.ERROR)
@@ -31,11 +31,15 @@ class TDocsTableModel(QAbstractTableModel):
 
     def _apply_company_sanitization(self, rows_to_process: list):
         """Passes the raw Source string through the Sanitizer and caches the result."""
+        # The same few hundred source strings repeat across thousands of rows
+        memo = {}
         for row in rows_to_process:
             source_str = str(row.get('Source', ''))
-            companies = CompanySanitizer.get_matching_contributors(source_str)
-            # If the sanitizer returns nothing, categorize it as "Other" so it remains filterable
-            row['_Sanitized_Companies'] = companies if companies else ["Other"]
+            if source_str not in memo:
+                companies = CompanySanitizer.get_matching_contributors(source_str)
+                # If the sanitizer returns nothing, categorize it as "Other" so it remains filterable
+                memo[source_str] = companies if companies else ["Other"]
+            row['_Sanitized_Companies'] = memo[source_str]
 
     def get_unmatched_sources(self) -> list:
         """Returns a sorted list of unique raw 'Source' strings that evaluated to 'Other'."""
@@ -29,7 +29,9 @@ from modules.meetings.ui.tdocs_menus import build_action_menu, build_related_men
 from modules.meetings.ui.tdocs_dialogs import ReadOnlyViewerDialog, InteractiveNotesDialog, StatisticsSettingsDialog
 from modules.emails.ui.email_window import EmailManagerWindow
 from modules.meetings.core.llm_exporter import LLMExporterThread
+from modules.meetings.core.revision_comparator import RevisionChainsComparatorThread
 from core.network.network_state import NetworkState
+from core.network.folder_watcher import FolderWatcher
 from modules.meetings.core.url_router import URLRouter
 
 
@@ -84,6 +86,11 @@ class TDocsWindow(QWidget):
         self._setup_table(main_layout, tdocs_data, user_data)
         self._setup_cache()
 
+        # ---> New revisions show up without pressing "Refresh": the shared watcher polls the Revisions folder
+        if self.revisions_url:
+            FolderWatcher.get_instance().listing_changed.connect(self._on_listing_changed)
+            FolderWatcher.get_instance().watch(self.revisions_url)
+
     def _setup_header(self, layout, title, is_electronic, count):
         header_layout = QHBoxLayout()
         title_lbl = QLabel(f"<b>{title}</b>")
@@ -160,6 +167,16 @@ class TDocsWindow(QWidget):
         self.llm_btn.setToolTip("Compiles all currently filtered TDocs into AI-grouped Mega-Files for Gemini")
         self.llm_btn.clicked.connect(self._export_llm_visible)
 
+        self.compare_revs_btn = QPushButton("⚖️ Compare Revisions")
+        self.compare_revs_btn.setStyleSheet(style_btn())
+        self.compare_revs_btn.setToolTip(
+            "Redlines every revision of the currently filtered TDocs (e.g. one Agenda Item) against its previous one")
+        compare_menu = QMenu(self)
+        compare_menu.addAction("🌐 HTML Redlines", lambda: self._compare_revisions_visible("html"))
+        compare_menu.addAction("📝 Word Redlines (.docx)", lambda: self._compare_revisions_visible("docx"))
+        self.compare_revs_btn.setMenu(compare_menu)
+        self.compare_revs_btn.setVisible(bool(self.revisions_url))
+
         self.export_btn = QPushButton("📝 Export")
         self.export_btn.setStyleSheet(style_btn())
         self.export_btn.setToolTip("Export the current filtered list to a formatted Markdown report.")
@@ -211,6 +228,7 @@ class TDocsWindow(QWidget):
         header_layout.addWidget(self.folder_btn)
         header_layout.addWidget(self.excel_btn)
         header_layout.addWidget(self.llm_btn)
+        header_layout.addWidget(self.compare_revs_btn)
         header_layout.addWidget(self.export_btn)
         header_layout.addWidget(self.stats_btn)
         header_layout.addWidget(self.stats_cfg_btn)
@@ -367,9 +385,9 @@ class TDocsWindow(QWidget):
                         self.model.dataChanged.emit(self.model.index(0, 0),
                                                     self.model.index(self.model.rowCount() - 1, 0))
                 except:
-                    if self.revisions_url: self._refresh_revisions(silent=True)
-            else:
-                if self.revisions_url: self._refresh_revisions(silent=True)
+                    pass
+            # ---> Cheap even if cached: conditional GET, and it is the baseline of the folder watcher
+            if self.revisions_url: self._refresh_revisions(silent=True)
 
     def _get_mod_date_str(self):
         try:
@@ -597,6 +615,29 @@ class TDocsWindow(QWidget):
         elif not silent:
             QMessageBox.warning(self, "Revisions Error", f"Failed to sync revisions:\n{msg}")
 
+    def _on_listing_changed(self, folder_url: str, events: list):
+        if FolderWatcher.folder_key(folder_url) != FolderWatcher.folder_key(self.revisions_url):
+            return
+        if not any(e.kind == FolderWatcher.NEW_REVISION for e in events):
+            return
+        entries = FolderWatcher.get_instance().get_entries(self.revisions_url)
+        if entries is None:
+            return
+        self.model.revisions = TDocsRevisionsFetcherThread.revisions_from_entries(entries)
+        self.model.dataChanged.emit(self.model.index(0, 0), self.model.index(self.model.rowCount() - 1, 0))
+        TDocsRevisionsFetcherThread.save_revisions(self.meeting_dir, self.model.revisions)
+        new_revs = [f"{e.tdoc}{e.revision}" for e in events if e.kind == FolderWatcher.NEW_REVISION]
+        logging.info(f"🆕 New revisions: {', '.join(new_revs)}")
+
+    def closeEvent(self, event):
+        if self.revisions_url:
+            FolderWatcher.get_instance().unwatch(self.revisions_url)
+            try:
+                FolderWatcher.get_instance().listing_changed.disconnect(self._on_listing_changed)
+            except TypeError:
+                pass
+        super().closeEvent(event)
+
     def _fetch_tdocs_by_agenda(self):
         url_key = self.mtg_info.get("url_key", "")
         if not url_key: return
@@ -781,6 +822,43 @@ class TDocsWindow(QWidget):
         else:
             QMessageBox.warning(self, "Export Failed", msg)
 
+    def _compare_revisions_visible(self, output_format: str):
+        tdoc_ids = []
+        for r in range(self.proxy.rowCount()):
+            source_index = self.proxy.mapToSource(self.proxy.index(r, 0))
+            base_tdoc = self.model._data[source_index.row()].get("TDoc", "")
+            revisions = self.model.revisions.get(base_tdoc, [])
+            if revisions:
+                tdoc_ids.append(base_tdoc)
+                tdoc_ids.extend(f"{base_tdoc}{rev}" for rev in revisions)
+
+        if not tdoc_ids:
+            return QMessageBox.warning(self, "No Revisions", "None of the visible TDocs has revisions to compare.")
+
+        self.compare_revs_btn.setText("⏳ Comparing...")
+        self.compare_revs_btn.setEnabled(False)
+
+        self.compare_revs_thread = RevisionChainsComparatorThread(
+            self.meeting_dir,
+            tdoc_ids,
+            self.docs_ftp_url,
+            self.revisions_url,
+            self.meeting_dir / "Export" / "Redlines",
+            output_format=output_format
+        )
+        self.compare_revs_thread.progress.connect(lambda msg: self.compare_revs_btn.setText(f"⏳ {msg}"[:35]))
+        self.compare_revs_thread.finished.connect(self._on_compare_revisions_finished)
+        self.compare_revs_thread.start()
+
+    def _on_compare_revisions_finished(self, success: bool, msg: str):
+        self.compare_revs_btn.setText("⚖️ Compare Revisions")
+        self.compare_revs_btn.setEnabled(True)
+        if success:
+            QMessageBox.information(self, "Revisions Compared", msg)
+            _open_folder(self.meeting_dir / "Export" / "Redlines")
+        else:
+            QMessageBox.warning(self, "Comparison Failed", msg)
+
     def _get_tdoc_prefix(self):
         """Smartly pre-fills the WP part and the year (e.g., 'S2-26')."""
         # 1. Try to extract from the actual first_tdoc
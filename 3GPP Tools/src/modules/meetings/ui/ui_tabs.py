@@ -15,6 +15,7 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                              QMessageBox, QFrame, QFileDialog)
 
 from core.network.session import NetworkConfigDialog
+from threegpp_common.cache_governor import CacheGovernor
 from modules.meetings.core.compare_manager import ComparisonManager
 from modules.meetings.core.meetings_db import MeetingsDatabase
 from modules.meetings.core.settings import MeetingsSettings
@@ -318,10 +319,17 @@ class MeetingsTab(QWidget):
         cart_layout.addWidget(self.lbl_slot_b)
         cart_layout.addStretch()
 
-        self.btn_compare = QPushButton("⚖️ Compare in Word")
+        self.compare_format_combo = QComboBox()
+        for output_format, label in WordComparatorThread.OUTPUT_FORMATS.items():
+            self.compare_format_combo.addItem(label, output_format)
+        self.compare_format_combo.setToolTip(
+            "Output of the comparison. Legacy .doc files and SharePoint/OneDrive links always use Word's Compare.")
+
+        self.btn_compare = QPushButton("⚖️ Compare Docs")
         self.btn_compare.setEnabled(False)
         self.btn_compare.setToolTip(
-            "Launch an invisible Word instance to generate a visual redline diff between Slot A and Slot B.")
+            "Generate a redline diff between Slot A and Slot B. .docx files are compared without Word unless the "
+            "native Word comparison is selected.")
         self.btn_compare.setStyleSheet(
             "QPushButton { font-weight: bold; background-color: #0078D7; color: white; padding: 5px 15px; border-radius: 4px; } QPushButton:disabled { background-color: #A0C0E0; }")
         self.btn_compare.clicked.connect(self._run_comparison)
@@ -331,6 +339,7 @@ class MeetingsTab(QWidget):
         self.btn_clear_cart.setStyleSheet("QPushButton { color: #555; padding: 5px 10px; }")
         self.btn_clear_cart.clicked.connect(ComparisonManager.get_instance().clear_cart)
 
+        cart_layout.addWidget(self.compare_format_combo)
         cart_layout.addWidget(self.btn_compare)
         cart_layout.addWidget(self.btn_clear_cart)
 
@@ -571,9 +580,10 @@ class MeetingsTab(QWidget):
             self.btn_compare.setText("⏳ Comparing...")
             self.btn_compare.setEnabled(False)
 
-            self.cmp_thread = WordComparatorThread(mgr.slot_a['path'], mgr.slot_b['path'])
+            self.cmp_thread = WordComparatorThread(mgr.slot_a['path'], mgr.slot_b['path'],
+                                                   output_format=self.compare_format_combo.currentData())
             self.cmp_thread.ui_log_msg.connect(self._handle_compare_log)
-            self.cmp_thread.finished.connect(lambda: self.btn_compare.setText("⚖️ Compare in Word"))
+            self.cmp_thread.finished.connect(lambda: self.btn_compare.setText("⚖️ Compare Docs"))
             self.cmp_thread.finished.connect(lambda: self.btn_compare.setEnabled(True))
             self.cmp_thread.start()
 
@@ -823,6 +833,8 @@ class MeetingsTab(QWidget):
 
     def _open_tdocs_window(self, mtg_info: dict, filepath: str):
         self.settings.save_last_meeting(mtg_info)
+        # ---> Files of the meeting being worked on are never evicted from the local cache
+        CacheGovernor.set_active_meeting(mtg_info.get("folder_name") or mtg_info.get("meeting_number", ""))
         self._update_last_meeting_btn()
         mtg_id = mtg_info.get("mtg_id")
 
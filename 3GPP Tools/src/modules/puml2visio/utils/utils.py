@@ -11,6 +11,7 @@ from PyQt5.QtCore import QThread, pyqtSignal
 from core.utils.utils import get_best_java
 from modules.puml2visio.config.paths import PLANTUML_URL_LATEST, PLANTUML_URL_JAVA_8
 from core.network.session import NetworkSession
+from threegpp_common.tracing import Tracing
 
 
 # --- CORE UTILITIES ---
@@ -21,6 +22,7 @@ def strip_watermark(raw_text: str) -> str:
     return "\n".join(lines)
 
 
+@Tracing.traced("plantuml.render")
 def generate_cleaned_svg(puml_path: Path, jar_path: Path, log_callback=None) -> Path:
     java_exe, _ = get_best_java()
     command = [java_exe, "-jar", str(jar_path), "-tsvg", str(puml_path)]
@@ -11,6 +11,8 @@ from pathlib import Path
 from PyQt5.QtCore import QThread, pyqtSignal
 
 from core.network.session import NetworkSession
+from threegpp_common.host_concurrency import HostConcurrency
+from threegpp_common.spec_index import SpecIndex
 from modules.specifications.utils.utils import file_version_to_version
 from modules.specifications.core.database import SpecsDatabase
 
@@ -221,7 +223,8 @@ class SpecsCrawlerThread(QThread):
                         clean_series_number = match.group(1)
                         series_links.append((clean_series_number, url))
 
-                with ThreadPoolExecutor(max_workers=15) as executor:
+                # ---> Requests per host are limited by HostConcurrency: the pool is sized to the maximum
+                with ThreadPoolExecutor(max_workers=HostConcurrency.MAX_CONCURRENCY) as executor:
                     future_to_series = {
                         executor.submit(self.fetch_links, s_url if s_url.endswith('/') else s_url + '/'): (
                             s_name, s_url)
@@ -251,7 +254,7 @@ class SpecsCrawlerThread(QThread):
                                  logging.INFO)
             completed: int = 0
 
-            with ThreadPoolExecutor(max_workers=15) as executor:
+            with ThreadPoolExecutor(max_workers=HostConcurrency.MAX_CONCURRENCY) as executor:
                 futures = {executor.submit(self.fetch_spec_files, task[0], task[1], task[2], task[3]): task for task in
                            spec_tasks}
 
@@ -272,6 +275,10 @@ class SpecsCrawlerThread(QThread):
                                 result['series_name'], result['series_url'],
                                 spec_num, result['spec_url'], f_name, f_ver, f_url
                             )
+                        # ---> Shared with the Meeting Helper: version lookups without listing the archive again
+                        SpecIndex.record_versions(
+                            [(f_name, f_url) for f_name, _, f_url in files],
+                            archive_of_spec=spec_num if "/archive/" in self.root_url else None)
                     except Exception as e:
                         self.ui_log_msg.emit(f"❌ File fetch error: {e}", logging.ERROR)
 
@@ -289,7 +296,7 @@ class SpecsCrawlerThread(QThread):
                     f"⏳ Pass 2: Fetching deep metadata for {len(specs_needing_meta)} specifications...", logging.INFO)
                 completed_meta: int = 0
 
-                with ThreadPoolExecutor(max_workers=10) as executor:
+                with ThreadPoolExecutor(max_workers=HostConcurrency.MAX_CONCURRENCY) as executor:
                     meta_futures = {executor.submit(self.fetch_metadata_from_dynareport, task[2]): task for task in
                                     specs_needing_meta}
 
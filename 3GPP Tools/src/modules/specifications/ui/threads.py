@@ -4,6 +4,8 @@ from pathlib import Path
 from PyQt5.QtCore import QThread, pyqtSignal
 
 from core.network.session import NetworkSession
+from threegpp_common.cache_governor import CacheGovernor
+from threegpp_common.spec_index import SpecIndex
 
 
 class SpecDownloadThread(QThread):
@@ -23,7 +25,13 @@ class SpecDownloadThread(QThread):
             # ---> NEW: Emit a starting message
             self.ui_log_msg.emit(f"⏳ Downloading specification archive: {self.zip_path.name}...", logging.INFO)
 
-            NetworkSession.download_file(self.url, self.zip_path)
+            # ---> Versions already downloaded by either app are copied instead of downloaded again
+            if SpecIndex.place_local_file(self.zip_path):
+                self.ui_log_msg.emit(f"♻️ Reusing local copy of {self.zip_path.name}", logging.INFO)
+            else:
+                NetworkSession.download_file(self.url, self.zip_path)
+            SpecIndex.record_local_file(self.zip_path)
+            CacheGovernor.register(self.zip_path, CacheGovernor.SPECS)
 
             # ---> NEW: Emit a success message
             self.ui_log_msg.emit(f"✅ Download complete: {self.zip_path.name}", logging.INFO)
@@ -1,7 +1,9 @@
+import functools
 import os
 import logging
 from pathlib import Path
 
+@functools.lru_cache(maxsize=4096)
 def file_version_to_version(file_version: str) -> str:
     """
     Converts the file version of a 3GPP spec, e.g., a00 to a version number, e.g., 10.0.0.
@@ -1,23 +1,35 @@
 import tempfile
 import logging
 import traceback  # <--- NEW: Crucial for getting exact error lines
+import os
 from pathlib import Path
-import win32com.client
-import pythoncom
 from PyQt5.QtCore import QThread, pyqtSignal
 
+from threegpp_common.tracing import Tracing
 from core.utils.utils import get_proxies
+from threegpp_common.redline import DocxRedline
 
 
 class WordComparatorThread(QThread):
     ui_log_msg = pyqtSignal(str, int)
     finished = pyqtSignal()
 
-    def __init__(self, doc_a: str, doc_b: str, keep_open: bool = False):
+    # ---> "word" uses Word's CompareDocuments (COM). "html"/"docx" use the COM-free DocxRedline engine
+    WORD_NATIVE_FORMAT = "word"
+    OUTPUT_FORMATS = {
+        "html": "HTML redline (no Word needed)",
+        "docx": "Word file with tracked changes (no Word needed)",
+        WORD_NATIVE_FORMAT: "Native Word comparison",
+    }
+    # ---> Author of the tracked changes of "docx" comparisons
+    REDLINE_AUTHOR = "3GPP Tools"
+
+    def __init__(self, doc_a: str, doc_b: str, keep_open: bool = False, output_format: str = "html"):
         super().__init__()
         self.doc_a = doc_a
         self.doc_b = doc_b
         self.keep_open = keep_open
+        self.output_format = output_format or "html"
 
     def _resolve_path(self, input_str: str, doc_label: str) -> str:
         # ... (Keep your existing _resolve_path code here) ...
@@ -43,7 +55,48 @@ class WordComparatorThread(QThread):
             return str(tmp_path)
         return input_str
 
+    def _can_compare_without_word(self) -> bool:
+        # ---> Legacy .doc files and SharePoint/OneDrive links still need Word
+        if self.output_format == self.WORD_NATIVE_FORMAT:
+            return False
+        return all(doc and not doc.startswith(("http://", "https://")) and doc.lower().endswith(".docx")
+                   for doc in (self.doc_a, self.doc_b))
+
+    def _compare_without_word(self):
+        self.ui_log_msg.emit("⏳ Comparing documents (docx redline, Word not needed)...", logging.INFO)
+        path_a = Path(self._resolve_path(self.doc_a, "A"))
+        path_b = Path(self._resolve_path(self.doc_b, "B"))
+        self.ui_log_msg.emit(f"   ➔ Doc A (Base): {path_a.name}", logging.INFO)
+        self.ui_log_msg.emit(f"   ➔ Doc B (Rev) : {path_b.name}", logging.INFO)
+
+        with Tracing.span("docx.redline.compare"):
+            output_path = DocxRedline.compare(path_a, path_b, output_format=self.output_format,
+                                              author=self.REDLINE_AUTHOR)
+        self.ui_log_msg.emit(f"✅ Comparison generated successfully: {output_path}", logging.INFO)
+        if os.name == "nt":
+            # ---> Nothing was opened to compare: "keep open" opens A and B next to the comparison
+            if self.keep_open:
+                os.startfile(str(path_a))
+                os.startfile(str(path_b))
+            os.startfile(str(output_path))
+
     def run(self):
+        try:
+            if self._can_compare_without_word():
+                try:
+                    self._compare_without_word()
+                except Exception as e:
+                    err_trace = traceback.format_exc()
+                    self.ui_log_msg.emit(f"❌ Comparison Error: {str(e)}\n\nTraceback:\n{err_trace}", logging.ERROR)
+            else:
+                self._compare_in_word()
+        finally:
+            self.finished.emit()
+
+    def _compare_in_word(self):
+        import win32com.client
+        import pythoncom
+
         doc_original = None
         doc_revised = None
         word = None
@@ -67,7 +120,6 @@ class WordComparatorThread(QThread):
 
             self.ui_log_msg.emit("⏳ Step 2: Creating local sandbox copies...", logging.INFO)
             import shutil
-            import os
             import stat
             temp_dir = Path(tempfile.gettempdir()) / "3gpp_compare_tmp"
             temp_dir.mkdir(parents=True, exist_ok=True)
@@ -133,25 +185,31 @@ class WordComparatorThread(QThread):
             word.DisplayAlerts = -1
 
             # Execute comparison using the exact kwargs you verified
-            cmp_doc = word.CompareDocuments(
-                OriginalDocument=doc_original,
-                RevisedDocument=doc_revised,
-                Destination=2,
-                IgnoreAllComparisonWarnings=True,
-                CompareFormatting=True,
-                CompareCaseChanges=True,
-                CompareWhitespace=True,
-                CompareFields=True
-            )
-
-            self.ui_log_msg.emit("⏳ Step 6: Closing source documents...", logging.INFO)
-            try:
-                doc_original.Close(SaveChanges=False)
-                doc_revised.Close(SaveChanges=False)
+            with Tracing.span("com.word.compare"):
+                cmp_doc = word.CompareDocuments(
+                    OriginalDocument=doc_original,
+                    RevisedDocument=doc_revised,
+                    Destination=2,
+                    IgnoreAllComparisonWarnings=True,
+                    CompareFormatting=True,
+                    CompareCaseChanges=True,
+                    CompareWhitespace=True,
+                    CompareFields=True
+                )
+
+            if self.keep_open:
+                self.ui_log_msg.emit("⏳ Step 6: Keeping source documents open...", logging.INFO)
                 doc_original = None
                 doc_revised = None
-            except Exception:
-                pass
+            else:
+                self.ui_log_msg.emit("⏳ Step 6: Closing source documents...", logging.INFO)
+                try:
+                    doc_original.Close(SaveChanges=False)
+                    doc_revised.Close(SaveChanges=False)
+                    doc_original = None
+                    doc_revised = None
+                except Exception:
+                    pass
 
             if cmp_doc:
                 cmp_doc.Activate()
@@ -182,11 +240,11 @@ class WordComparatorThread(QThread):
 
             # -> NEW: Wipe the entire temp directory in one shot, destroying the locked copies and the saved unlocked copies
             try:
-                if temp_dir and temp_dir.exists():
+                # ---> The source documents kept open are saved in the temp directory
+                if temp_dir and temp_dir.exists() and not self.keep_open:
                     import shutil
                     shutil.rmtree(temp_dir, ignore_errors=True)
             except Exception as e:
                 print(f"Cleanup warning: {e}")
 
-            pythoncom.CoUninitialize()
-            self.finished.emit()
\ No newline at end of file
+            pythoncom.CoUninitialize()
\ No newline at end of file
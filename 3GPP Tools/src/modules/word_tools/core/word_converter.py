@@ -10,6 +10,7 @@ import pythoncom
 import win32com.client
 from PyQt5.QtCore import QThread, pyqtSignal
 
+from threegpp_common.tracing import Tracing
 from core.utils.utils import get_proxies
 from modules.word_tools.core.sensitivity_label import set_sensitivity_label
 
@@ -40,6 +41,7 @@ def _sanitize_file_attributes(file_path: Path) -> None:
         pass
 
 
+@Tracing.traced("com.word.convert")
 def convert_doc_to_docx(
     doc_path: Union[str, Path],
     output_path: Optional[Union[str, Path]] = None,
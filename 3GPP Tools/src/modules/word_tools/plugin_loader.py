@@ -20,7 +20,8 @@ def register_word_plugin():
     register_task(
         target_format="compare_docx",
         display_name="COMPARE DOCS",
-        thread_factory=lambda f, p, ctx: WordComparatorThread(p.get('doc_a'), p.get('doc_b'), p.get('keep_open'))
+        thread_factory=lambda f, p, ctx: WordComparatorThread(p.get('doc_a'), p.get('doc_b'), p.get('keep_open'),
+                                                             p.get('output_format', "html"))
     )
     register_task(
         target_format="word_convert",
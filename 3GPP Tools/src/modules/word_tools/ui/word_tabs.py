@@ -8,6 +8,7 @@ import win32com.client
 import pythoncom
 
 from core.ui.ui_components import InteractiveDropLabel
+from modules.word_tools.core.word_comparator import WordComparatorThread
 
 class DocumentSelectorPane(QWidget):
     """A symmetric, reusable widget handling Local, Open, and URL inputs."""
@@ -112,7 +113,7 @@ class DocumentSelectorPane(QWidget):
 class WordExtractorTab(QWidget):
     extract_visio_requested = pyqtSignal(str)
     split_doc_requested = pyqtSignal(str, str, int)
-    compare_doc_requested = pyqtSignal(str, str, bool)
+    compare_doc_requested = pyqtSignal(str, str, bool, str)
     convert_doc_requested = pyqtSignal(str, str)
 
     def __init__(self):
@@ -132,7 +133,7 @@ class WordExtractorTab(QWidget):
         self.op_combo.addItems([
             "Extract Embedded Visio Diagrams",
             "Subtractive Slicing (Split by Clause)",
-            "Compare Documents (Native Word Diff)",
+            "Compare Documents",
             "Convert Document Format"
         ])
         switcher_layout.addWidget(self.op_combo)
@@ -184,12 +185,20 @@ class WordExtractorTab(QWidget):
         panes_layout.addWidget(self.pane_b)
         compare_layout.addLayout(panes_layout)
 
+        cmp_form = QFormLayout()
+        self.compare_format_combo = QComboBox()
+        self.compare_format_combo.setStyleSheet("padding: 4px; font-weight: bold;")
+        for output_format, label in WordComparatorThread.OUTPUT_FORMATS.items():
+            self.compare_format_combo.addItem(label, output_format)
+        cmp_form.addRow("Comparison Output:", self.compare_format_combo)
+        compare_layout.addLayout(cmp_form)
+
         self.keep_open_cb = QCheckBox("Keep source documents (A and B) open after comparison")
         self.keep_open_cb.setStyleSheet("color: #444; margin-top: 5px;")
         self.keep_open_cb.setChecked(True)
         compare_layout.addWidget(self.keep_open_cb)
 
-        self.run_compare_btn = QPushButton("⚖️ Run Word Comparison")
+        self.run_compare_btn = QPushButton("⚖️ Run Comparison")
         self.run_compare_btn.setStyleSheet(
             "font-weight: bold; padding: 10px; background-color: #395396; color: white; border-radius: 4px;")
         self.run_compare_btn.clicked.connect(self._trigger_comparison)
@@ -232,9 +241,10 @@ class WordExtractorTab(QWidget):
         val_a = val_a_list[0] if val_a_list else ""
         val_b = val_b_list[0] if val_b_list else ""
         keep_open = self.keep_open_cb.isChecked()
+        output_format = self.compare_format_combo.currentData()
 
         if val_a and val_b:
-            self.compare_doc_requested.emit(val_a, val_b, keep_open)
+            self.compare_doc_requested.emit(val_a, val_b, keep_open, output_format)
 
     def _trigger_conversion(self):
         # Grab the list of all dropped files
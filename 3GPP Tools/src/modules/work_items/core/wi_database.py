@@ -9,8 +9,18 @@ class WorkItemsDatabase:
     Connects to the shared 3gpp_data.db file to maintain a single source of truth.
     """
 
+    REMARK_DATE_SEPARATOR = ':::'
+    REMARKS_SEPARATOR = '|||'
+    # Words shorter than this have no trigram and are matched with LIKE instead of the FTS index
+    FTS_MIN_TERM_LENGTH = 3
+
+    # Filter options (sorted releases, mapped WGs) per database file. Shared by all instances of the process
+    # (UI tab and scraper threads), cleared on every write
+    _filter_options_cache = {}
+
     def __init__(self, db_path: Path):
         self.db_path = db_path
+        self.fts_enabled = False
         self._init_db()
 
     def _get_connection(self):
@@ -54,6 +64,123 @@ class WorkItemsDatabase:
                     FOREIGN KEY(wi_code) REFERENCES work_items(code)
                 )
             ''')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_wi_remarks_code ON wi_remarks(wi_code)')
+
+            # ---> Remarks bundle ("date:::remark|||date:::remark") materialized at write time instead of a
+            # GROUP_CONCAT on every search
+            columns = [row[1] for row in cursor.execute('PRAGMA table_info(work_items)')]
+            if 'remarks' not in columns:
+                cursor.execute('ALTER TABLE work_items ADD COLUMN remarks TEXT')
+                cursor.execute(f'''
+                    UPDATE work_items SET remarks = (
+                        SELECT GROUP_CONCAT(r.creation_date || '{self.REMARK_DATE_SEPARATOR}' || r.remark,
+                                            '{self.REMARKS_SEPARATOR}')
+                        FROM wi_remarks r WHERE r.wi_code = work_items.code)
+                ''')
+
+            # ---> Incremental sync: HTTP validators and content hash of every scraped page (WG lists, WI details)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS wi_sync_state (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    content_hash TEXT
+                )
+            ''')
+
+            self.fts_enabled = self._init_fts(cursor)
+
+    @staticmethod
+    def _init_fts(cursor) -> bool:
+        """
+        Full-text index over code, acronym, name and remarks, kept in sync with work_items by triggers.
+        The trigram tokenizer matches any substring of at least 3 characters (e.g. "ProSe" also finds "5GProSe",
+        which a word-prefix index misses), so searches return the same rows as the LIKE search they replace.
+        The FTS rowid comes from wi_search_ids (INTEGER PRIMARY KEY), which, unlike the implicit rowid of
+        work_items, survives a VACUUM of the shared database.
+        Returns False if this SQLite build has no FTS5 or no trigram tokenizer (before 3.34): searches then fall
+        back to LIKE.
+        """
+        try:
+            fts_exists = cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'work_items_fts'").fetchone()
+            if fts_exists:
+                return True
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS wi_search_ids (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    code TEXT UNIQUE
+                )
+            ''')
+            cursor.execute('''
+                CREATE VIRTUAL TABLE work_items_fts USING fts5(
+                    code, acronym, name, remarks,
+                    tokenize = 'trigram'
+                )
+            ''')
+
+            # ---> No "OR IGNORE" here: the ON CONFLICT clause of the triggering upsert would override it
+            insert_fts = '''
+                INSERT INTO wi_search_ids (code)
+                SELECT new.code WHERE NOT EXISTS (SELECT 1 FROM wi_search_ids WHERE code = new.code);
+                INSERT INTO work_items_fts (rowid, code, acronym, name, remarks)
+                SELECT id, new.code, new.acronym, new.name, new.remarks FROM wi_search_ids WHERE code = new.code;
+            '''
+            delete_fts = '''
+                DELETE FROM work_items_fts WHERE rowid = (SELECT id FROM wi_search_ids WHERE code = old.code);
+            '''
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS work_items_fts_insert AFTER INSERT ON work_items BEGIN
+                    {insert_fts}
+                END
+            ''')
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS work_items_fts_update AFTER UPDATE ON work_items BEGIN
+                    {delete_fts}
+                    DELETE FROM wi_search_ids WHERE code = old.code AND old.code != new.code;
+                    {insert_fts}
+                END
+            ''')
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS work_items_fts_delete AFTER DELETE ON work_items BEGIN
+                    {delete_fts}
+                    DELETE FROM wi_search_ids WHERE code = old.code;
+                END
+            ''')
+
+            # ---> First run on an existing database: index what is already there
+            cursor.execute('INSERT OR IGNORE INTO wi_search_ids (code) SELECT code FROM work_items')
+            cursor.execute('''
+                INSERT INTO work_items_fts (rowid, code, acronym, name, remarks)
+                SELECT s.id, wi.code, wi.acronym, wi.name, wi.remarks
+                FROM work_items wi JOIN wi_search_ids s ON s.code = wi.code
+            ''')
+            return True
+        except sqlite3.OperationalError as e:
+            import logging
+            logging.warning(f"⚠️ FTS5 trigram index not available, Work Item search falls back to LIKE: {e}")
+            return False
+
+    @classmethod
+    def _to_fts_query(cls, search_term: str) -> tuple:
+        """
+        '5G ProSe' -> ('"ProSe"', ['5G']): every word must appear (as a substring). Words of FTS_MIN_TERM_LENGTH
+        or more characters go to the trigram index (quotes escaped), shorter ones are returned for a LIKE match.
+        """
+        tokens = [t for t in re.split(r'\s+', search_term.strip()) if t]
+        fts_tokens = [t for t in tokens if len(t) >= cls.FTS_MIN_TERM_LENGTH]
+        like_tokens = [t for t in tokens if len(t) < cls.FTS_MIN_TERM_LENGTH]
+        return ' AND '.join('"' + t.replace('"', '""') + '"' for t in fts_tokens), like_tokens
+
+    @classmethod
+    def _bundle_remarks(cls, remarks: list) -> str:
+        """Same format the WI table delegate parses: newest first, 'date:::text' joined by '|||'."""
+        ordered = sorted(remarks, key=lambda r: r[0] or '', reverse=True)
+        return cls.REMARKS_SEPARATOR.join(f"{date}{cls.REMARK_DATE_SEPARATOR}{text}" for date, text in ordered)
+
+    def _invalidate_caches(self):
+        WorkItemsDatabase._filter_options_cache.pop(str(self.db_path), None)
 
     def get_all_work_items(self) -> list:
         """Fetches all work items to populate the UI table, ordered by code descending numerically."""
@@ -69,6 +196,61 @@ class WorkItemsDatabase:
             logging.error(f"Failed to fetch Work Items: {e}")
             return []
 
+    def get_wg_work_items(self, wg_name: str) -> dict:
+        """Maps code -> {acronym, name, release} for the Work Items currently mapped to a Working Group."""
+        query = """
+            SELECT wi.code, wi.acronym, wi.name, wi.release
+            FROM work_items wi
+            JOIN wi_group_map m ON m.wi_code = wi.code
+            JOIN working_groups w ON w.id = m.group_id
+            WHERE w.name = ?
+        """
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(query, (wg_name,))
+                return {row[0]: {'acronym': row[1], 'name': row[2], 'release': row[3]} for row in cursor.fetchall()}
+        except Exception as e:
+            import logging
+            logging.error(f"Failed to fetch Work Items of {wg_name}: {e}")
+            return {}
+
+    def get_sync_states(self, urls: list) -> dict:
+        """Maps URL -> {etag, last_modified, content_hash} for the scraped pages that were already synced."""
+        if not urls:
+            return {}
+        states = {}
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                # ---> Chunked to stay below SQLite's bound-parameter limit on large targeted updates
+                for i in range(0, len(urls), 500):
+                    chunk = urls[i:i + 500]
+                    placeholders = ','.join(['?'] * len(chunk))
+                    cursor.execute(
+                        f"SELECT url, etag, last_modified, content_hash FROM wi_sync_state WHERE url IN ({placeholders})",
+                        chunk)
+                    for url, etag, last_modified, content_hash in cursor.fetchall():
+                        states[url] = {'etag': etag, 'last_modified': last_modified, 'content_hash': content_hash}
+        except Exception as e:
+            import logging
+            logging.error(f"Failed to fetch WI sync state: {e}")
+        return states
+
+    def save_sync_states(self, states: dict):
+        """Persists URL -> {etag, last_modified, content_hash}. Call only once the page content is in the database."""
+        if not states:
+            return
+        rows = [(url, state.get('etag'), state.get('last_modified'), state.get('content_hash'))
+                for url, state in states.items()]
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany('''
+                INSERT OR REPLACE INTO wi_sync_state (url, etag, last_modified, content_hash)
+                VALUES (?, ?, ?, ?)
+            ''', rows)
+            conn.commit()
+
     def upsert_work_items(self, wg_name: str, items: list):
         """
         Bulk inserts or updates Work Items and maps them to their Working Group.
@@ -113,9 +295,24 @@ class WorkItemsDatabase:
             ''', map_data)
 
             conn.commit()
+        self._invalidate_caches()
+
+    @staticmethod
+    def _release_sort_key(rel: str) -> int:
+        """Numbers descending, R99 at the absolute bottom."""
+        if rel.upper() == 'R99':
+            return -1
+        match = re.search(r'\d+', rel)
+        if match:
+            return int(match.group())
+        return 0
 
     def get_filter_options(self) -> dict:
-        """Fetches unique Release versions and mapped Working Groups for the UI dropdowns."""
+        """Fetches unique Release versions and mapped Working Groups for the UI dropdowns (cached until the next write)."""
+        cached = WorkItemsDatabase._filter_options_cache.get(str(self.db_path))
+        if cached is not None:
+            return {key: list(values) for key, values in cached.items()}
+
         options = {'releases': [], 'groups': []}
         try:
             with self._get_connection() as conn:
@@ -124,17 +321,7 @@ class WorkItemsDatabase:
                 # Fetch unique releases
                 cursor.execute("SELECT DISTINCT release FROM work_items WHERE release IS NOT NULL AND release != ''")
                 raw_releases = [str(r[0]).strip() for r in cursor.fetchall()]
-
-                # Custom sort: Numbers descending, R99 at the absolute bottom
-                def release_sort_key(rel):
-                    if rel.upper() == 'R99':
-                        return -1
-                    match = re.search(r'\d+', rel)
-                    if match:
-                        return int(match.group())
-                    return 0
-
-                raw_releases.sort(key=release_sort_key, reverse=True)
+                raw_releases.sort(key=self._release_sort_key, reverse=True)
                 options['releases'] = raw_releases
 
                 # Fetch only WGs that are actually mapped to work items
@@ -145,39 +332,55 @@ class WorkItemsDatabase:
                     ORDER BY w.name
                 """)
                 options['groups'] = [str(r[0]).strip() for r in cursor.fetchall()]
+            WorkItemsDatabase._filter_options_cache[str(self.db_path)] = options
 
         except Exception as e:
             import logging
             logging.error(f"Error fetching WI filter options: {e}")
-        return options
+        return {key: list(values) for key, values in options.items()}
 
     def search_work_items(self, search_term: str = None, releases: list = None, wg_names: list = None) -> list:
-        """Searches Work Items by text, multiple releases, and multiple working groups."""
-
-        # Inject the system creation_date into the concatenated string using ':::' so Python can sort it later
-        query = """
-            SELECT wi.code, wi.acronym, wi.name, wi.latest_wid, wi.release, wi.start_date, wi.end_date,
-                   GROUP_CONCAT(r.creation_date || ':::' || r.remark, '|||') AS remarks 
-            FROM work_items wi
-            LEFT JOIN wi_remarks r ON wi.code = r.wi_code
         """
-        params = []
-
-        # Check if we need to actively filter by Working Group
-        filter_by_wg = wg_names and 'ALL' not in wg_names and len(wg_names) > 0
-
-        # If filtering by WG, join the mapping tables
-        if filter_by_wg:
-            query += """
-                JOIN wi_group_map m ON wi.code = m.wi_code
-                JOIN working_groups w ON m.group_id = w.id
+        Searches Work Items by text, multiple releases, and multiple working groups.
+        Every word of the search term must appear in the code, acronym, name or remarks (substring match, case
+        insensitive). Words of 3+ characters use the FTS5 trigram index and results are ranked by relevance;
+        without it (or for short words only) LIKE is used. Without a search term, results are ordered by code
+        descending.
+        """
+        fts_query, like_tokens = self._to_fts_query(search_term) if search_term else ('', [])
+        use_fts = bool(fts_query) and self.fts_enabled
+        if search_term and not use_fts:
+            like_tokens = [t for t in re.split(r'\s+', search_term.strip()) if t]
+
+        if use_fts:
+            query = """
+                SELECT wi.code, wi.acronym, wi.name, wi.latest_wid, wi.release, wi.start_date, wi.end_date,
+                       wi.remarks
+                FROM work_items_fts f
+                JOIN wi_search_ids s ON s.id = f.rowid
+                JOIN work_items wi ON wi.code = s.code
+                WHERE work_items_fts MATCH ?
             """
+            params = [fts_query]
+        else:
+            query = """
+                SELECT wi.code, wi.acronym, wi.name, wi.latest_wid, wi.release, wi.start_date, wi.end_date,
+                       wi.remarks
+                FROM work_items wi
+                WHERE 1=1
+            """
+            params = []
 
-        query += " WHERE 1=1"
-
-        if filter_by_wg:
+        # Check if we need to actively filter by Working Group
+        if wg_names and 'ALL' not in wg_names and len(wg_names) > 0:
             placeholders = ','.join(['?'] * len(wg_names))
-            query += f" AND w.name IN ({placeholders})"
+            # ---> Semi-join: no duplicates for WIs mapped to several of the selected WGs, so no GROUP BY needed
+            query += f"""
+                AND wi.code IN (
+                    SELECT m.wi_code FROM wi_group_map m
+                    JOIN working_groups w ON m.group_id = w.id
+                    WHERE w.name IN ({placeholders}))
+            """
             params.extend(wg_names)
 
         if releases and 'ALL' not in releases and len(releases) > 0:
@@ -185,13 +388,15 @@ class WorkItemsDatabase:
             query += f" AND wi.release IN ({placeholders})"
             params.extend(releases)
 
-        if search_term:
-            query += " AND (wi.acronym LIKE ? OR wi.name LIKE ? OR wi.code LIKE ?)"
-            term = f"%{search_term}%"
-            params.extend([term, term, term])
+        for token in like_tokens:
+            query += " AND (wi.acronym LIKE ? OR wi.name LIKE ? OR wi.code LIKE ? OR wi.remarks LIKE ?)"
+            term = f"%{token}%"
+            params.extend([term, term, term, term])
 
-        # Group by code so GROUP_CONCAT bundles remarks per work item
-        query += " GROUP BY wi.code ORDER BY CAST(wi.code AS INTEGER) DESC"
+        if use_fts:
+            query += " ORDER BY f.rank, CAST(wi.code AS INTEGER) DESC"
+        else:
+            query += " ORDER BY CAST(wi.code AS INTEGER) DESC"
 
         try:
             with self._get_connection() as conn:
@@ -214,7 +419,10 @@ class WorkItemsDatabase:
                 cursor.execute("DELETE FROM wi_remarks WHERE wi_code = ?", (code,))
                 # Delete the main work item record
                 cursor.execute("DELETE FROM work_items WHERE code = ?", (code,))
+                # ---> Unchanged pages would otherwise never bring deleted WIs back: next sync is a full one
+                cursor.execute("DELETE FROM wi_sync_state")
                 conn.commit()
+            self._invalidate_caches()
         except Exception as e:
             import logging
             logging.error(f"Failed to delete Work Item {code}: {e}")
@@ -233,7 +441,10 @@ class WorkItemsDatabase:
                 cursor.execute(f"DELETE FROM wi_remarks WHERE wi_code IN ({placeholders})", code_list)
                 cursor.execute(f"DELETE FROM work_items WHERE code IN ({placeholders})", code_list)
 
+                # ---> Unchanged pages would otherwise never bring deleted WIs back: next sync is a full one
+                cursor.execute("DELETE FROM wi_sync_state")
                 conn.commit()
+            self._invalidate_caches()
         except Exception as e:
             import logging
             logging.error(f"Failed to batch delete Work Items: {e}")
@@ -242,6 +453,8 @@ class WorkItemsDatabase:
         """
         Batch updates multiple Work Items with scraped metadata using a single transaction,
         including clearing and re-inserting their associated remarks.
+        Raises sqlite3.Error if the transaction failed (nothing is written), so that the caller does not store the
+        sync state of WIs that are not in the database.
         """
         import logging
 
@@ -254,6 +467,7 @@ class WorkItemsDatabase:
         update_tuples = []
         remark_tuples = []
         wi_codes_to_clear = []
+        remark_bundles = []
 
         # Prepare our data for batch execution
         for meta in metadata_list:
@@ -274,6 +488,8 @@ class WorkItemsDatabase:
                     remark['date'],
                     remark['text']
                 ))
+            wi_remarks = [(remark['date'], remark['text']) for remark in meta.get('remarks', [])]
+            remark_bundles.append((self._bundle_remarks(wi_remarks) or None, wi_code))
 
         try:
             # The 'with' block acts as an atomic transaction
@@ -306,5 +522,11 @@ class WorkItemsDatabase:
                     ''', remark_tuples)
                     logging.info(f"Database INSERT for new wi_remarks added {cursor.rowcount} row(s).")
 
+                # 4. Materialize the remarks bundle (also refreshes the FTS index through the update trigger)
+                cursor.executemany('UPDATE work_items SET remarks = ? WHERE code = ?', remark_bundles)
+
         except Exception as e:
-            logging.error(f"Failed to batch update Work Items metadata: {e}", exc_info=True)
\ No newline at end of file
+            logging.error(f"Failed to batch update Work Items metadata: {e}", exc_info=True)
+            raise
+        finally:
+            self._invalidate_caches()
\ No newline at end of file
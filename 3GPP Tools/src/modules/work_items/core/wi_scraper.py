@@ -7,8 +7,22 @@ from PyQt5.QtCore import QThread, pyqtSignal
 from bs4 import BeautifulSoup
 
 from core.network.session import NetworkSession
+from threegpp_common.host_concurrency import HostConcurrency
 from modules.work_items.core.wi_database import WorkItemsDatabase
 
+# ASP.NET pages (WI details) embed per-request state that would make every download look changed
+VOLATILE_HTML_REGEX = re.compile(
+    r'<input[^>]+name="(?:__VIEWSTATE|__VIEWSTATEGENERATOR|__EVENTVALIDATION|__REQUESTDIGEST)"[^>]*>',
+    re.IGNORECASE)
+
+
+def fetch_if_changed(url: str, state: dict):
+    """
+    Conditional GET of a scraped page (see NetworkSession.fetch_if_changed).
+    new_state must only be saved once the parsed content is in the database.
+    """
+    return NetworkSession.fetch_if_changed(url, state, normalize=lambda html: VOLATILE_HTML_REGEX.sub('', html))
+
 
 class WorkItemsScraperThread(QThread):
     # Emits (current_completed, total_wgs, message_text)
@@ -26,6 +40,7 @@ class WorkItemsScraperThread(QThread):
             "RAN": "RP", "RAN1": "R1", "RAN2": "R2", "RAN3": "R3", "RAN4": "R4", "RAN5": "R5", "RAN6": "R6",
             "CT": "CP", "CT1": "C1", "CT3": "C3", "CT4": "C4", "CT6": "C6"
         }
+        self.report = {'new': [], 'changed': [], 'removed': []}
 
     def run(self):
         # Instantiate a local DB connection inside the thread
@@ -34,11 +49,16 @@ class WorkItemsScraperThread(QThread):
         self.progress.emit(0, total_wgs, "Initializing Work Items parallel sync...")
 
         completed = 0
-
-        # Use a ThreadPool to download up to 5 WG pages concurrently
-        with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
+        unchanged_wgs = 0
+        # Per-run change report: WI codes that were added, changed or no longer listed by their WG
+        self.report = {'new': [], 'changed': [], 'removed': []}
+        wg_urls = {wg_name: self._get_wg_url(wg_code) for wg_name, wg_code in self.wgs.items()}
+        sync_states = db.get_sync_states(list(wg_urls.values()))
+
+        # Download the WG pages concurrently. Requests per host are limited by HostConcurrency
+        with concurrent.futures.ThreadPoolExecutor(max_workers=HostConcurrency.MAX_CONCURRENCY) as executor:
             future_to_wg = {
-                executor.submit(self._fetch_and_parse, wg_name, wg_code): wg_name
+                executor.submit(self._fetch_and_parse, wg_name, wg_code, sync_states.get(wg_urls[wg_name])): wg_name
                 for wg_name, wg_code in self.wgs.items()
             }
 
@@ -46,38 +66,70 @@ class WorkItemsScraperThread(QThread):
                 wg_name = future_to_wg[future]
                 completed += 1
                 try:
-                    items = future.result()
-                    if items:
-                        # Push the parsed items into the database atomically
-                        db.upsert_work_items(wg_name, items)
-                        msg = f"Synced {len(items)} WIs for {wg_name}."
+                    items, new_state = future.result()
+                    if items is None:
+                        unchanged_wgs += 1
+                        msg = f"No changes for {wg_name}."
+                    elif items:
+                        changes = self._get_changes(db.get_wg_work_items(wg_name), items)
+                        # Push only the new and changed items into the database atomically
+                        db.upsert_work_items(wg_name, changes['new'] + changes['changed'])
+                        for change_type, change_items in changes.items():
+                            self.report[change_type].extend(
+                                item if isinstance(item, str) else item['code'] for item in change_items)
+                        msg = (f"Synced {len(items)} WIs for {wg_name} ({len(changes['new'])} new, "
+                               f"{len(changes['changed'])} changed, {len(changes['removed'])} removed).")
                     else:
                         msg = f"No active WIs found for {wg_name}."
 
+                    # ---> Nothing parsed (e.g. error page or new layout): no state, so the page is fetched again
+                    if items is None or items:
+                        db.save_sync_states({wg_urls[wg_name]: new_state})
                     self.progress.emit(completed, total_wgs, msg)
                 except Exception as e:
                     self.progress.emit(completed, total_wgs, f"Error syncing {wg_name}: {str(e)}")
 
-        self.finished_sync.emit(True, "Successfully synced Work Items for all Working Groups.")
-
-    def _fetch_and_parse(self, wg_name: str, wg_code: str) -> list:
-        url = f"https://www.3gpp.org/dynareport?code=TSG-WG--{wg_code}--wis.htm"
-
-        # Utilize the global session to inherit proxies and humanness settings
-        session = NetworkSession.get_instance()
-        NetworkSession.apply_humanness(session)
-
-        response = session.get(url, timeout=30)
-        response.raise_for_status()
-
-        soup = BeautifulSoup(response.text, "html.parser")
+        summary = (f"{len(self.report['new'])} new, {len(self.report['changed'])} changed and "
+                   f"{len(self.report['removed'])} removed Work Items ({unchanged_wgs}/{total_wgs} WGs unchanged).")
+        logging.info(f"📋 Work Items sync: {summary} Report: {self.report}")
+        self.finished_sync.emit(True, f"Successfully synced Work Items for all Working Groups.\n{summary}")
+
+    @staticmethod
+    def _get_wg_url(wg_code: str) -> str:
+        return f"https://www.3gpp.org/dynareport?code=TSG-WG--{wg_code}--wis.htm"
+
+    @staticmethod
+    def _get_changes(stored_items: dict, items: list) -> dict:
+        """
+        Compares the parsed WG page with the Work Items stored for that WG.
+        'removed' lists the codes no longer in the page. They are only reported: the WIs may still be listed by
+        another WG and the user may have deleted them on purpose.
+        """
+        changes = {'new': [], 'changed': [], 'removed': []}
+        for item in items:
+            stored = stored_items.get(item['code'])
+            if stored is None:
+                changes['new'].append(item)
+            elif any((stored.get(key) or '') != item[key] for key in ('acronym', 'name', 'release')):
+                changes['changed'].append(item)
+        listed_codes = {item['code'] for item in items}
+        changes['removed'] = sorted(code for code in stored_items if code not in listed_codes)
+        return changes
+
+    def _fetch_and_parse(self, wg_name: str, wg_code: str, sync_state: dict = None):
+        """Returns (items, new_sync_state). items is None if the WG page did not change since the last sync."""
+        html_text, new_state = fetch_if_changed(self._get_wg_url(wg_code), sync_state)
+        if html_text is None:
+            return None, new_state
+
+        soup = BeautifulSoup(html_text, "html.parser")
 
         # Locate the specific table holding the WIs
         table = soup.find("table", class_="dsp-tsgwgxwis")
         parsed_items = []
 
         if not table:
-            return parsed_items
+            return parsed_items, new_state
 
         for row in table.find_all("tr"):
             cols = row.find_all("td")
@@ -107,7 +159,7 @@ class WorkItemsScraperThread(QThread):
                     "release": release
                 })
 
-        return parsed_items
+        return parsed_items, new_state
 
 
 import re
@@ -117,6 +169,7 @@ from bs4 import BeautifulSoup
 from PyQt5.QtCore import QThread, pyqtSignal
 
 from core.network.session import NetworkSession
+from threegpp_common.host_concurrency import HostConcurrency
 from modules.work_items.core.wi_database import WorkItemsDatabase
 
 
@@ -128,6 +181,8 @@ class TargetedWIScraperThread(QThread):
         super().__init__(parent)
         self.db_path = db_path
         self.target_wi_codes = target_wi_codes
+        # Per-run change report: WI codes whose details changed / did not change since the last update
+        self.report = {'changed': [], 'unchanged': []}
 
     def run(self):
         if not self.target_wi_codes:
@@ -142,11 +197,16 @@ class TargetedWIScraperThread(QThread):
 
         completed = 0
         batch_metadata = []
-
-        # Pool HTTP requests to prevent bottlenecks, capping at 10 simultaneous workers
-        with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
+        batch_states = {}
+        # ---> Sync states of changed WIs: only stored once their metadata is in the database
+        changed_states = {}
+        wi_urls = {wi_code: self._get_details_url(wi_code) for wi_code in self.target_wi_codes}
+        sync_states = db.get_sync_states(list(wi_urls.values()))
+
+        # Pool HTTP requests to prevent bottlenecks. Requests per host are limited by HostConcurrency
+        with concurrent.futures.ThreadPoolExecutor(max_workers=HostConcurrency.MAX_CONCURRENCY) as executor:
             future_to_wi = {
-                executor.submit(self._fetch_and_parse_details, wi_code): wi_code
+                executor.submit(self._fetch_and_parse_details, wi_code, sync_states.get(wi_urls[wi_code])): wi_code
                 for wi_code in self.target_wi_codes
             }
 
@@ -154,14 +214,21 @@ class TargetedWIScraperThread(QThread):
                 wi_code = future_to_wi[future]
                 completed += 1
                 try:
-                    metadata = future.result()
-                    if metadata:
+                    metadata, new_state = future.result()
+                    if metadata is None:
+                        batch_states[wi_urls[wi_code]] = new_state
+                        self.report['unchanged'].append(wi_code)
+                        msg = f"No changes for WI {wi_code}."
+                    elif any(metadata.values()):
+                        changed_states[wi_urls[wi_code]] = new_state
+                        self.report['changed'].append(wi_code)
                         # Append the WI Code so the database knows which row to update
                         metadata['code'] = wi_code
                         batch_metadata.append(metadata)
                         msg = f"Parsed metadata for WI {wi_code}."
                         logging.debug(f"Successfully scraped WI {wi_code}: {metadata}")
                     else:
+                        # ---> No sync state stored: the page is fetched again on the next update
                         msg = f"No metadata found for WI {wi_code}."
                         logging.warning(msg)
 
@@ -177,27 +244,46 @@ class TargetedWIScraperThread(QThread):
             self.progress.emit(completed, total_targets, "Saving batch to database...")
             try:
                 db.update_work_items_metadata(batch_metadata)
+                batch_states.update(changed_states)
             except Exception as e:
                 logging.error(f"Database transaction failed: {e}", exc_info=True)
+                self._save_sync_states(db, batch_states)
                 self.finished_sync.emit(False, f"Database transaction failed: {str(e)}")
                 return
         else:
-            logging.warning("batch_metadata is empty! Skipping database update.")
-
-        self.finished_sync.emit(True, f"Successfully processed {len(batch_metadata)} Work Items.")
-
-    def _fetch_and_parse_details(self, wi_code: str) -> dict:
-        # FIXED: Removed the markdown brackets from the URL string
-        url = f"https://portal.3gpp.org/desktopmodules/WorkItem/WorkItemDetails.aspx?workitemId={wi_code}"
+            logging.info("No changed WI details. Skipping database update.")
+
+        # Validators are only stored once the content is safely in the database
+        self._save_sync_states(db, batch_states)
+
+        logging.info(f"📋 Targeted WI update: {len(self.report['changed'])} changed, "
+                     f"{len(self.report['unchanged'])} unchanged. Report: {self.report}")
+        self.finished_sync.emit(
+            True,
+            f"Successfully processed {len(batch_metadata)} Work Items "
+            f"({len(self.report['unchanged'])} unchanged since the last update).")
+
+    @staticmethod
+    def _save_sync_states(db: WorkItemsDatabase, states: dict):
+        try:
+            db.save_sync_states(states)
+        except Exception as e:
+            logging.error(f"Could not save WI sync state: {e}", exc_info=True)
+
+    @staticmethod
+    def _get_details_url(wi_code: str) -> str:
+        return f"https://portal.3gpp.org/desktopmodules/WorkItem/WorkItemDetails.aspx?workitemId={wi_code}"
+
+    def _fetch_and_parse_details(self, wi_code: str, sync_state: dict = None):
+        """Returns (metadata, new_sync_state). metadata is None if the WI page did not change since the last update."""
+        url = self._get_details_url(wi_code)
         logging.info(f"Fetching WI details from: {url}")
 
-        session = NetworkSession.get_instance()
-        NetworkSession.apply_humanness(session)
-
-        response = session.get(url, timeout=30)
-        response.raise_for_status()
+        html_text, new_state = fetch_if_changed(url, sync_state)
+        if html_text is None:
+            return None, new_state
 
-        soup = BeautifulSoup(response.text, "html.parser")
+        soup = BeautifulSoup(html_text, "html.parser")
         metadata = {
             'start_date': '',
             'end_date': '',
@@ -239,4 +325,4 @@ class TargetedWIScraperThread(QThread):
         # Ensure remarks are sorted from most recent to oldest based on the system date string before saving
         metadata['remarks'].sort(key=lambda x: x['date'], reverse=True)
 
-        return metadata
\ No newline at end of file
+        return metadata, new_state
\ No newline at end of file
@@ -0,0 +1,8 @@
+import sys
+from pathlib import Path
+
+try:
+    import threegpp_common
+except ImportError:
+    # ---> Not installed (pip install -e "../3GPP Common"): use the package next to this application
+    sys.path.append(str(Path(__file__).resolve().parents[3] / "3GPP Common"))
@@ -0,0 +1,74 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from modules.meetings.core.docx_markdown import DocxMarkdownExtractor, LLMMarkdownCache, extract_docx_markdown
+from threegpp_common.config import CommonConfig
+
+DOCX_FOLDER = Path(__file__).parent / 'fixtures' / 'docx'
+
+
+def get_lines(md: str) -> list:
+    return [line for line in md.split('\n') if line.strip()]
+
+
+class Test_test_docx_markdown(unittest.TestCase):
+    def test_cr_tracked_changes(self):
+        lines = get_lines(DocxMarkdownExtractor.extract(DOCX_FOLDER / 'cr_tracked_changes.docx', 'pCR'))
+        self.assertEqual(lines[1], '[INSERTED: shall] [DELETED: may] The AMF shall reject the request. '
+                                   '[COMMENT Ericsson: Why shall?]')
+        # Paragraph mark changes (w:rPr/w:ins) are not text
+        self.assertNotIn('mark', lines[1])
+        self.assertEqual(lines[2].strip(), '[DELETED: This paragraph is removed.]')
+        self.assertEqual(lines[3], '*[<<<<< Next change >>>>>]*')
+
+    def test_all_new_block(self):
+        lines = get_lines(DocxMarkdownExtractor.extract(DOCX_FOLDER / 'cr_tracked_changes.docx', 'CR'))
+        self.assertEqual(lines[4], "> **Note to LLM:** Entering 'All Text New' block.")
+        self.assertEqual(lines[5], '[ADDED BLOCK]: Added paragraph.')
+        # A numbered clause heading ends the block
+        self.assertEqual(lines[6:], ['5.2.2 Authentication', 'Unchanged paragraph.'])
+
+    def test_changes_accepted_outside_crs(self):
+        lines = get_lines(DocxMarkdownExtractor.extract(DOCX_FOLDER / 'cr_tracked_changes.docx', 'discussion'))
+        self.assertEqual(lines[0], '### 5.2.1 Registration procedure')
+        self.assertEqual(lines[1], 'The AMF shall reject the request. [COMMENT Ericsson: Why shall?]')
+        self.assertNotIn('DELETED', ''.join(lines))
+        self.assertEqual(lines[2], '*[<<<<< Next change >>>>>]*')
+
+    def test_tables_and_text_boxes(self):
+        lines = get_lines(DocxMarkdownExtractor.extract(DOCX_FOLDER / 'discussion_tables.docx', 'discussion'))
+        self.assertEqual(lines[0], '# Introduction')
+        # mc:Fallback duplicates the text box content of mc:Choice
+        self.assertEqual(lines[1], 'Text box content')
+        self.assertEqual(lines[2:8], [
+            '| Feature | Rel-18 | Rel-19 |',
+            '|---|---|---|',
+            '| Spanning both releases |  | A\\|B |',
+            '| Merged | x | y |',
+            '|  | z | w |',
+            'Proposal 1: Agree the table.'])
+
+    def test_not_a_docx(self):
+        with tempfile.TemporaryDirectory() as folder:
+            doc_path = Path(folder) / 'S2-2401234.docx'
+            doc_path.write_bytes(b'Not a zip file')
+            self.assertTrue(extract_docx_markdown(str(doc_path), 'CR').startswith('Error parsing document'))
+
+    def test_cache_path_per_mode(self):
+        self.assertEqual(LLMMarkdownCache.get_path('ab' * 16, 'pCR').name,
+                         LLMMarkdownCache.get_path('ab' * 16, 'CR').name)
+        self.assertNotEqual(LLMMarkdownCache.get_path('ab' * 16, 'CR').name,
+                            LLMMarkdownCache.get_path('ab' * 16, 'discussion').name)
+
+    def test_cache_below_cache_root(self):
+        with tempfile.TemporaryDirectory() as folder, \
+                mock.patch.object(CommonConfig, 'root', CommonConfig.DEFAULT_ROOT):
+            CommonConfig.configure(folder)
+            self.assertEqual(LLMMarkdownCache.get_path('ab' * 16, 'CR').parent,
+                             Path(folder) / 'llm_markdown' / 'ab')
+
+
+if __name__ == '__main__':
+    unittest.main()
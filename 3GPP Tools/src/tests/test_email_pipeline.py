@@ -0,0 +1,65 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from modules.emails.core.email_db import EmailDatabase
+from modules.emails.core.email_parser import EmailParser
+from modules.emails.core.email_pipeline import EmailParsePipeline
+from modules.emails.core.mail_source import LocalMailSource
+
+EMAILS_FOLDER = Path(__file__).parent / 'fixtures' / 'emails'
+AI_LOOKUP = {'S2-2401234': '8.1', 'S2-2401500': '9.2'}
+
+
+class Test_test_email_pipeline(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.db = EmailDatabase(Path(self.folder.name) / 'emails.db')
+        source = LocalMailSource(str(EMAILS_FOLDER), include_subfolders=True)
+        self.fields = [EmailParser.extract_fields(item) for _, _, item in source.iter_items()]
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def run_pipeline(self) -> list:
+        results = []
+
+        def on_parsed(parsed):
+            results.append(parsed)
+            return parsed or None
+
+        pipeline = EmailParsePipeline(AI_LOOKUP, self.db, on_parsed, max_workers=2)
+        try:
+            for fields in self.fields:
+                pipeline.submit(fields)
+            pipeline.finish()
+        finally:
+            pipeline.close()
+        return results
+
+    def test_pool_same_as_inline(self):
+        inline = [EmailParser.parse_fields(fields, AI_LOOKUP) for fields in self.fields]
+        self.assertEqual(len([parsed for parsed in inline if parsed]), 3)
+        # One item per chunk: every item is parsed in the worker processes
+        with mock.patch.object(EmailParsePipeline, 'CHUNK_SIZE', 1), \
+                mock.patch.object(EmailParsePipeline, 'MAX_IN_FLIGHT', 2):
+            pooled = self.run_pipeline()
+        self.assertEqual(pooled, inline)
+        self.assertEqual(len(self.db.get_stored_msg_paths()), 0)
+        self.assertEqual(self.db.get_email('<0001.S2-2401234@nokia.com>')['sender_email'], 'jane.doe@nokia.com')
+
+    def test_small_scan_inline(self):
+        self.assertEqual(self.run_pipeline(), [EmailParser.parse_fields(fields, AI_LOOKUP) for fields in self.fields])
+
+    def test_parsed_fields(self):
+        parsed = {p['id']: p for p in (EmailParser.parse_fields(f, AI_LOOKUP) for f in self.fields) if p}
+        listserv = parsed['<0001.S2-2401234@nokia.com>']
+        self.assertEqual(listserv['sender_email'], 'jane.doe@nokia.com')
+        self.assertEqual(listserv['agenda_item'], '8.1')
+        self.assertEqual(sorted(listserv['revisions_mentioned'].split(', ')), ['S2-2401234r01', 'S2-2401234r02'])
+        self.assertEqual(parsed['<0002.S2-2401500@ericsson.com>']['short_text'], 'Ericsson: provided rev1.')
+
+
+if __name__ == '__main__':
+    unittest.main()
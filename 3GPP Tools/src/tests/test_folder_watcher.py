@@ -0,0 +1,60 @@
+import unittest
+from unittest import mock
+
+from core.network.folder_watcher import FolderWatcher
+from core.network.session import NetworkSession
+from modules.meetings.core.tdocs_threads import TDocsRevisionsFetcherThread
+
+revisions_url = 'https://www.3gpp.org/ftp/tsg_sa/WG2_Arch/TSGS2_160_Hyderabad_2024-02/INBOX/Revisions/'
+
+
+def listing_html(names) -> str:
+    rows = ''.join(
+        f'<tr><td><img src="/ftp/geticon.axd?file=zip"></td><td><a href="{revisions_url}{name}">{name}</a></td>'
+        f'<td>2024/02/26 10:30</td><td>1000 bytes</td></tr>' for name in names)
+    return f'<html><body><table>{rows}</table></body></html>'
+
+
+class Test_test_folder_watcher(unittest.TestCase):
+    def test_refresh_emits_changes(self):
+        emitted = []
+        responses = [
+            (listing_html(['S2-2401234r01.zip']), {'etag': '"1"'}),
+            # 304 Not Modified
+            (None, {'etag': '"1"'}),
+            (listing_html(['S2-2401234r01.zip', 'S2-2401234r02.zip']), {'etag': '"2"'})]
+        with mock.patch.object(NetworkSession, 'fetch_if_changed', side_effect=responses) as fetch_if_changed:
+            watcher = FolderWatcher()
+            watcher.listing_changed.connect(lambda folder_url, events: emitted.append((folder_url, events)))
+            first_entries = watcher.refresh(revisions_url)
+            self.assertEqual(watcher.refresh(revisions_url), first_entries)
+            self.assertEqual(fetch_if_changed.call_args.args, (revisions_url, {'etag': '"1"'}))
+            self.assertEqual(emitted, [])
+
+            watcher.refresh(revisions_url.rstrip('/'))
+
+        self.assertEqual(len(emitted), 1)
+        folder_url, events = emitted[0]
+        self.assertEqual(FolderWatcher.folder_key(folder_url), revisions_url)
+        self.assertEqual([(e.kind, e.tdoc, e.revision) for e in events],
+                         [(FolderWatcher.NEW_REVISION, 'S2-2401234', 'r02')])
+        self.assertEqual(len(watcher.get_entries(revisions_url)), 2)
+
+    def test_diff_listings(self):
+        with mock.patch.object(NetworkSession, 'fetch_if_changed', return_value=(
+                listing_html(['S2-2401234r01.zip', 'S2-2401235.zip', 'readme.txt']), {})):
+            entries = FolderWatcher().refresh(revisions_url)
+        events = FolderWatcher.diff_listings(entries[:1], entries)
+        self.assertEqual([(e.kind, e.tdoc) for e in events], [(FolderWatcher.NEW_TDOC, 'S2-2401235')])
+
+    def test_other_format_falls_back_to_links(self):
+        # Not an FTP listing (e.g. other listings of the meeting server): the revisions are still found
+        html = ('<html><body><ul><li><a href="S2-2401234r01.zip">S2-2401234r01.zip</a></li>'
+                '<li><a href="S2-2401234r02.zip">S2-2401234r02.zip</a></li></ul></body></html>')
+        with mock.patch.object(NetworkSession, 'fetch_if_changed', return_value=(html, {})):
+            entries = FolderWatcher().refresh(revisions_url)
+        self.assertEqual(TDocsRevisionsFetcherThread.revisions_from_entries(entries), {'S2-2401234': ['r01', 'r02']})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import datetime
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from modules.emails.core.email_db import EmailDatabase
+from modules.emails.core.email_threads import EmailSyncThread
+from modules.emails.core.mail_source import LocalMailSource, MailSource, open_mail_source
+
+EMAILS_FOLDER = Path(__file__).parent / 'fixtures' / 'emails'
+AI_LOOKUP = {'S2-2401234': '8.1', 'S2-2401500': '9.2'}
+
+
+def to_local_time(utc_time: datetime.datetime) -> datetime.datetime:
+    return utc_time.replace(tzinfo=datetime.timezone.utc).astimezone().replace(tzinfo=None)
+
+
+class Test_test_mail_source(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.source_folder = Path(self.folder.name) / 'source'
+        self.source_folder.mkdir()
+        for eml in EMAILS_FOLDER.glob('*.eml'):
+            shutil.copy(eml, self.source_folder)
+        self.meeting_dir = Path(self.folder.name) / 'meeting'
+        self.db = EmailDatabase(Path(self.folder.name) / 'emails.db')
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def sync(self, full_resync=False) -> str:
+        thread = EmailSyncThread(str(self.source_folder), self.meeting_dir, AI_LOOKUP, self.db, full_resync=full_resync)
+        results = []
+        thread.finished.connect(lambda success, message: results.append((success, message)))
+        thread.run()
+        self.assertTrue(results[0][0], results[0][1])
+        return results[0][1]
+
+    def get_high_water_mark(self) -> datetime.datetime:
+        key = LocalMailSource(str(self.source_folder)).key
+        return datetime.datetime.fromisoformat(self.db.get_sync_state(key)['high_water_mark'])
+
+    def test_items_newest_first(self):
+        with open_mail_source(str(self.source_folder)) as source:
+            self.assertIsInstance(source, LocalMailSource)
+            self.assertTrue(source.open())
+            items = [item for _, _, item in source.iter_items()]
+        self.assertEqual([item.EntryID for item in items],
+                         ['<0002.S2-2401500@ericsson.com>', '<0001.S2-2401234@nokia.com>',
+                          '<0003.logistics@3gpp.org>'])
+        # Listserv emails carry the sender in Reply-To
+        self.assertEqual(items[1].ReplyRecipients[0].Address, 'jane.doe@nokia.com')
+
+    def test_incomplete_source(self):
+        class NoSaveMailSource(MailSource):
+            def open(self):
+                return True
+
+            def iter_items(self, received_after=None, received_before=None):
+                return iter([])
+
+            def get_item(self, entry_id):
+                return None
+
+        # Fails when created, not halfway through a sync
+        self.assertRaises(TypeError, NoSaveMailSource, str(self.source_folder))
+
+    def test_incremental_sync(self):
+        self.assertEqual(self.sync(), 'Successfully synced 2 emails.')
+        self.assertEqual(self.get_high_water_mark(), to_local_time(datetime.datetime(2024, 5, 13, 9, 30)))
+        saved = list((self.meeting_dir / 'S2-2401234' / 'email approval').glob('*.eml'))
+        self.assertEqual(len(saved), 1)
+
+        # Only the new email is parsed. The ones inside the overlap before the high-water mark are skipped
+        shutil.copy(EMAILS_FOLDER / 'later' / '004_S2-2401234.eml', self.source_folder)
+        self.assertEqual(self.sync(), 'Successfully synced 1 emails.')
+        self.assertEqual(self.get_high_water_mark(), to_local_time(datetime.datetime(2024, 5, 14, 10, 0)))
+        with sqlite3.connect(self.db.db_path) as conn:
+            n_emails = conn.execute('SELECT COUNT(*) FROM emails').fetchone()[0]
+        self.assertEqual(n_emails, 3)
+
+    def test_full_resync(self):
+        self.sync()
+        self.assertEqual(self.sync(), 'Successfully synced 0 emails.')
+        self.assertEqual(self.sync(full_resync=True), 'Successfully synced 2 emails.')
+        # Messages already on disk are not written again
+        saved = list((self.meeting_dir / 'S2-2401234' / 'email approval').glob('*.eml'))
+        self.assertEqual(len(saved), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
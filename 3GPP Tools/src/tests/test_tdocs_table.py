@@ -0,0 +1,45 @@
+import unittest
+
+from modules.meetings.core.tdocs_parser import TDocsTable
+
+
+class Test_test_tdocs_table(unittest.TestCase):
+    def setUp(self):
+        self.table = TDocsTable(
+            ['TDoc', 'Title'],
+            [['S2-2401003', 'S2-2401001', 'S2-2401002'], ['Third', 'First', 'Second']])
+
+    def test_row_survives_sort(self):
+        row = self.table[0]
+        tdoc_dict = {r['TDoc']: r for r in self.table}
+        self.table.sort(key=lambda r: r['TDoc'])
+
+        self.assertEqual([r['TDoc'] for r in self.table], ['S2-2401001', 'S2-2401002', 'S2-2401003'])
+        self.assertEqual(row['TDoc'], 'S2-2401003')
+        self.assertEqual(row['Title'], 'Third')
+        self.assertTrue(all(r['TDoc'] == tdoc_id for tdoc_id, r in tdoc_dict.items()))
+
+        # Writes through a row kept before the sort go to the same TDoc
+        tdoc_dict['S2-2401002']['Revised to'] = 'S2-2401002r01'
+        self.assertEqual(self.table[1]['Revised to'], 'S2-2401002r01')
+        self.assertNotIn('Revised to', self.table[0])
+
+    def test_row_survives_extend_and_sort(self):
+        row = self.table[2]
+        self.table.extend([{'TDoc': 'S2-2401000', 'Title': 'Zeroth', 'Is revision of': ''}])
+        self.table.sort(key=lambda r: r['TDoc'])
+
+        self.assertEqual(row['TDoc'], 'S2-2401002')
+        self.assertEqual(self.table[0]['Title'], 'Zeroth')
+        self.assertEqual(self.table[3].get('Is revision of', 'missing'), 'missing')
+        self.assertEqual(len(self.table), 4)
+
+    def test_columns_in_table_order(self):
+        self.table.sort(key=lambda r: r['TDoc'], reverse=True)
+        self.assertEqual(self.table.column('Title'), ['Third', 'Second', 'First'])
+        self.assertEqual(self.table.to_cache()['columns'][0], ['S2-2401003', 'S2-2401002', 'S2-2401001'])
+        self.assertEqual([r['TDoc'] for r in self.table[1:]], ['S2-2401002', 'S2-2401001'])
+
+
+if __name__ == '__main__':
+    unittest.main()
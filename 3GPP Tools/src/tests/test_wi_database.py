@@ -0,0 +1,61 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from modules.meetings.core.meetings_db import MeetingsDatabase
+from modules.work_items.core.wi_database import WorkItemsDatabase
+
+WORK_ITEMS = [
+    {'code': '1010101', 'acronym': 'ProSe_Ph3', 'name': 'ProSe relay enhancements', 'release': 'Rel-19'},
+    {'code': '1010102', 'acronym': '5GProSe', 'name': 'Proximity based services in 5GS', 'release': 'Rel-18'},
+    {'code': '1010103', 'acronym': 'FS_AIMLsys', 'name': 'Study on AI/ML system support', 'release': 'Rel-19'},
+]
+
+
+class Test_test_wi_database(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.folder.name) / 'work_items.db'
+        # Working groups are shared with the meetings tables
+        MeetingsDatabase(self.db_path)
+        self.db = WorkItemsDatabase(self.db_path)
+        self.db.upsert_work_items('SA2', WORK_ITEMS)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def search_codes(self, search_term: str) -> list:
+        return sorted(row['code'] for row in self.db.search_work_items(search_term))
+
+    def test_fts_enabled(self):
+        self.assertTrue(self.db.fts_enabled)
+
+    def test_infix_match(self):
+        self.assertEqual(self.search_codes('ProSe'), ['1010101', '1010102'])
+        self.assertEqual(self.search_codes('prose'), ['1010101', '1010102'])
+        self.assertEqual(self.search_codes('AIML'), ['1010103'])
+
+    def test_all_words_match(self):
+        self.assertEqual(self.search_codes('5G ProSe'), ['1010102'])
+        self.assertEqual(self.search_codes('ProSe relay'), ['1010101'])
+        self.assertEqual(self.search_codes('ProSe AIML'), [])
+
+    def test_short_words(self):
+        # No trigram in 2-character words: matched with LIKE
+        self.assertEqual(self.search_codes('5G'), ['1010102'])
+        self.assertEqual(self.search_codes('AI'), ['1010103'])
+
+    def test_like_fallback(self):
+        self.db.fts_enabled = False
+        self.assertEqual(self.search_codes('ProSe'), ['1010101', '1010102'])
+        self.assertEqual(self.search_codes('5G ProSe'), ['1010102'])
+
+    def test_index_follows_updates(self):
+        # The triggers keep the index in sync with work_items
+        self.db.upsert_work_items('SA2', [{'code': '1010104', 'acronym': 'eProSe', 'name': 'Enhanced relays',
+                                           'release': 'Rel-20'}])
+        self.assertEqual(self.search_codes('ProSe'), ['1010101', '1010102', '1010104'])
+
+
+if __name__ == '__main__':
+    unittest.main()
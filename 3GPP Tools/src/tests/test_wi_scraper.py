@@ -0,0 +1,98 @@
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import modules.work_items.core.wi_scraper as wi_scraper
+from modules.meetings.core.meetings_db import MeetingsDatabase
+from modules.work_items.core.wi_database import WorkItemsDatabase
+from modules.work_items.core.wi_scraper import TargetedWIScraperThread, WorkItemsScraperThread
+
+WI_CODE = '1010101'
+WI_DETAILS_HTML = '''
+<html><body>
+<span id="lblStartDate">2024-05-01</span>
+<span id="lblEndDate">2025-12-31</span>
+<a id="lnkWiVersion">SP-240101</a>
+</body></html>
+'''
+WG_PAGE_HTML = '''
+<html><body><table class="dsp-tsgwgxwis">
+<tr><td><a href="/desktopmodules/WorkItem/WorkItemDetails.aspx?workitemId=1010102">New study</a></td>
+<td>FS_NewStudy</td><td>Rel-20</td></tr>
+</table></body></html>
+'''
+
+
+class Test_test_wi_scraper(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.folder.name) / 'work_items.db'
+        # Working groups are shared with the meetings tables
+        MeetingsDatabase(self.db_path)
+        self.db = WorkItemsDatabase(self.db_path)
+        self.db.upsert_work_items('SA2', [{'code': WI_CODE, 'acronym': 'FS_AIMLsys', 'name': 'Study', 'release': 'Rel-19'}])
+        self.sync_states = []
+        self.pages = {}
+        self.fetch_patch = mock.patch.object(wi_scraper, 'fetch_if_changed', side_effect=self.fetch_if_changed)
+        self.fetch_patch.start()
+
+    def tearDown(self):
+        self.fetch_patch.stop()
+        self.folder.cleanup()
+
+    def fetch_if_changed(self, url, state):
+        self.sync_states.append(state)
+        return self.pages.get(url, WI_DETAILS_HTML), {'etag': '"v1"', 'last_modified': None, 'content_hash': 'abc'}
+
+    def run_update(self):
+        thread = TargetedWIScraperThread(self.db_path, [WI_CODE])
+        results = []
+        thread.finished_sync.connect(lambda success, message: results.append(success))
+        thread.run()
+        return results[0]
+
+    def test_metadata_written(self):
+        self.assertTrue(self.run_update())
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute('SELECT start_date, latest_wid FROM work_items WHERE code = ?', (WI_CODE,)).fetchone()
+        self.assertEqual(row, ('2024-05-01', 'SP-240101'))
+        # Conditional GET on the next update
+        self.run_update()
+        self.assertEqual(self.sync_states[-1]['etag'], '"v1"')
+
+    def test_database_failure_fetches_again(self):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("CREATE TRIGGER fail_update BEFORE UPDATE ON work_items "
+                         "BEGIN SELECT RAISE(ABORT, 'database or disk is full'); END")
+        self.assertFalse(self.run_update())
+        self.assertEqual(self.db.get_sync_states([TargetedWIScraperThread._get_details_url(WI_CODE)]), {})
+
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('DROP TRIGGER fail_update')
+        self.assertTrue(self.run_update())
+        # Fetched again without validators
+        self.assertIsNone(self.sync_states[-1])
+
+    def run_wg_sync(self):
+        thread = WorkItemsScraperThread(self.db_path)
+        thread.wgs = {'SA2': 'S2'}
+        thread.run()
+        return thread.report
+
+    def test_empty_wg_page_fetches_again(self):
+        wg_url = WorkItemsScraperThread._get_wg_url('S2')
+        self.pages[wg_url] = '<html><body>Service unavailable</body></html>'
+        self.assertEqual(self.run_wg_sync()['new'], [])
+        self.assertEqual(self.db.get_sync_states([wg_url]), {})
+
+        self.pages[wg_url] = WG_PAGE_HTML
+        self.assertEqual(self.run_wg_sync()['new'], ['1010102'])
+        # Fetched again without validators
+        self.assertIsNone(self.sync_states[-1])
+        self.assertIn(wg_url, self.db.get_sync_states([wg_url]))
+
+
+if __name__ == '__main__':
+    unittest.main()